@@ -5,3 +5,4 @@ from .models import api as models
 from .structures import api as structures
 from .parsers import api as parsers
 from .builders import api as builders
+from .benchmarks import api as benchmarks
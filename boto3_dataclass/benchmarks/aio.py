@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+
+"""
+Event loop latency of many concurrent paginators cast by the ``aio.py`` of
+the meta package, the fields are built on the event loop vs on a thread pool.
+
+Every client is a stub of an aiobotocore ``AsyncPageIterator``, it yields the
+same synthetic page ``n_pages`` times after a simulated network round trip
+(``asyncio.sleep``). ``n_clients`` consumers run concurrently, each one reads
+every field of every item of its pages (:func:`aio.build`), while a probe
+task sleeps ``interval`` in a loop and records how late it wakes up, the
+event loop lag. In these modes:
+
+- ``inline``: ``iter_items`` without an executor, the fields are built on
+  the event loop by the consumer
+- ``thread``: ``iter_items`` with a thread pool, every page is cast and built
+  on the pool, the consumer reads the cached fields
+
+We report the wall time of all clients and the percentiles of the lag.
+"""
+
+import typing as T
+import time
+import asyncio
+import functools
+import dataclasses
+from pathlib import Path
+from types import ModuleType
+from concurrent.futures import ThreadPoolExecutor
+
+from ..utils import import_generated_package
+from .common import (
+    BenchmarkEnv,
+    get_dir_benchmark,
+    import_meta_package,
+    percentiles,
+    run_interleaved,
+    summarize,
+    write_json,
+)
+from .runtime import RuntimeTarget
+from .synthetic import SyntheticResponseGenerator
+from .shm import get_item_field
+
+MODES = ["inline", "thread"]
+
+
+class StubPageIterator:
+    """
+    Yield the same page ``n_pages`` times, each one after ``latency`` seconds.
+    """
+
+    def __init__(self, page: dict[str, T.Any], n_pages: int, latency: float):
+        self.page = page
+        self.n_pages = n_pages
+        self.latency = latency
+
+    async def __aiter__(self):
+        for _ in range(self.n_pages):
+            await asyncio.sleep(self.latency)
+            yield self.page
+
+
+async def probe_lag(stop: asyncio.Event, interval: float) -> list[float]:
+    """
+    Sleep ``interval`` until ``stop`` is set.
+
+    :returns: how late every wake up is, in seconds
+    """
+    lags = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(max(time.perf_counter() - start - interval, 0.0))
+    return lags
+
+
+@dataclasses.dataclass
+class AioResult:
+    """
+    The event loop lag of one target.
+
+    :param target: e.g. ``s3.list_objects_v2``
+    :param key: the list of items, e.g. ``Contents``
+    :param n_clients: number of concurrent paginators
+    :param n_pages: number of pages per paginator
+    :param n_items: number of items per page
+    :param times: ``{mode: one wall time of all clients per run}``
+    :param lags: ``{mode: every event loop lag of all runs}``
+    """
+
+    target: str = dataclasses.field()
+    key: str = dataclasses.field()
+    n_clients: int = dataclasses.field()
+    n_pages: int = dataclasses.field()
+    n_items: int = dataclasses.field()
+    times: dict[str, list[float]] = dataclasses.field(default_factory=dict)
+    lags: dict[str, list[float]] = dataclasses.field(default_factory=dict)
+
+    def lag_stats(self, mode: str) -> dict[str, float]:
+        stats = percentiles(self.lags[mode])
+        stats["max"] = max(self.lags[mode], default=0.0)
+        return stats
+
+    def to_dict(self) -> dict[str, T.Any]:
+        data = dataclasses.asdict(self)
+        del data["lags"]
+        data["stats"] = {
+            mode: {"time": summarize(self.times[mode]), "lag": self.lag_stats(mode)}
+            for mode in MODES
+        }
+        return data
+
+
+@dataclasses.dataclass
+class AioBenchmarkReport:
+    """
+    The event loop lag benchmark results of a generator version.
+    """
+
+    env: BenchmarkEnv = dataclasses.field(default_factory=BenchmarkEnv)
+    results: list[AioResult] = dataclasses.field(default_factory=list)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return {
+            "env": dataclasses.asdict(self.env),
+            "results": [result.to_dict() for result in self.results],
+        }
+
+    def write(self, path: Path):
+        write_json(path, self.to_dict())
+
+    def summary(self) -> str:
+        lines = []
+        for result in self.results:
+            parts = []
+            for mode in MODES:
+                time_ms = summarize(result.times[mode])["median"] * 1000
+                lag = result.lag_stats(mode)
+                parts.append(
+                    f"{mode} {time_ms:.2f} ms, lag p99 {lag['p99'] * 1000:.2f} ms "
+                    f"/ max {lag['max'] * 1000:.2f} ms"
+                )
+            lines.append(
+                f"- {result.target}.{result.key} ({result.n_clients} clients x "
+                f"{result.n_pages} pages x {result.n_items} items): " + ", ".join(parts)
+            )
+        return "\n".join(lines)
+
+
+async def _consume(aio: ModuleType, pages, target: RuntimeTarget, key: str, **kwargs):
+    n = 0
+    async for item in aio.iter_items(
+        pages,
+        key,
+        service_name=target.cm.service_name,
+        operation_name=target.method_name,
+        **kwargs,
+    ):
+        aio.build(item)
+        n += 1
+    return n
+
+
+async def _run_clients(
+    aio: ModuleType,
+    target: RuntimeTarget,
+    key: str,
+    page: dict[str, T.Any],
+    n_clients: int,
+    n_pages: int,
+    latency: float,
+    interval: float,
+    executor: ThreadPoolExecutor | None,
+) -> tuple[float, list[float]]:
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_lag(stop, interval))
+    start = time.perf_counter()
+    counts = await asyncio.gather(
+        *[
+            _consume(
+                aio,
+                StubPageIterator(page, n_pages, latency),
+                target,
+                key,
+                executor=executor,
+                offload_threshold=1,
+            )
+            for _ in range(n_clients)
+        ]
+    )
+    elapsed = time.perf_counter() - start
+    stop.set()
+    lags = await probe
+    expected = n_clients * n_pages * len(page[key])
+    if sum(counts) != expected:  # pragma: no cover
+        raise ValueError(f"{target.name} yielded {sum(counts)} of {expected} items")
+    return elapsed, lags
+
+
+def run_aio_benchmark(
+    target: RuntimeTarget,
+    key: str,
+    aio: ModuleType,
+    n_clients: int = 20,
+    n_pages: int = 5,
+    n_items: int = 1000,
+    n_threads: int = 1,
+    latency: float = 0.01,
+    interval: float = 0.001,
+    n_runs: int = 3,
+) -> AioResult:
+    """
+    :param aio: the ``aio`` module of the meta package
+    :param latency: the simulated network round trip of a page
+    :param interval: the sleep of the lag probe
+    """
+    generator = SyntheticResponseGenerator(tdm=target.tdm, list_size=1)
+    item = generator.make(get_item_field(target, key).anno.nested_type_name)
+    page = generator.make(target.caster_method.boto3_stubs_type_name)
+    # every page of every client is the same dict, the cast objects are not
+    page[key] = [item] * n_items
+
+    result = AioResult(
+        target=target.name,
+        key=key,
+        n_clients=n_clients,
+        n_pages=n_pages,
+        n_items=n_items,
+    )
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        executors = {"inline": None, "thread": executor}
+        # import the caster and type_defs, and start the thread, before the timer
+        for mode in MODES:
+            asyncio.run(
+                _run_clients(
+                    aio=aio,
+                    target=target,
+                    key=key,
+                    page=page,
+                    n_clients=1,
+                    n_pages=1,
+                    latency=0,
+                    interval=interval,
+                    executor=executors[mode],
+                )
+            )
+
+        def run_once(mode: str) -> tuple[float, list[float]]:
+            return asyncio.run(
+                _run_clients(
+                    aio=aio,
+                    target=target,
+                    key=key,
+                    page=page,
+                    n_clients=n_clients,
+                    n_pages=n_pages,
+                    latency=latency,
+                    interval=interval,
+                    executor=executors[mode],
+                )
+            )
+
+        runs = run_interleaved(
+            {mode: functools.partial(run_once, mode) for mode in MODES},
+            n_runs=n_runs,
+        )
+    for mode in MODES:
+        result.times[mode] = [elapsed for elapsed, _ in runs[mode]]
+        result.lags[mode] = [lag for _, lags in runs[mode] for lag in lags]
+    return result
+
+
+def run_aio_benchmark_all(
+    targets: list[tuple[RuntimeTarget, str]],
+    n_clients: int = 20,
+    n_pages: int = 5,
+    n_items: int = 1000,
+    n_threads: int = 1,
+    n_runs: int = 3,
+    dir_workspace: Path | None = None,
+) -> AioBenchmarkReport:
+    """
+    Compare the two modes for every target.
+
+    :param targets: the caster methods and the list of items, e.g.
+        ``(RuntimeTarget.from_service("s3", "list_objects_v2"), "Contents")``
+    :param n_clients: number of concurrent paginators
+    :param n_pages: number of pages per paginator
+    :param n_items: number of items per page
+    :param n_threads: number of threads of the pool
+    :param n_runs: number of runs per target and mode
+    :param dir_workspace: where to render the packages, default is
+        ``build/benchmarks/aio/``
+    """
+    if dir_workspace is None:
+        dir_workspace = get_dir_benchmark("aio") / "packages"
+    aio = import_meta_package(dir_workspace / "meta").aio
+    report = AioBenchmarkReport()
+    for target, key in targets:
+        # the real package name, aio finds the caster by the service name
+        import_generated_package(
+            package_name="boto3_dataclass_" + target.cm.service_name,
+            tdm=target.tdm,
+            cm=target.cm,
+            dir_root=dir_workspace / "services",
+        )
+        report.results.append(
+            run_aio_benchmark(
+                target=target,
+                key=key,
+                aio=aio,
+                n_clients=n_clients,
+                n_pages=n_pages,
+                n_items=n_items,
+                n_threads=n_threads,
+                n_runs=n_runs,
+            )
+        )
+    return report
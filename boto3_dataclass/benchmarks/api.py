@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+from .common import BenchmarkEnv
+from .common import get_path_benchmark_result
+from .cold_start import ResponseFixture
+from .cold_start import build_zip_layer
+from .cold_start import ColdStartSample
+from .cold_start import ColdStartResult
+from .cold_start import ColdStartReport
+from .cold_start import run_cold_start_all
+from .synthetic import SyntheticResponseGenerator
+from .synthetic import get_path_synthetic_response
+from .runtime import RuntimeTarget
+from .runtime import RuntimeResult
+from .runtime import RuntimeReport
+from .runtime import run_runtime_benchmark_all
+from .throughput import ThroughputScenario
+from .throughput import scenario_factories
+from .throughput import ThroughputResult
+from .throughput import ThroughputReport
+from .throughput import run_throughput_benchmark_all
+from .memory import materialize
+from .memory import deep_size
+from .memory import DeepSize
+from .memory import ClassSize
+from .memory import MemoryResult
+from .memory import MemoryReport
+from .memory import run_memory_benchmark_all
+from .codegen import CorpusEntry
+from .codegen import pin_corpus
+from .codegen import load_corpus
+from .codegen import CodegenReport
+from .codegen import get_path_codegen_report
+from .codegen import run_codegen_benchmark_all
+from .hook import import_hook_module
+from .hook import HookResult
+from .hook import HookReport
+from .hook import run_hook_benchmark_all
+from .common import import_meta_package
+from .factory import FactoryResult
+from .factory import FactoryReport
+from .factory import run_factory_benchmark_all
+from .compact import CompactResult
+from .compact import CompactReport
+from .compact import run_compact_benchmark_all
+from .tree_shake import TreeShakeResult
+from .tree_shake import TreeShakeReport
+from .tree_shake import run_tree_shake_benchmark_all
+from .dedup import DedupResult
+from .dedup import DedupReport
+from .dedup import run_dedup_benchmark_all
+from .slim import SlimResult
+from .slim import SlimBenchmarkReport
+from .slim import run_slim_benchmark_all
+from .bundle import DEFAULT_ALLOWLIST
+from .bundle import BundleResult
+from .bundle import BundleBenchmarkReport
+from .bundle import run_bundle_benchmark
+from .transfer import StatePickler
+from .transfer import TransferResult
+from .transfer import TransferReport
+from .transfer import run_transfer_benchmark_all
+from .shm import ShmResult
+from .shm import ShmBenchmarkReport
+from .shm import run_shm_benchmark_all
+from .aio import AioResult
+from .aio import AioBenchmarkReport
+from .aio import run_aio_benchmark_all
+from .hashing import HashingResult
+from .hashing import HashingBenchmarkReport
+from .hashing import run_hashing_benchmark_all
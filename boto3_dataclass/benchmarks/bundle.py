@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+"""
+Size and import time of a bundle package built from an allowlist of
+``service.operation`` names vs the full service packages, see
+:class:`~boto3_dataclass.builders.publish_boto3_dataclass_bundle.Boto3DataclassBundleBuilder`.
+
+1. the full packages of the services in the allowlist (tree shaken and
+   deduped, like the builder) and the bundle are rendered with the current
+   templates and compiled to ``.pyc``, like an installed wheel
+2. the ``caster`` and ``type_defs`` modules of every service are imported
+   in a fresh interpreter (``caster.py`` loads ``type_defs.py`` lazily), interleaving the modes, so a noisy machine affects both the
+   same way
+"""
+
+import typing as T
+import os
+import sys
+import json
+import subprocess
+import dataclasses
+from pathlib import Path
+
+from ..utils import write
+from ..models.reachability import TypeReachabilityGraph
+from ..builders.bytecode import compile_package
+from ..builders.publish_boto3_dataclass_slim import get_sub_package_name
+from ..builders.publish_boto3_dataclass_bundle import Boto3DataclassBundleBuilder
+from .common import (
+    BenchmarkEnv,
+    get_dir_benchmark,
+    parse_service,
+    summarize,
+    write_json,
+)
+
+MODES = ["full", "bundle"]
+
+DEFAULT_ALLOWLIST = [
+    "dynamodb.get_item",
+    "dynamodb.query",
+    "lambda.invoke",
+    "s3.list_objects_v2",
+    "sqs.receive_message",
+]
+
+# the modules imported by the generated code are imported before the timer
+_CHILD_CODE = """
+import sys, json, time, importlib
+import typing, dataclasses, functools
+
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+print(json.dumps({"import_time": time.perf_counter() - start}))
+"""
+
+
+def run_import_modules_once(
+    module_names: list[str],
+    dir_workspace: Path,
+    timeout: float = 300,
+    python: str = sys.executable,
+) -> float:
+    """
+    Import the modules in a fresh interpreter.
+
+    :returns: the import time in seconds
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(dir_workspace)
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    args = [python, "-c", _CHILD_CODE, *module_names]
+    res = subprocess.run(args, env=env, capture_output=True, text=True, timeout=timeout)
+    if res.returncode != 0:
+        raise RuntimeError(f"Import of {module_names} failed:\n{res.stderr.strip()}")
+    return json.loads(res.stdout.strip().splitlines()[-1])["import_time"]
+
+
+def _get_source_bytes(dir_package: Path) -> int:
+    return sum(path.stat().st_size for path in dir_package.rglob("*.py"))
+
+
+@dataclasses.dataclass
+class BundleResult:
+    """
+    The full service packages and the bundle of one allowlist.
+
+    :param operations: the ``service.operation`` names of the allowlist
+    :param classes: ``{mode: number of dataclasses}``
+    :param source_bytes: ``{mode: bytes of the source}``
+    :param import_times: ``{mode: one import time per fresh interpreter}``
+    """
+
+    operations: list[str] = dataclasses.field(default_factory=list)
+    classes: dict[str, int] = dataclasses.field(default_factory=dict)
+    source_bytes: dict[str, int] = dataclasses.field(default_factory=dict)
+    import_times: dict[str, list[float]] = dataclasses.field(default_factory=dict)
+
+    def stats(self, mode: str) -> dict[str, float]:
+        return summarize(self.import_times[mode])
+
+    def to_dict(self) -> dict[str, T.Any]:
+        data = dataclasses.asdict(self)
+        data["stats"] = {mode: self.stats(mode) for mode in MODES}
+        return data
+
+
+@dataclasses.dataclass
+class BundleBenchmarkReport:
+    """
+    The bundle package benchmark result of a generator version.
+    """
+
+    env: BenchmarkEnv = dataclasses.field(default_factory=BenchmarkEnv)
+    result: BundleResult = dataclasses.field(default_factory=BundleResult)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return {
+            "env": dataclasses.asdict(self.env),
+            "result": self.result.to_dict(),
+        }
+
+    def write(self, path: Path):
+        write_json(path, self.to_dict())
+
+    def summary(self) -> str:
+        result = self.result
+        full_ms = result.stats("full")["median"] * 1000
+        bundle_ms = result.stats("bundle")["median"] * 1000
+        return (
+            f"- {len(result.operations)} operations: "
+            f"{result.classes['bundle']} of {result.classes['full']} classes, "
+            f"{result.source_bytes['full']} -> {result.source_bytes['bundle']} bytes, "
+            f"import {full_ms:.2f} ms -> {bundle_ms:.2f} ms"
+        )
+
+
+def run_bundle_benchmark(
+    allowlist: T.Iterable[str] = tuple(DEFAULT_ALLOWLIST),
+    n_runs: int = 5,
+    dir_workspace: Path | None = None,
+    package_name: str = "boto3_dataclass_bench_bundle",
+) -> BundleBenchmarkReport:
+    """
+    Compare the bundle of the allowlist with the full service packages.
+
+    :param allowlist: the ``service.operation`` names
+    :param n_runs: number of fresh interpreters per mode
+    :param dir_workspace: where to render the packages, default is
+        ``build/benchmarks/bundle/packages/``
+    """
+    if dir_workspace is None:
+        dir_workspace = get_dir_benchmark("bundle") / "packages"
+    builder = Boto3DataclassBundleBuilder.new(
+        package_name=package_name,
+        allowlist=allowlist,
+    )
+    builder.structure.dir_repo = dir_workspace / "bundle"
+    slim_report = builder.build_all()
+    compile_package(builder.structure.dir_package)
+
+    result = BundleResult(operations=builder.operations)
+    result.classes["full"] = sum(s.classes_before for s in slim_report.services)
+    result.classes["bundle"] = sum(s.classes_after for s in slim_report.services)
+    result.source_bytes["full"] = 0
+    full_modules = []
+    for service_name in sorted(builder.manifest.services):
+        tdm, cm = parse_service(service_name)
+        tdm = TypeReachabilityGraph.new(tdm=tdm, cm=cm).shake(tdm).dedup()
+        full_package_name = f"boto3_dataclass_{get_sub_package_name(service_name)}"
+        dir_package = dir_workspace / "full" / full_package_name
+        type_defs_line = f"from mypy_boto3_{cm.service_name} import type_defs"
+        write(dir_package / "type_defs.py", tdm.gen_code(type_defs_line=type_defs_line))
+        write(dir_package / "caster.py", cm.gen_code())
+        write(dir_package / "__init__.py", "")
+        compile_package(dir_package)
+        result.source_bytes["full"] += _get_source_bytes(dir_package)
+        full_modules.extend(
+            [f"{full_package_name}.caster", f"{full_package_name}.type_defs"]
+        )
+
+    result.source_bytes["bundle"] = _get_source_bytes(builder.structure.dir_package)
+    bundle_modules = [
+        f"{package_name}.{sub_package_name}.{module}"
+        for sub_package_name in builder.service_names
+        for module in ["caster", "type_defs"]
+    ]
+
+    module_names = {"full": full_modules, "bundle": bundle_modules}
+    dir_roots = {"full": dir_workspace / "full", "bundle": builder.structure.dir_repo}
+    for mode in MODES:
+        result.import_times[mode] = []
+    for _ in range(n_runs):
+        for mode in MODES:
+            result.import_times[mode].append(
+                run_import_modules_once(
+                    module_names=module_names[mode],
+                    dir_workspace=dir_roots[mode],
+                )
+            )
+    return BundleBenchmarkReport(result=result)
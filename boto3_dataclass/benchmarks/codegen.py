@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+
+"""
+Codegen throughput benchmark on a pinned corpus of stub files.
+
+The corpus goes from small to huge: the test stub in
+:mod:`boto3_dataclass.tests.gen_code`, then ``iam``, ``s3`` and ``ec2``. The
+sha256 of every stub file is pinned in ``codegen_corpus.json`` next to this
+module, the benchmark refuses to run on different stubs, so the results of two
+commits are always comparable. Use :func:`pin_corpus` to re-pin after a
+``boto3-stubs`` upgrade.
+
+Every corpus entry runs in a fresh process, each stage is timed separately:
+
+- ``parse_type_defs``: :meth:`TypedDefsModuleParser.parse <boto3_dataclass.parsers.type_defs_parser.TypedDefsModuleParser.parse>`
+- ``parse_client``: :meth:`ClientModuleParser.parse <boto3_dataclass.parsers.client_parser.ClientModuleParser.parse>`
+- ``gen_code``: :meth:`TypedDefsModule.gen_code <boto3_dataclass.models.typed_dict.TypedDefsModule.gen_code>`
+  and :meth:`CasterModule.gen_code <boto3_dataclass.models.caster.CasterModule.gen_code>`
+- ``black``: :func:`~boto3_dataclass.utils.black_format_code`
+- ``write``: :func:`~boto3_dataclass.utils.write`
+
+We report lines/s (input stub lines for the parse stages, generated lines for
+the others) and the peak RSS of the process after each stage. The report is
+stored by git commit in ``build/benchmarks/codegen/${git_commit}.json``.
+"""
+
+import typing as T
+import sys
+import json
+import time
+import hashlib
+import dataclasses
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from ..paths import path_enum
+from ..utils import black_format_code, write
+from ..parsers.type_defs_parser import TypedDefsModuleParser
+from ..parsers.client_parser import ClientModuleParser
+
+from .common import BenchmarkEnv, get_dir_benchmark, summarize, write_json
+
+path_corpus_manifest = Path(__file__).absolute().parent / "codegen_corpus.json"
+
+STAGES = [
+    "parse_type_defs",
+    "parse_client",
+    "gen_code",
+    "black",
+    "write",
+]
+
+TEST_CORPUS_NAME = "test"
+
+
+def sha256_file(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@dataclasses.dataclass
+class CorpusEntry:
+    """
+    A set of stub files in the corpus.
+
+    :param name: ``test`` or a service name, e.g. ``ec2``
+    :param path_type_defs_pyi: the ``type_defs.pyi`` stub file
+    :param path_client_pyi: the ``client.pyi`` stub file, the test stub doesn't have one
+    """
+
+    name: str = dataclasses.field()
+    path_type_defs_pyi: Path = dataclasses.field()
+    path_client_pyi: Path | None = dataclasses.field(default=None)
+
+    @classmethod
+    def new(cls, name: str) -> "CorpusEntry":
+        if name == TEST_CORPUS_NAME:
+            return cls(
+                name=name,
+                path_type_defs_pyi=path_enum.dir_python_lib
+                / "tests"
+                / "gen_code"
+                / "type_defs.pyi",
+            )
+        from ..structures.api import Boto3DataclassServiceStructure
+
+        structure = Boto3DataclassServiceStructure.new(name)
+        return cls(
+            name=name,
+            path_type_defs_pyi=structure.path_mypy_boto3_type_defs_pyi,
+            path_client_pyi=structure.path_mypy_boto3_client_pyi,
+        )
+
+    @property
+    def files(self) -> dict[str, Path]:
+        files = {"type_defs.pyi": self.path_type_defs_pyi}
+        if self.path_client_pyi is not None:
+            files["client.pyi"] = self.path_client_pyi
+        return files
+
+    def get_sha256(self) -> dict[str, str]:
+        return {name: sha256_file(path) for name, path in self.files.items()}
+
+
+def pin_corpus(
+    names: T.Iterable[str],
+    path_manifest: Path = path_corpus_manifest,
+):
+    """
+    Pin the sha256 of the stub files currently installed.
+    """
+    entries = [CorpusEntry.new(name) for name in names]
+    data = {entry.name: entry.get_sha256() for entry in entries}
+    write(path_manifest, json.dumps(data, indent=2) + "\n")
+
+
+def load_corpus(
+    names: T.Iterable[str] | None = None,
+    path_manifest: Path = path_corpus_manifest,
+) -> list[CorpusEntry]:
+    """
+    Load the pinned corpus, verify the installed stub files are the pinned ones.
+
+    :param names: only load these entries, default is all the pinned entries
+    """
+    manifest = json.loads(path_manifest.read_text(encoding="utf-8"))
+    if names is None:
+        names = list(manifest)
+    entries = []
+    for name in names:
+        if name not in manifest:
+            raise ValueError(f"{name!r} is not in the pinned corpus {path_manifest}")
+        entry = CorpusEntry.new(name)
+        if entry.get_sha256() != manifest[name]:
+            raise ValueError(
+                f"The stub files of {name!r} are not the pinned ones, "
+                f"results would not be comparable. Install the pinned "
+                f"boto3-stubs, or re-pin the corpus with pin_corpus()."
+            )
+        entries.append(entry)
+    return entries
+
+
+def get_peak_rss_mb() -> float:
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    if sys.platform == "darwin":  # pragma: no cover
+        return peak / 1024 / 1024
+    return peak / 1024
+
+
+def count_lines(path: Path) -> int:
+    with path.open("rb") as f:
+        return sum(1 for _ in f)
+
+
+@dataclasses.dataclass
+class StageResult:
+    """
+    One stage of the codegen pipeline on one corpus entry.
+
+    :param stage: e.g. ``black``
+    :param n_lines: input stub lines for the parse stages, generated lines
+        for the other stages
+    :param time: min / median / max seconds
+    :param lines_per_sec: ``n_lines`` / median time
+    :param peak_rss_mb: peak RSS of the process after this stage, in MB
+    """
+
+    stage: str = dataclasses.field()
+    n_lines: int = dataclasses.field(default=0)
+    time: dict[str, float] = dataclasses.field(default_factory=dict)
+    lines_per_sec: float = dataclasses.field(default=0.0)
+    peak_rss_mb: float = dataclasses.field(default=0.0)
+
+
+@dataclasses.dataclass
+class CorpusResult:
+    """
+    All stages of one corpus entry.
+
+    :param name: e.g. ``ec2``
+    :param sha256: ``{file_name: sha256}`` of the stub files
+    :param stages: one result per stage
+    """
+
+    name: str = dataclasses.field()
+    sha256: dict[str, str] = dataclasses.field(default_factory=dict)
+    stages: list[StageResult] = dataclasses.field(default_factory=list)
+
+    @property
+    def stages_mapping(self) -> dict[str, StageResult]:
+        return {stage.stage: stage for stage in self.stages}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, T.Any]) -> "CorpusResult":
+        return cls(
+            name=data["name"],
+            sha256=data["sha256"],
+            stages=[StageResult(**stage) for stage in data["stages"]],
+        )
+
+
+def run_codegen_benchmark(
+    entry: CorpusEntry,
+    dir_workspace: Path,
+    n_runs: int = 3,
+) -> CorpusResult:
+    """
+    Run every stage ``n_runs`` times on a corpus entry, in the current process.
+    Use :func:`run_codegen_benchmark_all` to get a fresh process per entry.
+    """
+    samples: dict[str, list[float]] = {stage: [] for stage in STAGES}
+    n_lines: dict[str, int] = {stage: 0 for stage in STAGES}
+    peak_rss_mb: dict[str, float] = {stage: 0.0 for stage in STAGES}
+
+    def timeit(stage: str, func: T.Callable[[], T.Any]) -> T.Any:
+        start = time.perf_counter()
+        result = func()
+        samples[stage].append(time.perf_counter() - start)
+        peak_rss_mb[stage] = get_peak_rss_mb()
+        return result
+
+    n_lines["parse_type_defs"] = count_lines(entry.path_type_defs_pyi)
+    if entry.path_client_pyi is not None:
+        n_lines["parse_client"] = count_lines(entry.path_client_pyi)
+    type_defs_line = f"from mypy_boto3_{entry.name} import type_defs"
+    for _ in range(n_runs):
+        tdm = timeit(
+            "parse_type_defs",
+            TypedDefsModuleParser(path_stub_file=entry.path_type_defs_pyi).parse,
+        )
+        if entry.path_client_pyi is None:
+            files = ["type_defs.py"]
+        else:
+            cm = timeit(
+                "parse_client",
+                ClientModuleParser(path_stub_file=entry.path_client_pyi).parse,
+            )
+            files = ["type_defs.py", "caster.py"]
+
+        def gen_code() -> list[tuple[str, str]]:
+            codes = [("type_defs.py", tdm.gen_code(type_defs_line=type_defs_line))]
+            if "caster.py" in files:
+                codes.append(("caster.py", cm.gen_code()))
+            return codes
+
+        codes = timeit("gen_code", gen_code)
+        formatted = timeit(
+            "black",
+            lambda: [(name, black_format_code(code)) for name, code in codes],
+        )
+        n_lines["gen_code"] = sum(code.count("\n") for _, code in codes)
+        n_lines["black"] = n_lines["write"] = sum(
+            code.count("\n") for _, code in formatted
+        )
+        timeit(
+            "write",
+            lambda: [
+                write(dir_workspace / entry.name / name, code)
+                for name, code in formatted
+            ],
+        )
+
+    result = CorpusResult(name=entry.name, sha256=entry.get_sha256())
+    for stage in STAGES:
+        if not samples[stage]:
+            continue
+        time_stats = summarize(samples[stage])
+        median = time_stats["median"]
+        result.stages.append(
+            StageResult(
+                stage=stage,
+                n_lines=n_lines[stage],
+                time=time_stats,
+                lines_per_sec=n_lines[stage] / median if median else 0.0,
+                peak_rss_mb=peak_rss_mb[stage],
+            )
+        )
+    return result
+
+
+@dataclasses.dataclass
+class StageChange:
+    """
+    The change of a stage compared to a previous commit.
+
+    :param speedup: previous median time / current median time, above 1 is faster
+    """
+
+    name: str = dataclasses.field()
+    stage: str = dataclasses.field()
+    previous_time: float = dataclasses.field()
+    current_time: float = dataclasses.field()
+
+    @property
+    def speedup(self) -> float:
+        return self.previous_time / self.current_time if self.current_time else 0.0
+
+
+@dataclasses.dataclass
+class CodegenReport:
+    """
+    The codegen benchmark results of a commit.
+    """
+
+    env: BenchmarkEnv = dataclasses.field(default_factory=BenchmarkEnv)
+    results: list[CorpusResult] = dataclasses.field(default_factory=list)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, T.Any]) -> "CodegenReport":
+        return cls(
+            env=BenchmarkEnv(**data["env"]),
+            results=[CorpusResult.from_dict(result) for result in data["results"]],
+        )
+
+    def write(self, path: Path):
+        write_json(path, self.to_dict())
+
+    @classmethod
+    def read(cls, path: Path) -> "CodegenReport":
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+    def compare(self, previous: "CodegenReport") -> list[StageChange]:
+        """
+        Compare the median time of every stage with a previous commit. The
+        corpus entries with different stub files are skipped.
+        """
+        previous_results = {result.name: result for result in previous.results}
+        changes = []
+        for result in self.results:
+            prev = previous_results.get(result.name)
+            if prev is None or prev.sha256 != result.sha256:
+                continue
+            prev_stages = prev.stages_mapping
+            for stage in result.stages:
+                if stage.stage in prev_stages:
+                    changes.append(
+                        StageChange(
+                            name=result.name,
+                            stage=stage.stage,
+                            previous_time=prev_stages[stage.stage].time["median"],
+                            current_time=stage.time["median"],
+                        )
+                    )
+        return changes
+
+    def summary(self) -> str:
+        lines = []
+        for result in self.results:
+            for stage in result.stages:
+                lines.append(
+                    f"- {result.name} {stage.stage}: "
+                    f"{stage.time['median']:.3f} s, "
+                    f"{stage.lines_per_sec:,.0f} lines/s, "
+                    f"peak RSS {stage.peak_rss_mb:.0f} MB"
+                )
+        return "\n".join(lines)
+
+
+def get_path_codegen_report(git_commit: str | None) -> Path:
+    """
+    Example: ``build/benchmarks/codegen/1d12d5d1a2b3.json``
+    """
+    name = "unknown" if git_commit is None else git_commit[:12]
+    return get_dir_benchmark("codegen") / f"{name}.json"
+
+
+def run_codegen_benchmark_all(
+    entries: list[CorpusEntry],
+    n_runs: int = 3,
+    dir_workspace: Path | None = None,
+) -> CodegenReport:
+    """
+    Run the codegen benchmark on every corpus entry, each one in a fresh
+    process, so the peak RSS of an entry is not polluted by the previous one.
+
+    :param entries: see :func:`load_corpus`
+    :param n_runs: number of runs of every stage, we report min / median / max
+    :param dir_workspace: where to write the generated code, default is
+        ``build/benchmarks/codegen/output/``
+    """
+    if dir_workspace is None:
+        dir_workspace = get_dir_benchmark("codegen") / "output"
+    report = CodegenReport()
+    mp_context = multiprocessing.get_context("spawn")
+    for entry in entries:
+        with ProcessPoolExecutor(max_workers=1, mp_context=mp_context) as executor:
+            future = executor.submit(
+                run_codegen_benchmark,
+                entry,
+                dir_workspace,
+                n_runs,
+            )
+            report.results.append(future.result())
+    return report
@@ -0,0 +1,438 @@
+# -*- coding: utf-8 -*-
+
+"""
+Cold-start benchmark of the generated ``boto3_dataclass_{service_name}`` packages.
+
+It simulates what a Lambda function does on a cold start. In a fresh
+interpreter, with no bytecode written (the Lambda file system is read-only),
+it measures:
+
+1. ``import boto3_dataclass_{service_name}``
+2. the first ``caster.{method_name}(response)`` call
+3. the first nested attribute access, e.g. ``res.Role.RoleLastUsed.Region``
+
+The response comes from a recorded :class:`ResponseFixture`, the bundled ones
+live in ``boto3_dataclass/benchmarks/fixtures/${service_name}/${method_name}.json``.
+
+The package can be imported from these layouts:
+
+- ``dir``: the package folder in ``build/repos/``, like ``pip install``
+- ``zip``: a zipped Lambda layer (``python/boto3_dataclass_{service_name}/...``)
+  imported with ``zipimport``
+- ``wheel``: the source only, like today's wheel unpacked on a read-only file
+  system, every import compiles the source code
+- ``archive``: one archive file with the code of all fixture packages,
+  imported by ``boto3_dataclass.archive``, see
+  :func:`~boto3_dataclass.builders.bytecode.build_archive`
+
+Example::
+
+    report = run_cold_start_all(
+        fixtures=ResponseFixture.list_all(),
+        layouts=["dir", "zip"],
+        n_runs=5,
+    )
+    report.write(get_path_benchmark_result("cold_start"))
+"""
+
+import typing as T
+import os
+import sys
+import json
+import time
+import shutil
+import zipfile
+import subprocess
+import py_compile
+import dataclasses
+from pathlib import Path
+
+from ..builders.bytecode import compile_package, build_archive
+from .common import (
+    BenchmarkEnv,
+    get_dir_benchmark,
+    import_meta_package,
+    summarize,
+    write_json,
+)
+
+dir_fixtures = Path(__file__).absolute().parent / "fixtures"
+
+T_LAYOUT = T.Literal[
+    "dir",  # the package folder, like pip install
+    "zip",  # a zipped Lambda layer, imported with zipimport
+    "wheel",  # the source only, nothing precompiled
+    "archive",  # one archive file of all packages, with a meta path importer
+]
+
+META_PACKAGE_NAME = "boto3_dataclass_bench_meta"
+
+# The code that runs in the fresh interpreter. The fixture is loaded before
+# the clock starts, so only the generated code is measured. The caster loads
+# ``type_defs.py`` lazily, it is imported explicitly so the import time
+# includes it.
+_CHILD_CODE = """
+import sys, json, time, importlib
+
+package_name, method_name, nested_attribute, path_fixture, path_archive = sys.argv[1:6]
+with open(path_fixture, "r", encoding="utf-8") as f:
+    response = json.load(f)["response"]
+if path_archive:
+    from boto3_dataclass_bench_meta.archive import install
+
+start = time.perf_counter()
+if path_archive:
+    install(path_archive)
+module = importlib.import_module(package_name)
+importlib.import_module(package_name + ".type_defs")
+import_done = time.perf_counter()
+obj = getattr(module.caster, method_name)(response)
+cast_done = time.perf_counter()
+value = obj
+for attr in nested_attribute.split("."):
+    value = value[int(attr)] if attr.isdigit() else getattr(value, attr)
+access_done = time.perf_counter()
+
+print(json.dumps({
+    "import_time": import_done - start,
+    "first_cast_time": cast_done - import_done,
+    "first_access_time": access_done - cast_done,
+    "value": repr(value),
+}))
+"""
+
+
+@dataclasses.dataclass
+class ResponseFixture:
+    """
+    A recorded boto3 response of a client method.
+
+    :param service_name: e.g. ``iam``
+    :param method_name: the client and caster method, e.g. ``get_role``
+    :param nested_attribute: the attribute path to access after casting,
+        integer parts are list indexes, e.g. ``Reservations.0.Instances.0.InstanceId``
+    :param response: the raw boto3 response
+    :param path: where the fixture is loaded from
+    """
+
+    service_name: str = dataclasses.field()
+    method_name: str = dataclasses.field()
+    nested_attribute: str = dataclasses.field()
+    response: dict[str, T.Any] = dataclasses.field(default_factory=dict)
+    path: Path | None = dataclasses.field(default=None)
+
+    @property
+    def package_name(self) -> str:
+        return f"boto3_dataclass_{self.service_name}"
+
+    @classmethod
+    def load(cls, path: Path) -> "ResponseFixture":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(path=path, **data)
+
+    def dump(self, path: Path):
+        data = dataclasses.asdict(self)
+        data.pop("path")
+        write_json(path, data)
+        self.path = path
+
+    @classmethod
+    def list_all(
+        cls,
+        dir_root: Path = dir_fixtures,
+        service_names: T.Optional[T.Iterable[str]] = None,
+    ) -> list["ResponseFixture"]:
+        """
+        Load all ``${dir_root}/${service_name}/${method_name}.json`` fixtures.
+        """
+        if service_names is not None:
+            service_names = set(service_names)
+        fixtures = list()
+        for path in sorted(dir_root.glob("*/*.json")):
+            if service_names is None or path.parent.name in service_names:
+                fixtures.append(cls.load(path))
+        return fixtures
+
+
+def build_zip_layer(
+    dir_package: Path,
+    path_zip: Path,
+    precompile: bool = True,
+) -> Path:
+    """
+    Zip a package folder into a Lambda layer style archive, all files are
+    under the ``python/`` prefix.
+
+    :param dir_package: the package folder, e.g. ``.../boto3_dataclass_iam``
+    :param path_zip: where to write the zip file
+    :param precompile: also add the ``.pyc`` files. ``zipimport`` can't write
+        bytecode, so without them every import compiles the source code. They
+        use the unchecked hash invalidation mode, because the zip entry mtime
+        doesn't have the precision to validate timestamp based ``.pyc``.
+
+    :returns: the ``sys.path`` entry to import the package from the zip file
+    """
+    path_zip.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(path_zip, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for path in sorted(dir_package.rglob("*.py")):
+            if "__pycache__" in path.parts:  # pragma: no cover
+                continue
+            relpath = path.relative_to(dir_package.parent).as_posix()
+            arcname = f"python/{relpath}"
+            zf.write(path, arcname)
+            if precompile:
+                path_pyc = path_zip.parent / "pyc" / f"{relpath}c"
+                py_compile.compile(
+                    str(path),
+                    cfile=str(path_pyc),
+                    dfile=arcname,
+                    doraise=True,
+                    invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+                )
+                # zipimport only looks for the legacy ``module.pyc`` location
+                zf.write(path_pyc, f"{arcname}c")
+    return path_zip / "python"
+
+
+@dataclasses.dataclass
+class ColdStartSample:
+    """
+    One cold-start run in a fresh interpreter, all times are in seconds.
+
+    :param import_time: import the generated package
+    :param first_cast_time: the first ``caster.{method_name}(response)`` call
+    :param first_access_time: the first nested attribute access
+    :param process_time: wall time of the whole interpreter process,
+        including interpreter startup and loading the fixture
+    """
+
+    import_time: float = dataclasses.field()
+    first_cast_time: float = dataclasses.field()
+    first_access_time: float = dataclasses.field()
+    process_time: float = dataclasses.field()
+
+    @property
+    def total_time(self) -> float:
+        return self.import_time + self.first_cast_time + self.first_access_time
+
+
+def run_cold_start_once(
+    fixture: ResponseFixture,
+    sys_path: Path,
+    path_archive: Path | None = None,
+    timeout: float = 300,
+    python: str = sys.executable,
+) -> ColdStartSample:
+    """
+    Run one cold start in a fresh interpreter.
+
+    :param fixture: the response to cast
+    :param sys_path: the directory (or zip file path) that contains the package
+    :param path_archive: import the package from this archive file, opening
+        the archive is part of the import time
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(sys_path)
+    # the Lambda file system is read-only
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    args = [
+        python,
+        "-c",
+        _CHILD_CODE,
+        fixture.package_name,
+        fixture.method_name,
+        fixture.nested_attribute,
+        str(fixture.path),
+        "" if path_archive is None else str(path_archive),
+    ]
+    start = time.perf_counter()
+    res = subprocess.run(
+        args,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    process_time = time.perf_counter() - start
+    if res.returncode != 0:
+        raise RuntimeError(
+            f"Cold start of {fixture.package_name}.caster.{fixture.method_name} "
+            f"failed:\n{res.stderr.strip()}"
+        )
+    data = json.loads(res.stdout.strip().splitlines()[-1])
+    return ColdStartSample(
+        import_time=data["import_time"],
+        first_cast_time=data["first_cast_time"],
+        first_access_time=data["first_access_time"],
+        process_time=process_time,
+    )
+
+
+@dataclasses.dataclass
+class ColdStartResult:
+    """
+    All cold-start runs of one fixture in one layout.
+
+    :param service_name: e.g. ``iam``
+    :param method_name: e.g. ``get_role``
+    :param layout: ``dir``, ``zip``, ``wheel`` or ``archive``
+    :param samples: one sample per fresh interpreter
+    :param error: the error message if the cold start failed
+    """
+
+    service_name: str = dataclasses.field()
+    method_name: str = dataclasses.field()
+    layout: str = dataclasses.field()
+    samples: list[ColdStartSample] = dataclasses.field(default_factory=list)
+    error: str | None = dataclasses.field(default=None)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """
+        Min / median / max of every metric.
+        """
+        metrics = [
+            "import_time",
+            "first_cast_time",
+            "first_access_time",
+            "total_time",
+            "process_time",
+        ]
+        return {
+            metric: summarize([getattr(sample, metric) for sample in self.samples])
+            for metric in metrics
+        }
+
+    def to_dict(self) -> dict[str, T.Any]:
+        data = dataclasses.asdict(self)
+        data["stats"] = self.stats()
+        return data
+
+
+@dataclasses.dataclass
+class ColdStartReport:
+    """
+    The cold-start benchmark results of a generator version.
+    """
+
+    env: BenchmarkEnv = dataclasses.field(default_factory=BenchmarkEnv)
+    results: list[ColdStartResult] = dataclasses.field(default_factory=list)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return {
+            "env": dataclasses.asdict(self.env),
+            "results": [result.to_dict() for result in self.results],
+        }
+
+    def write(self, path: Path):
+        write_json(path, self.to_dict())
+
+    def summary(self) -> str:
+        lines = []
+        for result in self.results:
+            name = f"{result.service_name}.{result.method_name} ({result.layout})"
+            if result.error is not None:
+                lines.append(f"- {name}: {result.error.splitlines()[0]}")
+                continue
+            stats = result.stats()
+            lines.append(
+                f"- {name}: "
+                f"import {stats['import_time']['median'] * 1000:.2f} ms, "
+                f"first cast {stats['first_cast_time']['median'] * 1000:.3f} ms, "
+                f"first access {stats['first_access_time']['median'] * 1000:.3f} ms, "
+                f"process {stats['process_time']['median'] * 1000:.1f} ms"
+            )
+        return "\n".join(lines)
+
+
+def run_cold_start_all(
+    fixtures: list[ResponseFixture],
+    layouts: T.Iterable[T_LAYOUT] = ("dir", "zip"),
+    n_runs: int = 5,
+    precompile: bool = True,
+    get_dir_package: T.Optional[T.Callable[[str], Path]] = None,
+    dir_workspace: Path | None = None,
+) -> ColdStartReport:
+    """
+    Run the cold-start benchmark for every fixture in every layout. The runs
+    are sequential so they don't compete for CPU.
+
+    :param fixtures: the responses to cast, one result per fixture and layout
+    :param layouts: any of ``dir``, ``zip``, ``wheel`` and ``archive``
+    :param n_runs: number of fresh interpreters per fixture and layout
+    :param precompile: ship ``.pyc`` files in the ``dir`` and ``zip`` layouts,
+        like ``pip install`` does and like a well built Lambda layer does.
+        They use the unchecked hash invalidation mode, like
+        :func:`~boto3_dataclass.builders.bytecode.add_bytecode_to_wheel`
+    :param get_dir_package: return the package folder of a service, default
+        is the generated package in ``build/repos/``
+    :param dir_workspace: where to put the zip layers, the source copies and
+        the archive, default is
+        ``build/benchmarks/cold_start/``
+    """
+    if get_dir_package is None:
+        get_dir_package = _get_dir_package_in_build_repos
+    if dir_workspace is None:
+        dir_workspace = get_dir_benchmark("cold_start")
+
+    path_archive = None
+    if "archive" in layouts:
+        dir_packages = {get_dir_package(fixture.service_name) for fixture in fixtures}
+        path_archive = dir_workspace / "archive" / "boto3_dataclass.archive"
+        build_archive(
+            dir_packages=sorted(p for p in dir_packages if p.exists()),
+            path_archive=path_archive,
+        )
+        import_meta_package(dir_workspace / "archive", META_PACKAGE_NAME)
+
+    report = ColdStartReport()
+    for fixture in fixtures:
+        dir_package = get_dir_package(fixture.service_name)
+        for layout in layouts:
+            result = ColdStartResult(
+                service_name=fixture.service_name,
+                method_name=fixture.method_name,
+                layout=layout,
+            )
+            report.results.append(result)
+            if not dir_package.exists():
+                result.error = f"{dir_package} not found, build the package first"
+                continue
+            kwargs = dict()
+            if layout == "dir":
+                if precompile:
+                    compile_package(dir_package)
+                sys_path = dir_package.parent
+            elif layout == "wheel":
+                dir_wheel = dir_workspace / "wheel"
+                shutil.rmtree(dir_wheel / dir_package.name, ignore_errors=True)
+                shutil.copytree(
+                    dir_package,
+                    dir_wheel / dir_package.name,
+                    ignore=shutil.ignore_patterns("__pycache__"),
+                )
+                sys_path = dir_wheel
+            elif layout == "archive":
+                sys_path = dir_workspace / "archive"
+                kwargs["path_archive"] = path_archive
+            elif layout == "zip":
+                sys_path = build_zip_layer(
+                    dir_package=dir_package,
+                    path_zip=dir_workspace / "layers" / f"{dir_package.name}.zip",
+                    precompile=precompile,
+                )
+            else:  # pragma: no cover
+                raise ValueError(f"Unknown layout: {layout!r}")
+            try:
+                for _ in range(n_runs):
+                    result.samples.append(
+                        run_cold_start_once(fixture, sys_path, **kwargs)
+                    )
+            except RuntimeError as e:
+                result.error = str(e)
+    return report
+
+
+def _get_dir_package_in_build_repos(service_name: str) -> Path:
+    from ..structures.api import Boto3DataclassServiceStructure
+
+    return Boto3DataclassServiceStructure.new(service_name).dir_package
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+
+"""
+Shared helpers for the benchmark suites.
+
+Every benchmark writes its result as JSON to ``build/benchmarks/${suite}/``,
+together with a :class:`BenchmarkEnv` that records the generator version, the
+git commit and the interpreter, so results can be compared across generator
+versions.
+"""
+
+import typing as T
+import sys
+import json
+import time
+import shutil
+import importlib
+import statistics
+import platform
+import datetime
+import subprocess
+import dataclasses
+from pathlib import Path
+from types import ModuleType
+
+from .._version import __version__
+from ..paths import path_enum
+from ..utils import write
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from ..models.typed_dict import TypedDefsModule
+    from ..models.caster import CasterModule
+
+
+def get_git_commit(dir_repo: Path = path_enum.dir_project_root) -> str | None:
+    """
+    The current git commit of the generator, None if not in a git repo.
+    """
+    try:
+        res = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=dir_repo,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return res.stdout.strip()
+    except Exception:  # pragma: no cover
+        return None
+
+
+@dataclasses.dataclass
+class BenchmarkEnv:
+    """
+    Where and with which generator a benchmark ran.
+
+    :param version: the boto3_dataclass generator version
+    :param git_commit: the git commit of the generator
+    :param python_version: e.g. ``3.11.7``
+    :param platform: e.g. ``Linux-6.1.0-x86_64-with-glibc2.36``
+    :param create_at: ISO format UTC time when the benchmark ran
+    """
+
+    version: str = dataclasses.field(default=__version__)
+    git_commit: str | None = dataclasses.field(default_factory=get_git_commit)
+    python_version: str = dataclasses.field(default=platform.python_version())
+    platform: str = dataclasses.field(default=platform.platform())
+    create_at: str = dataclasses.field(
+        default_factory=lambda: datetime.datetime.now(datetime.timezone.utc).isoformat()
+    )
+
+
+def get_dir_benchmark(suite: str) -> Path:
+    """
+    Example: ``build/benchmarks/cold_start``
+    """
+    return path_enum.dir_build / "benchmarks" / suite
+
+
+def get_path_benchmark_result(suite: str, version: str = __version__) -> Path:
+    """
+    Example: ``build/benchmarks/cold_start/1.40.0.json``
+    """
+    return get_dir_benchmark(suite) / f"{version}.json"
+
+
+def write_json(path: Path, data: T.Any):
+    write(path, json.dumps(data, indent=2))
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """
+    Min / median / max of the samples, the median is what we track over time.
+    """
+    if not samples:
+        return {}
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+    }
+
+
+def percentiles(
+    samples: list[float],
+    qs: T.Iterable[int] = (50, 90, 99),
+) -> dict[str, float]:
+    """
+    Nearest-rank percentiles of the samples, e.g. ``{"p50": ..., "p99": ...}``.
+    """
+    if not samples:
+        return {}
+    samples = sorted(samples)
+    n = len(samples)
+    return {f"p{q}": samples[max(-(-q * n // 100) - 1, 0)] for q in qs}
+
+
+T_RUN = T.TypeVar("T_RUN")
+
+
+def run_interleaved(
+    funcs: dict[str, T.Callable[[], T_RUN]],
+    n_runs: int,
+) -> dict[str, list[T_RUN]]:
+    """
+    Run every mode ``n_runs`` times, the modes are interleaved, so a noisy
+    machine affects all of them the same way.
+
+    :param funcs: ``{mode: the function of one run}``, it returns the
+        measurement of the run, e.g. the time
+    :returns: ``{mode: one measurement per run}``
+    """
+    values = {mode: [] for mode in funcs}
+    for _ in range(n_runs):
+        for mode, func in funcs.items():
+            values[mode].append(func())
+    return values
+
+
+def time_once(func: T.Callable[[], T.Any]) -> float:
+    """
+    The wall time of one call, in seconds.
+    """
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def parse_service(service_name: str) -> tuple["TypedDefsModule", "CasterModule"]:
+    """
+    Parse the installed mypy-boto3 stubs of a service like the builder, the
+    botocore operation names are filled in for ``caster.cast(...)``.
+    """
+    from ..structures.api import Boto3DataclassServiceStructure
+    from ..parsers.api import (
+        TypedDefsModuleParser,
+        ClientModuleParser,
+        BotocoreModelParser,
+    )
+
+    structure = Boto3DataclassServiceStructure.new(service_name)
+    tdm = TypedDefsModuleParser(
+        path_stub_file=structure.path_mypy_boto3_type_defs_pyi,
+    ).parse()
+    cm = ClientModuleParser(
+        path_stub_file=structure.path_mypy_boto3_client_pyi,
+    ).parse()
+    BotocoreModelParser(service_name=service_name).set_operation_names(cm)
+    return tdm, cm
+
+
+def import_meta_package(
+    dir_root: Path,
+    package_name: str = "boto3_dataclass_bench_meta",
+) -> ModuleType:
+    """
+    Render the ``__init__.py`` and the runtime modules of the
+    ``boto3_dataclass`` meta package (``hook.py``, ``factory.py``,
+    ``archive.py``, ``trace.py``, ``shm.py``, ``aio.py``) with the current
+    templates, write them to ``${dir_root}/${package_name}/`` and import the
+    package and the modules.
+    The package is not named ``boto3_dataclass``, it would shadow the
+    generator.
+    """
+    from ..templates.api import tpl_enum
+    from ..structures.api import PyProjectStructure
+    from ..builders.publish_boto3_dataclass import Boto3DataclassBuilder
+
+    builder = Boto3DataclassBuilder(
+        version=__version__,
+        structure=PyProjectStructure(package_name=package_name),
+    )
+    dir_package = dir_root / package_name
+    modules = {
+        "hook": tpl_enum.boto3_dataclass__package__hook_py,
+        "factory": tpl_enum.boto3_dataclass__package__factory_py,
+        "archive": tpl_enum.boto3_dataclass__package__archive_py,
+        "trace": tpl_enum.boto3_dataclass__package__trace_py,
+        "shm": tpl_enum.boto3_dataclass__package__shm_py,
+        "aio": tpl_enum.boto3_dataclass__package__aio_py,
+    }
+    write(
+        dir_package / "__init__.py",
+        tpl_enum.boto3_dataclass__package____init___py.render(builder=builder),
+    )
+    for module_name, template in modules.items():
+        write(dir_package / f"{module_name}.py", template.render())
+    shutil.rmtree(dir_package / "__pycache__", ignore_errors=True)
+    importlib.invalidate_caches()
+    sys.path.insert(0, str(dir_root))
+    try:
+        for name in list(sys.modules):
+            if name == package_name or name.startswith(f"{package_name}."):
+                del sys.modules[name]
+        package = importlib.import_module(package_name)
+        for module_name in modules:
+            importlib.import_module(f"{package_name}.{module_name}")
+        return package
+    finally:
+        sys.path.remove(str(dir_root))
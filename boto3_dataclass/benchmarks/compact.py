@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+
+"""
+Size and import time of the compact, table-driven ``type_defs.py`` vs the
+default one, see ``TypedDefsModule.gen_code(compact=True)``.
+
+For every service and mode the ``type_defs.py`` is rendered with the current
+templates and measured:
+
+1. lines and bytes of the source, black formatted like the builder by default
+2. bytes of the ``.pyc``, this is what an installed wheel loads
+3. the import time of ``type_defs`` in a fresh interpreter, with the ``.pyc``
+   present, like an installed wheel
+"""
+
+import typing as T
+import os
+import sys
+import json
+import shutil
+import py_compile
+import subprocess
+import functools
+import dataclasses
+import importlib.util
+from pathlib import Path
+
+from ..utils import write, black_format_code
+from .common import (
+    BenchmarkEnv,
+    get_dir_benchmark,
+    parse_service,
+    run_interleaved,
+    summarize,
+    write_json,
+)
+
+MODES = ["default", "compact"]
+
+# The code that runs in the fresh interpreter, ``typing``, ``dataclasses``
+# and ``functools`` are imported before the clock starts, every boto3 user
+# has them imported already.
+_CHILD_CODE = """
+import sys, json, time, importlib
+import typing, dataclasses, functools
+
+start = time.perf_counter()
+importlib.import_module(sys.argv[1] + ".type_defs")
+print(json.dumps({"import_time": time.perf_counter() - start}))
+"""
+
+
+def render_type_defs(
+    service_name: str,
+    dir_package: Path,
+    compact: bool,
+    black: bool = True,
+) -> Path:
+    """
+    Render the ``type_defs.py`` of a service into ``${dir_package}/`` and
+    compile it to ``.pyc``.
+
+    :returns: the path of the ``type_defs.py``
+    """
+    tdm, _ = parse_service(service_name)
+    type_defs_line = f"from mypy_boto3_{service_name} import type_defs"
+    code = tdm.gen_code(type_defs_line=type_defs_line, compact=compact)
+    if black:
+        code = black_format_code(code)
+    return write_type_defs(dir_package, code)
+
+
+def write_type_defs(dir_package: Path, code: str) -> Path:
+    """
+    Write a ``type_defs.py`` into ``${dir_package}/`` and compile it to ``.pyc``.
+
+    :returns: the path of the ``type_defs.py``
+    """
+    shutil.rmtree(dir_package / "__pycache__", ignore_errors=True)
+    path = dir_package / "type_defs.py"
+    write(dir_package / "__init__.py", "")
+    write(path, code)
+    py_compile.compile(str(path), doraise=True)
+    return path
+
+
+def run_import_once(
+    package_name: str,
+    dir_workspace: Path,
+    timeout: float = 300,
+    python: str = sys.executable,
+) -> float:
+    """
+    Import ``${package_name}.type_defs`` in a fresh interpreter.
+
+    :returns: the import time in seconds
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(dir_workspace)
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    args = [python, "-c", _CHILD_CODE, package_name]
+    res = subprocess.run(args, env=env, capture_output=True, text=True, timeout=timeout)
+    if res.returncode != 0:
+        raise RuntimeError(
+            f"Import of {package_name}.type_defs failed:\n{res.stderr.strip()}"
+        )
+    return json.loads(res.stdout.strip().splitlines()[-1])["import_time"]
+
+
+@dataclasses.dataclass
+class CompactResult:
+    """
+    The size and import time of the ``type_defs.py`` of one service in one mode.
+
+    :param service_name: e.g. ``ec2``
+    :param mode: ``default`` or ``compact``
+    :param lines: number of source lines
+    :param source_bytes: bytes of the source
+    :param pyc_bytes: bytes of the ``.pyc``
+    :param import_times: one import time per fresh interpreter, in seconds
+    """
+
+    service_name: str = dataclasses.field()
+    mode: str = dataclasses.field()
+    lines: int = dataclasses.field(default=0)
+    source_bytes: int = dataclasses.field(default=0)
+    pyc_bytes: int = dataclasses.field(default=0)
+    import_times: list[float] = dataclasses.field(default_factory=list)
+
+    def stats(self) -> dict[str, float]:
+        return summarize(self.import_times)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        data = dataclasses.asdict(self)
+        data["stats"] = self.stats()
+        return data
+
+
+def _percent(new: float, old: float) -> str:
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+@dataclasses.dataclass
+class CompactReport:
+    """
+    The compact benchmark results of a generator version.
+    """
+
+    env: BenchmarkEnv = dataclasses.field(default_factory=BenchmarkEnv)
+    results: list[CompactResult] = dataclasses.field(default_factory=list)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return {
+            "env": dataclasses.asdict(self.env),
+            "results": [result.to_dict() for result in self.results],
+        }
+
+    def write(self, path: Path):
+        write_json(path, self.to_dict())
+
+    def summary(self) -> str:
+        lines = []
+        default_results = dict()
+        for result in self.results:
+            line = (
+                f"- {result.service_name} ({result.mode}): "
+                f"{result.lines} lines, {result.source_bytes} bytes, "
+                f"{result.pyc_bytes} pyc bytes, "
+                f"import {result.stats()['median'] * 1000:.2f} ms"
+            )
+            if result.mode == "default":
+                default_results[result.service_name] = result
+            elif result.service_name in default_results:
+                old = default_results[result.service_name]
+                line += (
+                    f" (lines {_percent(result.lines, old.lines)}, "
+                    f"bytes {_percent(result.source_bytes, old.source_bytes)}, "
+                    f"pyc {_percent(result.pyc_bytes, old.pyc_bytes)}, "
+                    f"import {_percent(result.stats()['median'], old.stats()['median'])})"
+                )
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def run_compact_benchmark(
+    service_name: str,
+    dir_workspace: Path,
+    n_runs: int = 5,
+    black: bool = True,
+) -> list[CompactResult]:
+    package_name = f"boto3_dataclass_{service_name}"
+    results = list()
+    for mode in MODES:
+        dir_root = dir_workspace / mode
+        path = render_type_defs(
+            service_name=service_name,
+            dir_package=dir_root / package_name,
+            compact=mode == "compact",
+            black=black,
+        )
+        code = path.read_text(encoding="utf-8")
+        path_pyc = Path(importlib.util.cache_from_source(str(path)))
+        results.append(
+            CompactResult(
+                service_name=service_name,
+                mode=mode,
+                lines=code.count("\n"),
+                source_bytes=path.stat().st_size,
+                pyc_bytes=path_pyc.stat().st_size,
+            )
+        )
+    import_times = run_interleaved(
+        {
+            mode: functools.partial(
+                run_import_once,
+                package_name=package_name,
+                dir_workspace=dir_workspace / mode,
+            )
+            for mode in MODES
+        },
+        n_runs=n_runs,
+    )
+    for mode, result in zip(MODES, results):
+        result.import_times = import_times[mode]
+    return results
+
+
+def run_compact_benchmark_all(
+    service_names: list[str],
+    n_runs: int = 5,
+    black: bool = True,
+    dir_workspace: Path | None = None,
+) -> CompactReport:
+    """
+    Compare the compact ``type_defs.py`` with the default one for every service.
+
+    :param service_names: e.g. ``["ec2"]``
+    :param n_runs: number of fresh interpreters per service and mode
+    :param black: black format the code like the builder, it is slow for
+        the big services
+    :param dir_workspace: where to render the packages, default is
+        ``build/benchmarks/compact/``
+    """
+    if dir_workspace is None:
+        dir_workspace = get_dir_benchmark("compact") / "packages"
+    report = CompactReport()
+    for service_name in service_names:
+        report.results.extend(
+            run_compact_benchmark(
+                service_name=service_name,
+                dir_workspace=dir_workspace,
+                n_runs=n_runs,
+                black=black,
+            )
+        )
+    return report
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+"""
+What the structural deduplication of ``type_defs.py`` merges, see
+:meth:`~boto3_dataclass.models.typed_dict.TypedDefsModule.dedup`.
+
+For every service the tree shaken ``type_defs.py`` (what the builder generates
+by default) is rendered with the current templates twice, with one dataclass
+per TypedDict (``no_dedup``) and with the structurally identical TypedDicts
+merged (``dedup``), and measured:
+
+1. number of classes and aliases, lines and bytes of the source
+2. the import time of ``type_defs`` in a fresh interpreter, with the ``.pyc``
+   present, like an installed wheel
+"""
+
+import typing as T
+import functools
+import dataclasses
+from pathlib import Path
+
+from ..utils import black_format_code
+from ..models.reachability import TypeReachabilityGraph
+from ..builders.size_report import count_classes_and_fields
+from .common import (
+    BenchmarkEnv,
+    get_dir_benchmark,
+    parse_service,
+    run_interleaved,
+    summarize,
+    write_json,
+)
+from .compact import write_type_defs, run_import_once
+
+MODES = ["no_dedup", "dedup"]
+
+
+@dataclasses.dataclass
+class DedupResult:
+    """
+    The ``type_defs.py`` of one service in one mode.
+
+    :param service_name: e.g. ``ec2``
+    :param mode: ``no_dedup`` or ``dedup``
+    :param classes: number of dataclasses
+    :param aliases: number of aliases of another dataclass
+    :param lines: number of source lines
+    :param source_bytes: bytes of the source
+    :param import_times: one import time per fresh interpreter, in seconds
+    """
+
+    service_name: str = dataclasses.field()
+    mode: str = dataclasses.field()
+    classes: int = dataclasses.field(default=0)
+    aliases: int = dataclasses.field(default=0)
+    lines: int = dataclasses.field(default=0)
+    source_bytes: int = dataclasses.field(default=0)
+    import_times: list[float] = dataclasses.field(default_factory=list)
+
+    @property
+    def dedup_ratio(self) -> float:
+        """
+        The share of the TypedDicts that are aliases.
+        """
+        return self.aliases / (self.classes + self.aliases)
+
+    def stats(self) -> dict[str, float]:
+        return summarize(self.import_times)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        data = dataclasses.asdict(self)
+        data["dedup_ratio"] = self.dedup_ratio
+        data["stats"] = self.stats()
+        return data
+
+
+@dataclasses.dataclass
+class DedupReport:
+    """
+    The dedup benchmark results of a generator version.
+    """
+
+    env: BenchmarkEnv = dataclasses.field(default_factory=BenchmarkEnv)
+    results: list[DedupResult] = dataclasses.field(default_factory=list)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return {
+            "env": dataclasses.asdict(self.env),
+            "results": [result.to_dict() for result in self.results],
+        }
+
+    def write(self, path: Path):
+        write_json(path, self.to_dict())
+
+    def summary(self) -> str:
+        lines = []
+        results = {
+            (result.service_name, result.mode): result for result in self.results
+        }
+        service_names = list(
+            dict.fromkeys(result.service_name for result in self.results)
+        )
+        for service_name in service_names:
+            old = results[(service_name, "no_dedup")]
+            new = results[(service_name, "dedup")]
+            old_ms = old.stats()["median"] * 1000
+            new_ms = new.stats()["median"] * 1000
+            lines.append(
+                f"- {service_name}: "
+                f"{new.aliases} of {old.classes} classes are aliases "
+                f"({new.dedup_ratio:.1%}), "
+                f"{old.lines} -> {new.lines} lines, "
+                f"import {old_ms:.2f} ms -> {new_ms:.2f} ms"
+            )
+        return "\n".join(lines)
+
+
+def run_dedup_benchmark(
+    service_name: str,
+    dir_workspace: Path,
+    n_runs: int = 5,
+    black: bool = True,
+) -> list[DedupResult]:
+    tdm, cm = parse_service(service_name)
+    tdm = TypeReachabilityGraph.new(tdm=tdm, cm=cm).shake(tdm)
+    tdms = {"no_dedup": tdm, "dedup": tdm.dedup()}
+    package_name = f"boto3_dataclass_{service_name}"
+    type_defs_line = f"from mypy_boto3_{service_name} import type_defs"
+    results = list()
+    for mode in MODES:
+        code = tdms[mode].gen_code(type_defs_line=type_defs_line)
+        if black:
+            code = black_format_code(code)
+        path = write_type_defs(dir_workspace / mode / package_name, code)
+        classes, _ = count_classes_and_fields(code)
+        results.append(
+            DedupResult(
+                service_name=service_name,
+                mode=mode,
+                classes=classes,
+                aliases=len(tdms[mode].aliases),
+                lines=code.count("\n"),
+                source_bytes=path.stat().st_size,
+            )
+        )
+    import_times = run_interleaved(
+        {
+            mode: functools.partial(
+                run_import_once,
+                package_name=package_name,
+                dir_workspace=dir_workspace / mode,
+            )
+            for mode in MODES
+        },
+        n_runs=n_runs,
+    )
+    for mode, result in zip(MODES, results):
+        result.import_times = import_times[mode]
+    return results
+
+
+def run_dedup_benchmark_all(
+    service_names: list[str],
+    n_runs: int = 5,
+    black: bool = True,
+    dir_workspace: Path | None = None,
+) -> DedupReport:
+    """
+    Compare the deduplicated ``type_defs.py`` with one dataclass per
+    TypedDict for every service.
+
+    :param service_names: e.g. ``["ec2", "iam"]``
+    :param n_runs: number of fresh interpreters per service and mode
+    :param black: black format the code like the builder, it is slow for
+        the big services
+    :param dir_workspace: where to render the packages, default is
+        ``build/benchmarks/dedup/``
+    """
+    if dir_workspace is None:
+        dir_workspace = get_dir_benchmark("dedup") / "packages"
+    report = DedupReport()
+    for service_name in service_names:
+        report.results.extend(
+            run_dedup_benchmark(
+                service_name=service_name,
+                dir_workspace=dir_workspace,
+                n_runs=n_runs,
+                black=black,
+            )
+        )
+    return report
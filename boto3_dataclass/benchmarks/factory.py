@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+
+"""
+First-access and steady-state cost of the runtime class factory
+(``boto3_dataclass.factory``) vs the pre-generated
+``boto3_dataclass_{service_name}`` package.
+
+The first access runs in a fresh interpreter, like
+:mod:`~boto3_dataclass.benchmarks.cold_start`, and measures:
+
+1. the import, the generated package or the factory module
+2. the first cast, the factory loads the botocore service model and builds
+   the output class here
+3. the first nested attribute access, the factory builds the nested classes here
+
+Both read the ``.pyc`` files, like an installed wheel. The steady state is
+the ns per ``cast + nested attribute access`` in the current interpreter
+once everything is built.
+
+Both the factory and the service packages are rendered with the current
+templates, so a template change is measured without a rebuild.
+"""
+
+import typing as T
+import os
+import sys
+import json
+import subprocess
+import compileall
+import dataclasses
+from pathlib import Path
+
+from ..utils import import_generated_package
+from .common import (
+    BenchmarkEnv,
+    get_dir_benchmark,
+    import_meta_package,
+    summarize,
+    write_json,
+)
+from .cold_start import ResponseFixture
+from .runtime import RuntimeTarget
+from .hook import get_nested_attribute, measure_interleaved
+
+MODES = ["generated", "factory"]
+
+META_PACKAGE_NAME = "boto3_dataclass_bench_meta"
+
+# The code that runs in the fresh interpreter. The fixture is loaded before
+# the clock starts, botocore is imported before the clock starts too, every
+# boto3 user has it imported already. The generated ``type_defs.py`` is
+# imported explicitly, the caster would load it on the first cast.
+_CHILD_CODE = """
+import sys, json, time, importlib
+import botocore.loaders
+
+(
+    mode,
+    package_name,
+    service_name,
+    operation_name,
+    nested_attribute,
+    path_fixture,
+) = sys.argv[1:7]
+with open(path_fixture, "r", encoding="utf-8") as f:
+    response = json.load(f)["response"]
+
+start = time.perf_counter()
+if mode == "generated":
+    cast = importlib.import_module(package_name).caster.cast
+    importlib.import_module(package_name + ".type_defs")
+else:
+    factory = importlib.import_module(package_name + ".factory")
+    cast = factory.get_factory(service_name).cast
+import_done = time.perf_counter()
+obj = cast(operation_name, response)
+cast_done = time.perf_counter()
+value = obj
+for attr in nested_attribute.split("."):
+    value = value[int(attr)] if attr.isdigit() else getattr(value, attr)
+access_done = time.perf_counter()
+
+print(json.dumps({
+    "import_time": import_done - start,
+    "first_cast_time": cast_done - import_done,
+    "first_access_time": access_done - cast_done,
+}))
+"""
+
+
+@dataclasses.dataclass
+class FirstAccessSample:
+    """
+    The first-access timings of one fresh interpreter, in seconds.
+    """
+
+    import_time: float = dataclasses.field()
+    first_cast_time: float = dataclasses.field()
+    first_access_time: float = dataclasses.field()
+
+    @property
+    def total_time(self) -> float:
+        return self.import_time + self.first_cast_time + self.first_access_time
+
+
+def run_first_access_once(
+    mode: str,
+    fixture: ResponseFixture,
+    operation_name: str,
+    dir_workspace: Path,
+    timeout: float = 300,
+    python: str = sys.executable,
+) -> FirstAccessSample:
+    """
+    Run one first access in a fresh interpreter.
+
+    :param mode: ``generated`` or ``factory``
+    :param dir_workspace: the directory that contains the rendered packages
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(dir_workspace)
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    package_name = fixture.package_name if mode == "generated" else META_PACKAGE_NAME
+    args = [
+        python,
+        "-c",
+        _CHILD_CODE,
+        mode,
+        package_name,
+        fixture.service_name,
+        operation_name,
+        fixture.nested_attribute,
+        str(fixture.path),
+    ]
+    res = subprocess.run(args, env=env, capture_output=True, text=True, timeout=timeout)
+    if res.returncode != 0:
+        raise RuntimeError(
+            f"First access of {fixture.service_name}.{operation_name} ({mode}) "
+            f"failed:\n{res.stderr.strip()}"
+        )
+    data = json.loads(res.stdout.strip().splitlines()[-1])
+    return FirstAccessSample(**data)
+
+
+@dataclasses.dataclass
+class FactoryResult:
+    """
+    The cost of one fixture in one mode.
+
+    :param target: e.g. ``iam.get_role``
+    :param mode: ``generated`` or ``factory``
+    :param samples: one first-access sample per fresh interpreter
+    :param steady_ns_per_op: min / median / max ns per cast and nested
+        attribute access, once the classes are built
+    """
+
+    target: str = dataclasses.field()
+    mode: str = dataclasses.field()
+    samples: list[FirstAccessSample] = dataclasses.field(default_factory=list)
+    steady_ns_per_op: dict[str, float] = dataclasses.field(default_factory=dict)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """
+        Min / median / max of every first-access metric.
+        """
+        metrics = ["import_time", "first_cast_time", "first_access_time", "total_time"]
+        return {
+            metric: summarize([getattr(sample, metric) for sample in self.samples])
+            for metric in metrics
+        }
+
+    def to_dict(self) -> dict[str, T.Any]:
+        data = dataclasses.asdict(self)
+        data["stats"] = self.stats()
+        return data
+
+
+@dataclasses.dataclass
+class FactoryReport:
+    """
+    The factory benchmark results of a generator version.
+    """
+
+    env: BenchmarkEnv = dataclasses.field(default_factory=BenchmarkEnv)
+    results: list[FactoryResult] = dataclasses.field(default_factory=list)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return {
+            "env": dataclasses.asdict(self.env),
+            "results": [result.to_dict() for result in self.results],
+        }
+
+    def write(self, path: Path):
+        write_json(path, self.to_dict())
+
+    def summary(self) -> str:
+        lines = []
+        for result in self.results:
+            stats = result.stats()
+            lines.append(
+                f"- {result.target} ({result.mode}): "
+                f"first access {stats['total_time']['median'] * 1000:.2f} ms "
+                f"(import {stats['import_time']['median'] * 1000:.2f} ms, "
+                f"cast {stats['first_cast_time']['median'] * 1000:.2f} ms, "
+                f"access {stats['first_access_time']['median'] * 1000:.2f} ms), "
+                f"steady {result.steady_ns_per_op['min']:.0f} ns/op"
+            )
+        return "\n".join(lines)
+
+
+def run_factory_benchmark(
+    fixture: ResponseFixture,
+    meta: T.Any,
+    dir_workspace: Path,
+    n_runs: int = 5,
+    repeat: int = 5,
+    min_time: float = 0.2,
+) -> list[FactoryResult]:
+    target = RuntimeTarget.from_service(fixture.service_name, fixture.method_name)
+    operation_name = target.caster_method.operation_name
+    package = import_generated_package(
+        package_name=fixture.package_name,
+        tdm=target.tdm,
+        cm=target.cm,
+        dir_root=dir_workspace,
+    )
+    factory = meta.factory.get_factory(fixture.service_name)
+    casts = {"generated": package.caster.cast, "factory": factory.cast}
+    ops = {
+        mode: (
+            lambda cast=cast: get_nested_attribute(
+                cast(operation_name, fixture.response),
+                fixture.nested_attribute,
+            )
+        )
+        for mode, cast in casts.items()
+    }
+    if ops["generated"]() != ops["factory"]():  # pragma: no cover
+        raise ValueError(f"The factory and the generated {target.name} differ")
+    # like an installed wheel, the fresh interpreters don't compile the source
+    compileall.compile_dir(dir_workspace, quiet=1)
+    samples = measure_interleaved(ops, repeat, min_time)
+    results = list()
+    for mode in MODES:
+        results.append(
+            FactoryResult(
+                target=target.name,
+                mode=mode,
+                samples=[
+                    run_first_access_once(
+                        mode=mode,
+                        fixture=fixture,
+                        operation_name=operation_name,
+                        dir_workspace=dir_workspace,
+                    )
+                    for _ in range(n_runs)
+                ],
+                steady_ns_per_op=summarize(samples[mode]),
+            )
+        )
+    return results
+
+
+def run_factory_benchmark_all(
+    fixtures: list[ResponseFixture],
+    n_runs: int = 5,
+    repeat: int = 5,
+    min_time: float = 0.2,
+    dir_workspace: Path | None = None,
+) -> FactoryReport:
+    """
+    Compare the runtime class factory with the generated package for every
+    fixture.
+
+    :param fixtures: the recorded responses, see :class:`ResponseFixture`
+    :param n_runs: number of fresh interpreters per fixture and mode
+    :param repeat: number of steady-state timing rounds
+    :param min_time: minimal seconds of a steady-state timing round
+    :param dir_workspace: where to render the packages, default is
+        ``build/benchmarks/factory/``
+    """
+    if dir_workspace is None:
+        dir_workspace = get_dir_benchmark("factory") / "packages"
+    meta = import_meta_package(dir_workspace, META_PACKAGE_NAME)
+    report = FactoryReport()
+    for fixture in fixtures:
+        report.results.extend(
+            run_factory_benchmark(
+                fixture=fixture,
+                meta=meta,
+                dir_workspace=dir_workspace,
+                n_runs=n_runs,
+                repeat=repeat,
+                min_time=min_time,
+            )
+        )
+    return report
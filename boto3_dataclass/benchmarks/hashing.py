@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+
+"""
+Deduplicate the items of many responses, e.g. the same inventory listed
+from several regions or accounts, with the generated ``__hash__`` and
+``__eq__`` vs the usual workaround for the raw dicts.
+
+For every target, the synthetic items are deep copies of one item with a
+different identifier (``InstanceId``, ``RoleId``, the ``key_field_name`` of
+the class) or, if the class has none, a different first string field, every
+identifier ``n_copies`` times. In these modes:
+
+- ``json``: a set of ``json.dumps(item, sort_keys=True)`` of the raw dicts
+- ``cast``: ``make_many`` then a set of the objects, the hashes are computed
+- ``memo``: a set of the same objects again, the hashes are memoized
+
+We report the time of every mode and the number of unique items, which must
+be the same for all modes.
+"""
+
+import typing as T
+import copy
+import json
+import timeit
+import importlib
+import functools
+import dataclasses
+from pathlib import Path
+
+from ..utils import import_generated_package
+from .common import (
+    BenchmarkEnv,
+    get_dir_benchmark,
+    run_interleaved,
+    summarize,
+    write_json,
+)
+from .runtime import RuntimeTarget
+from .synthetic import SyntheticResponseGenerator
+from .shm import get_item_field
+
+MODES = ["json", "cast", "memo"]
+
+
+def _json_key(item: dict[str, T.Any]) -> str:
+    return json.dumps(item, sort_keys=True, default=str)
+
+
+def make_items(
+    item: dict[str, T.Any],
+    field: str,
+    n_unique: int,
+    n_copies: int,
+) -> list[dict[str, T.Any]]:
+    """
+    ``n_unique * n_copies`` deep copies of the item, ``field`` is set to one
+    of ``n_unique`` values. Deep copies, so no comparison is short-circuited
+    by identity.
+    """
+    items = []
+    for _ in range(n_copies):
+        for i in range(n_unique):
+            new_item = copy.deepcopy(item)
+            new_item[field] = f"{item[field]}-{i}"
+            items.append(new_item)
+    return items
+
+
+@dataclasses.dataclass
+class HashingResult:
+    """
+    The dedup time of one target.
+
+    :param target: e.g. ``iam.list_roles``
+    :param key: the list of items, e.g. ``Roles``
+    :param key_field: the identifier field that is hashed, e.g. ``RoleId``,
+        empty if the whole raw dict is hashed
+    :param n_items: number of items
+    :param n_unique: number of unique items
+    :param times: ``{mode: one time per run}``
+    """
+
+    target: str = dataclasses.field()
+    key: str = dataclasses.field()
+    key_field: str = dataclasses.field()
+    n_items: int = dataclasses.field()
+    n_unique: int = dataclasses.field()
+    times: dict[str, list[float]] = dataclasses.field(default_factory=dict)
+
+    def stats(self, mode: str) -> dict[str, float]:
+        return summarize(self.times[mode])
+
+    def to_dict(self) -> dict[str, T.Any]:
+        data = dataclasses.asdict(self)
+        data["stats"] = {mode: self.stats(mode) for mode in MODES}
+        return data
+
+
+@dataclasses.dataclass
+class HashingBenchmarkReport:
+    """
+    The dedup benchmark results of a generator version.
+    """
+
+    env: BenchmarkEnv = dataclasses.field(default_factory=BenchmarkEnv)
+    results: list[HashingResult] = dataclasses.field(default_factory=list)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return {
+            "env": dataclasses.asdict(self.env),
+            "results": [result.to_dict() for result in self.results],
+        }
+
+    def write(self, path: Path):
+        write_json(path, self.to_dict())
+
+    def summary(self) -> str:
+        lines = []
+        for result in self.results:
+            parts = [
+                f"{mode} {result.stats(mode)['median'] * 1000:.2f} ms" for mode in MODES
+            ]
+            hashed = result.key_field or "raw dict"
+            lines.append(
+                f"- {result.target}.{result.key} ({result.n_items} items, "
+                f"{result.n_unique} unique, hash {hashed}): " + ", ".join(parts)
+            )
+        return "\n".join(lines)
+
+
+def run_hashing_benchmark(
+    target: RuntimeTarget,
+    key: str,
+    klass: type,
+    n_unique: int = 5000,
+    n_copies: int = 2,
+    n_runs: int = 5,
+) -> HashingResult:
+    """
+    :param klass: the generated class of an item
+    :param n_unique: number of unique items
+    :param n_copies: number of copies of every unique item
+    """
+    tdd = target.tdm.tdds_mapping[get_item_field(target, key).anno.nested_type_name]
+    generator = SyntheticResponseGenerator(tdm=target.tdm, list_size=1)
+    item = generator.make(tdd.name)
+    key_field = tdd.key_field_name
+    if key_field is None:
+        field = next(name for name, value in item.items() if isinstance(value, str))
+    else:
+        field = key_field
+    items = make_items(item, field, n_unique=n_unique, n_copies=n_copies)
+
+    objects = klass.make_many(items)
+    counts = {
+        "json": len({_json_key(item) for item in items}),
+        "cast": len(set(klass.make_many(items))),
+        # the objects of the memo mode are hashed here, before the timer
+        "memo": len(set(objects)),
+    }
+    if set(counts.values()) != {n_unique}:
+        raise ValueError(f"{target.name} differs between the modes: {counts}")
+
+    ops = {
+        "json": lambda: {_json_key(item) for item in items},
+        "cast": lambda: set(klass.make_many(items)),
+        "memo": lambda: set(objects),
+    }
+    result = HashingResult(
+        target=target.name,
+        key=key,
+        key_field=key_field or "",
+        n_items=len(items),
+        n_unique=n_unique,
+    )
+    result.times = run_interleaved(
+        {mode: functools.partial(timeit.timeit, ops[mode], number=1) for mode in MODES},
+        n_runs=n_runs,
+    )
+    return result
+
+
+def run_hashing_benchmark_all(
+    targets: list[tuple[RuntimeTarget, str]],
+    n_unique: int = 5000,
+    n_copies: int = 2,
+    n_runs: int = 5,
+    dir_workspace: Path | None = None,
+) -> HashingBenchmarkReport:
+    """
+    Compare the modes for every target.
+
+    :param targets: the caster methods and the list of items, e.g.
+        ``(RuntimeTarget.from_service("iam", "list_roles"), "Roles")``
+    :param n_unique: number of unique items
+    :param n_copies: number of copies of every unique item
+    :param n_runs: number of runs per target and mode
+    :param dir_workspace: where to render the packages, default is
+        ``build/benchmarks/hashing/``
+    """
+    if dir_workspace is None:
+        dir_workspace = get_dir_benchmark("hashing") / "packages"
+    report = HashingBenchmarkReport()
+    for target, key in targets:
+        package_name = "boto3_dataclass_bench_" + target.name.replace(".", "_")
+        import_generated_package(
+            package_name=package_name,
+            tdm=target.tdm,
+            cm=target.cm,
+            dir_root=dir_workspace,
+        )
+        type_defs = importlib.import_module(f"{package_name}.type_defs")
+        klass = getattr(type_defs, get_item_field(target, key).anno.nested_model_name)
+        report.results.append(
+            run_hashing_benchmark(
+                target=target,
+                key=key,
+                klass=klass,
+                n_unique=n_unique,
+                n_copies=n_copies,
+                n_runs=n_runs,
+            )
+        )
+    return report
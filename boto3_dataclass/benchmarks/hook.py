@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+
+"""
+Per-call overhead of the opt-in boto3 hook, ``boto3_dataclass.hook``.
+
+The hook makes every client call return a ``TypedResponse``, a ``dict``
+subclass with a lazy ``.typed`` view. We call the same client method with
+and without the hook, the HTTP layer is replaced by a ``before-call`` handler
+that returns a recorded response (like ``botocore.stub.Stubber``, without the
+response validation and the queue), so only the botocore call path is timed:
+
+- ``raw``: a client without the hook
+- ``hooked``: a client with the hook, ``.typed`` is never accessed. This is
+  what every call pays once the hook is installed.
+- ``typed``: a client with the hook, then ``.typed`` and a nested attribute
+  are accessed
+
+``wrap`` is the ``TypedResponse`` construction alone, the part of the
+``hooked`` overhead that doesn't depend on botocore.
+
+The hook module is rendered from the template of the ``boto3_dataclass``
+meta package, and the service packages with the current templates, so a
+template change is measured without a rebuild.
+"""
+
+import typing as T
+import json
+import timeit
+import dataclasses
+from pathlib import Path
+from types import ModuleType
+
+from ..utils import import_generated_package
+from .common import (
+    BenchmarkEnv,
+    get_dir_benchmark,
+    import_meta_package,
+    summarize,
+    write_json,
+)
+from .cold_start import ResponseFixture
+from .runtime import RuntimeTarget, measure_ns_per_op
+from .throughput import new_boto3_session
+
+# the kwargs to pass the parameter validation, the response is recorded
+api_params = {
+    "dynamodb.describe_table": {"TableName": "my-table"},
+    "ec2.describe_instances": {},
+    "iam.get_role": {"RoleName": "my-role"},
+    "s3.list_objects_v2": {"Bucket": "my-bucket"},
+    "sts.get_caller_identity": {},
+}
+
+MODES = ["raw", "hooked", "typed"]
+
+
+def import_hook_module(
+    dir_root: Path,
+    package_name: str = "boto3_dataclass_bench_meta",
+) -> ModuleType:
+    """
+    Render the ``hook.py`` of the ``boto3_dataclass`` meta package to
+    ``${dir_root}/${package_name}/hook.py`` and import it.
+    """
+    return import_meta_package(dir_root, package_name).hook
+
+
+def make_before_call_handler(response: dict[str, T.Any]) -> T.Callable:
+    """
+    A ``before-call`` handler that short-circuits the HTTP request and returns
+    the recorded response. Every call gets a new dict, like the real response
+    parser, the ``after-call`` handlers of some services (e.g. the IAM policy
+    decoding) modify the response in place.
+    """
+    from botocore.awsrequest import AWSResponse
+
+    http_response = AWSResponse(None, 200, {}, None)
+    body = json.dumps(response)
+
+    def handler(**kwargs):
+        return http_response, json.loads(body)
+
+    return handler
+
+
+def measure_interleaved(
+    ops: dict[str, T.Callable[[], T.Any]],
+    repeat: int = 5,
+    min_time: float = 0.2,
+) -> dict[str, list[float]]:
+    """
+    Like :func:`~boto3_dataclass.benchmarks.runtime.measure_ns_per_op` for
+    several ops, the rounds of the ops are interleaved, so a slow period of
+    the machine affects all of them. The hook overhead is much smaller than
+    the noise of a botocore call otherwise.
+    """
+    timers = dict()
+    for key, op in ops.items():
+        timer = timeit.Timer(op)
+        number = 1
+        while timer.timeit(number) < min_time:
+            number *= 2
+        timers[key] = (timer, number)
+    samples = {key: [] for key in ops}
+    for _ in range(repeat):
+        for key, (timer, number) in timers.items():
+            samples[key].append(timer.timeit(number) / number * 1e9)
+    return samples
+
+
+def get_nested_attribute(obj, path: str):
+    """
+    Read an attribute path from a cast object, integer parts are list
+    indexes, e.g. ``Reservations.0.Instances.0.InstanceId``.
+    """
+    for part in path.split("."):
+        if part.isdigit():
+            obj = obj[int(part)]
+        else:
+            obj = getattr(obj, part)
+    return obj
+
+
+@dataclasses.dataclass
+class HookResult:
+    """
+    The per-call cost of one client method.
+
+    :param target: e.g. ``iam.get_role``
+    :param ns_per_call: ``{mode: min / median / max ns per call}``, the modes
+        are ``raw``, ``hooked`` and ``typed``
+    :param wrap_ns: min / median / max ns of the ``TypedResponse`` construction
+
+    The summary uses the fastest rounds, the other rounds are mostly noise
+    of the botocore call.
+    """
+
+    target: str = dataclasses.field()
+    ns_per_call: dict[str, dict[str, float]] = dataclasses.field(default_factory=dict)
+    wrap_ns: dict[str, float] = dataclasses.field(default_factory=dict)
+
+    @property
+    def overhead_ns(self) -> float:
+        """
+        The per-call overhead of the hook when ``.typed`` is not used, the
+        difference of the fastest rounds, like ``python -m timeit``.
+        """
+        return self.ns_per_call["hooked"]["min"] - self.ns_per_call["raw"]["min"]
+
+
+@dataclasses.dataclass
+class HookReport:
+    """
+    The hook benchmark results of a generator version.
+    """
+
+    env: BenchmarkEnv = dataclasses.field(default_factory=BenchmarkEnv)
+    results: list[HookResult] = dataclasses.field(default_factory=list)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return dataclasses.asdict(self)
+
+    def write(self, path: Path):
+        write_json(path, self.to_dict())
+
+    def summary(self) -> str:
+        lines = []
+        for result in self.results:
+            raw = result.ns_per_call["raw"]["min"]
+            typed = result.ns_per_call["typed"]["min"]
+            lines.append(
+                f"- {result.target}: raw {raw:.0f} ns/call, "
+                f"hooked {result.overhead_ns:+.0f} ns "
+                f"({result.overhead_ns / raw * 100:+.2f}%), "
+                f"typed {typed - raw:+.0f} ns, "
+                f"wrap {result.wrap_ns['min']:.0f} ns"
+            )
+        return "\n".join(lines)
+
+
+def run_hook_benchmark(
+    fixture: ResponseFixture,
+    hook: ModuleType,
+    dir_workspace: Path,
+    repeat: int = 5,
+    min_time: float = 0.2,
+) -> HookResult:
+    target = RuntimeTarget.from_service(fixture.service_name, fixture.method_name)
+    import_generated_package(
+        package_name=fixture.package_name,
+        tdm=target.tdm,
+        cm=target.cm,
+        dir_root=dir_workspace,
+    )
+    session = new_boto3_session()
+    raw_client = session.client(fixture.service_name)
+    hook.install(session)
+    try:
+        hooked_client = session.client(fixture.service_name)
+    finally:
+        hook.uninstall(session)
+    handler = make_before_call_handler(fixture.response)
+    for client in [raw_client, hooked_client]:
+        client.meta.events.register("before-call", handler)
+
+    kwargs = api_params[target.name]
+    raw_method = getattr(raw_client, fixture.method_name)
+    hooked_method = getattr(hooked_client, fixture.method_name)
+    ops = {
+        "raw": lambda: raw_method(**kwargs),
+        "hooked": lambda: hooked_method(**kwargs),
+        "typed": lambda: get_nested_attribute(
+            hooked_method(**kwargs).typed, fixture.nested_attribute
+        ),
+    }
+    if not isinstance(ops["hooked"](), hook.TypedResponse):  # pragma: no cover
+        raise TypeError("the hook is not installed on the client")
+
+    result = HookResult(target=target.name)
+    samples = measure_interleaved(ops, repeat, min_time)
+    for mode in MODES:
+        result.ns_per_call[mode] = summarize(samples[mode])
+    operation_name = raw_client.meta.method_to_api_mapping[fixture.method_name]
+    result.wrap_ns = summarize(
+        measure_ns_per_op(
+            lambda: hook.TypedResponse(
+                fixture.response, fixture.service_name, operation_name
+            ),
+            repeat,
+            min_time,
+        )
+    )
+    return result
+
+
+def run_hook_benchmark_all(
+    fixtures: list[ResponseFixture],
+    repeat: int = 5,
+    min_time: float = 0.2,
+    dir_workspace: Path | None = None,
+) -> HookReport:
+    """
+    Measure the per-call overhead of the hook for every fixture.
+
+    :param fixtures: the recorded responses, see :class:`ResponseFixture`,
+        the fixture must have an entry in :data:`api_params`
+    :param repeat: number of timing rounds
+    :param min_time: minimal seconds of a timing round
+    :param dir_workspace: where to render the hook and the generated packages,
+        default is ``build/benchmarks/hook/``
+    """
+    if dir_workspace is None:
+        dir_workspace = get_dir_benchmark("hook") / "packages"
+    hook = import_hook_module(dir_workspace)
+    report = HookReport()
+    for fixture in fixtures:
+        report.results.append(
+            run_hook_benchmark(
+                fixture=fixture,
+                hook=hook,
+                dir_workspace=dir_workspace,
+                repeat=repeat,
+                min_time=min_time,
+            )
+        )
+    return report
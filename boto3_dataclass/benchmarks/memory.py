@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+
+"""
+Memory footprint of the cast responses, compared to the raw boto3 dict.
+
+A generated dataclass keeps a reference to the raw dict (``boto3_raw_data``),
+every accessed ``cached_property`` is stored in the instance ``__dict__``, and
+every accessed nested field creates more wrapper objects, and a ``list`` for
+``make_many``. The scalar values are shared with the raw dict.
+
+:func:`deep_size` walks a cast object with the generated type information
+(the dataclass and its ``cached_property``) and reports the bytes retained by
+the wrappers vs the raw data, broken down per class. It works on any object
+created by a generated ``boto3_dataclass_{service_name}`` package::
+
+    res = caster.describe_instances(response)
+    for reservation in res.Reservations:
+        ...
+    size = deep_size(res)
+    print(size.summary())
+
+:func:`run_memory_benchmark_all` measures the same thing with ``tracemalloc``
+on synthetic responses, right after the cast and after every field has been
+accessed (``materialized``).
+"""
+
+import typing as T
+import gc
+import sys
+import dataclasses
+import tracemalloc
+from functools import cached_property
+from pathlib import Path
+
+from ..utils import import_generated_package
+from .common import (
+    BenchmarkEnv,
+    get_dir_benchmark,
+    write_json,
+)
+from .runtime import RuntimeTarget
+from .synthetic import SyntheticResponseGenerator
+
+
+def is_boto3_dataclass(obj) -> bool:
+    """
+    Whether the object is created by a generated package.
+    """
+    return dataclasses.is_dataclass(obj) and hasattr(obj, "boto3_raw_data")
+
+
+def iter_cached_property_names(klass: type) -> T.Iterable[str]:
+    for name, value in vars(klass).items():
+        if isinstance(value, cached_property):
+            yield name
+
+
+def materialize(obj) -> int:
+    """
+    Access every field of a cast object recursively, like the worst case of a
+    long-running service that reads everything. The fields that are not in
+    the response are skipped.
+
+    :returns: number of wrapper objects
+    """
+    n = 1
+    for name in iter_cached_property_names(type(obj)):
+        try:
+            value = getattr(obj, name)
+        except KeyError:
+            continue
+        if is_boto3_dataclass(value):
+            n += materialize(value)
+        elif isinstance(value, list):
+            for item in value:
+                if is_boto3_dataclass(item):
+                    n += materialize(item)
+    return n
+
+
+def get_raw_size(data, seen: set[int] | None = None) -> int:
+    """
+    The bytes of a raw boto3 dict, including everything in it, every object
+    is counted once.
+    """
+    if seen is None:
+        seen = set()
+    if id(data) in seen:
+        return 0
+    seen.add(id(data))
+    size = sys.getsizeof(data)
+    if isinstance(data, dict):
+        for key, value in data.items():
+            size += get_raw_size(key, seen) + get_raw_size(value, seen)
+    elif isinstance(data, (list, tuple, set)):
+        for value in data:
+            size += get_raw_size(value, seen)
+    return size
+
+
+@dataclasses.dataclass
+class ClassSize:
+    """
+    The wrapper cost of one generated class.
+
+    :param count: number of instances
+    :param instance_bytes: the instance objects
+    :param dict_bytes: the instance ``__dict__`` that stores the cached properties
+    :param list_bytes: the ``list`` created by ``make_many`` for this class
+    """
+
+    count: int = dataclasses.field(default=0)
+    instance_bytes: int = dataclasses.field(default=0)
+    dict_bytes: int = dataclasses.field(default=0)
+    list_bytes: int = dataclasses.field(default=0)
+
+    @property
+    def total_bytes(self) -> int:
+        return self.instance_bytes + self.dict_bytes + self.list_bytes
+
+
+@dataclasses.dataclass
+class DeepSize:
+    """
+    The bytes retained by a cast object.
+
+    :param raw_bytes: the raw boto3 dict
+    :param wrapper_bytes: the generated objects on top of the raw dict
+    :param classes: ``{class_name: ClassSize}``
+    """
+
+    raw_bytes: int = dataclasses.field(default=0)
+    wrapper_bytes: int = dataclasses.field(default=0)
+    classes: dict[str, ClassSize] = dataclasses.field(default_factory=dict)
+
+    @property
+    def wrapper_ratio(self) -> float:
+        """
+        The wrapper bytes per raw byte.
+        """
+        return self.wrapper_bytes / self.raw_bytes if self.raw_bytes else 0.0
+
+    def summary(self, top: int = 10) -> str:
+        lines = [
+            f"raw: {self.raw_bytes} bytes, wrapper: {self.wrapper_bytes} bytes "
+            f"({self.wrapper_ratio * 100:.1f}% of raw)",
+        ]
+        classes = sorted(
+            self.classes.items(),
+            key=lambda item: item[1].total_bytes,
+            reverse=True,
+        )
+        for name, class_size in classes[:top]:
+            lines.append(
+                f"- {name}: {class_size.count} objects, "
+                f"{class_size.total_bytes} bytes"
+            )
+        return "\n".join(lines)
+
+
+def deep_size(obj, materialize_all: bool = False) -> DeepSize:
+    """
+    Walk a cast object, report the bytes retained by the wrappers vs the raw
+    data, broken down per class. Only the accessed fields have wrappers,
+    unless ``materialize_all`` is True.
+    """
+    if materialize_all:
+        materialize(obj)
+    result = DeepSize(raw_bytes=get_raw_size(obj.boto3_raw_data))
+    seen: set[int] = set()
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        name = type(obj).__name__
+        class_size = result.classes.setdefault(name, ClassSize())
+        class_size.count += 1
+        class_size.instance_bytes += sys.getsizeof(obj)
+        class_size.dict_bytes += sys.getsizeof(vars(obj))
+        for attr, value in vars(obj).items():
+            if attr == "boto3_raw_data":
+                continue
+            if is_boto3_dataclass(value):
+                stack.append(value)
+            elif isinstance(value, list) and value and is_boto3_dataclass(value[0]):
+                result.classes.setdefault(
+                    type(value[0]).__name__, ClassSize()
+                ).list_bytes += sys.getsizeof(value)
+                stack.extend(value)
+    result.wrapper_bytes = sum(c.total_bytes for c in result.classes.values())
+    return result
+
+
+def measure_retained(func: T.Callable[[], T.Any]) -> tuple[T.Any, int]:
+    """
+    Call the function, return its result and the bytes still allocated
+    afterward, measured with ``tracemalloc``.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = func()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+
+@dataclasses.dataclass
+class MemoryResult:
+    """
+    The memory footprint of one target and list size.
+
+    :param target: e.g. ``ec2.describe_instances``
+    :param list_size: number of items in every list of the synthetic response
+    :param raw_bytes: the raw response dict, measured with ``tracemalloc``
+    :param cast_bytes: retained by ``caster.{method_name}(response)``
+    :param materialized_bytes: retained by accessing every field afterward
+    :param n_objects: number of wrapper objects after every field is accessed
+    :param classes: per class breakdown after every field is accessed,
+        ``{class_name: ClassSize}``
+    """
+
+    target: str = dataclasses.field()
+    list_size: int = dataclasses.field()
+    raw_bytes: int = dataclasses.field(default=0)
+    cast_bytes: int = dataclasses.field(default=0)
+    materialized_bytes: int = dataclasses.field(default=0)
+    n_objects: int = dataclasses.field(default=0)
+    classes: dict[str, ClassSize] = dataclasses.field(default_factory=dict)
+
+
+@dataclasses.dataclass
+class MemoryReport:
+    """
+    The memory benchmark results of a generator version.
+    """
+
+    env: BenchmarkEnv = dataclasses.field(default_factory=BenchmarkEnv)
+    results: list[MemoryResult] = dataclasses.field(default_factory=list)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return dataclasses.asdict(self)
+
+    def write(self, path: Path):
+        write_json(path, self.to_dict())
+
+    def summary(self, top: int = 3) -> str:
+        lines = []
+        for result in self.results:
+            wrapper_bytes = result.cast_bytes + result.materialized_bytes
+            ratio = wrapper_bytes / result.raw_bytes if result.raw_bytes else 0.0
+            classes = sorted(
+                result.classes.items(),
+                key=lambda item: item[1].total_bytes,
+                reverse=True,
+            )[:top]
+            top_classes = ", ".join(
+                f"{name} {class_size.total_bytes}" for name, class_size in classes
+            )
+            lines.append(
+                f"- {result.target} (list size {result.list_size}): "
+                f"raw {result.raw_bytes} bytes, cast +{result.cast_bytes}, "
+                f"materialized +{result.materialized_bytes} "
+                f"({ratio * 100:.1f}% of raw, {result.n_objects} objects), "
+                f"top: {top_classes}"
+            )
+        return "\n".join(lines)
+
+
+def run_memory_benchmark_all(
+    targets: list[RuntimeTarget],
+    list_sizes: T.Iterable[int] = (1, 10, 100),
+    dir_workspace: Path | None = None,
+) -> MemoryReport:
+    """
+    Measure the memory footprint for every target and list size.
+
+    :param targets: the caster methods to benchmark
+    :param list_sizes: number of items in every list of the synthetic response
+    :param dir_workspace: where to render the generated packages, default is
+        ``build/benchmarks/memory/``
+    """
+    if dir_workspace is None:
+        dir_workspace = get_dir_benchmark("memory") / "packages"
+    report = MemoryReport()
+    for target in targets:
+        package = import_generated_package(
+            package_name="boto3_dataclass_bench_" + target.name.replace(".", "_"),
+            tdm=target.tdm,
+            cm=target.cm,
+            dir_root=dir_workspace,
+        )
+        cast = getattr(package.caster, target.method_name)
+        type_name = target.caster_method.boto3_stubs_type_name
+        for list_size in list_sizes:
+            generator = SyntheticResponseGenerator(tdm=target.tdm, list_size=list_size)
+            response, raw_bytes = measure_retained(lambda: generator.make(type_name))
+            obj, cast_bytes = measure_retained(lambda: cast(response))
+            n_objects, materialized_bytes = measure_retained(lambda: materialize(obj))
+            size = deep_size(obj)
+            report.results.append(
+                MemoryResult(
+                    target=target.name,
+                    list_size=list_size,
+                    raw_bytes=raw_bytes,
+                    cast_bytes=cast_bytes,
+                    materialized_bytes=materialized_bytes,
+                    n_objects=n_objects,
+                    classes=size.classes,
+                )
+            )
+    return report
@@ -0,0 +1,417 @@
+# -*- coding: utf-8 -*-
+
+"""
+Runtime microbenchmarks of the generated dataclasses against plain ``dict``
+indexing of the same boto3 response.
+
+The generated code is rendered with the current templates and imported
+in-process (see :func:`~boto3_dataclass.utils.import_generated_package`),
+so a change to ``typed_dict_def.jinja`` or ``typed_dict_field.jinja`` is
+measured without a rebuild. The responses come from
+:class:`~boto3_dataclass.benchmarks.synthetic.SyntheticResponseGenerator`,
+with different list sizes.
+
+Every access pattern has a ``dataclass`` and a ``dict`` implementation:
+
+- ``caster``: ``caster.{method_name}(response)``, vs returning the dict
+- ``first_access``: cast and read the first scalar field of the response,
+  through all the nested ``make_one`` on the way, vs chained ``dict`` indexing
+- ``cached_access``: read the same field again on an object already accessed,
+  the ``cached_property`` hit path, vs chained ``dict`` indexing
+- ``full_walk``: cast and read every field recursively, this includes all
+  the ``make_one`` and ``make_many``, vs walking the dict
+
+For each one we report ns/op and the memory blocks / bytes allocated per op
+that stay alive as long as the user keeps the casted object (measured with
+``tracemalloc``).
+
+Example::
+
+    targets = [
+        RuntimeTarget.from_test_gen_code(),
+        RuntimeTarget.from_service("iam", "list_roles"),
+    ]
+    report = run_runtime_benchmark_all(targets, list_sizes=[1, 10, 100])
+    report.write(get_path_benchmark_result("runtime"))
+"""
+
+import typing as T
+import gc
+import timeit
+import tracemalloc
+import dataclasses
+from pathlib import Path
+from types import ModuleType
+
+from ..models.typed_dict import TypedDefsModule, TypedDictDef
+from ..models.caster import CasterMethod, CasterModule
+from ..utils import import_generated_package
+
+from .common import (
+    BenchmarkEnv,
+    get_dir_benchmark,
+    parse_service,
+    summarize,
+    write_json,
+)
+from .synthetic import SyntheticResponseGenerator
+
+T_IMPL = T.Literal["dataclass", "dict"]
+
+PATTERNS = [
+    "caster",
+    "first_access",
+    "cached_access",
+    "full_walk",
+]
+
+
+@dataclasses.dataclass
+class RuntimeTarget:
+    """
+    A caster method to benchmark.
+
+    :param name: the name in the report, e.g. ``iam.list_roles``
+    :param tdm: the parsed ``type_defs`` module of the service
+    :param cm: the caster module of the service
+    :param method_name: the caster method to call, e.g. ``list_roles``
+    """
+
+    name: str = dataclasses.field()
+    tdm: TypedDefsModule = dataclasses.field()
+    cm: CasterModule = dataclasses.field()
+    method_name: str = dataclasses.field()
+
+    @property
+    def caster_method(self) -> CasterMethod:
+        return self.cm.cms_mapping[self.method_name]
+
+    @property
+    def response_tdd(self) -> TypedDictDef:
+        return self.tdm.tdds_mapping[self.caster_method.boto3_stubs_type_name]
+
+    @classmethod
+    def from_test_gen_code(cls) -> "RuntimeTarget":
+        """
+        The ``UserTypeDef`` in :mod:`boto3_dataclass.tests.gen_code`.
+        """
+        from ..tests.gen_code.typed_dict_def_mapping import tdm
+
+        cm = CasterModule(
+            service_name="gen_code",
+            cms=[
+                CasterMethod(
+                    method_name="get_user",
+                    boto3_stubs_type_name="UserTypeDef",
+                    boto3_dataclass_type_name="User",
+                ),
+            ],
+        )
+        return cls(name="gen_code.get_user", tdm=tdm, cm=cm, method_name="get_user")
+
+    @classmethod
+    def from_service(cls, service_name: str, method_name: str) -> "RuntimeTarget":
+        """
+        A client method of a real service, parsed from the installed mypy-boto3 stubs.
+        """
+        tdm, cm = parse_service(service_name)
+        if method_name not in cm.cms_mapping:
+            raise ValueError(
+                f"{service_name} client has no caster method {method_name!r}"
+            )
+        return cls(
+            name=f"{service_name}.{method_name}",
+            tdm=tdm,
+            cm=cm,
+            method_name=method_name,
+        )
+
+    def find_first_scalar_path(self) -> list[str]:
+        """
+        The attribute path to the first scalar field, following the nested
+        (non list) fields, e.g. ``["ResponseMetadata", "RequestId"]``.
+        """
+        tdd = self.response_tdd
+        path = []
+        while True:
+            nested = None
+            for tdf in tdd.fields:
+                anno = tdf.anno
+                if not anno.is_nested_typed_dict:
+                    return path + [tdf.name]
+                if (
+                    nested is None
+                    and anno.nested_type_subscriptor != "List"
+                    and anno.nested_type_name in self.tdm.tdds_mapping
+                ):
+                    nested = tdf
+            if nested is None:
+                raise ValueError(f"{tdd.name} has no scalar field to access")
+            path.append(nested.name)
+            tdd = self.tdm.tdds_mapping[nested.anno.nested_type_name]
+
+
+def walk_dataclass(obj, tdd: TypedDictDef, tdm: TypedDefsModule) -> int:
+    """
+    Read every field in the response recursively, return the number of fields.
+    """
+    n = 0
+    for tdf in tdd.fields:
+        if tdf.name not in obj.boto3_raw_data:
+            continue
+        value = getattr(obj, tdf.safe_field_name)
+        n += 1
+        anno = tdf.anno
+        if anno.is_nested_typed_dict and anno.nested_type_name in tdm.tdds_mapping:
+            nested_tdd = tdm.tdds_mapping[anno.nested_type_name]
+            if anno.nested_type_subscriptor == "List":
+                for item in value:
+                    n += walk_dataclass(item, nested_tdd, tdm)
+            else:
+                n += walk_dataclass(value, nested_tdd, tdm)
+    return n
+
+
+def walk_dict(data: dict, tdd: TypedDictDef, tdm: TypedDefsModule) -> int:
+    """
+    The ``dict`` version of :func:`walk_dataclass`.
+    """
+    n = 0
+    for tdf in tdd.fields:
+        if tdf.name not in data:
+            continue
+        value = data[tdf.name]
+        n += 1
+        anno = tdf.anno
+        if anno.is_nested_typed_dict and anno.nested_type_name in tdm.tdds_mapping:
+            nested_tdd = tdm.tdds_mapping[anno.nested_type_name]
+            if anno.nested_type_subscriptor == "List":
+                for item in value:
+                    n += walk_dict(item, nested_tdd, tdm)
+            else:
+                n += walk_dict(value, nested_tdd, tdm)
+    return n
+
+
+def make_ops(
+    target: RuntimeTarget,
+    package: ModuleType,
+    response: dict[str, T.Any],
+) -> dict[tuple[str, T_IMPL], T.Callable[[], T.Any]]:
+    """
+    The ``{(pattern, impl): op}`` to benchmark. The dataclass ops return the
+    casted object, so the allocation measurement keeps alive everything the
+    access created, like the cached properties and the nested objects.
+    """
+    cast = getattr(package.caster, target.method_name)
+    tdd, tdm = target.response_tdd, target.tdm
+    path = target.find_first_scalar_path()
+
+    def get_attr_path(obj):
+        for name in path:
+            obj = getattr(obj, name)
+        return obj
+
+    def get_key_path(data):
+        for name in path:
+            data = data[name]
+        return data
+
+    def first_access():
+        obj = cast(response)
+        get_attr_path(obj)
+        return obj
+
+    def full_walk():
+        obj = cast(response)
+        walk_dataclass(obj, tdd, tdm)
+        return obj
+
+    accessed = first_access()
+
+    return {
+        ("caster", "dataclass"): lambda: cast(response),
+        ("caster", "dict"): lambda: response,
+        ("first_access", "dataclass"): first_access,
+        ("first_access", "dict"): lambda: get_key_path(response),
+        ("cached_access", "dataclass"): lambda: get_attr_path(accessed),
+        ("cached_access", "dict"): lambda: get_key_path(response),
+        ("full_walk", "dataclass"): full_walk,
+        ("full_walk", "dict"): lambda: walk_dict(response, tdd, tdm),
+    }
+
+
+def measure_ns_per_op(
+    op: T.Callable[[], T.Any],
+    repeat: int = 5,
+    min_time: float = 0.2,
+) -> list[float]:
+    """
+    Like ``python -m timeit``, pick the number of loops that takes at least
+    ``min_time`` seconds, then return the ns/op of each of the ``repeat`` rounds.
+    """
+    timer = timeit.Timer(op)
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time:
+            break
+        number *= 2
+    return [timer.timeit(number) / number * 1e9 for _ in range(repeat)]
+
+
+def measure_allocations(
+    op: T.Callable[[], T.Any],
+    number: int = 200,
+) -> tuple[float, float]:
+    """
+    Run the op ``number`` times and keep all the results, return the memory
+    blocks and bytes allocated per op that are still alive.
+    """
+    op()  # warm up, e.g. the cached_property on the class
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        results = [op() for _ in range(number)]
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    # the result list itself is not part of the op
+    blocks = sum(stat.count_diff for stat in stats) - 1
+    size = sum(stat.size_diff for stat in stats) - len(results) * 8
+    return max(blocks, 0) / number, max(size, 0) / number
+
+
+@dataclasses.dataclass
+class RuntimeResult:
+    """
+    The result of one access pattern of one implementation.
+
+    :param target: e.g. ``iam.list_roles``
+    :param list_size: number of items in every list of the synthetic response
+    :param pattern: ``caster``, ``first_access``, ``cached_access`` or ``full_walk``
+    :param impl: ``dataclass`` or ``dict``
+    :param ns_per_op: min / median / max ns per op
+    :param blocks_per_op: memory blocks allocated per op that are still alive
+    :param bytes_per_op: bytes allocated per op that are still alive
+    """
+
+    target: str = dataclasses.field()
+    list_size: int = dataclasses.field()
+    pattern: str = dataclasses.field()
+    impl: str = dataclasses.field()
+    ns_per_op: dict[str, float] = dataclasses.field(default_factory=dict)
+    blocks_per_op: float = dataclasses.field(default=0.0)
+    bytes_per_op: float = dataclasses.field(default=0.0)
+
+
+@dataclasses.dataclass
+class RuntimeReport:
+    """
+    The runtime benchmark results of a generator version.
+    """
+
+    env: BenchmarkEnv = dataclasses.field(default_factory=BenchmarkEnv)
+    results: list[RuntimeResult] = dataclasses.field(default_factory=list)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return dataclasses.asdict(self)
+
+    def write(self, path: Path):
+        write_json(path, self.to_dict())
+
+    def summary(self) -> str:
+        """
+        One line per target, list size and pattern, with the dataclass / dict ratio.
+        """
+        mapping = {(r.target, r.list_size, r.pattern, r.impl): r for r in self.results}
+        lines = []
+        for result in self.results:
+            if result.impl != "dataclass":
+                continue
+            key = (result.target, result.list_size, result.pattern)
+            baseline = mapping.get(key + ("dict",))
+            line = (
+                f"- {result.target} (list size {result.list_size}) {result.pattern}: "
+                f"{result.ns_per_op['median']:.0f} ns/op, "
+                f"{result.blocks_per_op:.1f} blocks/op, "
+                f"{result.bytes_per_op:.0f} bytes/op"
+            )
+            if baseline is not None and baseline.ns_per_op["median"]:
+                ratio = result.ns_per_op["median"] / baseline.ns_per_op["median"]
+                line += f" ({ratio:.1f}x dict)"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def run_runtime_benchmark(
+    target: RuntimeTarget,
+    list_size: int,
+    dir_workspace: Path,
+    repeat: int = 5,
+    min_time: float = 0.2,
+    patterns: T.Iterable[str] = tuple(PATTERNS),
+) -> list[RuntimeResult]:
+    package_name = "boto3_dataclass_bench_" + target.name.replace(".", "_")
+    package = import_generated_package(
+        package_name=package_name,
+        tdm=target.tdm,
+        cm=target.cm,
+        dir_root=dir_workspace,
+    )
+    response = SyntheticResponseGenerator(tdm=target.tdm, list_size=list_size).make(
+        target.caster_method.boto3_stubs_type_name
+    )
+    ops = make_ops(target, package, response)
+    results = []
+    for pattern in patterns:
+        for impl in ["dataclass", "dict"]:
+            op = ops[(pattern, impl)]
+            blocks_per_op, bytes_per_op = measure_allocations(op)
+            results.append(
+                RuntimeResult(
+                    target=target.name,
+                    list_size=list_size,
+                    pattern=pattern,
+                    impl=impl,
+                    ns_per_op=summarize(measure_ns_per_op(op, repeat, min_time)),
+                    blocks_per_op=blocks_per_op,
+                    bytes_per_op=bytes_per_op,
+                )
+            )
+    return results
+
+
+def run_runtime_benchmark_all(
+    targets: list[RuntimeTarget],
+    list_sizes: T.Iterable[int] = (1, 10, 100),
+    repeat: int = 5,
+    min_time: float = 0.2,
+    dir_workspace: Path | None = None,
+) -> RuntimeReport:
+    """
+    Run every access pattern for every target and list size.
+
+    :param targets: the caster methods to benchmark
+    :param list_sizes: number of items in every list of the synthetic response
+    :param repeat: number of timing rounds, we report min / median / max
+    :param min_time: minimal seconds of a timing round
+    :param dir_workspace: where to render the generated packages, default is
+        ``build/benchmarks/runtime/``
+    """
+    if dir_workspace is None:
+        dir_workspace = get_dir_benchmark("runtime") / "packages"
+    report = RuntimeReport()
+    for target in targets:
+        for list_size in list_sizes:
+            report.results.extend(
+                run_runtime_benchmark(
+                    target=target,
+                    list_size=list_size,
+                    dir_workspace=dir_workspace,
+                    repeat=repeat,
+                    min_time=min_time,
+                )
+            )
+    return report
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+
+"""
+Distribute the items of a large response to a process pool, a pickled slice
+per task vs the ``shm.py`` of the meta package, where the items are written
+once into a shared memory block and every task is a view of it.
+
+For every target and number of items, the synthetic response is split into
+``n_tasks`` slices and every worker casts and reads every field of the items
+of its slice, in these modes:
+
+- ``pickle``: ``pool.map`` over the slices of raw dicts, each is pickled to
+  the worker
+- ``shm``: :meth:`SharedItems.create` writes the block (the time is
+  included), ``pool.map`` over :meth:`SharedItems.split`, each view pickles
+  as the block name and a range
+
+We report the wall time, the bytes pickled to the workers and the size of
+the shared block.
+"""
+
+import typing as T
+import copy
+import pickle
+import importlib
+import multiprocessing
+import functools
+import dataclasses
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from ..utils import import_generated_package
+from .common import (
+    BenchmarkEnv,
+    get_dir_benchmark,
+    import_meta_package,
+    run_interleaved,
+    summarize,
+    time_once,
+    write_json,
+)
+from .runtime import RuntimeTarget
+from .synthetic import SyntheticResponseGenerator
+from .memory import materialize
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from ..models.typed_dict import TypedDictField
+
+MODES = ["pickle", "shm"]
+
+
+def _process_items(klass: type, items: list[dict[str, T.Any]]) -> int:
+    return sum(materialize(obj) for obj in klass.make_many(items))
+
+
+def _process_view(view) -> int:
+    with view:
+        return sum(materialize(obj) for obj in view)
+
+
+@dataclasses.dataclass
+class ShmResult:
+    """
+    The distribution time of one target and number of items.
+
+    :param target: e.g. ``s3.list_objects_v2``
+    :param key: the list of items, e.g. ``Contents``
+    :param n_items: number of items in the response
+    :param n_tasks: number of slices
+    :param sent_bytes: ``{mode: bytes pickled to the workers}``
+    :param shm_bytes: size of the shared memory block
+    :param times: ``{mode: one wall time per run}``
+    """
+
+    target: str = dataclasses.field()
+    key: str = dataclasses.field()
+    n_items: int = dataclasses.field()
+    n_tasks: int = dataclasses.field()
+    sent_bytes: dict[str, int] = dataclasses.field(default_factory=dict)
+    shm_bytes: int = dataclasses.field(default=0)
+    times: dict[str, list[float]] = dataclasses.field(default_factory=dict)
+
+    def stats(self, mode: str) -> dict[str, float]:
+        return summarize(self.times[mode])
+
+    def to_dict(self) -> dict[str, T.Any]:
+        data = dataclasses.asdict(self)
+        data["stats"] = {mode: self.stats(mode) for mode in MODES}
+        return data
+
+
+@dataclasses.dataclass
+class ShmBenchmarkReport:
+    """
+    The shared memory benchmark results of a generator version.
+    """
+
+    env: BenchmarkEnv = dataclasses.field(default_factory=BenchmarkEnv)
+    results: list[ShmResult] = dataclasses.field(default_factory=list)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return {
+            "env": dataclasses.asdict(self.env),
+            "results": [result.to_dict() for result in self.results],
+        }
+
+    def write(self, path: Path):
+        write_json(path, self.to_dict())
+
+    def summary(self) -> str:
+        lines = []
+        for result in self.results:
+            pickle_ms = result.stats("pickle")["median"] * 1000
+            shm_ms = result.stats("shm")["median"] * 1000
+            lines.append(
+                f"- {result.target}.{result.key} ({result.n_items} items, "
+                f"{result.n_tasks} tasks): "
+                f"pickle {result.sent_bytes['pickle']} bytes sent / {pickle_ms:.2f} ms, "
+                f"shm {result.sent_bytes['shm']} bytes sent "
+                f"+ {result.shm_bytes} bytes block / {shm_ms:.2f} ms"
+            )
+        return "\n".join(lines)
+
+
+def get_item_field(target: RuntimeTarget, key: str) -> "TypedDictField":
+    """
+    The field of ``response[key]``, e.g. ``Contents`` of ``s3.list_objects_v2``,
+    a list of ``ObjectTypeDef``.
+    """
+    tdd = target.tdm.tdds_mapping[target.caster_method.boto3_stubs_type_name]
+    for tdf in tdd.fields:
+        if tdf.name == key and tdf.anno.is_nested_typed_dict:
+            return tdf
+    raise ValueError(f"{target.name} has no list of TypedDict named {key!r}")
+
+
+def run_shm_benchmark(
+    target: RuntimeTarget,
+    key: str,
+    klass: type,
+    shm: T.Any,
+    n_items: int,
+    pool: ProcessPoolExecutor,
+    n_tasks: int = 8,
+    n_runs: int = 3,
+) -> ShmResult:
+    """
+    :param klass: the generated class of an item
+    :param shm: the ``shm`` module of the meta package
+    """
+    generator = SyntheticResponseGenerator(tdm=target.tdm, list_size=1)
+    item = generator.make(get_item_field(target, key).anno.nested_type_name)
+    # the item is built once and copied, a list_size of n_items would also fan
+    # out every nested list. Deep copies, pickle would not send a shared
+    # nested dict twice
+    response = {key: [copy.deepcopy(item) for _ in range(n_items)]}
+    items = response[key]
+    size, extra = divmod(n_items, n_tasks)
+    slices = []
+    start = 0
+    for i in range(n_tasks):
+        stop = start + size + (1 if i < extra else 0)
+        slices.append(items[start:stop])
+        start = stop
+
+    result = ShmResult(target=target.name, key=key, n_items=n_items, n_tasks=n_tasks)
+    result.sent_bytes["pickle"] = sum(
+        len(pickle.dumps((klass, items_))) for items_ in slices
+    )
+    with shm.SharedItems.create(response, key=key, klass=klass) as shared:
+        result.shm_bytes = shared._shm.size
+        views = shared.split(n_tasks)
+        result.sent_bytes["shm"] = sum(len(pickle.dumps(view)) for view in views)
+        expected = sum(pool.map(_process_view, views))
+    if sum(pool.map(_process_items, [klass] * n_tasks, slices)) != expected:
+        raise ValueError(f"{target.name} differs between the modes")
+
+    def run_pickle():
+        list(pool.map(_process_items, [klass] * n_tasks, slices))
+
+    def run_shm():
+        with shm.SharedItems.create(response, key=key, klass=klass) as shared:
+            list(pool.map(_process_view, shared.split(n_tasks)))
+
+    result.times = run_interleaved(
+        {
+            "pickle": functools.partial(time_once, run_pickle),
+            "shm": functools.partial(time_once, run_shm),
+        },
+        n_runs=n_runs,
+    )
+    return result
+
+
+def run_shm_benchmark_all(
+    targets: list[tuple[RuntimeTarget, str]],
+    n_items_list: T.Iterable[int] = (1000, 10000),
+    n_workers: int = 2,
+    n_tasks: int = 8,
+    n_runs: int = 3,
+    dir_workspace: Path | None = None,
+) -> ShmBenchmarkReport:
+    """
+    Compare the two modes for every target and number of items.
+
+    :param targets: the caster methods and the list of items, e.g.
+        ``(RuntimeTarget.from_service("s3", "list_objects_v2"), "Contents")``
+    :param n_items_list: number of items in the response
+    :param n_workers: number of processes in the pool
+    :param n_tasks: number of slices
+    :param n_runs: number of runs per target, number of items and mode
+    :param dir_workspace: where to render the packages, default is
+        ``build/benchmarks/shm/``
+    """
+    if dir_workspace is None:
+        dir_workspace = get_dir_benchmark("shm") / "packages"
+    shm = import_meta_package(dir_workspace / "meta").shm
+    classes = []
+    for target, key in targets:
+        package_name = "boto3_dataclass_bench_" + target.name.replace(".", "_")
+        import_generated_package(
+            package_name=package_name,
+            tdm=target.tdm,
+            cm=target.cm,
+            dir_root=dir_workspace,
+        )
+        type_defs = importlib.import_module(f"{package_name}.type_defs")
+        model_name = get_item_field(target, key).anno.nested_model_name
+        classes.append(getattr(type_defs, model_name))
+    report = ShmBenchmarkReport()
+    # fork, the workers inherit the imported packages
+    mp_context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=mp_context) as pool:
+        # start the workers before the timer
+        list(pool.map(len, [b""] * n_workers))
+        for (target, key), klass in zip(targets, classes):
+            for n_items in n_items_list:
+                report.results.append(
+                    run_shm_benchmark(
+                        target=target,
+                        key=key,
+                        klass=klass,
+                        shm=shm,
+                        n_items=n_items,
+                        pool=pool,
+                        n_tasks=n_tasks,
+                        n_runs=n_runs,
+                    )
+                )
+    return report
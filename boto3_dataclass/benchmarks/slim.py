@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+"""
+Size and import time of a slim package built from a recorded usage manifest
+vs the full service package, see
+:func:`~boto3_dataclass.models.usage.make_slim_modules`.
+
+For every response fixture:
+
+1. the full package (tree shaken and deduped, like the builder) is rendered
+   with the current templates and traced by the ``trace.py`` of the meta
+   package, while the fixture is cast and the nested attribute is read
+2. the slim package is rendered from the recorded usage, the same nested
+   attribute is read from it and compared
+3. both ``type_defs.py`` are measured, number of classes, bytes of the
+   source and the import time in a fresh interpreter, with the ``.pyc``
+   present, like an installed wheel
+"""
+
+import typing as T
+import functools
+import dataclasses
+from pathlib import Path
+
+from ..models.reachability import TypeReachabilityGraph
+from ..models.usage import ServiceUsage, make_slim_modules
+from ..utils import import_generated_package
+from .common import (
+    BenchmarkEnv,
+    get_dir_benchmark,
+    import_meta_package,
+    parse_service,
+    run_interleaved,
+    summarize,
+    write_json,
+)
+from .cold_start import ResponseFixture
+from .compact import write_type_defs, run_import_once
+from .hook import get_nested_attribute
+
+MODES = ["full", "slim"]
+
+
+@dataclasses.dataclass
+class SlimResult:
+    """
+    The full and the slim ``type_defs.py`` of one response fixture.
+
+    :param target: e.g. ``iam.get_role``
+    :param usage: the recorded usage manifest of the service
+    :param classes: ``{mode: number of dataclasses}``
+    :param source_bytes: ``{mode: bytes of the source}``
+    :param import_times: ``{mode: one import time per fresh interpreter}``
+    """
+
+    target: str = dataclasses.field()
+    usage: dict[str, T.Any] = dataclasses.field(default_factory=dict)
+    classes: dict[str, int] = dataclasses.field(default_factory=dict)
+    source_bytes: dict[str, int] = dataclasses.field(default_factory=dict)
+    import_times: dict[str, list[float]] = dataclasses.field(default_factory=dict)
+
+    def stats(self, mode: str) -> dict[str, float]:
+        return summarize(self.import_times[mode])
+
+    def to_dict(self) -> dict[str, T.Any]:
+        data = dataclasses.asdict(self)
+        data["stats"] = {mode: self.stats(mode) for mode in MODES}
+        return data
+
+
+@dataclasses.dataclass
+class SlimBenchmarkReport:
+    """
+    The slim package benchmark results of a generator version.
+    """
+
+    env: BenchmarkEnv = dataclasses.field(default_factory=BenchmarkEnv)
+    results: list[SlimResult] = dataclasses.field(default_factory=list)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return {
+            "env": dataclasses.asdict(self.env),
+            "results": [result.to_dict() for result in self.results],
+        }
+
+    def write(self, path: Path):
+        write_json(path, self.to_dict())
+
+    def summary(self) -> str:
+        lines = []
+        for result in self.results:
+            full_ms = result.stats("full")["median"] * 1000
+            slim_ms = result.stats("slim")["median"] * 1000
+            lines.append(
+                f"- {result.target}: "
+                f"{result.classes['slim']} of {result.classes['full']} classes, "
+                f"{result.source_bytes['full']} -> {result.source_bytes['slim']} bytes, "
+                f"import {full_ms:.2f} ms -> {slim_ms:.2f} ms"
+            )
+        return "\n".join(lines)
+
+
+def trace_fixture(
+    fixture: ResponseFixture,
+    trace: T.Any,
+    package: T.Any,
+) -> tuple[ServiceUsage, T.Any]:
+    """
+    Cast the fixture with the package and read the nested attribute, while
+    the package is traced.
+
+    :param trace: the ``trace`` module of the meta package
+    :param package: the imported service package
+
+    :returns: the recorded usage and the value of the nested attribute
+    """
+    tracer = trace.UsageTracer()
+    tracer.trace(fixture.service_name)
+    try:
+        res = getattr(package.caster, fixture.method_name)(fixture.response)
+        value = get_nested_attribute(res, fixture.nested_attribute)
+    finally:
+        tracer.uninstall()
+    usage = tracer.to_dict()["services"][fixture.service_name]
+    return ServiceUsage.from_dict(usage), value
+
+
+def run_slim_benchmark(
+    fixture: ResponseFixture,
+    trace: T.Any,
+    dir_workspace: Path,
+    n_runs: int = 5,
+) -> SlimResult:
+    tdm, cm = parse_service(fixture.service_name)
+    tdm = TypeReachabilityGraph.new(tdm=tdm, cm=cm).shake(tdm).dedup()
+    package = import_generated_package(
+        package_name=fixture.package_name,
+        tdm=tdm,
+        cm=cm,
+        dir_root=dir_workspace / "full",
+    )
+    usage, value = trace_fixture(fixture, trace, package)
+    slim_tdm, slim_cm = make_slim_modules(tdm=tdm, cm=cm, usage=usage)
+    slim_package = import_generated_package(
+        package_name=fixture.package_name,
+        tdm=slim_tdm,
+        cm=slim_cm,
+        dir_root=dir_workspace / "slim",
+    )
+    res = getattr(slim_package.caster, fixture.method_name)(fixture.response)
+    if get_nested_attribute(res, fixture.nested_attribute) != value:
+        raise ValueError(f"{fixture.nested_attribute} differs in the slim package")
+
+    target = f"{fixture.service_name}.{fixture.method_name}"
+    result = SlimResult(target=target, usage=usage.to_dict())
+    type_defs_line = f"from mypy_boto3_{fixture.service_name} import type_defs"
+    for mode, tdm_ in zip(MODES, [tdm, slim_tdm]):
+        path = write_type_defs(
+            dir_workspace / "import" / mode / fixture.package_name,
+            tdm_.gen_code(type_defs_line=type_defs_line),
+        )
+        result.classes[mode] = len(tdm_.tdds)
+        result.source_bytes[mode] = path.stat().st_size
+    result.import_times = run_interleaved(
+        {
+            mode: functools.partial(
+                run_import_once,
+                package_name=fixture.package_name,
+                dir_workspace=dir_workspace / "import" / mode,
+            )
+            for mode in MODES
+        },
+        n_runs=n_runs,
+    )
+    return result
+
+
+def run_slim_benchmark_all(
+    fixtures: list[ResponseFixture],
+    n_runs: int = 5,
+    dir_workspace: Path | None = None,
+) -> SlimBenchmarkReport:
+    """
+    Compare the slim package of every response fixture with the full one.
+
+    :param fixtures: the recorded responses, see :class:`ResponseFixture`
+    :param n_runs: number of fresh interpreters per fixture and mode
+    :param dir_workspace: where to render the packages, default is
+        ``build/benchmarks/slim/``
+    """
+    if dir_workspace is None:
+        dir_workspace = get_dir_benchmark("slim") / "packages"
+    trace = import_meta_package(dir_workspace / "meta").trace
+    report = SlimBenchmarkReport()
+    for fixture in fixtures:
+        report.results.append(
+            run_slim_benchmark(
+                fixture=fixture,
+                trace=trace,
+                dir_workspace=dir_workspace / fixture.method_name,
+                n_runs=n_runs,
+            )
+        )
+    return report
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+"""
+Generate random but schema-valid synthetic boto3 responses from the
+:class:`~boto3_dataclass.models.typed_dict.TypedDefsModule` IR, so the
+benchmarks and load tests can cast production size payloads without calling AWS.
+
+Every field of every TypedDict is present, nested TypedDict are dicts and list
+of nested TypedDict are lists, this is exactly what the generated dataclasses
+access. The IR doesn't keep the scalar types (the generated code doesn't check
+them either), so every scalar field is a random hex string.
+
+Small responses are built in memory::
+
+    generator = SyntheticResponseGenerator(tdm=tdm, list_size=10, seed=1)
+    response = generator.make_response(cm, "list_roles")
+
+Large responses are streamed to disk, the root list (e.g. ``Reservations``
+of ``describe_instances``) grows item by item until the file reaches the
+target size, so the payload never has to fit in memory::
+
+    n_items = generator.dump(
+        type_name="DescribeInstancesResultTypeDef",
+        path=Path("describe_instances.json"),
+        target_size=500 * 1000 * 1000,
+    )
+"""
+
+import typing as T
+import json
+import random
+import dataclasses
+from pathlib import Path
+
+from ..models.typed_dict import TypedDefsModule, TypedDictDef, TypedDictField
+
+from .common import get_dir_benchmark
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from ..models.caster import CasterModule
+
+
+@dataclasses.dataclass
+class SyntheticResponseGenerator:
+    """
+    Build a response dict that has every field of a TypedDict.
+
+    :param tdm: the parsed ``type_defs`` module
+    :param list_size: number of items in every list of nested TypedDict,
+        the list fan-out
+    :param max_depth: stop nesting at this depth, for recursive shapes like
+        the DynamoDB ``AttributeValue``. The nested fields below are omitted,
+        like an optional field that is not in the response.
+    :param scalar_size: length of the random scalar values
+    :param seed: the random seed, the same seed gives the same response
+    """
+
+    tdm: TypedDefsModule = dataclasses.field()
+    list_size: int = dataclasses.field(default=3)
+    max_depth: int = dataclasses.field(default=5)
+    scalar_size: int = dataclasses.field(default=16)
+    seed: int | None = dataclasses.field(default=0)
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+
+    def _is_nested(self, tdf: TypedDictField) -> bool:
+        anno = tdf.anno
+        return (
+            anno.is_nested_typed_dict and anno.nested_type_name in self.tdm.tdds_mapping
+        )
+
+    def make_scalar(self) -> str:
+        n = self.scalar_size
+        return format(self._random.getrandbits(n * 4), f"0{n}x")
+
+    def make_field(self, tdf: TypedDictField, depth: int) -> T.Any:
+        """
+        The value of a field of a TypedDict at the given depth.
+        """
+        anno = tdf.anno
+        if anno.nested_type_subscriptor == "List":
+            return [
+                self.make(anno.nested_type_name, depth + 1)
+                for _ in range(self.list_size)
+            ]
+        return self.make(anno.nested_type_name, depth + 1)
+
+    def make(self, type_name: str, depth: int = 0) -> dict[str, T.Any]:
+        """
+        Build a response dict of the given TypedDict, e.g. ``GetRoleResponseTypeDef``.
+        """
+        data = dict()
+        for tdf in self.tdm.tdds_mapping[type_name].fields:
+            if self._is_nested(tdf):
+                if depth >= self.max_depth:
+                    continue
+                data[tdf.name] = self.make_field(tdf, depth)
+            else:
+                data[tdf.name] = self.make_scalar()
+        return data
+
+    def make_response(self, cm: "CasterModule", method_name: str) -> dict[str, T.Any]:
+        """
+        Build the response of a caster method, e.g. ``iam`` ``get_role``.
+        """
+        return self.make(cm.cms_mapping[method_name].boto3_stubs_type_name)
+
+    def find_fan_out_field(self, tdd: TypedDictDef) -> TypedDictField | None:
+        """
+        The first list of nested TypedDict of a TypedDict, e.g. ``Reservations``
+        of ``DescribeInstancesResultTypeDef``. None if there is no such list.
+        """
+        for tdf in tdd.fields:
+            if self._is_nested(tdf) and tdf.anno.nested_type_subscriptor == "List":
+                return tdf
+        return None
+
+    def dump(
+        self,
+        type_name: str,
+        path: Path,
+        target_size: int | None = None,
+        fan_out_field: str | None = None,
+    ) -> int:
+        """
+        Stream a response of the given TypedDict to a JSON file.
+
+        :param type_name: e.g. ``DescribeInstancesResultTypeDef``
+        :param path: the JSON file to write
+        :param target_size: keep adding items to the root list until the file
+            has at least this many bytes. None means ``list_size`` items,
+            like :meth:`make`.
+        :param fan_out_field: the root list to grow, default is the first
+            list of nested TypedDict of the root TypedDict
+
+        :returns: number of items in the root list
+        """
+        tdd = self.tdm.tdds_mapping[type_name]
+        if fan_out_field is None:
+            tdf = self.find_fan_out_field(tdd)
+            fan_out_field = None if tdf is None else tdf.name
+        elif fan_out_field not in tdd.fields_mapping or not (
+            self._is_nested(tdd.fields_mapping[fan_out_field])
+            and tdd.fields_mapping[fan_out_field].anno.nested_type_subscriptor == "List"
+        ):
+            raise ValueError(
+                f"{type_name}.{fan_out_field} is not a list of nested TypedDict"
+            )
+        if target_size is not None and fan_out_field is None:
+            raise ValueError(f"{type_name} has no list to fill up to the target size")
+
+        n_items = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as f:
+            size = f.write("{")
+            for i, tdf in enumerate(tdd.fields):
+                if i:
+                    size += f.write(", ")
+                size += f.write(json.dumps(tdf.name) + ": ")
+                if tdf.name != fan_out_field:
+                    if self._is_nested(tdf):
+                        value = self.make_field(tdf, depth=0)
+                    else:
+                        value = self.make_scalar()
+                    size += f.write(json.dumps(value))
+                    continue
+                size += f.write("[")
+                while True:
+                    if target_size is None:
+                        if n_items >= self.list_size:
+                            break
+                    # the rest of the root is small, the target size is an estimation
+                    elif n_items and size >= target_size:
+                        break
+                    if n_items:
+                        size += f.write(", ")
+                    item = self.make(tdf.anno.nested_type_name, depth=1)
+                    size += f.write(json.dumps(item))
+                    n_items += 1
+                size += f.write("]")
+            f.write("}")
+        return n_items
+
+
+def get_path_synthetic_response(
+    service_name: str,
+    method_name: str,
+    list_size: int,
+    seed: int | None,
+    target_size: int | None = None,
+) -> Path:
+    """
+    Where a reusable synthetic response is cached, example:
+    ``build/benchmarks/synthetic/ec2/describe_instances-list-3-seed-0-size-1000000.json``
+    """
+    name = f"{method_name}-list-{list_size}-seed-{seed}"
+    if target_size is not None:
+        name += f"-size-{target_size}"
+    return get_dir_benchmark("synthetic") / service_name / f"{name}.json"
@@ -0,0 +1,404 @@
+# -*- coding: utf-8 -*-
+
+"""
+End-to-end throughput benchmark of ``boto3 client call -> caster -> attribute
+access``, against `moto <https://github.com/getmoto/moto>`_ as a local AWS
+stand-in.
+
+A :class:`ThroughputScenario` fills a moto server with data, for example
+100 objects in a S3 bucket, then calls a high volume operation like
+``s3.list_objects_v2`` from a thread pool, in two modes:
+
+- ``raw``: call the client and read the attributes from the response dict
+- ``cast``: call the client, cast the response with the caster and read the
+  same attributes from the dataclass
+
+For every concurrency level we report requests / sec, the per-call latency
+percentiles and the cast + access latency percentiles, so the casting overhead
+can be budgeted against the HTTP round trip and the botocore parsing.
+
+The moto server runs in a thread of the benchmark process (``ThreadedMotoServer``),
+so it shares the GIL with the client threads. The absolute numbers are lower
+than against AWS, the ``raw`` vs ``cast`` comparison is what matters.
+
+moto is not a dependency of ``boto3_dataclass``, install it with::
+
+    pip install "moto[server]"
+
+Example::
+
+    report = run_throughput_benchmark_all(
+        scenarios=[scenario_s3_list_objects_v2(n_items=100)],
+        thread_counts=[1, 4, 16],
+        n_calls=200,
+    )
+    report.write(get_path_benchmark_result("throughput"))
+"""
+
+import typing as T
+import time
+import contextlib
+import dataclasses
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from ..utils import import_generated_package
+from .common import (
+    BenchmarkEnv,
+    get_dir_benchmark,
+    percentiles,
+    write_json,
+)
+from .runtime import RuntimeTarget
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from boto3.session import Session
+
+T_MODE = T.Literal[
+    "raw",  # read the attributes from the response dict
+    "cast",  # cast the response, then read the attributes from the dataclass
+]
+
+MODES = ["raw", "cast"]
+
+
+def get_values(obj, path: str, is_dict: bool) -> list[T.Any]:
+    """
+    Read an attribute path from a response, ``*`` iterates over a list, e.g.
+    ``Reservations.*.Instances.*.InstanceId``.
+    """
+    values = [obj]
+    for part in path.split("."):
+        if part == "*":
+            values = [item for value in values for item in value]
+        elif is_dict:
+            values = [value[part] for value in values]
+        else:
+            values = [getattr(value, part) for value in values]
+    return values
+
+
+@dataclasses.dataclass
+class ThroughputScenario:
+    """
+    A client operation to call again and again.
+
+    :param service_name: e.g. ``s3``
+    :param method_name: e.g. ``list_objects_v2``
+    :param setup: create the data in moto, return the kwargs of the call
+    :param access_paths: the attributes to read from every response, see
+        :func:`get_values`
+    :param n_items: number of items the setup creates, e.g. S3 objects
+    """
+
+    service_name: str = dataclasses.field()
+    method_name: str = dataclasses.field()
+    setup: T.Callable[[T.Any, int], dict[str, T.Any]] = dataclasses.field()
+    access_paths: list[str] = dataclasses.field(default_factory=list)
+    n_items: int = dataclasses.field(default=100)
+
+    @property
+    def name(self) -> str:
+        return f"{self.service_name}.{self.method_name}"
+
+
+def _setup_s3_list_objects_v2(client, n_items: int) -> dict[str, T.Any]:
+    bucket = "boto3-dataclass-benchmark"
+    client.create_bucket(Bucket=bucket)
+    for i in range(n_items):
+        client.put_object(Bucket=bucket, Key=f"data/{i:06d}.json", Body=b"{}")
+    return {"Bucket": bucket, "Prefix": "data/"}
+
+
+def scenario_s3_list_objects_v2(n_items: int = 100) -> ThroughputScenario:
+    return ThroughputScenario(
+        service_name="s3",
+        method_name="list_objects_v2",
+        setup=_setup_s3_list_objects_v2,
+        access_paths=["Contents.*.Key", "Contents.*.Size", "KeyCount"],
+        n_items=n_items,
+    )
+
+
+def _setup_dynamodb_query(client, n_items: int) -> dict[str, T.Any]:
+    table = "boto3-dataclass-benchmark"
+    client.create_table(
+        TableName=table,
+        KeySchema=[
+            {"AttributeName": "pk", "KeyType": "HASH"},
+            {"AttributeName": "sk", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "pk", "AttributeType": "S"},
+            {"AttributeName": "sk", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    for i in range(n_items):
+        client.put_item(
+            TableName=table,
+            Item={
+                "pk": {"S": "user-1"},
+                "sk": {"S": f"order-{i:06d}"},
+                "amount": {"N": str(i)},
+            },
+        )
+    return {
+        "TableName": table,
+        "KeyConditionExpression": "pk = :pk",
+        "ExpressionAttributeValues": {":pk": {"S": "user-1"}},
+    }
+
+
+def scenario_dynamodb_query(n_items: int = 100) -> ThroughputScenario:
+    return ThroughputScenario(
+        service_name="dynamodb",
+        method_name="query",
+        setup=_setup_dynamodb_query,
+        access_paths=["Items", "Count", "ScannedCount"],
+        n_items=n_items,
+    )
+
+
+def _setup_ec2_describe_instances(client, n_items: int) -> dict[str, T.Any]:
+    client.run_instances(ImageId="ami-12c6146b", MinCount=n_items, MaxCount=n_items)
+    return {}
+
+
+def scenario_ec2_describe_instances(n_items: int = 100) -> ThroughputScenario:
+    return ThroughputScenario(
+        service_name="ec2",
+        method_name="describe_instances",
+        setup=_setup_ec2_describe_instances,
+        access_paths=[
+            "Reservations.*.Instances.*.InstanceId",
+            "Reservations.*.Instances.*.Placement.AvailabilityZone",
+        ],
+        n_items=n_items,
+    )
+
+
+def _setup_sqs_receive_message(client, n_items: int) -> dict[str, T.Any]:
+    queue_url = client.create_queue(QueueName="boto3-dataclass-benchmark")["QueueUrl"]
+    for i in range(n_items):
+        client.send_message(QueueUrl=queue_url, MessageBody=f"message-{i}")
+    # the messages stay visible, so every call receives messages
+    return {"QueueUrl": queue_url, "MaxNumberOfMessages": 10, "VisibilityTimeout": 0}
+
+
+def scenario_sqs_receive_message(n_items: int = 100) -> ThroughputScenario:
+    return ThroughputScenario(
+        service_name="sqs",
+        method_name="receive_message",
+        setup=_setup_sqs_receive_message,
+        access_paths=["Messages.*.MessageId", "Messages.*.Body"],
+        n_items=n_items,
+    )
+
+
+scenario_factories = {
+    "s3.list_objects_v2": scenario_s3_list_objects_v2,
+    "dynamodb.query": scenario_dynamodb_query,
+    "ec2.describe_instances": scenario_ec2_describe_instances,
+    "sqs.receive_message": scenario_sqs_receive_message,
+}
+
+
+@contextlib.contextmanager
+def start_moto_server() -> T.Iterator[str]:
+    """
+    Start a moto server in a thread on a random port, yield the endpoint url.
+    """
+    try:
+        from moto.server import ThreadedMotoServer
+    except ImportError as e:  # pragma: no cover
+        raise ImportError(
+            "The throughput benchmark needs moto, "
+            'install it with: pip install "moto[server]"'
+        ) from e
+
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+    server.start()
+    try:
+        host, port = server.get_host_and_port()
+        yield f"http://{host}:{port}"
+    finally:
+        server.stop()
+
+
+def new_boto3_session() -> "Session":
+    import boto3
+
+    return boto3.session.Session(
+        aws_access_key_id="testing",
+        aws_secret_access_key="testing",
+        aws_session_token="testing",
+        region_name="us-east-1",
+    )
+
+
+@dataclasses.dataclass
+class ThroughputResult:
+    """
+    The result of one scenario, mode and concurrency level.
+
+    :param scenario: e.g. ``s3.list_objects_v2``
+    :param n_items: number of items the setup created
+    :param mode: ``raw`` or ``cast``
+    :param n_threads: number of concurrent threads
+    :param n_calls: total number of calls
+    :param requests_per_sec: calls / wall time
+    :param latency_ms: p50 / p90 / p99 of the whole call in milliseconds
+    :param cast_latency_ms: p50 / p90 / p99 of the cast and attribute access
+        part (the dict access in ``raw`` mode) in milliseconds
+    """
+
+    scenario: str = dataclasses.field()
+    n_items: int = dataclasses.field()
+    mode: str = dataclasses.field()
+    n_threads: int = dataclasses.field()
+    n_calls: int = dataclasses.field()
+    requests_per_sec: float = dataclasses.field(default=0.0)
+    latency_ms: dict[str, float] = dataclasses.field(default_factory=dict)
+    cast_latency_ms: dict[str, float] = dataclasses.field(default_factory=dict)
+
+
+def run_throughput_benchmark(
+    scenario: ThroughputScenario,
+    client,
+    caster,
+    call_kwargs: dict[str, T.Any],
+    mode: T_MODE,
+    n_threads: int,
+    n_calls: int,
+) -> ThroughputResult:
+    """
+    Call the operation ``n_calls`` times from ``n_threads`` threads.
+    """
+    method = getattr(client, scenario.method_name)
+    cast = getattr(caster, scenario.method_name)
+    is_dict = mode == "raw"
+
+    def call(_) -> tuple[float, float]:
+        start = time.perf_counter()
+        res = method(**call_kwargs)
+        call_done = time.perf_counter()
+        obj = res if is_dict else cast(res)
+        for path in scenario.access_paths:
+            get_values(obj, path, is_dict)
+        end = time.perf_counter()
+        return end - start, end - call_done
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        samples = list(executor.map(call, range(n_calls)))
+    elapsed = time.perf_counter() - start
+    return ThroughputResult(
+        scenario=scenario.name,
+        n_items=scenario.n_items,
+        mode=mode,
+        n_threads=n_threads,
+        n_calls=n_calls,
+        requests_per_sec=n_calls / elapsed,
+        latency_ms=percentiles([total * 1000 for total, _ in samples]),
+        cast_latency_ms=percentiles([cast * 1000 for _, cast in samples]),
+    )
+
+
+@dataclasses.dataclass
+class ThroughputReport:
+    """
+    The throughput benchmark results of a generator version.
+    """
+
+    env: BenchmarkEnv = dataclasses.field(default_factory=BenchmarkEnv)
+    results: list[ThroughputResult] = dataclasses.field(default_factory=list)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return dataclasses.asdict(self)
+
+    def write(self, path: Path):
+        write_json(path, self.to_dict())
+
+    def summary(self) -> str:
+        """
+        One line per scenario and concurrency level, with the cast overhead.
+        """
+        mapping = {(r.scenario, r.n_threads, r.mode): r for r in self.results}
+        lines = []
+        for result in self.results:
+            if result.mode != "cast":
+                continue
+            line = (
+                f"- {result.scenario} ({result.n_items} items, "
+                f"{result.n_threads} threads): "
+                f"{result.requests_per_sec:.1f} req/s, "
+                f"p50 {result.latency_ms['p50']:.2f} ms, "
+                f"p99 {result.latency_ms['p99']:.2f} ms, "
+                f"cast + access p50 {result.cast_latency_ms['p50']:.3f} ms"
+            )
+            raw = mapping.get((result.scenario, result.n_threads, "raw"))
+            if raw is not None:
+                overhead = (
+                    result.cast_latency_ms["p50"] - raw.cast_latency_ms["p50"]
+                ) / raw.latency_ms["p50"]
+                line += (
+                    f" (raw {raw.requests_per_sec:.1f} req/s, "
+                    f"overhead {overhead * 100:.1f}% of p50)"
+                )
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def run_throughput_benchmark_all(
+    scenarios: list[ThroughputScenario],
+    thread_counts: T.Iterable[int] = (1, 4, 16),
+    n_calls: int = 200,
+    dir_workspace: Path | None = None,
+) -> ThroughputReport:
+    """
+    Run every scenario in both modes for every concurrency level, against a
+    fresh moto server.
+
+    :param scenarios: the operations to call
+    :param thread_counts: the concurrency sweep
+    :param n_calls: number of calls per scenario, mode and concurrency level
+    :param dir_workspace: where to render the generated packages, default is
+        ``build/benchmarks/throughput/``
+    """
+    if dir_workspace is None:
+        dir_workspace = get_dir_benchmark("throughput") / "packages"
+    report = ThroughputReport()
+    with start_moto_server() as endpoint_url:
+        session = new_boto3_session()
+        for scenario in scenarios:
+            target = RuntimeTarget.from_service(
+                scenario.service_name,
+                scenario.method_name,
+            )
+            package = import_generated_package(
+                package_name=f"boto3_dataclass_bench_{scenario.service_name}",
+                tdm=target.tdm,
+                cm=target.cm,
+                dir_root=dir_workspace,
+            )
+            # boto3 client is thread safe, all the threads share one client
+            client = session.client(
+                scenario.service_name,
+                endpoint_url=endpoint_url,
+            )
+            call_kwargs = scenario.setup(client, scenario.n_items)
+            for n_threads in thread_counts:
+                for mode in MODES:
+                    report.results.append(
+                        run_throughput_benchmark(
+                            scenario=scenario,
+                            client=client,
+                            caster=package.caster,
+                            call_kwargs=call_kwargs,
+                            mode=mode,
+                            n_threads=n_threads,
+                            n_calls=n_calls,
+                        )
+                    )
+    return report
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+"""
+Pickle size and round-trip time of the cast responses, e.g. sending a cast
+``DescribeInstancesResult`` to a ``multiprocessing`` or ``mpire`` worker.
+
+A generated dataclass pickles the raw dict only (``__reduce__``), the
+``cached_property`` values are rebuilt lazily after unpickling. Without it,
+pickle ships the instance ``__dict__``, the raw dict plus every accessed
+nested wrapper object. Every synthetic response is cast and every field is
+accessed (the worst case), then pickled in these modes:
+
+- ``raw``: the response dict alone, the lower bound
+- ``state``: the default dataclass pickling, the instance ``__dict__``,
+  emulated by :class:`StatePickler`
+- ``reduce``: the generated ``__reduce__``
+
+For every mode we measure the pickle bytes, ``pickle.dumps`` and
+``pickle.loads`` time, and the wall time to send the object to the workers
+of a process pool, where it is unpickled and every field is read again.
+"""
+
+import typing as T
+import time
+import pickle
+import copyreg
+import io
+import multiprocessing
+import functools
+import dataclasses
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from ..utils import import_generated_package
+from .common import (
+    BenchmarkEnv,
+    get_dir_benchmark,
+    run_interleaved,
+    summarize,
+    write_json,
+)
+from .runtime import RuntimeTarget
+from .synthetic import SyntheticResponseGenerator
+from .memory import is_boto3_dataclass, materialize
+
+MODES = ["raw", "state", "reduce"]
+
+
+class StatePickler(pickle.Pickler):
+    """
+    Pickle the generated dataclasses like a dataclass without ``__reduce__``,
+    with the instance ``__dict__`` as the state.
+    """
+
+    def reducer_override(self, obj):
+        if is_boto3_dataclass(obj):
+            return copyreg.__newobj__, (type(obj),), vars(obj)
+        return NotImplemented
+
+
+def dumps(obj, mode: str) -> bytes:
+    if mode == "state":
+        buffer = io.BytesIO()
+        StatePickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+        return buffer.getvalue()
+    return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _load_in_worker(data: bytes) -> int:
+    obj = pickle.loads(data)
+    # the reduce mode pays for the lazy rebuild here
+    return materialize(obj) if is_boto3_dataclass(obj) else len(obj)
+
+
+@dataclasses.dataclass
+class TransferResult:
+    """
+    The pickle size and time of one target and list size.
+
+    :param target: e.g. ``ec2.describe_instances``
+    :param list_size: number of items in every list of the synthetic response
+    :param pickle_bytes: ``{mode: bytes of the pickle}``
+    :param dumps_times: ``{mode: one pickle.dumps time per run}``
+    :param loads_times: ``{mode: one pickle.loads time per run}``
+    :param pool_times: ``{mode: one pool round trip of all tasks per run}``
+    """
+
+    target: str = dataclasses.field()
+    list_size: int = dataclasses.field()
+    pickle_bytes: dict[str, int] = dataclasses.field(default_factory=dict)
+    dumps_times: dict[str, list[float]] = dataclasses.field(default_factory=dict)
+    loads_times: dict[str, list[float]] = dataclasses.field(default_factory=dict)
+    pool_times: dict[str, list[float]] = dataclasses.field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        data = dataclasses.asdict(self)
+        data["stats"] = {
+            mode: {
+                "dumps": summarize(self.dumps_times[mode]),
+                "loads": summarize(self.loads_times[mode]),
+                "pool": summarize(self.pool_times[mode]),
+            }
+            for mode in MODES
+        }
+        return data
+
+
+@dataclasses.dataclass
+class TransferReport:
+    """
+    The pickle benchmark results of a generator version.
+    """
+
+    env: BenchmarkEnv = dataclasses.field(default_factory=BenchmarkEnv)
+    results: list[TransferResult] = dataclasses.field(default_factory=list)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return {
+            "env": dataclasses.asdict(self.env),
+            "results": [result.to_dict() for result in self.results],
+        }
+
+    def write(self, path: Path):
+        write_json(path, self.to_dict())
+
+    def summary(self) -> str:
+        lines = []
+        for result in self.results:
+            parts = []
+            for mode in MODES:
+                pool_ms = summarize(result.pool_times[mode])["median"] * 1000
+                parts.append(
+                    f"{mode} {result.pickle_bytes[mode]} bytes / {pool_ms:.2f} ms"
+                )
+            lines.append(
+                f"- {result.target} (list size {result.list_size}): " + ", ".join(parts)
+            )
+        return "\n".join(lines)
+
+
+def run_transfer_benchmark(
+    target: RuntimeTarget,
+    package: T.Any,
+    list_size: int,
+    pool: ProcessPoolExecutor,
+    n_tasks: int = 8,
+    n_runs: int = 3,
+) -> TransferResult:
+    """
+    :param package: the imported generated package, imported before the
+        pool is forked, so the workers can unpickle its classes
+    :param n_tasks: number of objects sent to the pool per run
+    """
+    generator = SyntheticResponseGenerator(tdm=target.tdm, list_size=list_size)
+    response = generator.make(target.caster_method.boto3_stubs_type_name)
+    obj = getattr(package.caster, target.method_name)(response)
+    materialize(obj)
+    objects = {"raw": response, "state": obj, "reduce": obj}
+
+    result = TransferResult(target=target.name, list_size=list_size)
+    for mode in MODES:
+        data = dumps(objects[mode], mode)
+        loaded = pickle.loads(data)
+        if loaded != objects[mode]:
+            raise ValueError(f"{target.name} differs after the {mode} round trip")
+        result.pickle_bytes[mode] = len(data)
+
+    def run_once(mode: str) -> tuple[float, float, float]:
+        start = time.perf_counter()
+        data = dumps(objects[mode], mode)
+        dumps_time = time.perf_counter() - start
+        start = time.perf_counter()
+        pickle.loads(data)
+        loads_time = time.perf_counter() - start
+        start = time.perf_counter()
+        futures = [
+            pool.submit(_load_in_worker, dumps(objects[mode], mode))
+            for _ in range(n_tasks)
+        ]
+        for future in futures:
+            future.result()
+        return dumps_time, loads_time, time.perf_counter() - start
+
+    runs = run_interleaved(
+        {mode: functools.partial(run_once, mode) for mode in MODES},
+        n_runs=n_runs,
+    )
+    for mode in MODES:
+        result.dumps_times[mode] = [run[0] for run in runs[mode]]
+        result.loads_times[mode] = [run[1] for run in runs[mode]]
+        result.pool_times[mode] = [run[2] for run in runs[mode]]
+    return result
+
+
+def run_transfer_benchmark_all(
+    targets: list[RuntimeTarget],
+    list_sizes: T.Iterable[int] = (3, 5),
+    n_workers: int = 2,
+    n_tasks: int = 8,
+    n_runs: int = 3,
+    dir_workspace: Path | None = None,
+) -> TransferReport:
+    """
+    Measure the pickle size and time for every target and list size.
+
+    :param targets: the caster methods to benchmark
+    :param list_sizes: number of items in every list of the synthetic response
+    :param n_workers: number of processes in the pool
+    :param n_tasks: number of objects sent to the pool per run
+    :param n_runs: number of runs per target, list size and mode
+    :param dir_workspace: where to render the generated packages, default is
+        ``build/benchmarks/transfer/``
+    """
+    if dir_workspace is None:
+        dir_workspace = get_dir_benchmark("transfer") / "packages"
+    packages = [
+        import_generated_package(
+            package_name="boto3_dataclass_bench_" + target.name.replace(".", "_"),
+            tdm=target.tdm,
+            cm=target.cm,
+            dir_root=dir_workspace,
+        )
+        for target in targets
+    ]
+    report = TransferReport()
+    # fork, the workers inherit the imported packages
+    mp_context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=mp_context) as pool:
+        # start the workers before the timer
+        list(pool.map(len, [b""] * n_workers))
+        for target, package in zip(targets, packages):
+            for list_size in list_sizes:
+                report.results.append(
+                    run_transfer_benchmark(
+                        target=target,
+                        package=package,
+                        list_size=list_size,
+                        pool=pool,
+                        n_tasks=n_tasks,
+                        n_runs=n_runs,
+                    )
+                )
+    return report
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+"""
+What the tree shaking of ``type_defs.py`` removes, see
+:class:`~boto3_dataclass.models.reachability.TypeReachabilityGraph`.
+
+For every service the ``type_defs.py`` is rendered with the current templates
+twice, with every TypedDict (``keep_all``) and with only the types a caster
+method can return (``shaken``), and measured:
+
+1. number of classes and fields, lines and bytes of the source
+2. the import time of ``type_defs`` in a fresh interpreter, with the ``.pyc``
+   present, like an installed wheel
+"""
+
+import typing as T
+import functools
+import dataclasses
+from pathlib import Path
+
+from ..utils import black_format_code
+from ..models.reachability import TypeReachabilityGraph
+from ..builders.size_report import count_classes_and_fields
+from .common import (
+    BenchmarkEnv,
+    get_dir_benchmark,
+    parse_service,
+    run_interleaved,
+    summarize,
+    write_json,
+)
+from .compact import write_type_defs, run_import_once
+
+MODES = ["keep_all", "shaken"]
+
+
+@dataclasses.dataclass
+class TreeShakeResult:
+    """
+    The ``type_defs.py`` of one service in one mode.
+
+    :param service_name: e.g. ``ec2``
+    :param mode: ``keep_all`` or ``shaken``
+    :param classes: number of dataclasses
+    :param fields: number of fields of all dataclasses
+    :param lines: number of source lines
+    :param source_bytes: bytes of the source
+    :param import_times: one import time per fresh interpreter, in seconds
+    """
+
+    service_name: str = dataclasses.field()
+    mode: str = dataclasses.field()
+    classes: int = dataclasses.field(default=0)
+    fields: int = dataclasses.field(default=0)
+    lines: int = dataclasses.field(default=0)
+    source_bytes: int = dataclasses.field(default=0)
+    import_times: list[float] = dataclasses.field(default_factory=list)
+
+    def stats(self) -> dict[str, float]:
+        return summarize(self.import_times)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        data = dataclasses.asdict(self)
+        data["stats"] = self.stats()
+        return data
+
+
+@dataclasses.dataclass
+class TreeShakeReport:
+    """
+    The tree shaking benchmark results of a generator version.
+    """
+
+    env: BenchmarkEnv = dataclasses.field(default_factory=BenchmarkEnv)
+    results: list[TreeShakeResult] = dataclasses.field(default_factory=list)
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return {
+            "env": dataclasses.asdict(self.env),
+            "results": [result.to_dict() for result in self.results],
+        }
+
+    def write(self, path: Path):
+        write_json(path, self.to_dict())
+
+    def summary(self) -> str:
+        lines = []
+        results = {
+            (result.service_name, result.mode): result for result in self.results
+        }
+        service_names = list(
+            dict.fromkeys(result.service_name for result in self.results)
+        )
+        for service_name in service_names:
+            old = results[(service_name, "keep_all")]
+            new = results[(service_name, "shaken")]
+            old_ms = old.stats()["median"] * 1000
+            new_ms = new.stats()["median"] * 1000
+            lines.append(
+                f"- {service_name}: "
+                f"removed {old.classes - new.classes} of {old.classes} classes, "
+                f"{old.lines - new.lines} of {old.lines} lines, "
+                f"import {old_ms:.2f} ms -> {new_ms:.2f} ms"
+            )
+        return "\n".join(lines)
+
+
+def run_tree_shake_benchmark(
+    service_name: str,
+    dir_workspace: Path,
+    n_runs: int = 5,
+    black: bool = True,
+) -> list[TreeShakeResult]:
+    tdm, cm = parse_service(service_name)
+    tdms = {
+        "keep_all": tdm,
+        "shaken": TypeReachabilityGraph.new(tdm=tdm, cm=cm).shake(tdm),
+    }
+    package_name = f"boto3_dataclass_{service_name}"
+    type_defs_line = f"from mypy_boto3_{service_name} import type_defs"
+    results = list()
+    for mode in MODES:
+        code = tdms[mode].gen_code(type_defs_line=type_defs_line)
+        if black:
+            code = black_format_code(code)
+        path = write_type_defs(dir_workspace / mode / package_name, code)
+        classes, fields = count_classes_and_fields(code)
+        results.append(
+            TreeShakeResult(
+                service_name=service_name,
+                mode=mode,
+                classes=classes,
+                fields=fields,
+                lines=code.count("\n"),
+                source_bytes=path.stat().st_size,
+            )
+        )
+    import_times = run_interleaved(
+        {
+            mode: functools.partial(
+                run_import_once,
+                package_name=package_name,
+                dir_workspace=dir_workspace / mode,
+            )
+            for mode in MODES
+        },
+        n_runs=n_runs,
+    )
+    for mode, result in zip(MODES, results):
+        result.import_times = import_times[mode]
+    return results
+
+
+def run_tree_shake_benchmark_all(
+    service_names: list[str],
+    n_runs: int = 5,
+    black: bool = True,
+    dir_workspace: Path | None = None,
+) -> TreeShakeReport:
+    """
+    Compare the tree shaken ``type_defs.py`` with the one that keeps every
+    TypedDict for every service.
+
+    :param service_names: e.g. ``["ec2", "iam"]``
+    :param n_runs: number of fresh interpreters per service and mode
+    :param black: black format the code like the builder, it is slow for
+        the big services
+    :param dir_workspace: where to render the packages, default is
+        ``build/benchmarks/tree_shake/``
+    """
+    if dir_workspace is None:
+        dir_workspace = get_dir_benchmark("tree_shake") / "packages"
+    report = TreeShakeReport()
+    for service_name in service_names:
+        report.results.extend(
+            run_tree_shake_benchmark(
+                service_name=service_name,
+                dir_workspace=dir_workspace,
+                n_runs=n_runs,
+                black=black,
+            )
+        )
+    return report
@@ -3,3 +3,29 @@
 from .publish_pyproject import PyProjectBuilder
 from .publish_boto3_dataclass_service import Boto3DataclassServiceBuilder
 from .publish_boto3_dataclass import Boto3DataclassBuilder
+from .publish_boto3_dataclass_core import CoreIndex
+from .publish_boto3_dataclass_core import CoreReport
+from .publish_boto3_dataclass_core import make_core_module
+from .publish_boto3_dataclass_core import Boto3DataclassCoreBuilder
+from .shard import ShardSpec
+from .shard import ShardManifest
+from .shard import merge_shard_manifests
+from .shard import merge_shard_manifest_files
+from .smoke_import import SmokeImportReport
+from .smoke_import import smoke_import
+from .smoke_import import run_smoke_import_all
+from .size_report import ServiceSize
+from .size_report import SizeReport
+from .size_report import SizeBudget
+from .size_report import SizeHistory
+from .size_report import get_path_shard_size_report
+from .size_report import append_size_report
+from .size_report import record_size_report
+from .size_report import record_wheel_sizes
+from .size_report import merge_shard_size_report_files
+from .bytecode import compile_package
+from .bytecode import add_bytecode_to_wheel
+from .bytecode import build_archive
+from .publish_boto3_dataclass_slim import SlimReport
+from .publish_boto3_dataclass_slim import Boto3DataclassSlimBuilder
+from .publish_boto3_dataclass_bundle import Boto3DataclassBundleBuilder
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+"""
+Ship precompiled bytecode with the generated service packages.
+
+The import of a big service package is dominated by compiling
+``type_defs.py``, and on a read-only file system (Lambda, containers with a
+read-only root) the ``.pyc`` can't be written at runtime, so every cold start
+compiles it again. This module offers two build time options:
+
+1. :func:`add_bytecode_to_wheel`, add ``__pycache__/*.pyc`` to a built wheel.
+   The ``.pyc`` use the unchecked hash invalidation mode, the interpreter
+   loads them without a ``stat`` of the source to validate the mtime, and
+   they stay valid after the wheel is unpacked with any mtime.
+2. :func:`build_archive`, put the code objects of many packages into one
+   file, ``boto3_dataclass.archive.install(path)`` adds a meta path finder
+   that imports them from it. One ``open`` + ``mmap`` instead of a
+   ``stat`` / ``open`` / ``read`` per module.
+
+The bytecode is specific to the interpreter version that compiled it. The
+wheel keeps the ``.py`` files, the other interpreters ignore the ``.pyc``
+with a different cache tag and compile the source as usual. The archive
+records the bytecode magic number and refuses to load on another version.
+
+Note that ``pip install`` compiles the ``.py`` files again after install, the
+shipped ``.pyc`` matter for ``pip install --no-compile``, ``uv pip install``
+(no compile by default) and the unpacked wheels of a Lambda layer.
+"""
+
+import typing as T
+import io
+import os
+import base64
+import struct
+import marshal
+import hashlib
+import zipfile
+import tempfile
+import compileall
+import py_compile
+import importlib.util
+from pathlib import Path
+
+ARCHIVE_MAGIC = b"B3DCARCH"
+# magic, bytecode magic number, index size
+ARCHIVE_HEADER = struct.Struct("<8s4sQ")
+
+
+def compile_package(
+    dir_package: Path,
+    optimize_levels: T.Sequence[int] = (0,),
+) -> list[Path]:
+    """
+    Compile all modules of a package folder to ``__pycache__/*.pyc`` with
+    the unchecked hash invalidation mode.
+
+    :param dir_package: the package folder, e.g. ``.../boto3_dataclass_iam``
+    :param optimize_levels: ``0`` is loaded by default, ``1`` and ``2`` are
+        only loaded by ``python -O`` and ``python -OO``
+
+    :returns: the ``.pyc`` files
+    """
+    compileall.compile_dir(
+        str(dir_package),
+        quiet=1,
+        force=True,
+        optimize=list(optimize_levels),
+        invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+    )
+    return sorted(dir_package.rglob("__pycache__/*.pyc"))
+
+
+def _record_line(arcname: str, data: bytes) -> str:
+    digest = base64.urlsafe_b64encode(hashlib.sha256(data).digest())
+    return f"{arcname},sha256={digest.rstrip(b'=').decode('ascii')},{len(data)}"
+
+
+def add_bytecode_to_wheel(
+    path_wheel: Path,
+    optimize_levels: T.Sequence[int] = (0,),
+) -> list[str]:
+    """
+    Add the ``.pyc`` of every ``.py`` file to a built wheel in place, and
+    update the ``RECORD`` file. The ``.pyc`` already in the wheel are
+    replaced.
+
+    :param path_wheel: the ``.whl`` file
+    :param optimize_levels: see :func:`compile_package`
+
+    :returns: the archive names of the added ``.pyc``
+    """
+    with zipfile.ZipFile(path_wheel) as zf:
+        infos = [info for info in zf.infolist() if not info.filename.endswith(".pyc")]
+        files = {info.filename: zf.read(info) for info in infos}
+
+    arcname_record = next(name for name in files if name.endswith(".dist-info/RECORD"))
+    pycs = dict()
+    with tempfile.TemporaryDirectory() as dir_temp:
+        for arcname, data in files.items():
+            if not arcname.endswith(".py"):
+                continue
+            path_py = Path(dir_temp, "src", arcname)
+            path_py.parent.mkdir(parents=True, exist_ok=True)
+            path_py.write_bytes(data)
+            for optimize in optimize_levels:
+                arcname_pyc = importlib.util.cache_from_source(
+                    arcname,
+                    optimization="" if optimize == 0 else optimize,
+                )
+                path_pyc = Path(dir_temp, "pyc", arcname_pyc)
+                py_compile.compile(
+                    str(path_py),
+                    cfile=str(path_pyc),
+                    dfile=arcname,
+                    doraise=True,
+                    optimize=optimize,
+                    invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+                )
+                pycs[arcname_pyc] = path_pyc.read_bytes()
+
+    record_lines = [
+        line
+        for line in files[arcname_record].decode("utf-8").splitlines()
+        if line and not line.split(",", 1)[0].endswith(".pyc")
+    ]
+    # RECORD lists itself without hash, keep it last
+    record_lines = [
+        line for line in record_lines if not line.startswith(f"{arcname_record},")
+    ]
+    record_lines.extend(_record_line(name, data) for name, data in pycs.items())
+    record_lines.append(f"{arcname_record},,")
+    files[arcname_record] = ("\n".join(record_lines) + "\n").encode("utf-8")
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for info in infos:
+            if info.filename != arcname_record:
+                zf.writestr(info, files[info.filename])
+        for arcname_pyc, data in pycs.items():
+            zf.writestr(arcname_pyc, data)
+        zf.writestr(arcname_record, files[arcname_record])
+    path_wheel.write_bytes(buffer.getvalue())
+    return list(pycs)
+
+
+def iter_modules(dir_package: Path) -> T.Iterable[tuple[str, bool, Path]]:
+    """
+    Yield ``(module name, is package, path)`` of every module in a package
+    folder, e.g. ``("boto3_dataclass_iam.caster", False, .../caster.py)``.
+    """
+    for path in sorted(dir_package.rglob("*.py")):
+        if "__pycache__" in path.parts:  # pragma: no cover
+            continue
+        parts = list(path.relative_to(dir_package.parent).with_suffix("").parts)
+        is_package = parts[-1] == "__init__"
+        if is_package:
+            parts.pop()
+        yield ".".join(parts), is_package, path
+
+
+def build_archive(
+    dir_packages: T.Iterable[Path],
+    path_archive: Path,
+    optimize: int = 0,
+) -> dict[str, tuple[bool, int, int]]:
+    """
+    Compile the modules of many package folders into one archive file, see
+    ``boto3_dataclass.archive`` for the importer.
+
+    The layout is the header (:data:`ARCHIVE_HEADER`), the marshalled index
+    ``{module name: (is package, offset, size)}``, then the marshalled code
+    objects, the offset is relative to the end of the index.
+
+    :param dir_packages: the package folders, e.g. ``.../boto3_dataclass_iam``
+    :param path_archive: where to write the archive
+    :param optimize: the optimization level of the code objects, the archive
+        code is used with or without ``python -O``
+
+    :returns: the index
+    """
+    index = dict()
+    blobs = list()
+    offset = 0
+    for dir_package in dir_packages:
+        for module_name, is_package, path in iter_modules(dir_package):
+            relpath = path.relative_to(dir_package.parent).as_posix()
+            code = compile(
+                path.read_bytes(),
+                f"{path_archive}/{relpath}",
+                "exec",
+                dont_inherit=True,
+                optimize=optimize,
+            )
+            blob = marshal.dumps(code)
+            index[module_name] = (is_package, offset, len(blob))
+            blobs.append(blob)
+            offset += len(blob)
+    index_blob = marshal.dumps(index)
+    path_archive.parent.mkdir(parents=True, exist_ok=True)
+    path_temp = path_archive.with_name(f"{path_archive.name}.{os.getpid()}.tmp")
+    with path_temp.open("wb") as f:
+        f.write(
+            ARCHIVE_HEADER.pack(
+                ARCHIVE_MAGIC,
+                importlib.util.MAGIC_NUMBER,
+                len(index_blob),
+            )
+        )
+        f.write(index_blob)
+        for blob in blobs:
+            f.write(blob)
+    path_temp.replace(path_archive)
+    return index
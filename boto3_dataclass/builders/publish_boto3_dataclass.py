@@ -32,7 +32,7 @@ class Boto3DataclassBuilder(PyProjectBuilder):
     The builder handles:
 
     - Discovering all available AWS service packages
-    - Generating imports for all service packages in __init__.py
+    - Generating the lazy service attributes in __init__.py
     - Creating package dependencies on all service packages
     - Building package configuration files
 
@@ -50,7 +50,13 @@ class Boto3DataclassBuilder(PyProjectBuilder):
 
         build/repos/boto3_dataclass-project/
         ├── boto3_dataclass/
-        │   └── __init__.py          # Imports all service packages
+        │   ├── __init__.py          # Service packages as lazy attributes
+        │   ├── hook.py              # Opt-in boto3 hook, ``response.typed``
+        │   ├── factory.py           # Runtime class factory from botocore shapes
+        │   ├── archive.py           # Import the service packages from one archive
+        │   ├── trace.py             # Opt-in usage tracer for the slim builder
+        │   ├── shm.py               # Shared memory handoff to process pools
+        │   └── aio.py               # Cast the pages of aiobotocore paginators
         ├── pyproject.toml           # Dependencies on all service packages
         ├── README.rst
         └── LICENSE.txt
@@ -106,16 +112,28 @@ class Boto3DataclassBuilder(PyProjectBuilder):
         This method orchestrates the complete build process for the umbrella package:
 
         1. Cleans the output directory
-        2. Creates boto3_dataclass/__init__.py with imports for all services
-        3. Creates pyproject.toml with dependencies on all service packages
-        4. Creates README.rst documentation
-        5. Creates LICENSE.txt file
+        2. Creates boto3_dataclass/__init__.py with lazy service attributes
+        3. Creates boto3_dataclass/hook.py, the opt-in boto3 hook
+        4. Creates boto3_dataclass/factory.py, the runtime class factory
+        5. Creates boto3_dataclass/archive.py, the single archive importer
+        6. Creates boto3_dataclass/trace.py, the opt-in usage tracer
+        7. Creates boto3_dataclass/shm.py, the shared memory handoff
+        8. Creates boto3_dataclass/aio.py, the asyncio page casting
+        9. Creates pyproject.toml with dependencies on all service packages
+        10. Creates README.rst documentation
+        11. Creates LICENSE.txt file
 
         The resulting package structure allows users to ``import boto3_dataclass``
         and access all AWS service dataclasses through a single import.
         """
         self.structure.remove_dir()
         self.build_init_py()
+        self.build_hook_py()
+        self.build_factory_py()
+        self.build_archive_py()
+        self.build_trace_py()
+        self.build_shm_py()
+        self.build_aio_py()
         self.build_pyproject_toml()
         self.build_README_rst()
         self.build_LICENSE_txt()
@@ -124,14 +142,86 @@ class Boto3DataclassBuilder(PyProjectBuilder):
         """
         Build the main package ``__init__.py`` file from template.
 
-        Creates the package initialization file that imports and exposes
-        all available AWS service dataclass packages. This allows users
-        to access all functionality through the main package.
+        Creates the package initialization file that exposes the installed
+        AWS service dataclass packages as attributes, e.g.
+        ``boto3_dataclass.iam``, imported on first access, and
+        ``list_services()``, the installed services found without importing
+        them.
         """
         path = self.structure.path_init_py
         tpl = tpl_enum.boto3_dataclass__package____init___py
         self.build_by_template(path, tpl)
 
+    def build_hook_py(self):
+        """
+        Build the ``hook.py`` module from template.
+
+        Creates the opt-in boto3 hook, ``boto3_dataclass.hook.install(session)``
+        makes every client created by the session return a ``dict`` that
+        exposes the dataclass view as ``response.typed``.
+        """
+        path = self.structure.dir_package / "hook.py"
+        tpl = tpl_enum.boto3_dataclass__package__hook_py
+        self.build_by_template(path, tpl)
+
+    def build_factory_py(self):
+        """
+        Build the ``factory.py`` module from template.
+
+        Creates the runtime mode, the dataclasses are built on first use from
+        the botocore service model, without the service packages.
+        """
+        path = self.structure.dir_package / "factory.py"
+        tpl = tpl_enum.boto3_dataclass__package__factory_py
+        self.build_by_template(path, tpl)
+
+    def build_archive_py(self):
+        """
+        Build the ``archive.py`` module from template.
+
+        Creates the meta path importer of the single archive file built by
+        :func:`~boto3_dataclass.builders.bytecode.build_archive`.
+        """
+        path = self.structure.dir_package / "archive.py"
+        tpl = tpl_enum.boto3_dataclass__package__archive_py
+        self.build_by_template(path, tpl)
+
+    def build_trace_py(self):
+        """
+        Build the ``trace.py`` module from template.
+
+        Creates the opt-in usage tracer, it records the caster methods,
+        classes and fields used at runtime for the slim package builder, see
+        :mod:`boto3_dataclass.builders.publish_boto3_dataclass_slim`.
+        """
+        path = self.structure.dir_package / "trace.py"
+        tpl = tpl_enum.boto3_dataclass__package__trace_py
+        self.build_by_template(path, tpl)
+
+    def build_shm_py(self):
+        """
+        Build the ``shm.py`` module from template.
+
+        Creates the shared memory handoff, the items of a large response are
+        serialized once into a shared memory block, the workers of a process
+        pool read them lazily with the generated classes.
+        """
+        path = self.structure.dir_package / "shm.py"
+        tpl = tpl_enum.boto3_dataclass__package__shm_py
+        self.build_by_template(path, tpl)
+
+    def build_aio_py(self):
+        """
+        Build the ``aio.py`` module from template.
+
+        Creates the asyncio helpers, they cast the pages of the aiobotocore
+        paginators, and build the large ones on an executor so the event
+        loop is not blocked.
+        """
+        path = self.structure.dir_package / "aio.py"
+        tpl = tpl_enum.boto3_dataclass__package__aio_py
+        self.build_by_template(path, tpl)
+
     def build_pyproject_toml(self):
         """
         Build the ``pyproject.toml`` configuration file from template.
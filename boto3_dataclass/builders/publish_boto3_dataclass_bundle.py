@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+"""
+Builder for a self-contained bundle package from an allowlist of
+``service.operation`` names, e.g.::
+
+    ["s3.list_objects_v2", "sqs.receive_message", "dynamodb.query"]
+
+Only the caster methods of the allowlist and the closure of the output types
+they reach are generated, every class keeps all its fields, see
+:func:`~boto3_dataclass.models.usage.make_bundle_modules`. The layout is the
+one of :mod:`~boto3_dataclass.builders.publish_boto3_dataclass_slim`, with a
+``pyproject.toml`` so that it can be built into a wheel::
+
+    build
+    |-- repos
+        |-- ${package_name}-project
+            |-- pyproject.toml
+            |-- README.rst
+            |-- LICENSE.txt
+            |-- ${package_name}
+                |-- __init__.py
+                |-- s3
+                    |-- __init__.py
+                    |-- caster.py
+                    |-- type_defs.py
+
+The class names of different services collide (e.g. ``Tag``), so the bundle
+is one package with a sub package per service rather than one module.
+"""
+
+import typing as T
+import dataclasses
+
+from .._version import __version__
+from ..templates.api import tpl_enum
+from ..structures.api import PyProjectStructure
+from ..models.typed_dict import TypedDefsModule
+from ..models.caster import CasterModule
+from ..models.usage import UsageManifest, make_bundle_modules
+
+from .publish_boto3_dataclass_service import T_PARSER_BACKEND
+from .publish_boto3_dataclass_slim import SlimReport, Boto3DataclassSlimBuilder
+
+
+@dataclasses.dataclass
+class Boto3DataclassBundleBuilder(Boto3DataclassSlimBuilder):
+    """
+    Builder for a self-contained bundle package.
+
+    :param manifest: The operations of the allowlist, without classes, see
+        :meth:`~boto3_dataclass.models.usage.UsageManifest.from_allowlist`
+    """
+
+    @classmethod
+    def new(
+        cls,
+        package_name: str,
+        allowlist: T.Iterable[str],
+        version: str = __version__,
+        parser_backend: T_PARSER_BACKEND = "stub",
+        compact: bool = False,
+    ) -> "Boto3DataclassBundleBuilder":
+        """
+        :param package_name: e.g. ``my_app_boto3_dataclass``
+        :param allowlist: the ``service.operation`` names, the operation is
+            the client method name or the botocore operation name
+        """
+        return cls(
+            version=version,
+            structure=PyProjectStructure(package_name=package_name),
+            manifest=UsageManifest.from_allowlist(allowlist),
+            parser_backend=parser_backend,
+            compact=compact,
+        )
+
+    @property
+    def operations(self) -> list[str]:
+        """
+        The sorted ``service.operation`` names of the allowlist.
+        """
+        return sorted(
+            f"{service_name}.{operation}"
+            for service_name, usage in self.manifest.services.items()
+            for operation in usage.operations
+        )
+
+    def build_all(self) -> SlimReport:
+        """
+        Build the bundle package.
+
+        :returns: what the bundle keeps of the full service packages
+
+        :raises ValueError: if an operation of the allowlist does not exist,
+            the whole allowlist is checked before anything is written
+        """
+        report = super().build_all()
+        self.build_pyproject_toml()
+        self.build_README_rst()
+        self.build_LICENSE_txt()
+        return report
+
+    def build_init_py(self):
+        path = self.structure.path_init_py
+        tpl = tpl_enum.boto3_dataclass_bundle__package____init___py
+        self.build_by_template(path, tpl)
+
+    def build_pyproject_toml(self):
+        path = self.structure.path_pyproject_toml
+        tpl = tpl_enum.boto3_dataclass_bundle__pyproject_toml
+        self.build_by_template(path, tpl)
+
+    def build_README_rst(self):
+        path = self.structure.path_README_rst
+        tpl = tpl_enum.boto3_dataclass_bundle__README_rst
+        self.build_by_template(path, tpl)
+
+    def build_LICENSE_txt(self):
+        path = self.structure.path_LICENSE_txt
+        tpl = tpl_enum.common__LICENSE_txt
+        self.build_by_template(path, tpl)
+
+    def make_modules(
+        self,
+        tdm: TypedDefsModule,
+        cm: CasterModule,
+        service_name: str,
+    ) -> tuple[TypedDefsModule, CasterModule]:
+        return make_bundle_modules(
+            tdm=tdm,
+            cm=cm,
+            operations=self.manifest.services[service_name].operations,
+        )
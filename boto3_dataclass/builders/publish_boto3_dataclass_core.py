@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+
+"""
+Builder for the ``boto3_dataclass_core`` package, the dataclasses that are
+structurally identical across the service packages, e.g. ``ResponseMetadata``
+and ``Tag``, are generated once in it and the service packages import them::
+
+    # boto3_dataclass_iam/type_defs.py
+    from boto3_dataclass_core.type_defs import (
+        ResponseMetadata as ResponseMetadata,
+        Tag as Tag,
+    )
+
+The name in the service package doesn't change, so the per-service API stays
+the same. A process that uses 20 services loads these classes once instead
+of 20 times.
+
+A shape goes to the core package when its structural hash (see
+:mod:`boto3_dataclass.models.structural`) appears in at least
+``min_services`` services. The nested shapes of a shared shape are shared
+too, so the core package never imports a service package.
+
+The mapping ``{structural hash: core TypedDict name}`` is saved as a
+:class:`CoreIndex` in ``build/core/${version}.json``, the service builders
+read it when ``use_core`` is set.
+"""
+
+import typing as T
+import json
+import dataclasses
+from pathlib import Path
+from collections import Counter
+
+import mpire
+
+from .._version import __version__
+from ..constants import TYPE_DEF, CORE_PACKAGE_NAME
+from ..paths import path_enum
+from ..utils import black_format_code, write
+from ..templates.api import tpl_enum
+from ..structures.api import PyProjectStructure
+from ..models.typed_dict import (
+    TypedDictFieldAnnotation,
+    TypedDictField,
+    TypedDictDef,
+    TypedDefsModule,
+)
+from ..models.structural import get_structural_hashes
+
+from .publish_pyproject import PyProjectBuilder
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from .publish_boto3_dataclass_service import Boto3DataclassServiceBuilder
+
+# the core classes come from many services, there is no single stub module
+# for the ``boto3_raw_data`` annotation
+CORE_TYPE_DEFS_LINE = "type_defs = T.Any"
+
+
+@dataclasses.dataclass
+class CoreIndex:
+    """
+    The shapes in the ``boto3_dataclass_core`` package of a version.
+
+    :param version: the package version of the build
+    :param shapes: ``{structural hash: TypedDict name in the core package}``
+    """
+
+    version: str = dataclasses.field()
+    shapes: dict[str, str] = dataclasses.field(default_factory=dict)
+
+    @staticmethod
+    def get_dir() -> Path:
+        return path_enum.dir_build / "core"
+
+    @property
+    def path(self) -> Path:
+        return self.get_dir() / f"{self.version}.json"
+
+    def write(self):
+        write(self.path, json.dumps(dataclasses.asdict(self), indent=4))
+
+    @classmethod
+    def read(cls, version: str) -> "CoreIndex":
+        path = cls(version=version).path
+        if not path.exists():
+            raise FileNotFoundError(
+                f"{path} not found, build the {CORE_PACKAGE_NAME} package first"
+            )
+        return cls(**json.loads(path.read_text(encoding="utf-8")))
+
+
+def _get_core_name(names: list[str]) -> str:
+    """
+    The most common name of a shape across the services, then the shortest.
+    """
+    counter = Counter(names)
+    return min(counter, key=lambda name: (-counter[name], len(name), name))
+
+
+def make_core_module(
+    service_tdms: dict[str, TypedDefsModule],
+    min_services: int = 2,
+) -> tuple[TypedDefsModule, CoreIndex]:
+    """
+    Find the shapes that are structurally identical in at least
+    ``min_services`` services and make the core module of them.
+
+    :param service_tdms: ``{service name: the type_defs module}``, after the
+        tree shaking and the dedup, like the builder generates them
+
+    :returns: the core module and the index, the version of the index is
+        not set
+    """
+    # {hash: {service name: TypedDictDef}}
+    occurrences: dict[str, dict[str, TypedDictDef]] = dict()
+    service_hashes = dict()
+    for service_name in sorted(service_tdms):
+        tdm = service_tdms[service_name]
+        hashes = get_structural_hashes(tdm.tdds, tdm.aliases)
+        service_hashes[service_name] = hashes
+        for tdd in tdm.tdds:
+            occurrences.setdefault(hashes[tdd.name], {}).setdefault(service_name, tdd)
+    shared = {
+        h: tdds_by_service
+        for h, tdds_by_service in occurrences.items()
+        if len(tdds_by_service) >= min_services
+    }
+
+    # name the core shapes, a name used by more than one shape gets the hash
+    preferred = {
+        h: _get_core_name([tdd.name for tdd in tdds_by_service.values()])
+        for h, tdds_by_service in shared.items()
+    }
+    counter = Counter(preferred.values())
+    shapes = dict()
+    for h, name in preferred.items():
+        if counter[name] > 1:
+            name = f"{name.removesuffix(TYPE_DEF)}_{h[:8]}{TYPE_DEF}"
+        shapes[h] = name
+
+    # rewrite the nested targets to the core names, a shape with a nested
+    # target outside the core (e.g. a type from another module) stays in
+    # the service packages
+    while True:
+        tdds = dict()
+        for h, tdds_by_service in shared.items():
+            if h not in shapes:
+                continue
+            service_name, tdd = next(iter(tdds_by_service.items()))
+            hashes = service_hashes[service_name]
+            aliases = service_tdms[service_name].aliases
+            fields = list()
+            for tdf in tdd.fields:
+                anno = tdf.anno
+                if anno.is_nested_typed_dict:
+                    target = aliases.get(anno.nested_type_name, anno.nested_type_name)
+                    nested_type_name = shapes.get(hashes.get(target))
+                    if nested_type_name is None:
+                        break
+                    anno = TypedDictFieldAnnotation(
+                        is_nested_typed_dict=True,
+                        nested_type_name=nested_type_name,
+                        nested_type_subscriptor=anno.nested_type_subscriptor,
+                    )
+                fields.append(TypedDictField(name=tdf.name, anno=anno))
+            else:
+                tdds[h] = TypedDictDef(name=shapes[h], fields=fields)
+        if len(tdds) == len(shapes):
+            break
+        shapes = {h: name for h, name in shapes.items() if h in tdds}
+
+    core_tdm = TypedDefsModule(tdds=sorted(tdds.values(), key=lambda tdd: tdd.name))
+    return core_tdm, CoreIndex(version="", shapes=shapes)
+
+
+@dataclasses.dataclass
+class ServiceCoreSize:
+    """
+    The ``type_defs.py`` of one service without and with the core package.
+
+    :param classes_moved: number of dataclasses imported from the core package
+    """
+
+    service_name: str = dataclasses.field()
+    bytes_before: int = dataclasses.field(default=0)
+    bytes_after: int = dataclasses.field(default=0)
+    classes_moved: int = dataclasses.field(default=0)
+
+
+@dataclasses.dataclass
+class CoreReport:
+    """
+    How many bytes the core package saves across all service packages. The
+    sizes are measured on the rendered code before black formatting.
+
+    :param core_bytes: the ``type_defs.py`` of the core package
+    :param core_classes: number of dataclasses in the core package
+    """
+
+    version: str = dataclasses.field()
+    core_bytes: int = dataclasses.field(default=0)
+    core_classes: int = dataclasses.field(default=0)
+    services: list[ServiceCoreSize] = dataclasses.field(default_factory=list)
+
+    @property
+    def bytes_before(self) -> int:
+        return sum(service.bytes_before for service in self.services)
+
+    @property
+    def bytes_after(self) -> int:
+        return sum(service.bytes_after for service in self.services) + self.core_bytes
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    @property
+    def path(self) -> Path:
+        return CoreIndex.get_dir() / f"{self.version}-report.json"
+
+    def write(self):
+        data = dataclasses.asdict(self)
+        data["bytes_saved"] = self.bytes_saved
+        write(self.path, json.dumps(data, indent=4))
+
+    def summary(self, top: int = 10) -> str:
+        lines = [
+            f"{CORE_PACKAGE_NAME}: {self.core_classes} classes, {self.core_bytes} bytes",
+            f"{len(self.services)} service packages: "
+            f"{self.bytes_before} -> {self.bytes_after} bytes including the core "
+            f"package, {self.bytes_saved} bytes saved "
+            f"({self.bytes_saved / max(self.bytes_before, 1):.1%})",
+        ]
+        services = sorted(
+            self.services,
+            key=lambda service: service.bytes_after - service.bytes_before,
+        )
+        for service in services[:top]:
+            lines.append(
+                f"- {service.service_name}: {service.classes_moved} classes moved, "
+                f"{service.bytes_before} -> {service.bytes_after} bytes"
+            )
+        return "\n".join(lines)
+
+
+def make_core_report(
+    version: str,
+    service_tdms: dict[str, TypedDefsModule],
+    core_tdm: TypedDefsModule,
+    index: CoreIndex,
+) -> CoreReport:
+    report = CoreReport(
+        version=version,
+        core_bytes=len(core_tdm.gen_code(type_defs_line=CORE_TYPE_DEFS_LINE).encode()),
+        core_classes=len(core_tdm.tdds),
+    )
+    for service_name, tdm in service_tdms.items():
+        type_defs_line = f"from mypy_boto3_{service_name} import type_defs"
+        core_tdm_ = tdm.use_core(index.shapes)
+        report.services.append(
+            ServiceCoreSize(
+                service_name=service_name,
+                bytes_before=len(tdm.gen_code(type_defs_line=type_defs_line).encode()),
+                bytes_after=len(
+                    core_tdm_.gen_code(type_defs_line=type_defs_line).encode()
+                ),
+                classes_moved=len(core_tdm_.core_imports),
+            )
+        )
+    return report
+
+
+@dataclasses.dataclass
+class Boto3DataclassCoreBuilder(PyProjectBuilder):
+    """
+    Builder for the ``boto3_dataclass_core`` package.
+
+    :param version: Package version (inherited from PyProjectBuilder)
+    :param structure: The structure of the core package
+    :param tdm: The core ``type_defs`` module, see :func:`make_core_module`
+    :param index: The shapes in the core package, by structural hash
+
+    Example package structure::
+
+        build
+        |-- repos
+            |-- boto3_dataclass_core-project
+                |-- boto3_dataclass_core
+                    |-- __init__.py
+                    |-- type_defs.py
+                |-- LICENSE.txt
+                |-- README.rst
+                |-- pyproject.toml
+    """
+
+    structure: PyProjectStructure = dataclasses.field()
+    tdm: TypedDefsModule = dataclasses.field(default_factory=TypedDefsModule)
+    index: CoreIndex = dataclasses.field(default=None)
+
+    @classmethod
+    def new(
+        cls,
+        service_tdms: dict[str, TypedDefsModule],
+        version: str = __version__,
+        min_services: int = 2,
+    ) -> "Boto3DataclassCoreBuilder":
+        """
+        :param service_tdms: ``{service name: the type_defs module}``
+        :param min_services: a shape goes to the core package when it is in
+            at least this many services
+        """
+        tdm, index = make_core_module(service_tdms, min_services=min_services)
+        index.version = version
+        return cls(
+            version=version,
+            structure=PyProjectStructure(package_name=CORE_PACKAGE_NAME),
+            tdm=tdm,
+            index=index,
+        )
+
+    @staticmethod
+    def parallel_prepare_type_defs_modules(
+        builders: list["Boto3DataclassServiceBuilder"],
+        n_workers: int | None = None,
+    ) -> dict[str, TypedDefsModule]:
+        """
+        Parse the type_defs modules of the services in parallel, like the
+        service builders generate them.
+        """
+
+        def main(builder: "Boto3DataclassServiceBuilder"):
+            return builder.structure.service_name, builder.prepare_type_defs_module()
+
+        with mpire.WorkerPool(n_jobs=n_workers, start_method="fork") as pool:
+            results = pool.map(main, [{"builder": builder} for builder in builders])
+        return dict(results)
+
+    def build_all(self):
+        """
+        Build the core package and save the :class:`CoreIndex`.
+        """
+        self.structure.remove_dir()
+        self.build_init_py()
+        self.build_type_defs_py()
+        self.build_pyproject_toml()
+        self.build_README_rst()
+        self.build_LICENSE_txt()
+        self.index.write()
+
+    def build_init_py(self):
+        path = self.structure.path_init_py
+        tpl = tpl_enum.boto3_dataclass_core__package____init___py
+        self.build_by_template(path, tpl)
+
+    def build_type_defs_py(self):
+        path = self.structure.dir_package / "type_defs.py"
+        code = self.tdm.gen_code(type_defs_line=CORE_TYPE_DEFS_LINE)
+        write(path, black_format_code(code))
+
+    def build_pyproject_toml(self):
+        path = self.structure.path_pyproject_toml
+        tpl = tpl_enum.boto3_dataclass_core__pyproject_toml
+        self.build_by_template(path, tpl)
+
+    def build_README_rst(self):
+        path = self.structure.path_README_rst
+        tpl = tpl_enum.boto3_dataclass_core__README_rst
+        self.build_by_template(path, tpl)
+
+    def build_LICENSE_txt(self):
+        path = self.structure.path_LICENSE_txt
+        tpl = tpl_enum.common__LICENSE_txt
+        self.build_by_template(path, tpl)
@@ -18,8 +18,11 @@ The main components include:
 import typing as T
 import time
 import dataclasses
+from pathlib import Path
+from functools import cached_property
 
 import mpire
+from botocore.loaders import Loader
 from tenacity import retry, stop_after_attempt, wait_fixed, wait_chain
 
 from .._version import __version__
@@ -28,12 +31,43 @@ from ..templates.api import tpl_enum
 from ..structures.api import Boto3DataclassServiceStructure
 from ..parsers.api import TypedDefsModuleParser
 from ..parsers.api import ClientModuleParser
+from ..parsers.api import BotocoreModelParser
+from ..parsers.api import BotocoreTypedDefsModuleParser
+from ..parsers.api import BotocoreClientModuleParser
+from ..models.typed_dict import TypedDefsModule
+from ..models.caster import CasterModule
+from ..models.reachability import TypeReachabilityGraph
 
 from .publish_pyproject import PyProjectBuilder
+from .shard import ShardSpec, select_shard, ShardManifest, get_path_shard_manifest
+from .smoke_import import (
+    SmokeImportReport,
+    run_smoke_import_all,
+    get_path_smoke_import_report,
+)
+from .size_report import (
+    SizeBudget,
+    SizeReport,
+    get_path_shard_size_report,
+    record_size_report,
+    record_wheel_sizes,
+)
+from .bytecode import add_bytecode_to_wheel
+from .publish_boto3_dataclass_core import (
+    CoreIndex,
+    CoreReport,
+    Boto3DataclassCoreBuilder,
+    make_core_report,
+)
 
 if T.TYPE_CHECKING:  # pragma: no cover
     from ..pypi import T_PACKAGE_STATUS_INFO
 
+T_PARSER_BACKEND = T.Literal[
+    "stub",  # AST parse the mypy_boto3_${service_name}/*.pyi stub files
+    "botocore",  # load the botocore service-2.json service model
+]
+
 
 @dataclasses.dataclass
 class Boto3DataclassServiceBuilder(PyProjectBuilder):
@@ -49,6 +83,27 @@ class Boto3DataclassServiceBuilder(PyProjectBuilder):
 
     :param version: Package version (inherited from PyProjectBuilder)
     :param structure: The service structure containing paths and metadata for the package
+    :param parser_backend: Where to parse the type definitions and client methods
+        from, ``"stub"`` (mypy-boto3 stub files) or ``"botocore"`` (botocore
+        service models). Both produce the same intermediate representation,
+        see :mod:`boto3_dataclass.parsers.parity`.
+    :param compact: Generate ``type_defs.py`` in the compact mode, every
+        dataclass is declared by a ``_fields`` table and a shared base class
+        installs the fields, see
+        :meth:`~boto3_dataclass.models.typed_dict.TypedDefsModule.gen_code`.
+        Smaller module and faster import, but no static field completion in IDE.
+    :param keep_all_types: Generate a dataclass for every TypedDict in
+        ``type_defs.pyi``. By default only the types that a caster method can
+        return (directly or nested) are generated, the request only types are
+        removed, see :class:`~boto3_dataclass.models.reachability.TypeReachabilityGraph`.
+    :param dedup: Generate one dataclass for the structurally identical
+        TypedDicts, e.g. ``TagTypeDef`` and ``TagOutputTypeDef``, the others
+        are aliases of it, see
+        :meth:`~boto3_dataclass.models.typed_dict.TypedDefsModule.dedup`.
+    :param use_core: Import the dataclasses that are structurally identical
+        across services from the ``boto3_dataclass_core`` package instead of
+        generating them, the core package of the same version has to be built
+        first, see :mod:`boto3_dataclass.builders.publish_boto3_dataclass_core`.
 
     Example:
         >>> structure = Boto3DataclassServiceStructure.new("s3")
@@ -72,6 +127,11 @@ class Boto3DataclassServiceBuilder(PyProjectBuilder):
     """
 
     structure: "Boto3DataclassServiceStructure" = dataclasses.field()
+    parser_backend: T_PARSER_BACKEND = dataclasses.field(default="stub")
+    compact: bool = dataclasses.field(default=False)
+    keep_all_types: bool = dataclasses.field(default=False)
+    dedup: bool = dataclasses.field(default=True)
+    use_core: bool = dataclasses.field(default=False)
 
     def log(self, ith: int | None = None):
         """
@@ -111,27 +171,111 @@ class Boto3DataclassServiceBuilder(PyProjectBuilder):
         self.build_README_rst()
         self.build_LICENSE_txt()
 
+    @cached_property
+    def botocore_loader(self) -> Loader:
+        """
+        The botocore loader shared by both botocore parsers, so the service
+        model is only loaded once per build.
+        """
+        return Loader()
+
+    def parse_type_defs_module(self) -> TypedDefsModule:
+        """
+        Parse all TypedDict definitions of the service with the configured
+        parser backend.
+        """
+        if self.parser_backend == "stub":
+            # Parse mypy_boto3_{service_name}/type_defs.pyi stub file
+            path_stub_file = self.structure.path_mypy_boto3_type_defs_pyi
+            tdm_parser = TypedDefsModuleParser(path_stub_file=path_stub_file)
+        elif self.parser_backend == "botocore":
+            tdm_parser = BotocoreTypedDefsModuleParser(
+                service_name=self.structure.service_name,
+                loader=self.botocore_loader,
+            )
+        else:  # pragma: no cover
+            raise ValueError(f"Unknown parser backend: {self.parser_backend!r}")
+        return tdm_parser.parse()
+
+    def parse_client_module(self) -> CasterModule:
+        """
+        Parse all client methods that return a TypedDict with the configured
+        parser backend.
+        """
+        if self.parser_backend == "stub":
+            # Parse mypy-boto3 client stub file for operation signatures
+            path_stub_file = self.structure.path_mypy_boto3_client_pyi
+            cm_parser = ClientModuleParser(path_stub_file=path_stub_file)
+        elif self.parser_backend == "botocore":
+            cm_parser = BotocoreClientModuleParser(
+                service_name=self.structure.service_name,
+                loader=self.botocore_loader,
+            )
+        else:  # pragma: no cover
+            raise ValueError(f"Unknown parser backend: {self.parser_backend!r}")
+        cm = cm_parser.parse()
+        if self.parser_backend == "stub":
+            # the stub doesn't have the botocore operation name for caster.cast(),
+            # best effort, a stub service that botocore doesn't have keeps
+            # operation_name=None
+            try:
+                BotocoreModelParser(
+                    service_name=self.structure.service_name,
+                    loader=self.botocore_loader,
+                ).set_operation_names(cm)
+            except ValueError:
+                pass
+        return cm
+
+    @cached_property
+    def client_module(self) -> CasterModule:
+        """
+        The result of :meth:`parse_client_module`, so the client methods are
+        only parsed once per build, both the tree shaking and ``caster.py``
+        use them.
+        """
+        return self.parse_client_module()
+
+    def prepare_type_defs_module(self) -> TypedDefsModule:
+        """
+        Parse the type definitions and apply the tree shaking and the dedup
+        as configured, the core package is built from these modules.
+
+        1. Parses the mypy-boto3 type_defs.pyi stub file (or the botocore
+            service model, see ``parser_backend``)
+        2. Removes the types that no caster method can return, unless
+            ``keep_all_types`` is set
+        3. Merges the structurally identical types, if ``dedup`` is set
+        """
+        tdm = self.parse_type_defs_module()
+        if self.keep_all_types is False:
+            graph = TypeReachabilityGraph.new(tdm=tdm, cm=self.client_module)
+            tdm = graph.shake(tdm)
+        if self.dedup:
+            tdm = tdm.dedup()
+        return tdm
+
     def build_type_defs_py(self):
         """
         Build type definitions module by parsing mypy-boto3 type stubs.
 
         This method:
 
-        1. Parses the mypy-boto3 type_defs.pyi stub file
-        2. Generates corresponding dataclass definitions
-        3. Formats the code with black
-        4. Writes the final ``type_defs.py`` file
+        1. Prepares the type definitions, see :meth:`prepare_type_defs_module`
+        2. Imports the shared types from the core package, if ``use_core`` is set
+        3. Generates corresponding dataclass definitions
+        4. Formats the code with black
+        5. Writes the final ``type_defs.py`` file
         """
-        # Parse mypy_boto3_{service_name}/type_defs.pyi stub file
-        path_stub_file = self.structure.path_mypy_boto3_type_defs_pyi
-        tdm_parser = TypedDefsModuleParser(path_stub_file=path_stub_file)
-        tdm = tdm_parser.parse()
+        tdm = self.prepare_type_defs_module()
+        if self.use_core:
+            tdm = tdm.use_core(CoreIndex.read(self.version).shapes)
 
         # Generate boto3_dataclass_{service_name}/type_defs.py with import reference
         mypy_package_name = f"mypy_boto3_{self.structure.service_name}"
         type_defs_line = f"from {mypy_package_name} import type_defs"
         path = self.structure.path_boto3_dataclass_type_defs_py
-        code = tdm.gen_code(type_defs_line=type_defs_line)
+        code = tdm.gen_code(type_defs_line=type_defs_line, compact=self.compact)
 
         # Format code with black formatter for consistency
         code = black_format_code(code)
@@ -144,14 +288,12 @@ class Boto3DataclassServiceBuilder(PyProjectBuilder):
 
         This method:
 
-        1. Parses the mypy-boto3 client.pyi stub file
+        1. Parses the mypy-boto3 client.pyi stub file (or the botocore
+            service model, see ``parser_backend``)
         2. Generates caster functions for each service operation
         3. Formats and writes the ``caster.py`` module
         """
-        # Parse mypy-boto3 client stub file for operation signatures
-        path_stub_file = self.structure.path_mypy_boto3_client_pyi
-        cm_parser = ClientModuleParser(path_stub_file=path_stub_file)
-        cm = cm_parser.parse()
+        cm = self.client_module
 
         # Generate caster utilities code
         path = self.structure.path_boto3_dataclass_caster_py
@@ -209,18 +351,38 @@ class Boto3DataclassServiceBuilder(PyProjectBuilder):
     def list_all(
         cls,
         version: str = __version__,
+        parser_backend: T_PARSER_BACKEND = "stub",
+        compact: bool = False,
+        keep_all_types: bool = False,
+        dedup: bool = True,
+        use_core: bool = False,
     ) -> list["Boto3DataclassServiceBuilder"]:
         """
         Create builder instances for all available AWS services.
 
         :param version: Package version to assign to all builders
+        :param parser_backend: Parser backend to assign to all builders
+        :param compact: Whether all builders use the compact mode
+        :param keep_all_types: Whether all builders keep the unreachable types
+        :param dedup: Whether all builders merge the structurally identical types
+        :param use_core: Whether all builders import the shared types from the
+            core package
 
         :returns: List of :class:`Boto3DataclassServiceBuilder` instances,
             one for each AWS service
         """
         structure_list = Boto3DataclassServiceStructure.list_all()
         return [
-            cls(version=version, structure=structure) for structure in structure_list
+            cls(
+                version=version,
+                structure=structure,
+                parser_backend=parser_backend,
+                compact=compact,
+                keep_all_types=keep_all_types,
+                dedup=dedup,
+                use_core=use_core,
+            )
+            for structure in structure_list
         ]
 
     @classmethod
@@ -229,6 +391,12 @@ class Boto3DataclassServiceBuilder(PyProjectBuilder):
         version: str = __version__,
         package_status_info: T.Optional["T_PACKAGE_STATUS_INFO"] = None,
         limit: int | None = None,
+        shard: T.Optional["ShardSpec"] = None,
+        parser_backend: T_PARSER_BACKEND = "stub",
+        compact: bool = False,
+        keep_all_types: bool = False,
+        dedup: bool = True,
+        use_core: bool = False,
     ) -> list["Boto3DataclassServiceBuilder"]:
         """
         List, filter, and sort all available service packages.
@@ -236,29 +404,56 @@ class Boto3DataclassServiceBuilder(PyProjectBuilder):
         :param version: Package version for builders
         :param package_status_info: Dict of package statuses to filter completed packages
         :param limit: Maximum number of packages to process
+        :param shard: If given, only return the packages that belong to this
+            shard. Shards are balanced by the estimated build cost, see
+            :func:`~boto3_dataclass.builders.shard.partition_by_cost`. All
+            services are partitioned before the ``package_status_info`` filter,
+            so the nodes with different status snapshots agree on the shards.
+        :param parser_backend: Parser backend for builders, ``"stub"`` or ``"botocore"``
+        :param compact: Whether the builders use the compact mode
+        :param keep_all_types: Whether the builders keep the unreachable types
+        :param dedup: Whether the builders merge the structurally identical types
+        :param use_core: Whether the builders import the shared types from the
+            core package
         """
         if package_status_info is None:
             package_status_info = {}
 
         # Get all available service packages
-        package_list = cls.list_all(version=version)
-
-        # Filter out packages that are already completed/published
-        filtered_package_list = [
-            package
-            for package in package_list
-            if package_status_info.get(package.structure.package_name_slug, False)
-            is False
-        ]
+        package_list = cls.list_all(
+            version=version,
+            parser_backend=parser_backend,
+            compact=compact,
+            keep_all_types=keep_all_types,
+            dedup=dedup,
+            use_core=use_core,
+        )
 
         # Sort packages alphabetically for consistent processing order
         sorted_package_list = list(
             sorted(
-                filtered_package_list,
+                package_list,
                 key=lambda p: p.structure.package_name_slug,
             ),
         )
 
+        # Only keep the packages of this shard, this has to happen before
+        # filtering and applying the limit so every node sees the same partition
+        if shard is not None:
+            sorted_package_list = select_shard(
+                sorted_package_list,
+                cost_func=lambda p: p.structure.estimated_build_cost,
+                shard=shard,
+            )
+
+        # Filter out packages that are already completed/published
+        sorted_package_list = [
+            package
+            for package in sorted_package_list
+            if package_status_info.get(package.structure.package_name_slug, False)
+            is False
+        ]
+
         # Apply limit if specified
         if limit is not None:
             sorted_package_list = sorted_package_list[:limit]
@@ -274,7 +469,13 @@ class Boto3DataclassServiceBuilder(PyProjectBuilder):
         start_method: str = "fork",
         package_status_info: T.Optional["T_PACKAGE_STATUS_INFO"] = None,
         limit: int | None = None,
-    ):
+        shard: T.Optional["ShardSpec"] = None,
+        parser_backend: T_PARSER_BACKEND = "stub",
+        compact: bool = False,
+        keep_all_types: bool = False,
+        dedup: bool = True,
+        use_core: bool = False,
+    ) -> list["Boto3DataclassServiceBuilder"]:
         """
         Execute a function in parallel across multiple service packages.
 
@@ -287,11 +488,26 @@ class Boto3DataclassServiceBuilder(PyProjectBuilder):
         :param start_method: Multiprocessing start method ("fork" or "threading")
         :param package_status_info: Dict of package statuses to filter completed packages
         :param limit: Maximum number of packages to process
+        :param shard: Only process the packages that belong to this shard
+        :param parser_backend: Parser backend for builders, ``"stub"`` or ``"botocore"``
+        :param compact: Whether the builders use the compact mode
+        :param keep_all_types: Whether the builders keep the unreachable types
+        :param dedup: Whether the builders merge the structurally identical types
+        :param use_core: Whether the builders import the shared types from the
+            core package
+
+        :returns: The list of builders that have been processed
         """
         sorted_package_list = cls.list_filtered_sorted_all(
             version=version,
             package_status_info=package_status_info,
             limit=limit,
+            shard=shard,
+            parser_backend=parser_backend,
+            compact=compact,
+            keep_all_types=keep_all_types,
+            dedup=dedup,
+            use_core=use_core,
         )
         # Create task list with sequence numbers for logging
         tasks = [
@@ -306,6 +522,8 @@ class Boto3DataclassServiceBuilder(PyProjectBuilder):
                 tasks,
             )  # Results not used but kept for potential future use
 
+        return sorted_package_list
+
     @classmethod
     def parallel_build_all(
         cls,
@@ -313,6 +531,14 @@ class Boto3DataclassServiceBuilder(PyProjectBuilder):
         n_workers: int | None = None,
         package_status_info: T.Optional["T_PACKAGE_STATUS_INFO"] = None,
         limit: int | None = None,
+        shard: T.Optional["ShardSpec"] = None,
+        size_budget: T.Optional["SizeBudget"] = None,
+        parser_backend: T_PARSER_BACKEND = "stub",
+        compact: bool = False,
+        keep_all_types: bool = False,
+        dedup: bool = True,
+        use_core: bool = False,
+        min_services: int = 2,
     ):
         """
         Build all boto3 dataclass service packages in parallel.
@@ -320,26 +546,242 @@ class Boto3DataclassServiceBuilder(PyProjectBuilder):
         This method orchestrates parallel building of multiple AWS service packages,
         using multiprocessing to speed up the build process.
 
+        After the build, the size of the generated code is recorded in
+        ``build/size_history/${version}.json``, see
+        :func:`~boto3_dataclass.builders.size_report.record_size_report`.
+        A shard only writes its size report next to its shard manifest, it is
+        recorded by
+        :func:`~boto3_dataclass.builders.size_report.merge_shard_size_report_files`
+        after all shards are done.
+
         :param version: Package version for all built packages
         :param n_workers: Number of worker processes (None for auto-detection)
         :param package_status_info: Dict tracking package completion status
         :param limit: Maximum number of packages to build
+        :param shard: Only build the packages that belong to this shard, then
+            write the shard manifest to ``build/shards/${version}/shard-${i}-of-${N}.json``
+        :param size_budget: If given, fail the build when the generated code
+            grows more than the budget compared to the previous build. Not
+            allowed with ``shard``, the budget of a sharded build is checked
+            when the shard size reports are merged
+        :param parser_backend: Parse the stub files (``"stub"``) or the
+            botocore service models (``"botocore"``)
+        :param compact: Generate ``type_defs.py`` in the compact mode
+        :param keep_all_types: Generate a dataclass for every TypedDict,
+            including the request only types
+        :param dedup: Generate one dataclass for the structurally identical
+            TypedDicts, the others are aliases of it
+        :param use_core: Build the ``boto3_dataclass_core`` package from all
+            services first, then the service packages import the shared
+            dataclasses from it. A shard doesn't build the core package, the
+            shards would all rebuild it in the same directory and parse every
+            service, it only reads the core index built by :meth:`build_core`
+            before the shards run.
+        :param min_services: A dataclass goes to the core package when it is
+            in at least this many services
         """
+        if shard is not None and size_budget is not None:
+            raise ValueError(
+                "the size budget of a sharded build is checked when the shard "
+                "size reports are merged, see merge_shard_size_report_files"
+            )
+        if use_core and shard is not None:
+            # fail before the build if the core package is not built yet
+            CoreIndex.read(version)
+        elif use_core:
+            cls.build_core(
+                version=version,
+                n_workers=n_workers,
+                parser_backend=parser_backend,
+                keep_all_types=keep_all_types,
+                dedup=dedup,
+                min_services=min_services,
+            )
 
         def main(ith: int, package: "Boto3DataclassServiceBuilder"):
             """Worker function that builds a single service package."""
             package.log(ith)  # Log which package is being processed
             package.build_all()  # Execute full build process
 
-        cls._parallel_run(
+        package_list = cls._parallel_run(
             version=version,
             func=main,
             n_workers=n_workers,
             start_method="fork",  # Use fork for CPU-intensive build operations
             package_status_info=package_status_info,
             limit=limit,
+            shard=shard,
+            parser_backend=parser_backend,
+            compact=compact,
+            keep_all_types=keep_all_types,
+            dedup=dedup,
+            use_core=use_core,
         )
 
+        structures = [package.structure for package in package_list]
+        if shard is None:
+            report = record_size_report(
+                version=version,
+                structures=structures,
+                budget=size_budget,
+                n_workers=n_workers,
+            )
+        else:
+            # the manifest covers the whole shard, the services skipped by
+            # package_status_info too, so the shards still merge
+            cls.write_shard_manifest(
+                version=version,
+                shard=shard,
+                package_list=cls.list_filtered_sorted_all(
+                    version=version,
+                    shard=shard,
+                    parser_backend=parser_backend,
+                ),
+            )
+            report = SizeReport.measure(
+                version=version,
+                structures=structures,
+                n_workers=n_workers,
+            )
+            report.write(get_path_shard_size_report(version, shard))
+        print(report.summary(top=10))
+
+    @classmethod
+    def build_core(
+        cls,
+        version: str = __version__,
+        n_workers: int | None = None,
+        parser_backend: T_PARSER_BACKEND = "stub",
+        keep_all_types: bool = False,
+        dedup: bool = True,
+        min_services: int = 2,
+    ) -> "CoreReport":
+        """
+        Build the ``boto3_dataclass_core`` package from all services, save the
+        :class:`~boto3_dataclass.builders.publish_boto3_dataclass_core.CoreIndex`
+        and write the size report to ``build/core/${version}-report.json``.
+
+        :param min_services: A dataclass goes to the core package when it is
+            in at least this many services
+        """
+        builders = cls.list_all(
+            version=version,
+            parser_backend=parser_backend,
+            keep_all_types=keep_all_types,
+            dedup=dedup,
+        )
+        service_tdms = Boto3DataclassCoreBuilder.parallel_prepare_type_defs_modules(
+            builders=builders,
+            n_workers=n_workers,
+        )
+        core_builder = Boto3DataclassCoreBuilder.new(
+            service_tdms=service_tdms,
+            version=version,
+            min_services=min_services,
+        )
+        core_builder.build_all()
+        report = make_core_report(
+            version=version,
+            service_tdms=service_tdms,
+            core_tdm=core_builder.tdm,
+            index=core_builder.index,
+        )
+        report.write()
+        print(report.summary(top=10))
+        return report
+
+    @classmethod
+    def write_shard_manifest(
+        cls,
+        version: str,
+        shard: "ShardSpec",
+        package_list: list["Boto3DataclassServiceBuilder"],
+    ) -> "ShardManifest":
+        """
+        Hash all artifacts generated for this shard and write the shard manifest
+        to ``build/shards/${version}/shard-${i}-of-${N}.json``.
+
+        :param version: Package version for all built packages
+        :param shard: The shard that has been built
+        :param package_list: The builders that belong to this shard
+        """
+        manifest = ShardManifest.new(
+            version=version,
+            shard=shard,
+            builders=package_list,
+        )
+        path = get_path_shard_manifest(version=version, shard=shard)
+        manifest.write(path)
+        print(f"Shard manifest written to: file://{path}")
+        return manifest
+
+    @classmethod
+    def parallel_smoke_import_all(
+        cls,
+        version: str = __version__,
+        n_workers: int | None = None,
+        package_status_info: T.Optional["T_PACKAGE_STATUS_INFO"] = None,
+        limit: int | None = None,
+        shard: T.Optional["ShardSpec"] = None,
+        path_previous_report: Path | None = None,
+        threshold: float = 0.2,
+    ) -> "SmokeImportReport":
+        """
+        Import every generated package in a fresh interpreter after the build,
+        measure the import time and RSS delta, and write the report to
+        ``build/smoke_import/${version}.json``.
+
+        :param version: Package version for all built packages
+        :param n_workers: Max number of concurrent interpreters (None for cpu count)
+        :param package_status_info: Dict tracking package completion status
+        :param limit: Maximum number of packages to import
+        :param shard: Only import the packages that belong to this shard
+        :param path_previous_report: The report of a previous build, if given,
+            print the packages that got slower to import
+        :param threshold: Relative slow down to report, 0.2 means 20% slower
+
+        :raises ImportError: If any generated package fails to import
+        """
+        sorted_package_list = cls.list_filtered_sorted_all(
+            version=version,
+            package_status_info=package_status_info,
+            limit=limit,
+            shard=shard,
+        )
+        report = run_smoke_import_all(
+            version=version,
+            packages=[
+                (package.structure.package_name, package.structure.dir_repo)
+                for package in sorted_package_list
+            ],
+            n_workers=n_workers,
+        )
+        path = get_path_smoke_import_report(
+            version=version,
+            label=None if shard is None else f"shard-{shard.label}",
+        )
+        report.write(path)
+        print(
+            f"Smoke imported {len(report.results)} packages in "
+            f"{report.total_import_time:.3f} seconds (sum), "
+            f"report written to: file://{path}"
+        )
+
+        if path_previous_report is not None:
+            previous = SmokeImportReport.read(path_previous_report)
+            for regression in report.compare(previous, threshold=threshold):
+                print(
+                    f"Import regression {regression.package_name}: "
+                    f"{regression.before} -> {regression.after}"
+                )
+
+        if report.failed:
+            lines = [f"{len(report.failed)} generated packages failed to import:"]
+            for result in report.failed:
+                lines.append(f"- {result.package_name}: {result.error}")
+            raise ImportError("\n".join(lines))
+        return report
+
     @classmethod
     def parallel_poetry_build_all(
         cls,
@@ -347,6 +789,9 @@ class Boto3DataclassServiceBuilder(PyProjectBuilder):
         n_workers: int | None = None,
         package_status_info: T.Optional["T_PACKAGE_STATUS_INFO"] = None,
         limit: int | None = None,
+        shard: T.Optional["ShardSpec"] = None,
+        bytecode: bool = False,
+        bytecode_optimize_levels: T.Sequence[int] = (0, 1, 2),
     ):
         """
         Build all boto3 dataclass service packages with Poetry in parallel.
@@ -355,6 +800,16 @@ class Boto3DataclassServiceBuilder(PyProjectBuilder):
         :param n_workers: Number of worker threads (None for auto-detection)
         :param package_status_info: Dict tracking package upload status
         :param limit: Maximum number of packages to upload
+        :param shard: Only build the packages that belong to this shard
+        :param bytecode: Add the unchecked hash ``.pyc`` of the current
+            interpreter to the wheels, see
+            :func:`~boto3_dataclass.builders.bytecode.add_bytecode_to_wheel`
+        :param bytecode_optimize_levels: The optimization levels of the
+            ``.pyc``, ``1`` and ``2`` are the ``.opt-1.pyc`` and ``.opt-2.pyc``
+            loaded by ``python -O`` and ``python -OO``
+
+        The wheel sizes are added to the size report of the build, see
+        :func:`~boto3_dataclass.builders.size_report.record_wheel_sizes`.
         """
         @retry(stop=stop_after_attempt(3), wait=wait_fixed(10))
         def main(ith: int, package: "Boto3DataclassServiceBuilder"):
@@ -365,14 +820,27 @@ class Boto3DataclassServiceBuilder(PyProjectBuilder):
                 raise ValueError(
                     f"{package.structure.dir_dist} doesn't have exactly 2 files",
                 )
-
-        cls._parallel_run(
+            if bytecode:
+                for path in package.structure.dist_files:
+                    if path.endswith(".whl"):
+                        add_bytecode_to_wheel(
+                            Path(path),
+                            optimize_levels=bytecode_optimize_levels,
+                        )
+
+        package_list = cls._parallel_run(
             version=version,
             func=main,
             n_workers=n_workers,
             start_method="fork",  # Use fork for CPU-intensive build operations
             package_status_info=package_status_info,
             limit=limit,
+            shard=shard,
+        )
+        record_wheel_sizes(
+            version=version,
+            structures=[package.structure for package in package_list],
+            shard=shard,
         )
 
     @classmethod
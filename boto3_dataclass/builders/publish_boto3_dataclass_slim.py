@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+
+"""
+Builder for a slim private package, generated from the usage manifests
+recorded by the ``boto3_dataclass.trace`` module of the meta package.
+
+Only the caster methods, the dataclasses and the fields in the manifests are
+generated, see :func:`~boto3_dataclass.models.usage.make_slim_modules`, the
+other fields are read from the raw dict. One sub package per service::
+
+    build
+    |-- repos
+        |-- ${package_name}-project
+            |-- ${package_name}
+                |-- __init__.py
+                |-- iam
+                    |-- __init__.py
+                    |-- caster.py
+                    |-- type_defs.py
+
+The package has no runtime dependency, copy ``${package_name}/`` into the
+deployment artifact, e.g. a Lambda zip::
+
+    from my_slim_package.iam import caster
+
+    caster.get_role(response).Role.Arn
+"""
+
+import typing as T
+import json
+import keyword
+import dataclasses
+from pathlib import Path
+
+from .._version import __version__
+from ..utils import black_format_code, write
+from ..templates.api import tpl_enum
+from ..structures.api import PyProjectStructure, Boto3DataclassServiceStructure
+from ..models.typed_dict import TypedDefsModule
+from ..models.caster import CasterModule
+from ..models.usage import UsageManifest, make_slim_modules
+
+from .publish_pyproject import PyProjectBuilder
+from .publish_boto3_dataclass_service import (
+    T_PARSER_BACKEND,
+    Boto3DataclassServiceBuilder,
+)
+
+T_SERVICE_MODULES = tuple[TypedDefsModule, CasterModule, TypedDefsModule, CasterModule]
+
+
+def get_sub_package_name(service_name: str) -> str:
+    """
+    The sub package name of a service, e.g. ``sso_admin``, a Python keyword
+    gets an underscore suffix, e.g. ``lambda_``.
+    """
+    name = service_name.replace("-", "_")
+    if keyword.iskeyword(name):
+        name = f"{name}_"
+    return name
+
+
+@dataclasses.dataclass
+class SlimServiceSize:
+    """
+    The generated code of one service, the full package vs the slim one. The
+    sizes are measured on the rendered code before black formatting.
+    """
+
+    service_name: str = dataclasses.field()
+    methods_before: int = dataclasses.field(default=0)
+    methods_after: int = dataclasses.field(default=0)
+    classes_before: int = dataclasses.field(default=0)
+    classes_after: int = dataclasses.field(default=0)
+    fields_before: int = dataclasses.field(default=0)
+    fields_after: int = dataclasses.field(default=0)
+    bytes_before: int = dataclasses.field(default=0)
+    bytes_after: int = dataclasses.field(default=0)
+
+
+@dataclasses.dataclass
+class SlimReport:
+    """
+    What the slim package keeps of the full service packages.
+    """
+
+    package_name: str = dataclasses.field()
+    services: list[SlimServiceSize] = dataclasses.field(default_factory=list)
+
+    @property
+    def bytes_before(self) -> int:
+        return sum(service.bytes_before for service in self.services)
+
+    @property
+    def bytes_after(self) -> int:
+        return sum(service.bytes_after for service in self.services)
+
+    def write(self, path: Path):
+        write(path, json.dumps(dataclasses.asdict(self), indent=4))
+
+    def summary(self) -> str:
+        lines = [
+            f"{self.package_name}: {self.bytes_before} -> {self.bytes_after} bytes "
+            f"({self.bytes_after / max(self.bytes_before, 1):.1%})",
+        ]
+        for service in self.services:
+            lines.append(
+                f"- {service.service_name}: "
+                f"{service.methods_after} of {service.methods_before} methods, "
+                f"{service.classes_after} of {service.classes_before} classes, "
+                f"{service.fields_after} of {service.fields_before} fields, "
+                f"{service.bytes_before} -> {service.bytes_after} bytes"
+            )
+        return "\n".join(lines)
+
+
+@dataclasses.dataclass
+class Boto3DataclassSlimBuilder(PyProjectBuilder):
+    """
+    Builder for a slim private package.
+
+    :param version: Package version (inherited from PyProjectBuilder)
+    :param structure: The structure of the slim package
+    :param manifest: The merged usage manifest
+    :param parser_backend: See :class:`Boto3DataclassServiceBuilder`
+    :param compact: Generate ``type_defs.py`` in the compact mode
+    """
+
+    structure: PyProjectStructure = dataclasses.field()
+    manifest: UsageManifest = dataclasses.field(default_factory=UsageManifest)
+    parser_backend: T_PARSER_BACKEND = dataclasses.field(default="stub")
+    compact: bool = dataclasses.field(default=False)
+
+    @classmethod
+    def new(
+        cls,
+        package_name: str,
+        paths: T.Iterable[Path],
+        version: str = __version__,
+        parser_backend: T_PARSER_BACKEND = "stub",
+        compact: bool = False,
+    ) -> "Boto3DataclassSlimBuilder":
+        """
+        :param package_name: e.g. ``my_app_boto3_dataclass``
+        :param paths: the usage manifest files, e.g. one per sampled process,
+            they are merged
+        """
+        return cls(
+            version=version,
+            structure=PyProjectStructure(package_name=package_name),
+            manifest=UsageManifest.merge(UsageManifest.read(path) for path in paths),
+            parser_backend=parser_backend,
+            compact=compact,
+        )
+
+    @property
+    def service_names(self) -> list[str]:
+        """
+        The sub package names, e.g. ``["iam", "lambda_", "sso_admin"]``.
+        """
+        return sorted(
+            get_sub_package_name(service_name)
+            for service_name in self.manifest.services
+        )
+
+    def build_all(self) -> SlimReport:
+        """
+        Build the slim package.
+
+        Every service is parsed and reduced first, if any of them fails, e.g.
+        an operation not in the service, a ``ValueError`` listing all the
+        errors is raised and nothing on disk is touched.
+
+        :returns: what the slim package keeps of the full service packages
+        """
+        modules_mapping = dict()
+        errors = list()
+        for service_name in sorted(self.manifest.services):
+            try:
+                modules_mapping[service_name] = self.prepare_service(service_name)
+            except (ValueError, FileNotFoundError) as e:
+                errors.append(f"{service_name}: {e}")
+        if errors:
+            raise ValueError("\n".join(errors))
+
+        self.structure.remove_dir()
+        self.build_init_py()
+        report = SlimReport(package_name=self.structure.package_name)
+        for service_name, modules in modules_mapping.items():
+            report.services.append(self.build_service(service_name, modules))
+        return report
+
+    def build_init_py(self):
+        path = self.structure.path_init_py
+        tpl = tpl_enum.boto3_dataclass_slim__package____init___py
+        self.build_by_template(path, tpl)
+
+    def make_modules(
+        self,
+        tdm: TypedDefsModule,
+        cm: CasterModule,
+        service_name: str,
+    ) -> tuple[TypedDefsModule, CasterModule]:
+        """
+        Reduce the full modules of a service to the generated ones.
+        """
+        return make_slim_modules(
+            tdm=tdm,
+            cm=cm,
+            usage=self.manifest.services[service_name],
+        )
+
+    def prepare_service(
+        self,
+        service_name: str,
+    ) -> "T_SERVICE_MODULES":
+        """
+        Parse the full modules of a service and reduce them, nothing is written.
+
+        :param service_name: the service name in the manifest
+
+        :returns: ``(tdm, cm, slim_tdm, slim_cm)``
+        """
+        builder = Boto3DataclassServiceBuilder(
+            version=self.version,
+            structure=Boto3DataclassServiceStructure.new(
+                service_name.replace("-", "_")
+            ),
+            parser_backend=self.parser_backend,
+        )
+        tdm = builder.prepare_type_defs_module()
+        cm = builder.client_module
+        slim_tdm, slim_cm = self.make_modules(tdm=tdm, cm=cm, service_name=service_name)
+        return tdm, cm, slim_tdm, slim_cm
+
+    def build_service(
+        self,
+        service_name: str,
+        modules: T.Optional["T_SERVICE_MODULES"] = None,
+    ) -> SlimServiceSize:
+        """
+        Build the ``${package_name}/${sub_package_name}/`` sub package, see
+        :func:`get_sub_package_name`.
+
+        :param service_name: the service name in the manifest
+        :param modules: the output of :meth:`prepare_service`, prepared on the
+            fly if not given
+        """
+        if modules is None:
+            modules = self.prepare_service(service_name)
+        tdm, cm, slim_tdm, slim_cm = modules
+
+        type_defs_line = f"from mypy_boto3_{cm.service_name} import type_defs"
+        code = tdm.gen_code(type_defs_line=type_defs_line, compact=self.compact)
+        slim_code = slim_tdm.gen_code(
+            type_defs_line=type_defs_line,
+            compact=self.compact,
+        )
+        dir_service = self.structure.dir_package / get_sub_package_name(service_name)
+        write(dir_service / "type_defs.py", black_format_code(slim_code))
+        write(dir_service / "caster.py", black_format_code(slim_cm.gen_code()))
+        tpl = tpl_enum.boto3_dataclass_slim__package__service____init___py
+        write(dir_service / "__init__.py", tpl.render(service_name=cm.service_name))
+        return SlimServiceSize(
+            service_name=service_name,
+            methods_before=len(cm.cms),
+            methods_after=len(slim_cm.cms),
+            classes_before=len(tdm.tdds),
+            classes_after=len(slim_tdm.tdds),
+            fields_before=sum(len(tdd.fields) for tdd in tdm.tdds),
+            fields_after=sum(len(tdd.fields) for tdd in slim_tdm.tdds),
+            bytes_before=len(code.encode()) + len(cm.gen_code().encode()),
+            bytes_after=len(slim_code.encode()) + len(slim_cm.gen_code().encode()),
+        )
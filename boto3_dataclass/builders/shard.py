@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+
+"""
+Shard-aware multi-node build support.
+
+Rebuilding all 400+ service packages on a single machine is slow, so the build
+can be split into ``N`` shards that run on different nodes (or as ``N``
+processes on one box). Each shard:
+
+1. Selects its services with :func:`select_shard`, which balances the shards by
+   estimated build cost (stub file size) instead of by service count.
+2. Builds them as usual.
+3. Writes a :class:`ShardManifest` listing every generated artifact and its
+   sha256 hash.
+4. Writes the size report of its services, see
+   :func:`~boto3_dataclass.builders.size_report.get_path_shard_size_report`.
+
+Once all shards are done, :func:`merge_shard_manifests` validates that the union
+of all shard manifests covers every service exactly once.
+
+Example::
+
+    # on node 1 .. 4 (or 4 processes on the same machine)
+    $ python scripts/s02_build_all.py --shard 1/4
+    ...
+    $ python scripts/s02_build_all.py --shard 4/4
+
+    # after all shards are finished
+    $ python scripts/s03_merge_shard_manifests.py
+"""
+
+import typing as T
+import json
+import hashlib
+import dataclasses
+from pathlib import Path
+
+from ..paths import path_enum
+from ..utils import write
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from .publish_boto3_dataclass_service import Boto3DataclassServiceBuilder
+
+T_ITEM = T.TypeVar("T_ITEM")
+
+
+@dataclasses.dataclass(frozen=True)
+class ShardSpec:
+    """
+    Identify one shard out of ``total`` shards.
+
+    :param index: 1-based shard index, ``1 <= index <= total``
+    :param total: total number of shards
+    """
+
+    index: int = dataclasses.field()
+    total: int = dataclasses.field()
+
+    def __post_init__(self):
+        if self.total < 1:
+            raise ValueError(f"shard total must be >= 1, got {self.total}")
+        if not (1 <= self.index <= self.total):
+            raise ValueError(
+                f"shard index must be in [1, {self.total}], got {self.index}"
+            )
+
+    @classmethod
+    def parse(cls, s: str) -> "ShardSpec":
+        """
+        Parse the ``--shard i/N`` command line notation, for example ``"2/4"``.
+        """
+        try:
+            index, total = s.split("/")
+            return cls(index=int(index), total=int(total))
+        except ValueError as e:
+            raise ValueError(f"Invalid shard spec {s!r}, expected 'i/N': {e}")
+
+    @property
+    def label(self) -> str:
+        """
+        File name friendly representation, for example ``"2-of-4"``.
+        """
+        return f"{self.index}-of-{self.total}"
+
+
+def partition_by_cost(
+    items: T.Sequence[T_ITEM],
+    cost_func: T.Callable[[T_ITEM], int],
+    total: int,
+) -> list[list[T_ITEM]]:
+    """
+    Split ``items`` into ``total`` buckets with roughly equal total cost.
+
+    It uses the greedy "longest processing time first" algorithm: items are
+    visited from the most to the least expensive and each one goes to the
+    bucket with the lowest accumulated cost. The result only depends on the
+    input order and costs, so every node computes the same partition.
+
+    :param items: the items to partition, usually sorted by name
+    :param cost_func: return the estimated cost of an item
+    :param total: number of buckets
+    """
+    costs = [cost_func(item) for item in items]
+    # sort by cost descending, use the original position as a stable tie-breaker
+    order = sorted(range(len(items)), key=lambda i: (-costs[i], i))
+    buckets: list[list[int]] = [[] for _ in range(total)]
+    loads = [0] * total
+    for i in order:
+        # the bucket with the lowest load, the lowest bucket index wins a tie
+        j = min(range(total), key=lambda k: (loads[k], k))
+        buckets[j].append(i)
+        loads[j] += costs[i]
+    # keep the original order inside each bucket
+    return [[items[i] for i in sorted(bucket)] for bucket in buckets]
+
+
+def select_shard(
+    items: T.Sequence[T_ITEM],
+    cost_func: T.Callable[[T_ITEM], int],
+    shard: ShardSpec,
+) -> list[T_ITEM]:
+    """
+    Return the items that belong to the given shard.
+    """
+    return partition_by_cost(items, cost_func, shard.total)[shard.index - 1]
+
+
+def sha256_file(path: Path) -> str:
+    """
+    Compute the sha256 hex digest of a file.
+    """
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def get_dir_shard_manifests(version: str) -> Path:
+    """
+    Example: ``build/shards/1.40.0``
+    """
+    return path_enum.dir_build / "shards" / version
+
+
+def get_path_shard_manifest(version: str, shard: ShardSpec) -> Path:
+    """
+    Example: ``build/shards/1.40.0/shard-2-of-4.json``
+    """
+    return get_dir_shard_manifests(version) / f"shard-{shard.label}.json"
+
+
+@dataclasses.dataclass
+class ShardManifest:
+    """
+    The list of artifacts produced by one shard.
+
+    :param version: the package version being built
+    :param shard_index: 1-based shard index
+    :param shard_total: total number of shards
+    :param estimated_cost: sum of the estimated cost of all services in this shard
+    :param services: ``{service_name: {relative_path: sha256}}``, the relative
+        path is relative to the service package repo directory.
+    """
+
+    version: str = dataclasses.field()
+    shard_index: int = dataclasses.field()
+    shard_total: int = dataclasses.field()
+    estimated_cost: int = dataclasses.field(default=0)
+    services: dict[str, dict[str, str]] = dataclasses.field(default_factory=dict)
+
+    @property
+    def shard(self) -> ShardSpec:
+        return ShardSpec(index=self.shard_index, total=self.shard_total)
+
+    @classmethod
+    def new(
+        cls,
+        version: str,
+        shard: ShardSpec,
+        builders: list["Boto3DataclassServiceBuilder"],
+    ) -> "ShardManifest":
+        """
+        Hash every file generated for the given builders.
+        """
+        services = dict()
+        estimated_cost = 0
+        for builder in builders:
+            structure = builder.structure
+            estimated_cost += structure.estimated_build_cost
+            artifacts = dict()
+            if structure.dir_repo.exists():
+                for path in sorted(structure.dir_repo.rglob("*")):
+                    if path.is_file() and "__pycache__" not in path.parts:
+                        relpath = path.relative_to(structure.dir_repo).as_posix()
+                        artifacts[relpath] = sha256_file(path)
+            services[structure.service_name] = artifacts
+        return cls(
+            version=version,
+            shard_index=shard.index,
+            shard_total=shard.total,
+            estimated_cost=estimated_cost,
+            services=services,
+        )
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, T.Any]) -> "ShardManifest":
+        return cls(**data)
+
+    def write(self, path: Path):
+        write(path, json.dumps(self.to_dict(), indent=2))
+
+    @classmethod
+    def read(cls, path: Path) -> "ShardManifest":
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+def merge_shard_manifests(
+    manifests: list[ShardManifest],
+    expected_service_names: T.Optional[T.Iterable[str]] = None,
+) -> dict[str, dict[str, str]]:
+    """
+    Validate a complete set of shard manifests and merge them together.
+
+    The validation makes sure that:
+
+    - all manifests are built for the same version and the same shard total
+    - every shard from ``1`` to ``N`` is present exactly once
+    - every service is built by exactly one shard
+    - the union of the services equals ``expected_service_names`` (if given)
+
+    :returns: the merged ``{service_name: {relative_path: sha256}}`` mapping
+
+    :raises ValueError: if any of the above checks fails
+    """
+    if len(manifests) == 0:
+        raise ValueError("No shard manifest to merge")
+
+    versions = {manifest.version for manifest in manifests}
+    if len(versions) != 1:
+        raise ValueError(f"Shard manifests have different versions: {versions}")
+    totals = {manifest.shard_total for manifest in manifests}
+    if len(totals) != 1:
+        raise ValueError(f"Shard manifests have different shard totals: {totals}")
+    total = totals.pop()
+
+    indexes = sorted(manifest.shard_index for manifest in manifests)
+    if indexes != list(range(1, total + 1)):
+        raise ValueError(
+            f"Expected exactly one manifest for each shard 1..{total}, got {indexes}"
+        )
+
+    merged: dict[str, dict[str, str]] = dict()
+    owners: dict[str, list[str]] = dict()
+    for manifest in manifests:
+        for service_name, artifacts in manifest.services.items():
+            owners.setdefault(service_name, []).append(manifest.shard.label)
+            merged[service_name] = artifacts
+
+    duplicated = {
+        service_name: labels
+        for service_name, labels in owners.items()
+        if len(labels) > 1
+    }
+    if duplicated:
+        raise ValueError(f"Services built by more than one shard: {duplicated}")
+
+    if expected_service_names is not None:
+        expected = set(expected_service_names)
+        missing = sorted(expected.difference(merged))
+        extra = sorted(set(merged).difference(expected))
+        if missing or extra:
+            raise ValueError(
+                f"Shard manifests don't match the expected services, "
+                f"missing = {missing}, extra = {extra}"
+            )
+
+    return dict(sorted(merged.items()))
+
+
+def merge_shard_manifest_files(
+    version: str,
+    expected_service_names: T.Optional[T.Iterable[str]] = None,
+) -> dict[str, dict[str, str]]:
+    """
+    Read all shard manifests of a version from ``build/shards/${version}/``,
+    validate them with :func:`merge_shard_manifests` and write the merged
+    result to ``build/shards/${version}/merged.json``.
+    """
+    dir_manifests = get_dir_shard_manifests(version)
+    manifests = [
+        ShardManifest.read(path)
+        for path in sorted(dir_manifests.glob("shard-*-of-*.json"))
+    ]
+    merged = merge_shard_manifests(
+        manifests=manifests,
+        expected_service_names=expected_service_names,
+    )
+    write(dir_manifests / "merged.json", json.dumps(merged, indent=2))
+    return merged
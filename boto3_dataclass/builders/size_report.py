@@ -0,0 +1,537 @@
+# -*- coding: utf-8 -*-
+
+"""
+Generated artifact size analytics and size budget.
+
+Every template change affects 400+ generated packages, so we record the size of
+the generated code for every build and compare it with the previous build:
+
+- :class:`ServiceSize`: lines, bytes, class / field / caster method count,
+  compressed size and wheel size of one generated service package.
+- :class:`SizeReport`: the sizes of all service packages of one build.
+- :class:`SizeBudget`: the max allowed growth compared to a baseline build.
+- :class:`SizeHistory`: all builds of a version, stored in
+  ``build/size_history/${version}.json``.
+
+A sharded build (``--shard i/N``) doesn't touch the size history, every shard
+only writes its own report next to its shard manifest, see
+:func:`get_path_shard_size_report`. Once all shards are done,
+:func:`merge_shard_size_report_files` merges them into one report and records
+it, so the shards never write the same history file and a partial build never
+becomes the baseline.
+
+The wheels are built after the code is measured, :func:`record_wheel_sizes`
+adds their size to the report of the build once ``poetry build`` is done.
+"""
+
+import typing as T
+import ast
+import json
+import zlib
+import datetime
+import dataclasses
+from pathlib import Path
+
+import mpire
+
+from ..paths import path_enum
+from ..utils import write
+from .shard import ShardSpec, get_dir_shard_manifests
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from ..structures.api import Boto3DataclassServiceStructure
+
+
+def _is_field_node(node: ast.AST) -> bool:
+    """
+    Check if a class body node is a generated field, either
+    ``name = field("name")`` or a ``@cached_property`` method.
+    """
+    if isinstance(node, ast.Assign):
+        value = node.value
+        return (
+            isinstance(value, ast.Call)
+            and isinstance(value.func, ast.Name)
+            and value.func.id == "field"
+        )
+    if isinstance(node, ast.FunctionDef):
+        for decorator in node.decorator_list:
+            if isinstance(decorator, ast.Name) and decorator.id == "cached_property":
+                return True
+    return False
+
+
+def _count_field_table(node: ast.AST) -> int:
+    """
+    The number of fields in a ``_fields = (...)`` table of a class generated
+    in the compact mode, 0 if the node is not a field table.
+    """
+    if (
+        isinstance(node, ast.Assign)
+        and len(node.targets) == 1
+        and isinstance(node.targets[0], ast.Name)
+        and node.targets[0].id == "_fields"
+        and isinstance(node.value, ast.Tuple)
+    ):
+        return len(node.value.elts)
+    return 0
+
+
+def count_classes_and_fields(code: str) -> tuple[int, int]:
+    """
+    Count the number of top level classes and generated fields in a
+    generated ``type_defs.py`` module. Works on both the default and the
+    compact mode, the private base class of the compact mode is not counted.
+    """
+    module = ast.parse(code)
+    n_class = 0
+    n_field = 0
+    for node in module.body:
+        if isinstance(node, ast.ClassDef) and not node.name.startswith("_"):
+            n_class += 1
+            for sub_node in node.body:
+                if _is_field_node(sub_node):
+                    n_field += 1
+                else:
+                    n_field += _count_field_table(sub_node)
+    return n_class, n_field
+
+
+def count_caster_methods(code: str) -> int:
+    """
+    Count the number of public methods of the ``${Service}Caster`` class in a
+    generated ``caster.py`` module, the generic ``cast`` method is not counted.
+    """
+    module = ast.parse(code)
+    n_method = 0
+    for node in module.body:
+        if isinstance(node, ast.ClassDef) and node.name.endswith("Caster"):
+            for sub_node in node.body:
+                if isinstance(sub_node, ast.FunctionDef):
+                    if not sub_node.name.startswith("_") and sub_node.name != "cast":
+                        n_method += 1
+    return n_method
+
+
+@dataclasses.dataclass
+class ServiceSize:
+    """
+    The size of one generated service package.
+
+    :param service_name: AWS service name, e.g. ``ec2``
+    :param lines: total number of lines of all ``.py`` files
+    :param bytes: total size of all ``.py`` files
+    :param compressed_bytes: total size of all ``.py`` files after zlib compression
+    :param classes: number of generated dataclasses in ``type_defs.py``
+    :param fields: number of generated fields in ``type_defs.py``
+    :param caster_methods: number of caster methods in ``caster.py``
+    :param wheel_bytes: the size of the wheel file, None until the wheel is
+        built, see :func:`record_wheel_sizes`
+    """
+
+    service_name: str = dataclasses.field()
+    lines: int = dataclasses.field(default=0)
+    bytes: int = dataclasses.field(default=0)
+    compressed_bytes: int = dataclasses.field(default=0)
+    classes: int = dataclasses.field(default=0)
+    fields: int = dataclasses.field(default=0)
+    caster_methods: int = dataclasses.field(default=0)
+    wheel_bytes: int | None = dataclasses.field(default=None)
+
+    @classmethod
+    def measure(
+        cls,
+        structure: "Boto3DataclassServiceStructure",
+    ) -> "ServiceSize":
+        """
+        Measure the generated package of a service in ``build/repos/``.
+        """
+        size = cls(service_name=structure.service_name)
+        for path in sorted(structure.dir_package.rglob("*.py")):
+            b = path.read_bytes()
+            size.lines += len(b.splitlines())
+            size.bytes += len(b)
+            size.compressed_bytes += len(zlib.compress(b))
+        path = structure.path_boto3_dataclass_type_defs_py
+        if path.exists():
+            size.classes, size.fields = count_classes_and_fields(
+                path.read_text(encoding="utf-8")
+            )
+        path = structure.path_boto3_dataclass_caster_py
+        if path.exists():
+            size.caster_methods = count_caster_methods(path.read_text(encoding="utf-8"))
+        return size
+
+    def measure_wheel(self, structure: "Boto3DataclassServiceStructure"):
+        """
+        Set the size of the wheel in ``dist/``, None if there is no wheel.
+        """
+        self.wheel_bytes = None
+        if structure.dir_dist.exists():
+            wheels = sorted(structure.dir_dist.glob("*.whl"))
+            if wheels:
+                self.wheel_bytes = wheels[-1].stat().st_size
+
+    @classmethod
+    def from_dict(cls, data: dict[str, T.Any]) -> "ServiceSize":
+        # the reports of the older builds may have the metrics that we dropped
+        names = {field.name for field in dataclasses.fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in names})
+
+
+@dataclasses.dataclass
+class SizeReport:
+    """
+    The size of all generated service packages of one build.
+
+    :param version: the package version of the build
+    :param create_at: ISO format UTC time when the report was created
+    :param accepted: False if the build exceeded the size budget
+    :param services: ``{service_name: ServiceSize}``
+    """
+
+    version: str = dataclasses.field()
+    create_at: str = dataclasses.field(
+        default_factory=lambda: datetime.datetime.now(datetime.timezone.utc).isoformat()
+    )
+    accepted: bool = dataclasses.field(default=True)
+    services: dict[str, ServiceSize] = dataclasses.field(default_factory=dict)
+
+    @classmethod
+    def measure(
+        cls,
+        version: str,
+        structures: list["Boto3DataclassServiceStructure"],
+        n_workers: int | None = None,
+    ) -> "SizeReport":
+        """
+        Measure all given service packages in parallel.
+        """
+        with mpire.WorkerPool(n_jobs=n_workers, start_method="fork") as pool:
+            sizes = pool.map(ServiceSize.measure, [(s,) for s in structures])
+        return cls(
+            version=version,
+            services={size.service_name: size for size in sizes},
+        )
+
+    @classmethod
+    def merge(
+        cls,
+        version: str,
+        reports: list["SizeReport"],
+    ) -> "SizeReport":
+        """
+        Merge the reports of all shards of a build into one report.
+
+        :raises ValueError: if a service is in more than one report
+        """
+        merged = cls(version=version)
+        for report in reports:
+            for service_name, size in report.services.items():
+                if service_name in merged.services:
+                    raise ValueError(
+                        f"service {service_name!r} is in more than one shard size report"
+                    )
+                merged.services[service_name] = size
+        return merged
+
+    def total(
+        self,
+        metric: str,
+        service_names: T.Optional[T.Iterable[str]] = None,
+    ) -> int:
+        """
+        Sum a metric over all services, or the given services only.
+        """
+        if service_names is None:
+            service_names = self.services
+        return sum(
+            getattr(self.services[service_name], metric) or 0
+            for service_name in service_names
+            if service_name in self.services
+        )
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, T.Any]) -> "SizeReport":
+        data = dict(data)
+        data["services"] = {
+            service_name: ServiceSize.from_dict(size)
+            for service_name, size in data["services"].items()
+        }
+        return cls(**data)
+
+    def write(self, path: Path):
+        write(path, json.dumps(self.to_dict(), indent=2))
+
+    @classmethod
+    def read(cls, path: Path) -> "SizeReport":
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+    def summary(self, top: int = 20) -> str:
+        """
+        Human readable summary, the biggest services first.
+        """
+        lines = [
+            f"Number of service: {len(self.services)}",
+            f"Total: {self.total('lines')} lines",
+            f"Total Size: {self.total('bytes') / 1_000_000:.2f} MB "
+            f"({self.total('compressed_bytes') / 1_000_000:.2f} MB compressed)",
+            f"Total classes: {self.total('classes')}, "
+            f"fields: {self.total('fields')}, "
+            f"caster methods: {self.total('caster_methods')}",
+        ]
+        if any(size.wheel_bytes is not None for size in self.services.values()):
+            lines.append(
+                f"Total wheel size: {self.total('wheel_bytes') / 1_000_000:.2f} MB"
+            )
+        sizes = sorted(self.services.values(), key=lambda s: s.lines, reverse=True)
+        for size in sizes[:top]:
+            lines.append(
+                f"- {size.service_name:30} {size.lines:8} lines {size.bytes:10} bytes"
+            )
+        return "\n".join(lines)
+
+
+@dataclasses.dataclass
+class SizeBudget:
+    """
+    The max allowed relative growth of a build compared to a baseline build.
+    ``0.1`` means +10%, None means no limit. Only the services that exist in
+    both builds are compared, so partial (sharded / limited) builds work too.
+
+    :param max_total_bytes_growth: limit of the total ``.py`` bytes growth
+    :param max_total_lines_growth: limit of the total lines growth
+    :param max_service_bytes_growth: limit of the ``.py`` bytes growth of any
+        single service
+    """
+
+    max_total_bytes_growth: float | None = dataclasses.field(default=0.10)
+    max_total_lines_growth: float | None = dataclasses.field(default=None)
+    max_service_bytes_growth: float | None = dataclasses.field(default=None)
+
+    def check(
+        self,
+        report: SizeReport,
+        baseline: SizeReport,
+    ) -> list[str]:
+        """
+        :returns: human readable budget violations, empty if within budget
+        """
+        common = sorted(set(report.services).intersection(baseline.services))
+        violations = list()
+
+        def check_growth(name: str, before: int, after: int, limit: float | None):
+            if limit is None or before == 0:
+                return
+            growth = (after - before) / before
+            if growth > limit:
+                violations.append(
+                    f"{name} grew {growth:+.2%} ({before} -> {after}), "
+                    f"budget is {limit:+.2%}"
+                )
+
+        check_growth(
+            "total bytes",
+            baseline.total("bytes", common),
+            report.total("bytes", common),
+            self.max_total_bytes_growth,
+        )
+        check_growth(
+            "total lines",
+            baseline.total("lines", common),
+            report.total("lines", common),
+            self.max_total_lines_growth,
+        )
+        for service_name in common:
+            check_growth(
+                f"{service_name} bytes",
+                baseline.services[service_name].bytes,
+                report.services[service_name].bytes,
+                self.max_service_bytes_growth,
+            )
+        return violations
+
+
+@dataclasses.dataclass
+class SizeHistory:
+    """
+    All recorded builds of a version, stored in ``build/size_history/${version}.json``.
+    """
+
+    version: str = dataclasses.field()
+    reports: list[SizeReport] = dataclasses.field(default_factory=list)
+
+    @staticmethod
+    def get_dir() -> Path:
+        return path_enum.dir_build / "size_history"
+
+    @property
+    def path(self) -> Path:
+        return self.get_dir() / f"{self.version}.json"
+
+    @classmethod
+    def read(cls, version: str) -> "SizeHistory":
+        history = cls(version=version)
+        if history.path.exists():
+            data = json.loads(history.path.read_text(encoding="utf-8"))
+            history.reports = [SizeReport.from_dict(report) for report in data]
+        return history
+
+    def write(self):
+        content = json.dumps([report.to_dict() for report in self.reports], indent=2)
+        write(self.path, content)
+
+    @property
+    def last_accepted(self) -> SizeReport | None:
+        for report in reversed(self.reports):
+            if report.accepted:
+                return report
+        return None
+
+    def find_baseline(self) -> SizeReport | None:
+        """
+        The last accepted build of this version, or the last accepted build of
+        the most recently updated other version.
+        """
+        if self.last_accepted is not None:
+            return self.last_accepted
+        dir_history = self.get_dir()
+        if not dir_history.exists():
+            return None
+        paths = sorted(
+            [p for p in dir_history.glob("*.json") if p.stem != self.version],
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for path in paths:
+            baseline = SizeHistory.read(path.stem).last_accepted
+            if baseline is not None:
+                return baseline
+        return None
+
+
+def get_path_shard_size_report(version: str, shard: ShardSpec) -> Path:
+    """
+    Example: ``build/shards/1.40.0/size-2-of-4.json``
+    """
+    return get_dir_shard_manifests(version) / f"size-{shard.label}.json"
+
+
+def append_size_report(
+    report: SizeReport,
+    budget: SizeBudget | None = None,
+    baseline: SizeReport | None = None,
+) -> SizeReport:
+    """
+    Check the size budget against the baseline build and append the report to
+    the size history of its version.
+
+    :param report: the size report of a complete build
+    :param budget: the size budget, no check if None
+    :param baseline: the baseline build, default is :meth:`SizeHistory.find_baseline`
+
+    :raises ValueError: if the size budget is exceeded, the report is still
+        recorded but marked as not accepted, so it won't become the next baseline
+    """
+    history = SizeHistory.read(report.version)
+    if baseline is None:
+        baseline = history.find_baseline()
+    violations = list()
+    if budget is not None and baseline is not None:
+        violations = budget.check(report, baseline)
+    report.accepted = len(violations) == 0
+    history.reports.append(report)
+    history.write()
+    if violations:
+        raise ValueError(
+            "Generated code size budget exceeded:\n"
+            + "\n".join(f"- {violation}" for violation in violations)
+        )
+    return report
+
+
+def record_size_report(
+    version: str,
+    structures: list["Boto3DataclassServiceStructure"],
+    budget: SizeBudget | None = None,
+    baseline: SizeReport | None = None,
+    n_workers: int | None = None,
+) -> SizeReport:
+    """
+    Measure the generated packages and record the report with
+    :func:`append_size_report`.
+
+    :param version: the package version of the build
+    :param structures: the service packages to measure
+    :param budget: the size budget, no check if None
+    :param baseline: the baseline build, default is :meth:`SizeHistory.find_baseline`
+    :param n_workers: number of worker processes to measure the packages
+    """
+    report = SizeReport.measure(
+        version=version,
+        structures=structures,
+        n_workers=n_workers,
+    )
+    return append_size_report(report, budget=budget, baseline=baseline)
+
+
+def record_wheel_sizes(
+    version: str,
+    structures: list["Boto3DataclassServiceStructure"],
+    shard: ShardSpec | None = None,
+) -> SizeReport:
+    """
+    Add the size of the built wheels to the size report of the build, the
+    last report in the size history, or the size report of the shard, which
+    is merged later by :func:`merge_shard_size_report_files`.
+
+    :param structures: the service packages whose wheels were built
+
+    :raises ValueError: if the code of the build was not measured
+    """
+    if shard is None:
+        history = SizeHistory.read(version)
+        if not history.reports:
+            raise ValueError(
+                f"no size report of version {version} to add the wheels to"
+            )
+        report = history.reports[-1]
+    else:
+        path = get_path_shard_size_report(version, shard)
+        if not path.exists():
+            raise ValueError(f"{path} not found, build the shard {shard.label} first")
+        report = SizeReport.read(path)
+    for structure in structures:
+        size = report.services.get(structure.service_name)
+        if size is not None:
+            size.measure_wheel(structure)
+    if shard is None:
+        history.write()
+    else:
+        report.write(path)
+    return report
+
+
+def merge_shard_size_report_files(
+    version: str,
+    budget: SizeBudget | None = None,
+) -> SizeReport:
+    """
+    Read the size reports of all shards of a version from
+    ``build/shards/${version}/``, merge them with :meth:`SizeReport.merge` and
+    record the merged report with :func:`append_size_report`.
+
+    Call it after :func:`~boto3_dataclass.builders.shard.merge_shard_manifest_files`,
+    which validates that every shard is done.
+    """
+    reports = [
+        SizeReport.read(path)
+        for path in sorted(get_dir_shard_manifests(version).glob("size-*-of-*.json"))
+    ]
+    if not reports:
+        raise ValueError(f"no shard size report found for version {version}")
+    report = SizeReport.merge(version=version, reports=reports)
+    return append_size_report(report, budget=budget)
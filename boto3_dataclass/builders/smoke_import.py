@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+
+"""
+Post-build smoke import of the generated service packages.
+
+A template change can silently break the generated code or make it much slower
+to import. This module imports every generated ``boto3_dataclass_{service_name}``
+package in a fresh interpreter (``python -X importtime``), in a bounded pool of
+parallel subprocesses, and records:
+
+- whether the import succeeded, and the error if not
+- the wall clock import time
+- the top offenders reported by ``-X importtime``, sorted by self time
+- the RSS delta caused by the import
+
+The result is a :class:`SmokeImportReport` that can be saved as JSON and
+compared against the report of a previous build with
+:meth:`SmokeImportReport.compare`.
+"""
+
+import typing as T
+import os
+import sys
+import json
+import subprocess
+import dataclasses
+from pathlib import Path
+
+import mpire
+
+from ..paths import path_enum
+from ..utils import write
+
+# The code that runs in the fresh interpreter. It prints a marker to stderr
+# right before the import, so we can ignore the modules imported during the
+# interpreter startup in the ``-X importtime`` output. The caster loads
+# ``type_defs.py`` on the first cast, it is imported explicitly, so a broken
+# ``type_defs.py`` fails the smoke import and is measured.
+_CHILD_CODE = """
+import os, sys, json, time, importlib.util
+
+def rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        try:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        except ImportError:
+            return 0
+
+package_name = sys.argv[1]
+rss_before = rss()
+sys.stderr.write("{marker}\\n")
+sys.stderr.flush()
+start = time.perf_counter()
+__import__(package_name)
+if importlib.util.find_spec(package_name + ".type_defs") is not None:
+    __import__(package_name + ".type_defs")
+elapsed = time.perf_counter() - start
+rss_after = rss()
+print(json.dumps({{"import_time": elapsed, "rss_delta": rss_after - rss_before}}))
+"""
+
+_MARKER = "__BOTO3_DATACLASS_SMOKE_IMPORT_START__"
+
+
+@dataclasses.dataclass
+class ImportTimeEntry:
+    """
+    One line of the ``python -X importtime`` output.
+
+    :param module: the imported module name
+    :param self_us: time spent in the module itself, in microseconds
+    :param cumulative_us: time spent in the module and its imports, in microseconds
+    """
+
+    module: str = dataclasses.field()
+    self_us: int = dataclasses.field()
+    cumulative_us: int = dataclasses.field()
+
+
+def parse_importtime(
+    stderr: str, marker: str | None = _MARKER
+) -> list[ImportTimeEntry]:
+    """
+    Parse the ``-X importtime`` output, for example::
+
+        import time: self [us] | cumulative | imported package
+        import time:       345 |        345 |   dataclasses
+
+    :param stderr: the stderr output of the interpreter
+    :param marker: only parse the lines after this marker line
+    """
+    lines = stderr.splitlines()
+    if marker is not None and marker in lines:
+        lines = lines[lines.index(marker) + 1 :]
+    entries = list()
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) != 3:  # pragma: no cover
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:  # the header line
+            continue
+        entries.append(
+            ImportTimeEntry(
+                module=parts[2].strip(),
+                self_us=self_us,
+                cumulative_us=cumulative_us,
+            )
+        )
+    return entries
+
+
+@dataclasses.dataclass
+class ImportResult:
+    """
+    The smoke import result of one package.
+
+    :param package_name: the imported package, e.g. ``boto3_dataclass_ec2``
+    :param success: whether the import succeeded
+    :param import_time: wall clock import time in seconds
+    :param rss_delta: RSS increase caused by the import in bytes
+    :param top_offenders: the modules with the highest self time
+    :param error: the last lines of stderr if the import failed
+    """
+
+    package_name: str = dataclasses.field()
+    success: bool = dataclasses.field()
+    import_time: float | None = dataclasses.field(default=None)
+    rss_delta: int | None = dataclasses.field(default=None)
+    top_offenders: list[ImportTimeEntry] = dataclasses.field(default_factory=list)
+    error: str | None = dataclasses.field(default=None)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, T.Any]) -> "ImportResult":
+        data = dict(data)
+        data["top_offenders"] = [
+            ImportTimeEntry(**entry) for entry in data.get("top_offenders", [])
+        ]
+        return cls(**data)
+
+
+def smoke_import(
+    package_name: str,
+    dir_path: Path,
+    top_n: int = 5,
+    timeout: float = 300,
+    precompile: bool = True,
+    python: str = sys.executable,
+) -> ImportResult:
+    """
+    Import a package in a fresh interpreter and measure it.
+
+    :param package_name: the package to import, e.g. ``boto3_dataclass_ec2``
+    :param dir_path: the directory that contains the package folder, it is
+        prepended to ``PYTHONPATH``
+    :param top_n: number of top offenders to keep
+    :param timeout: timeout in seconds for the subprocess
+    :param precompile: byte compile the package before importing it, like
+        ``pip install`` does. If False, the measured import time includes
+        compiling the source code, which is what happens on a read-only
+        file system without ``.pyc`` files.
+    :param python: the interpreter to use
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(dir_path)] + [p for p in [env.get("PYTHONPATH")] if p]
+    )
+    # the import itself should never write bytecode, otherwise the result
+    # depends on whether the package has been imported before
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    if precompile:
+        subprocess.run(
+            [python, "-m", "compileall", "-q", str(dir_path / package_name)],
+            capture_output=True,
+            timeout=timeout,
+        )
+    args = [
+        python,
+        "-X",
+        "importtime",
+        "-c",
+        _CHILD_CODE.format(marker=_MARKER),
+        package_name,
+    ]
+    try:
+        res = subprocess.run(
+            args,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return ImportResult(
+            package_name=package_name,
+            success=False,
+            error=f"import timed out after {timeout} seconds",
+        )
+    if res.returncode != 0:
+        return ImportResult(
+            package_name=package_name,
+            success=False,
+            error="\n".join(res.stderr.strip().splitlines()[-5:]),
+        )
+    data = json.loads(res.stdout.strip().splitlines()[-1])
+    entries = parse_importtime(res.stderr)
+    entries.sort(key=lambda entry: entry.self_us, reverse=True)
+    return ImportResult(
+        package_name=package_name,
+        success=True,
+        import_time=data["import_time"],
+        rss_delta=data["rss_delta"],
+        top_offenders=entries[:top_n],
+    )
+
+
+@dataclasses.dataclass
+class ImportRegression:
+    """
+    A package that imports slower than in the previous build, or doesn't import anymore.
+    """
+
+    package_name: str = dataclasses.field()
+    before: float | None = dataclasses.field()
+    after: float | None = dataclasses.field()
+
+    @property
+    def ratio(self) -> float | None:
+        if self.before and self.after:
+            return self.after / self.before
+        return None
+
+
+@dataclasses.dataclass
+class SmokeImportReport:
+    """
+    The smoke import results of all packages of a build.
+
+    :param version: the package version of the build
+    :param results: ``{package_name: ImportResult}``
+    """
+
+    version: str = dataclasses.field()
+    results: dict[str, ImportResult] = dataclasses.field(default_factory=dict)
+
+    @property
+    def failed(self) -> list[ImportResult]:
+        return [result for result in self.results.values() if not result.success]
+
+    @property
+    def total_import_time(self) -> float:
+        return sum(result.import_time or 0.0 for result in self.results.values())
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, T.Any]) -> "SmokeImportReport":
+        return cls(
+            version=data["version"],
+            results={
+                package_name: ImportResult.from_dict(result)
+                for package_name, result in data["results"].items()
+            },
+        )
+
+    def write(self, path: Path):
+        write(path, json.dumps(self.to_dict(), indent=2))
+
+    @classmethod
+    def read(cls, path: Path) -> "SmokeImportReport":
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+    def compare(
+        self,
+        previous: "SmokeImportReport",
+        threshold: float = 0.2,
+        min_delta: float = 0.005,
+    ) -> list[ImportRegression]:
+        """
+        Find the packages that got slower to import compared to a previous build.
+
+        :param previous: the report of the previous build
+        :param threshold: relative slow down to report, 0.2 means 20% slower
+        :param min_delta: ignore absolute slow down smaller than this (in seconds),
+            small packages are too noisy otherwise
+
+        :returns: the regressions, including the packages that imported fine
+            in the previous build but fail now
+        """
+        regressions = list()
+        for package_name, result in sorted(self.results.items()):
+            prev = previous.results.get(package_name)
+            if prev is None or not prev.success:
+                continue
+            if not result.success:
+                regressions.append(
+                    ImportRegression(package_name, prev.import_time, None)
+                )
+            elif (
+                result.import_time > prev.import_time * (1 + threshold)
+                and result.import_time - prev.import_time > min_delta
+            ):
+                regressions.append(
+                    ImportRegression(package_name, prev.import_time, result.import_time)
+                )
+        return regressions
+
+
+def get_path_smoke_import_report(version: str, label: str | None = None) -> Path:
+    """
+    Example: ``build/smoke_import/1.40.0.json`` or
+    ``build/smoke_import/1.40.0-shard-2-of-4.json``
+    """
+    name = version if label is None else f"{version}-{label}"
+    return path_enum.dir_build / "smoke_import" / f"{name}.json"
+
+
+def run_smoke_import_all(
+    version: str,
+    packages: list[tuple[str, Path]],
+    n_workers: int | None = None,
+    top_n: int = 5,
+    precompile: bool = True,
+) -> SmokeImportReport:
+    """
+    Smoke import many packages in parallel.
+
+    Each import runs in its own subprocess, so a thread pool is enough to drive
+    them, ``n_workers`` bounds the number of concurrent interpreters.
+
+    :param version: the package version of the build
+    :param packages: list of ``(package_name, dir_path)``, see :func:`smoke_import`
+    :param n_workers: max number of concurrent subprocesses, default is the cpu count
+    :param top_n: number of top offenders to keep per package
+    :param precompile: see :func:`smoke_import`
+    """
+    tasks = [
+        {
+            "package_name": package_name,
+            "dir_path": dir_path,
+            "top_n": top_n,
+            "precompile": precompile,
+        }
+        for package_name, dir_path in packages
+    ]
+    with mpire.WorkerPool(n_jobs=n_workers, start_method="threading") as pool:
+        results = pool.map(smoke_import, tasks)
+    return SmokeImportReport(
+        version=version,
+        results={result.package_name: result for result in results},
+    )
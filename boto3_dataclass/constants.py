@@ -4,3 +4,4 @@ TYPE_DEF = "TypeDef"
 TYPED_DICT = "TypedDict"
 BASE_CLIENT = "BaseClient"
 PACKAGE_NAME_PREFIX = "boto3_dataclass"
+CORE_PACKAGE_NAME = "boto3_dataclass_core"
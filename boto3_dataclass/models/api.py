@@ -8,3 +8,9 @@ from .typed_dict import TypedDictDef
 from .typed_dict import TypedDefsModule
 from .caster import CasterMethod
 from .caster import CasterModule
+from .reachability import TypeReachabilityGraph
+from .structural import get_structural_hashes
+from .usage import ServiceUsage
+from .usage import UsageManifest
+from .usage import make_slim_modules
+from .usage import make_bundle_modules
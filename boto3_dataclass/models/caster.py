@@ -39,10 +39,13 @@ class CasterMethod:
         例如 'GetRoleResponseTypeDef'
     :param boto3_dataclass_type_name: 对应的 dataclass 类型名称,
         例如 'GetRoleResponse' (移除了 'TypeDef' 后缀)
+    :param operation_name: botocore 中的 operation 名称, 例如 'GetRole'.
+        boto3 自定义的方法在 botocore 中没有对应的 operation, 这时为 None.
     """
     method_name: str = dataclasses.field()
     boto3_stubs_type_name: str = dataclasses.field()
     boto3_dataclass_type_name: str = dataclasses.field()
+    operation_name: str | None = dataclasses.field(default=None)
 
     def gen_code(self) -> str:
         """
@@ -75,6 +78,20 @@ class CasterModule:
         """
         return {cm.method_name: cm for cm in self.cms}
 
+    @property
+    def dispatch_mapping(self) -> dict[str, str]:
+        """
+        ``caster.cast(operation_name, res)`` 用的分发表, 同时用 botocore 的
+        operation 名称和 client 方法名作为 key, 值是 dataclass 的类名, 例如
+        ``{"GetRole": "GetRoleResponse", "get_role": "GetRoleResponse", ...}``.
+        """
+        mapping = dict()
+        for cm in self.cms:
+            if cm.operation_name is not None:
+                mapping[cm.operation_name] = cm.boto3_dataclass_type_name
+            mapping[cm.method_name] = cm.boto3_dataclass_type_name
+        return mapping
+
     def gen_code(self) -> str:
         """
         生成整个转换器模块的代码字符串.
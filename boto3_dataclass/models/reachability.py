@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+"""
+这个模块负责计算哪些 TypedDict 是 caster 方法能够返回的, 用于对生成的
+``type_defs.py`` 做 tree shaking.
+
+``type_defs.pyi`` 中有大量的 ``*RequestTypeDef`` 以及只在 request 中用到的嵌套类型,
+没有任何 caster 方法会返回它们, 为它们生成的 dataclass 只会让 ``type_defs.py``
+更大, import 更慢. 我们以所有 :class:`~boto3_dataclass.models.caster.CasterMethod`
+的返回类型为起点, 沿着 :attr:`~boto3_dataclass.models.typed_dict.TypedDictFieldAnnotation.nested_type_name`
+遍历, 能到达的就是需要生成的类型::
+
+    GetRoleResponseTypeDef ---> RoleTypeDef ---> RoleLastUsedTypeDef
+                           |                |--> TagTypeDef
+                           |--> ResponseMetadataTypeDef
+"""
+
+import dataclasses
+
+from .typed_dict import TypedDefsModule
+from .caster import CasterModule
+
+
+@dataclasses.dataclass
+class TypeReachabilityGraph:
+    """
+    TypedDict 之间的引用关系图.
+
+    :param edges: ``{TypedDict 名称: {它的字段引用的嵌套 TypedDict 名称, ...}}``,
+        例如 ``{"GetRoleResponseTypeDef": {"RoleTypeDef", "ResponseMetadataTypeDef"}}``
+    :param roots: 遍历的起点, 也就是所有 caster 方法的返回类型,
+        例如 ``{"GetRoleResponseTypeDef", ...}``
+    """
+
+    edges: dict[str, set[str]] = dataclasses.field(default_factory=dict)
+    roots: set[str] = dataclasses.field(default_factory=set)
+
+    @classmethod
+    def new(
+        cls,
+        tdm: TypedDefsModule,
+        cm: CasterModule,
+    ) -> "TypeReachabilityGraph":
+        """
+        从 ``type_defs.pyi`` 和 ``client.pyi`` 的解析结果构建引用关系图.
+
+        ``tdm`` 也可以是 :meth:`~boto3_dataclass.models.typed_dict.TypedDefsModule.dedup`
+        之后的模块, 别名会被换成它指向的名称. 从 core 包导入的类型没有出边,
+        它的嵌套类型在 core 包中.
+        """
+
+        def resolve(name: str) -> str:
+            return tdm.aliases.get(name, name)
+
+        edges = {
+            tdd.name: {
+                resolve(field.anno.nested_type_name)
+                for field in tdd.fields
+                if field.anno.is_nested_typed_dict
+            }
+            for tdd in tdm.tdds
+        }
+        for name in tdm.core_imports:
+            edges[name] = set()
+        roots = {resolve(cm_.boto3_stubs_type_name) for cm_ in cm.cms}
+        return cls(edges=edges, roots=roots)
+
+    def reachable(self) -> set[str]:
+        """
+        所有能从 :attr:`roots` 到达的 TypedDict 名称, 包括 roots 本身.
+        不在 ``type_defs.pyi`` 中的名称会被忽略.
+        """
+        seen = set()
+        stack = [name for name in self.roots if name in self.edges]
+        while stack:
+            name = stack.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            stack.extend(nested for nested in self.edges[name] if nested in self.edges)
+        return seen
+
+    def shake(self, tdm: TypedDefsModule) -> TypedDefsModule:
+        """
+        返回一个只包含能到达的 TypedDict 的新 :class:`TypedDefsModule`,
+        保持原来的顺序. 指向能到达的 TypedDict 的别名也会保留.
+        """
+        reachable = self.reachable()
+        return TypedDefsModule(
+            tdds=[tdd for tdd in tdm.tdds if tdd.name in reachable],
+            aliases={
+                alias: name for alias, name in tdm.aliases.items() if name in reachable
+            },
+            core_imports={
+                name: core_name
+                for name, core_name in tdm.core_imports.items()
+                if name in reachable
+            },
+            raw_fallback=tdm.raw_fallback,
+        )
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+"""
+这个模块负责计算 TypedDict 的结构哈希 (structural hash), 用于合并结构完全相同的
+TypedDict.
+
+boto3-stubs 会为同一个 shape 生成多个结构完全相同的 TypedDict, 例如 ``FooTypeDef``
+和 ``FooOutputTypeDef``. 两个 TypedDict 结构相同的意思是: 字段名称相同, 每个字段是否是
+List 相同, 嵌套字段指向的 TypedDict 也结构相同 (递归定义, 可能有环). 例如::
+
+    class TagTypeDef(TypedDict):
+        Key: str
+        Value: str
+
+    class TagOutputTypeDef(TypedDict):
+        Key: str
+        Value: str
+
+    class RoleTypeDef(TypedDict):
+        Tags: List[TagTypeDef]
+
+    class RoleOutputTypeDef(TypedDict):
+        Tags: List[TagOutputTypeDef]
+
+这里 ``TagTypeDef`` 和 ``TagOutputTypeDef`` 结构相同, 所以 ``RoleTypeDef`` 和
+``RoleOutputTypeDef`` 也结构相同.
+
+计算分两步:
+
+1. partition refinement: 先按照不含嵌套目标的字段签名分组, 然后不断用
+   "字段签名 + 嵌套目标所在的组" 细分, 直到分组不再变化. 最后结构相同的
+   TypedDict 在同一个组.
+2. 从每个组出发, 按照字段名称的顺序遍历能到达的组并依次编号, 把遍历的结果序列化后
+   做 sha256, 就是与名称无关的结构哈希. 不同 service 之间也可以比较.
+"""
+
+import typing as T
+import hashlib
+
+from .typed_dict import TypedDictDef
+
+
+def get_field_signature(
+    tdd: TypedDictDef,
+    aliases: T.Optional[dict[str, str]] = None,
+) -> list[tuple[str, str | None, bool]]:
+    """
+    按字段名称排序的 ``(字段名称, 嵌套的 TypedDict 名称或 None, 是否是 List)`` 列表.
+
+    :param aliases: ``{别名: TypedDict 名称}``, 嵌套目标如果是别名, 换成它指向的名称,
+        见 :attr:`~boto3_dataclass.models.typed_dict.TypedDefsModule.aliases`.
+    """
+    if aliases is None:
+        aliases = {}
+    signature = list()
+    for field in tdd.fields:
+        target = None
+        if field.anno.is_nested_typed_dict:
+            target = aliases.get(
+                field.anno.nested_type_name, field.anno.nested_type_name
+            )
+        signature.append(
+            (field.name, target, field.anno.nested_type_subscriptor == "List")
+        )
+    return sorted(signature)
+
+
+def partition(
+    tdds: list[TypedDictDef],
+    aliases: T.Optional[dict[str, str]] = None,
+) -> dict[str, int]:
+    """
+    把结构相同的 TypedDict 分到同一个组.
+
+    :param aliases: 见 :func:`get_field_signature`.
+
+    :returns: ``{TypedDict 名称: 组的编号}``. 不在 ``tdds`` 中的嵌套目标
+        (例如来自其他模块的类型) 只和同名的目标相同.
+    """
+    signatures = {tdd.name: get_field_signature(tdd, aliases) for tdd in tdds}
+
+    def relabel(keys: dict[str, tuple]) -> dict[str, int]:
+        ids = dict()
+        return {name: ids.setdefault(key, len(ids)) for name, key in keys.items()}
+
+    blocks = relabel(
+        {
+            name: tuple((f, target is not None, many) for f, target, many in signature)
+            for name, signature in signatures.items()
+        }
+    )
+    while True:
+        new_blocks = relabel(
+            {
+                name: (
+                    blocks[name],
+                    tuple(
+                        (f, blocks.get(target, target), many)
+                        for f, target, many in signature
+                    ),
+                )
+                for name, signature in signatures.items()
+            }
+        )
+        # the refinement only splits groups, same number means stable
+        if len(set(new_blocks.values())) == len(set(blocks.values())):
+            return new_blocks
+        blocks = new_blocks
+
+
+def get_structural_hashes(
+    tdds: list[TypedDictDef],
+    aliases: T.Optional[dict[str, str]] = None,
+) -> dict[str, str]:
+    """
+    计算每个 TypedDict 的结构哈希, 结构相同的 TypedDict 哈希相同.
+
+    :param aliases: 见 :func:`get_field_signature`.
+
+    :returns: ``{TypedDict 名称: sha256 hex}``
+    """
+    blocks = partition(tdds, aliases)
+    # every TypedDict of a group has the same signature up to the group of
+    # the nested targets, so one of them represents the group
+    representatives = dict()
+    for tdd in tdds:
+        representatives.setdefault(blocks[tdd.name], get_field_signature(tdd, aliases))
+
+    hashes_by_block = dict()
+    for start in representatives:
+        numbers = {start: 0}
+        queue = [start]
+        parts = list()
+        for block in queue:
+            items = list()
+            for f, target, many in representatives[block]:
+                if target is None:
+                    ref = "-"
+                elif target in blocks:
+                    target_block = blocks[target]
+                    if target_block not in numbers:
+                        numbers[target_block] = len(numbers)
+                        queue.append(target_block)
+                    ref = str(numbers[target_block])
+                else:
+                    ref = f"?{target}"
+                items.append(f"{f}:{ref}:{int(many)}")
+            parts.append(",".join(items))
+        data = "|".join(parts).encode("utf-8")
+        hashes_by_block[start] = hashlib.sha256(data).hexdigest()
+    return {name: hashes_by_block[block] for name, block in blocks.items()}
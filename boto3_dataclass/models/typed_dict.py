@@ -69,6 +69,9 @@ class TypedDictFieldAnnotation:
 
 field_name_mapping = {name: f"{name}_" for name in keyword.kwlist}
 
+# 标识字段的后缀, 例如 ``Instance`` 的 ``InstanceId``, ``Role`` 的 ``RoleId``
+KEY_FIELD_SUFFIXES = ["Id", "Arn"]
+
 
 @dataclasses.dataclass
 class TypedDictField:
@@ -102,6 +105,18 @@ class TypedDictField:
             tdf=self
         )
 
+    @property
+    def compact_spec(self) -> str:
+        """
+        compact 模式下这个字段在 ``_fields`` 表中的代码, 普通字段是字段名称,
+        嵌套的字段是 ``(字段名称, 嵌套的 dataclass 类名, 是否是 List)``, 例如
+        ``"id"``, ``("user", "User", False)``, ``("users", "User", True)``.
+        """
+        if self.anno.is_nested_typed_dict:
+            many = self.anno.nested_type_subscriptor == "List"
+            return f'("{self.name}", "{self.anno.nested_model_name}", {many})'
+        return f'"{self.name}"'
+
 
 @dataclasses.dataclass
 class TypedDictDef:
@@ -133,11 +148,30 @@ class TypedDictDef:
         """
         return self.name.removesuffix(TYPE_DEF)
 
-    def gen_code(self) -> str:
+    @property
+    def key_field_name(self) -> str | None:
+        """
+        标识字段的名称, 例如 ``InstanceTypeDef`` 的 ``InstanceId``. 生成的 dataclass
+        的 ``__hash__`` 只对这个字段的值求 hash, 而不用遍历整个 raw dict.
+        不是嵌套的字段才算, 没有的话返回 None.
+        """
+        for suffix in KEY_FIELD_SUFFIXES:
+            tdf = self.fields_mapping.get(f"{self.model_name}{suffix}")
+            if tdf is not None and tdf.anno.is_nested_typed_dict is False:
+                return tdf.name
+        return None
+
+    def gen_code(self, compact: bool = False) -> str:
         """
         生成 TypedDict 的代码字符串.
+
+        :param compact: 是否用 compact 模式生成, 见 :meth:`TypedDefsModule.gen_code`.
         """
-        return tpl_enum.boto3_dataclass_service__package__typed_dict_def.render(td=self)
+        if compact:
+            tpl = tpl_enum.boto3_dataclass_service__package__typed_dict_def_compact
+        else:
+            tpl = tpl_enum.boto3_dataclass_service__package__typed_dict_def
+        return tpl.render(td=self)
 
 
 @dataclasses.dataclass
@@ -145,9 +179,22 @@ class TypedDefsModule:
     """
     对应一个实现了所有 ``type_defs.pyi`` 文件中的 TypedDict 的 dataclass.
     这个类储存着多个 :class:`TypedDictDef` 的定义信息.
+
+    :param tdds: 需要生成 dataclass 的 TypedDict 列表
+    :param aliases: 不生成 dataclass, 而是作为别名的 TypedDict,
+        ``{别名 TypedDict 名称: 生成了 dataclass 的 TypedDict 名称}``,
+        例如 ``{"TagOutputTypeDef": "TagTypeDef"}``, 见 :meth:`dedup`.
+    :param core_imports: 不生成 dataclass, 而是从 ``boto3_dataclass_core`` 导入的
+        TypedDict, ``{TypedDict 名称: core 包中的 TypedDict 名称}``, 见 :meth:`use_core`.
+    :param raw_fallback: 是否为每个 dataclass 加上 ``__getattr__``, 没有生成的字段
+        直接从 ``boto3_raw_data`` 读取原始值. slim 包只生成用到的字段, 见
+        :func:`~boto3_dataclass.models.usage.make_slim_modules`.
     """
 
     tdds: list["TypedDictDef"] = dataclasses.field(default_factory=list)
+    aliases: dict[str, str] = dataclasses.field(default_factory=dict)
+    core_imports: dict[str, str] = dataclasses.field(default_factory=dict)
+    raw_fallback: bool = dataclasses.field(default=False)
 
     @cached_property
     def tdds_mapping(self) -> dict[str, "TypedDictDef"]:
@@ -156,13 +203,101 @@ class TypedDefsModule:
         """
         return {tdd.name: tdd for tdd in self.tdds}
 
-    def gen_code(self, type_defs_line: str) -> str:
+    @property
+    def alias_model_names(self) -> dict[str, str]:
+        """
+        别名对应的 dataclass 类名, 例如 ``{"TagOutput": "Tag"}``.
+        """
+        return {
+            alias.removesuffix(TYPE_DEF): name.removesuffix(TYPE_DEF)
+            for alias, name in self.aliases.items()
+        }
+
+    def dedup(self) -> "TypedDefsModule":
+        """
+        合并结构相同的 TypedDict, 见 :mod:`boto3_dataclass.models.structural`.
+        每组结构相同的 TypedDict 只为名称最短的那个生成 dataclass, 其他的作为别名.
+        别名指向的是同一个类, 所以 ``isinstance`` 和 ``==`` 在别名之间也成立.
+
+        :returns: 一个新的 :class:`TypedDefsModule`, 保持原来的顺序.
+        """
+        from .structural import get_structural_hashes
+
+        hashes = get_structural_hashes(self.tdds, self.aliases)
+        canonical = dict()
+        for tdd in sorted(self.tdds, key=lambda tdd: len(tdd.name)):
+            canonical.setdefault(hashes[tdd.name], tdd.name)
+        tdds = list()
+        aliases = dict()
+        for tdd in self.tdds:
+            name = canonical[hashes[tdd.name]]
+            if name == tdd.name:
+                tdds.append(tdd)
+            else:
+                aliases[tdd.name] = name
+        for alias, name in self.aliases.items():
+            aliases[alias] = aliases.get(name, name)
+        return TypedDefsModule(
+            tdds=tdds,
+            aliases=aliases,
+            core_imports=dict(self.core_imports),
+            raw_fallback=self.raw_fallback,
+        )
+
+    @property
+    def core_model_names(self) -> dict[str, str]:
+        """
+        从 core 包导入的 dataclass 类名, ``{本模块中的类名: core 包中的类名}``,
+        例如 ``{"Tag": "Tag", "ResponseMetadata": "ResponseMetadata"}``.
+        """
+        return {
+            name.removesuffix(TYPE_DEF): core_name.removesuffix(TYPE_DEF)
+            for name, core_name in self.core_imports.items()
+        }
+
+    def use_core(self, core_shapes: dict[str, str]) -> "TypedDefsModule":
+        """
+        把结构哈希在 core 包中的 TypedDict 换成从 core 包导入, 不再生成 dataclass.
+        本模块中的类名不变, 所以对用户来说 API 没有变化.
+
+        :param core_shapes: ``{结构哈希: core 包中的 TypedDict 名称}``,
+            见 :class:`~boto3_dataclass.builders.publish_boto3_dataclass_core.CoreIndex`.
+
+        :returns: 一个新的 :class:`TypedDefsModule`, 保持原来的顺序.
+        """
+        from .structural import get_structural_hashes
+
+        hashes = get_structural_hashes(self.tdds, self.aliases)
+        tdds = list()
+        core_imports = dict(self.core_imports)
+        for tdd in self.tdds:
+            core_name = core_shapes.get(hashes[tdd.name])
+            if core_name is None:
+                tdds.append(tdd)
+            else:
+                core_imports[tdd.name] = core_name
+        return TypedDefsModule(
+            tdds=tdds,
+            aliases=dict(self.aliases),
+            core_imports=core_imports,
+            raw_fallback=self.raw_fallback,
+        )
+
+    def gen_code(self, type_defs_line: str, compact: bool = False) -> str:
         """
         生成整个模块的代码字符串.
 
         :param type_defs_line: The line to import the type definitions module.
             Example: ``"from boto3_dataclass.tests.gen_code import type_defs"``
+        :param compact: 是否用 compact 模式生成. compact 模式下每个 dataclass 只有一个
+            ``_fields`` 表, 由共享的基类 ``_Base`` 在 ``__init_subclass__`` 中安装字段,
+            不再为每个类生成 ``make_one``, ``make_many`` 和每个字段的代码, 模块和
+            ``.pyc`` 更小, import 更快. 代价是 IDE 无法静态地补全字段.
         """
+        if compact:
+            return tpl_enum.boto3_dataclass_service__package__type_defs_compact_py.render(
+                tddm=self
+            )
         return tpl_enum.boto3_dataclass_service__package__type_defs_py.render(
             tddm=self, type_defs_line=type_defs_line
         )
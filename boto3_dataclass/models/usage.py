@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+
+"""
+这个模块负责对运行时的使用记录 (usage manifest) 进行数据建模, 并根据使用记录
+生成只包含用到的类和方法的 slim 模块, 或者根据 ``service.operation`` 白名单
+生成只包含这些 operation 的 bundle 模块.
+
+使用记录由 ``boto3_dataclass.trace`` 在运行时生成, 格式如下::
+
+    {
+        "services": {
+            "iam": {
+                "operations": ["get_role"],
+                "classes": {
+                    "GetRoleResponse": ["Role"],
+                    "Role": ["Arn", "RoleName"]
+                }
+            }
+        }
+    }
+
+``operations`` 是传给 ``caster.cast()`` 的名称, 即 client 方法名或 botocore 的
+operation 名称. ``classes`` 是 ``{dataclass 类名: 访问过的属性名称}``, 属性名称是
+生成的代码中的名称, 例如 Python 关键字会有下划线后缀.
+"""
+
+import typing as T
+import json
+import dataclasses
+from pathlib import Path
+
+from ..constants import TYPE_DEF
+from ..utils import write
+from .typed_dict import TypedDictDef, TypedDefsModule
+from .caster import CasterModule
+from .reachability import TypeReachabilityGraph
+
+
+@dataclasses.dataclass
+class ServiceUsage:
+    """
+    一个 service 的使用记录.
+
+    :param operations: 用到的 caster 方法名或 botocore operation 名称
+    :param classes: ``{dataclass 类名: 访问过的属性名称}``
+    """
+
+    operations: set[str] = dataclasses.field(default_factory=set)
+    classes: dict[str, set[str]] = dataclasses.field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, T.Any]) -> "ServiceUsage":
+        return cls(
+            operations=set(data.get("operations", [])),
+            classes={
+                class_name: set(attrs)
+                for class_name, attrs in data.get("classes", {}).items()
+            },
+        )
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return {
+            "operations": sorted(self.operations),
+            "classes": {
+                class_name: sorted(self.classes[class_name])
+                for class_name in sorted(self.classes)
+            },
+        }
+
+    def update(self, other: "ServiceUsage"):
+        self.operations.update(other.operations)
+        for class_name, attrs in other.classes.items():
+            self.classes.setdefault(class_name, set()).update(attrs)
+
+
+@dataclasses.dataclass
+class UsageManifest:
+    """
+    多个 service 的使用记录.
+
+    :param services: ``{service 名称: 使用记录}``
+    """
+
+    services: dict[str, ServiceUsage] = dataclasses.field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, T.Any]) -> "UsageManifest":
+        return cls(
+            services={
+                service_name: ServiceUsage.from_dict(usage)
+                for service_name, usage in data.get("services", {}).items()
+            }
+        )
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return {
+            "services": {
+                service_name: self.services[service_name].to_dict()
+                for service_name in sorted(self.services)
+            }
+        }
+
+    @classmethod
+    def read(cls, path: Path) -> "UsageManifest":
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+    def write(self, path: Path):
+        write(path, json.dumps(self.to_dict(), indent=4))
+
+    @classmethod
+    def from_allowlist(cls, names: T.Iterable[str]) -> "UsageManifest":
+        """
+        从 ``service.operation`` 白名单创建只有 operations 的使用记录, 例如
+        ``["s3.list_objects_v2", "dynamodb.Query"]``. operation 可以是 client
+        方法名或 botocore 的 operation 名称.
+        """
+        manifest = cls()
+        for name in names:
+            service_name, sep, operation = name.partition(".")
+            if not (service_name and sep and operation):
+                raise ValueError(
+                    f"Invalid allowlist entry {name!r}, expected 'service.operation'"
+                )
+            usage = manifest.services.setdefault(service_name, ServiceUsage())
+            usage.operations.add(operation)
+        return manifest
+
+    @classmethod
+    def merge(cls, manifests: T.Iterable["UsageManifest"]) -> "UsageManifest":
+        """
+        合并多个使用记录, 例如采样模式下多个进程各自生成的记录.
+        """
+        merged = cls()
+        for manifest in manifests:
+            for service_name, usage in manifest.services.items():
+                merged.services.setdefault(service_name, ServiceUsage()).update(usage)
+        return merged
+
+
+def make_slim_modules(
+    tdm: TypedDefsModule,
+    cm: CasterModule,
+    usage: ServiceUsage,
+) -> tuple[TypedDefsModule, CasterModule]:
+    """
+    根据使用记录生成 slim 的 type_defs 和 caster 模块.
+
+    - 只保留用到的 caster 方法.
+    - 只保留用到的方法的返回类型, 访问过的类, 以及访问过的嵌套字段指向的类.
+    - 每个类只保留访问过的字段, 其他字段由 ``__getattr__`` 直接从
+      ``boto3_raw_data`` 读取原始值, 嵌套的字段也返回原始的 dict,
+      见 :attr:`~boto3_dataclass.models.typed_dict.TypedDefsModule.raw_fallback`.
+
+    使用记录中不存在的类名 (例如来自其他版本) 会被忽略.
+
+    :returns: ``(slim type_defs 模块, slim caster 模块)``
+    """
+    cms = [
+        method
+        for method in cm.cms
+        if method.method_name in usage.operations
+        or method.operation_name in usage.operations
+    ]
+
+    def resolve(name: str) -> str:
+        return tdm.aliases.get(name, name)
+
+    used_attrs: dict[str, set[str]] = dict()
+    for class_name, attrs in usage.classes.items():
+        name = resolve(f"{class_name}{TYPE_DEF}")
+        if name in tdm.tdds_mapping:
+            used_attrs.setdefault(name, set()).update(attrs)
+    keep = {resolve(method.boto3_stubs_type_name) for method in cms}
+    keep.update(used_attrs)
+
+    # the nested fields return a dataclass, its class is needed even if no
+    # field of it is accessed
+    queue = list(keep)
+    for name in queue:
+        tdd = tdm.tdds_mapping.get(name)
+        if tdd is None:
+            continue
+        attrs = used_attrs.get(name, set())
+        for tdf in tdd.fields:
+            if tdf.anno.is_nested_typed_dict and tdf.safe_field_name in attrs:
+                target = resolve(tdf.anno.nested_type_name)
+                if target not in keep:
+                    keep.add(target)
+                    queue.append(target)
+
+    tdds = [
+        TypedDictDef(
+            name=tdd.name,
+            fields=[
+                tdf
+                for tdf in tdd.fields
+                if tdf.safe_field_name in used_attrs.get(tdd.name, ())
+            ],
+        )
+        for tdd in tdm.tdds
+        if tdd.name in keep
+    ]
+    aliases = {alias: name for alias, name in tdm.aliases.items() if name in keep}
+    core_imports = {
+        name: core_name for name, core_name in tdm.core_imports.items() if name in keep
+    }
+    slim_tdm = TypedDefsModule(
+        tdds=tdds,
+        aliases=aliases,
+        core_imports=core_imports,
+        raw_fallback=True,
+    )
+    slim_cm = CasterModule(service_name=cm.service_name, cms=cms)
+    return slim_tdm, slim_cm
+
+
+def make_bundle_modules(
+    tdm: TypedDefsModule,
+    cm: CasterModule,
+    operations: T.Iterable[str],
+) -> tuple[TypedDefsModule, CasterModule]:
+    """
+    只保留白名单中的 caster 方法, 以及它们的返回类型能到达的所有 TypedDict,
+    每个类保留所有字段, 见 :class:`~boto3_dataclass.models.reachability.TypeReachabilityGraph`.
+
+    :param operations: client 方法名或 botocore 的 operation 名称
+
+    :raises ValueError: 如果 ``cm`` 中没有某个 operation
+
+    :returns: ``(bundle type_defs 模块, bundle caster 模块)``
+    """
+    operations = set(operations)
+    cms = [
+        method
+        for method in cm.cms
+        if method.method_name in operations or method.operation_name in operations
+    ]
+    found = {method.method_name for method in cms}
+    found.update(method.operation_name for method in cms)
+    missing = operations - found
+    if missing:
+        raise ValueError(
+            f"{cm.service_name} has no caster method for {sorted(missing)}"
+        )
+    bundle_cm = CasterModule(service_name=cm.service_name, cms=cms)
+    bundle_tdm = TypeReachabilityGraph.new(tdm=tdm, cm=bundle_cm).shake(tdm)
+    return bundle_tdm, bundle_cm
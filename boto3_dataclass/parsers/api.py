@@ -5,3 +5,9 @@ from .type_defs_parser import TypedDefsModuleParser
 from .type_defs_parser import TypedDictFieldAnnotationParser
 from .type_defs_parser import TypedDictFieldParser
 from .client_parser import ClientModuleParser
+from .botocore_parser import BotocoreModelParser
+from .botocore_parser import BotocoreTypedDefsModuleParser
+from .botocore_parser import BotocoreClientModuleParser
+from .parity import ServiceParity
+from .parity import ParserParityReport
+from .parity import run_parser_parity_all
@@ -0,0 +1,495 @@
+# -*- coding: utf-8 -*-
+
+"""
+直接从 botocore 自带的 ``botocore/data/${aws_service}/${api_version}/service-2.json``
+service model 中解析出和 stub parser 完全相同的中间结构 (IR), 也就是
+:class:`~boto3_dataclass.models.typed_dict.TypedDefsModule` 和
+:class:`~boto3_dataclass.models.caster.CasterModule`.
+
+stub parser 需要 AST 解析 ``mypy_boto3_*`` 的 200 多万行 ``.pyi`` 文件, 而 service model
+是一个紧凑的 JSON 文件. 为了让生成的代码和 stub parser 的结果尽量一致, 这里模仿了
+``mypy-boto3-builder`` 的命名规则:
+
+- 每个 structure shape ``Foo`` 对应一个 ``FooTypeDef``, exception shape, document
+  shape 和没有字段的 shape 除外.
+- 既出现在 input 中又出现在 output 中的 shape, 如果它包含 list, map, timestamp, blob,
+  document 这些 input / output 类型不一样的字段, 那么 output 中用到的是 ``FooOutputTypeDef``.
+- operation 的 output shape 会被加上 ``ResponseMetadata`` 字段. 如果这个 shape 同时
+  还被其他 shape 当作字段引用, 那么 output 用的是 ``FooResponseTypeDef``.
+- 没有 output 的 operation 返回 ``EmptyResponseMetadataTypeDef``, output 是一个没有
+  字段的 structure 的 operation 在 stub 中返回 ``Dict[str, Any]``, 所以没有 caster 方法.
+
+两个 parser 的结果的差异可以用 :mod:`boto3_dataclass.parsers.parity` 来对比.
+
+.. note::
+
+    botocore 的 :class:`botocore.model.Shape` 每次访问 ``members`` 都会重新创建
+    所有字段的 Shape 对象, 遍历整个 service model 的时候非常慢. 所以这里直接遍历
+    ``service-2.json`` 的 dict, 只用到了 botocore 的 loader 和 ``xform_name``.
+
+.. note::
+
+    这个模块中的所有 ``*Parser`` 类都使用了 Command Pattern, 也就是虽然是一个类,
+    但是它被用来当成一个函数来使用, 主函数只有 ``.parse()`` 这一个. 在整个生命周期内,
+    把需要共享的数据作为属性放在 ``_attr_name`` 的属性中, 使得代码更加简洁清晰.
+"""
+
+import typing as T
+import dataclasses
+from functools import cached_property
+
+from botocore import xform_name
+from botocore.loaders import Loader
+
+from ..constants import TYPE_DEF
+from ..models.typed_dict import (
+    TypedDictFieldAnnotation,
+    TypedDictField,
+    TypedDictDef,
+    TypedDefsModule,
+)
+from ..models.caster import CasterMethod, CasterModule
+
+RESPONSE_METADATA = "ResponseMetadata"
+EMPTY_RESPONSE_METADATA = "EmptyResponseMetadata"
+
+# output 中的类型和 input 中的类型不一样的 shape 类型, 例如 input 中的 list 是
+# ``Sequence[str]``, 而 output 中是 ``List[str]``
+_VARIANT_TYPE_NAMES = {"list", "map", "timestamp", "blob"}
+
+T_SHAPE = dict[str, T.Any]
+
+
+def get_botocore_service_name(
+    service_name: str,
+    loader: Loader | None = None,
+) -> str:
+    """
+    把 ``boto3_dataclass_${service_name}`` 中的 service name (例如 ``sso_admin``)
+    转换成 botocore 中的 service name (例如 ``sso-admin``).
+    """
+    if loader is None:
+        loader = Loader()
+    for name in loader.list_available_services("service-2"):
+        if name.replace("-", "_") == service_name:
+            return name
+    raise ValueError(f"Service {service_name!r} not found in botocore data")
+
+
+@dataclasses.dataclass
+class BotocoreModelParser:
+    """
+    从 botocore 的 service model 中解析出结构化的信息, 是
+    :class:`BotocoreTypedDefsModuleParser` 和 :class:`BotocoreClientModuleParser`
+    的基类, 负责 shape 和 TypedDict 名字之间的映射.
+
+    :param service_name: boto3_dataclass 中的 service name, 例如 ``iam``, ``sso_admin``.
+    :param loader: botocore 的 loader, 默认每个 parser 用一个新的 loader, 这样
+        service model 不会被缓存, 解析时间更有参考价值.
+    """
+
+    service_name: str = dataclasses.field()
+    loader: Loader | None = dataclasses.field(default=None)
+
+    @cached_property
+    def service_data(self) -> dict[str, T.Any]:
+        """
+        ``service-2.json`` 的内容.
+        """
+        loader = self.loader if self.loader is not None else Loader()
+        botocore_service_name = get_botocore_service_name(self.service_name, loader)
+        return loader.load_service_model(botocore_service_name, "service-2")
+
+    @property
+    def shapes(self) -> dict[str, T_SHAPE]:
+        """
+        ``{shape_name: shape}``, 按照 service model 中的顺序.
+        """
+        return self.service_data["shapes"]
+
+    @cached_property
+    def operation_inputs(self) -> dict[str, str | None]:
+        """
+        ``{operation_name: input_shape_name}``, 没有 input 的 operation 是 None.
+        """
+        return {
+            operation_name: operation.get("input", {}).get("shape")
+            for operation_name, operation in self.service_data["operations"].items()
+        }
+
+    @cached_property
+    def operation_outputs(self) -> dict[str, str | None]:
+        """
+        ``{operation_name: output_shape_name}``, 没有 output 的 operation 是 None.
+        """
+        return {
+            operation_name: operation.get("output", {}).get("shape")
+            for operation_name, operation in self.service_data["operations"].items()
+        }
+
+    @cached_property
+    def operation_names(self) -> dict[str, str]:
+        """
+        ``{client_method_name: operation_name}``, 例如 ``{"get_role": "GetRole"}``.
+        """
+        return {
+            xform_name(operation_name): operation_name
+            for operation_name in self.service_data["operations"]
+        }
+
+    def set_operation_names(self, cm: CasterModule):
+        """
+        给 stub parser 解析出来的 :class:`~boto3_dataclass.models.caster.CasterModule`
+        补上 botocore 的 operation 名称, boto3 自定义的方法保持为 None.
+        """
+        for caster_method in cm.cms:
+            caster_method.operation_name = self.operation_names.get(
+                caster_method.method_name
+            )
+
+    @staticmethod
+    def is_typed_dict_shape(shape: T_SHAPE) -> bool:
+        """
+        判断一个 shape 是否对应一个 TypedDict. exception 永远不会作为返回值,
+        document 和没有字段的 structure 在 stub 中都是 ``Dict[str, Any]``.
+        """
+        return (
+            shape["type"] == "structure"
+            and len(shape.get("members", {})) > 0
+            and not shape.get("exception", False)
+            and not shape.get("document", False)
+            and not shape.get("eventstream", False)
+        )
+
+    @cached_property
+    def structure_shape_names(self) -> list[str]:
+        """
+        所有需要生成 TypedDict 的 structure shape 的名字, 按照 service model 中的顺序.
+        """
+        return [
+            shape_name
+            for shape_name, shape in self.shapes.items()
+            if self.is_typed_dict_shape(shape)
+        ]
+
+    @staticmethod
+    def iter_member_shape_names(shape: T_SHAPE) -> T.Iterable[str]:
+        """
+        遍历一个 shape 直接引用的所有 shape 的名字.
+        """
+        type_name = shape["type"]
+        if type_name == "structure":
+            for member in shape.get("members", {}).values():
+                yield member["shape"]
+        elif type_name == "list":
+            yield shape["member"]["shape"]
+        elif type_name == "map":
+            yield shape["key"]["shape"]
+            yield shape["value"]["shape"]
+
+    def collect_reachable(self, shape_names: T.Iterable[str | None]) -> set[str]:
+        """
+        找到从这些 shape 出发能访问到的所有 structure shape 的名字.
+        """
+        names = set()
+        visited = set()
+        stack = [shape_name for shape_name in shape_names if shape_name is not None]
+        while stack:
+            shape_name = stack.pop()
+            if shape_name in visited:
+                continue
+            visited.add(shape_name)
+            shape = self.shapes[shape_name]
+            if shape["type"] == "structure":
+                names.add(shape_name)
+            stack.extend(self.iter_member_shape_names(shape))
+        return names
+
+    @cached_property
+    def input_shape_names(self) -> set[str]:
+        """
+        所有能从 operation 的 input 访问到的 structure shape 的名字.
+        """
+        return self.collect_reachable(self.operation_inputs.values())
+
+    @cached_property
+    def output_shape_names(self) -> set[str]:
+        """
+        所有能从 operation 的 output 访问到的 structure shape 的名字.
+        """
+        return self.collect_reachable(self.operation_outputs.values())
+
+    @cached_property
+    def member_shape_names(self) -> set[str]:
+        """
+        所有被其他 shape 当作字段 (或 list / map 的元素) 引用的 shape 的名字.
+        """
+        names = set()
+        for shape in self.shapes.values():
+            names.update(self.iter_member_shape_names(shape))
+        return names
+
+    @cached_property
+    def operation_output_shape_names(self) -> set[str]:
+        """
+        所有有字段的 operation output shape 的名字.
+        """
+        return {
+            shape_name
+            for shape_name in self.operation_outputs.values()
+            if shape_name is not None and self.shapes[shape_name].get("members")
+        }
+
+    @cached_property
+    def has_empty_response(self) -> bool:
+        """
+        是否有 operation 没有 output, 也就是返回 ``EmptyResponseMetadataTypeDef``.
+        """
+        return any(shape_name is None for shape_name in self.operation_outputs.values())
+
+    @cached_property
+    def variant_shape_names(self) -> set[str]:
+        """
+        在 input 和 output 中类型不一样的 structure shape 的名字, 也就是直接或者
+        间接包含了 list, map, timestamp, blob, document 字段的 shape. 没有字段的
+        structure 和 document 一样, 在 input 中是 ``Mapping``, 在 output 中是 ``Dict``.
+        """
+        cache: dict[str, bool] = dict()
+
+        def is_variant(shape_name: str) -> bool:
+            shape = self.shapes[shape_name]
+            type_name = shape["type"]
+            if type_name in _VARIANT_TYPE_NAMES:
+                return True
+            if type_name != "structure":
+                return False
+            if not self.is_typed_dict_shape(shape):
+                return True
+            if shape_name not in cache:
+                cache[shape_name] = False  # 防止循环引用导致的无限递归
+                cache[shape_name] = any(
+                    is_variant(member_shape_name)
+                    for member_shape_name in self.iter_member_shape_names(shape)
+                )
+            return cache[shape_name]
+
+        return {
+            shape_name
+            for shape_name in self.structure_shape_names
+            if is_variant(shape_name)
+        }
+
+    @cached_property
+    def output_variant_shape_names(self) -> set[str]:
+        """
+        需要额外生成一个 ``FooOutputTypeDef`` 的 shape 的名字.
+        """
+        return (
+            self.variant_shape_names & self.input_shape_names & self.output_shape_names
+        )
+
+    @cached_property
+    def response_shape_names(self) -> set[str]:
+        """
+        需要额外生成一个 ``FooResponseTypeDef`` 的 output shape 的名字.
+        """
+        return self.operation_output_shape_names & self.member_shape_names
+
+    def get_type_def_name(self, shape_name: str, is_output: bool) -> str:
+        """
+        获得一个 structure shape 在 input 或 output 中对应的 TypedDict 名字.
+        """
+        if is_output and shape_name in self.output_variant_shape_names:
+            return f"{shape_name}Output{TYPE_DEF}"
+        return f"{shape_name}{TYPE_DEF}"
+
+    def get_operation_type_def_name(self, shape_name: str | None) -> str | None:
+        """
+        获得一个 operation 的返回值对应的 TypedDict 名字. output 是一个没有字段的
+        structure 的时候, stub 中的返回值是 ``Dict[str, Any]``, 这时候返回 None.
+        """
+        if shape_name is None:
+            return f"{EMPTY_RESPONSE_METADATA}{TYPE_DEF}"
+        if shape_name not in self.operation_output_shape_names:
+            return None
+        if shape_name in self.response_shape_names:
+            return f"{shape_name}Response{TYPE_DEF}"
+        return self.get_type_def_name(shape_name, is_output=True)
+
+
+@dataclasses.dataclass
+class BotocoreTypedDefsModuleParser(BotocoreModelParser):
+    """
+    从 botocore 的 service model 中解析出所有的 TypedDict 定义, 结果和
+    :class:`~boto3_dataclass.parsers.type_defs_parser.TypedDefsModuleParser` 一样.
+    """
+
+    _tdm: TypedDefsModule = dataclasses.field(init=False)
+
+    @property
+    def tdm(self) -> TypedDefsModule:
+        return self._tdm
+
+    def parse(self) -> TypedDefsModule:
+        """
+        为每一个 structure shape 生成 TypedDict 定义, 然后加上 ``ResponseMetadataTypeDef``
+        和 ``EmptyResponseMetadataTypeDef``.
+        """
+        tdds = [self.make_response_metadata_tdd()]
+        if self.has_empty_response:
+            tdds.append(self.make_empty_response_metadata_tdd())
+        for shape_name in self.structure_shape_names:
+            is_output = shape_name not in self.input_shape_names
+            is_operation_output = shape_name in self.operation_output_shape_names
+            has_response = shape_name in self.response_shape_names
+            tdds.append(
+                self.parse_structure(
+                    name=f"{shape_name}{TYPE_DEF}",
+                    shape_name=shape_name,
+                    is_output=is_output,
+                    with_response_metadata=is_operation_output and not has_response,
+                )
+            )
+            if shape_name in self.output_variant_shape_names:
+                tdds.append(
+                    self.parse_structure(
+                        name=self.get_type_def_name(shape_name, is_output=True),
+                        shape_name=shape_name,
+                        is_output=True,
+                        with_response_metadata=False,
+                    )
+                )
+            if has_response:
+                tdds.append(
+                    self.parse_structure(
+                        name=self.get_operation_type_def_name(shape_name),
+                        shape_name=shape_name,
+                        is_output=True,
+                        with_response_metadata=True,
+                    )
+                )
+        self._tdm = TypedDefsModule(tdds=tdds)
+        return self.tdm
+
+    def make_response_metadata_tdd(self) -> TypedDictDef:
+        """
+        botocore 会在每个 response 中加上 ``ResponseMetadata``, 它不在 service model 中.
+        """
+        return TypedDictDef(
+            name=f"{RESPONSE_METADATA}{TYPE_DEF}",
+            fields=[
+                TypedDictField(name="RequestId"),
+                TypedDictField(name="HTTPStatusCode"),
+                TypedDictField(name="HTTPHeaders"),
+                TypedDictField(name="RetryAttempts"),
+                TypedDictField(name="HostId"),
+            ],
+        )
+
+    def make_response_metadata_tdf(self) -> TypedDictField:
+        return TypedDictField(
+            name=RESPONSE_METADATA,
+            anno=TypedDictFieldAnnotation(
+                is_nested_typed_dict=True,
+                nested_type_name=f"{RESPONSE_METADATA}{TYPE_DEF}",
+            ),
+        )
+
+    def make_empty_response_metadata_tdd(self) -> TypedDictDef:
+        """
+        没有返回值的 operation 只会返回 ``ResponseMetadata``.
+        """
+        return TypedDictDef(
+            name=f"{EMPTY_RESPONSE_METADATA}{TYPE_DEF}",
+            fields=[self.make_response_metadata_tdf()],
+        )
+
+    def parse_structure(
+        self,
+        name: str,
+        shape_name: str,
+        is_output: bool,
+        with_response_metadata: bool,
+    ) -> TypedDictDef:
+        """
+        把一个 structure shape 解析成 TypedDict 定义.
+
+        :param name: TypedDict 的名称
+        :param shape_name: structure shape 的名称
+        :param is_output: 嵌套的 TypedDict 是否使用 output 中的名字
+        :param with_response_metadata: 是否加上 ``ResponseMetadata`` 字段
+        """
+        fields = [
+            TypedDictField(
+                name=member_name,
+                anno=self.parse_member(member["shape"], is_output=is_output),
+            )
+            for member_name, member in self.shapes[shape_name]["members"].items()
+        ]
+        if with_response_metadata:
+            fields.append(self.make_response_metadata_tdf())
+        return TypedDictDef(name=name, fields=fields)
+
+    def parse_member(
+        self,
+        shape_name: str,
+        is_output: bool,
+    ) -> TypedDictFieldAnnotation:
+        """
+        把一个字段的 shape 解析成类型注解信息. 和
+        :class:`~boto3_dataclass.parsers.type_defs_parser.TypedDictFieldAnnotationParser`
+        的逻辑保持一致: list 会一层层往里找, 直到找到 structure; map 里面的 structure
+        不算嵌套的 TypedDict.
+        """
+        tdfa = TypedDictFieldAnnotation()
+        shape = self.shapes[shape_name]
+        while shape["type"] == "list":
+            tdfa.nested_type_subscriptor = "List"
+            shape_name = shape["member"]["shape"]
+            shape = self.shapes[shape_name]
+        if self.is_typed_dict_shape(shape):
+            tdfa.is_nested_typed_dict = True
+            tdfa.nested_type_name = self.get_type_def_name(
+                shape_name,
+                is_output=is_output,
+            )
+        return tdfa
+
+
+@dataclasses.dataclass
+class BotocoreClientModuleParser(BotocoreModelParser):
+    """
+    从 botocore 的 service model 中解析出所有的 client 方法, 结果和
+    :class:`~boto3_dataclass.parsers.client_parser.ClientModuleParser` 一样.
+    """
+
+    _caster_module: CasterModule = dataclasses.field(init=False)
+
+    @property
+    def caster_module(self) -> CasterModule:
+        return self._caster_module
+
+    def parse(self) -> CasterModule:
+        """
+        为每一个返回 TypedDict 的 operation 生成一个
+        :class:`~boto3_dataclass.models.caster.CasterMethod`, 方法名和 boto3 client
+        一样是 ``xform_name(operation_name)``. 和 stub 中一样按照 operation name 排序.
+        """
+        methods = list()
+        for operation_name, shape_name in sorted(self.operation_outputs.items()):
+            return_type = self.get_operation_type_def_name(shape_name)
+            if return_type is None:
+                continue
+            methods.append(
+                CasterMethod(
+                    method_name=xform_name(operation_name),
+                    boto3_stubs_type_name=return_type,
+                    boto3_dataclass_type_name=return_type.removesuffix(TYPE_DEF),
+                    operation_name=operation_name,
+                )
+            )
+        self._caster_module = CasterModule(
+            service_name=self.service_name,
+            cms=methods,
+        )
+        return self.caster_module
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+
+"""
+对比 stub parser (:mod:`~boto3_dataclass.parsers.type_defs_parser`,
+:mod:`~boto3_dataclass.parsers.client_parser`) 和 botocore parser
+(:mod:`~boto3_dataclass.parsers.botocore_parser`) 的解析结果, 并且统计两者的解析时间.
+
+stub 中有很多 botocore service model 里没有的 TypedDict, 例如 resource, paginator,
+waiter 的参数. 它们永远不会出现在 caster 的返回值中, 所以我们只对比从 caster
+方法的返回值出发能访问到的 TypedDict, 这些才会影响生成的代码的行为.
+"""
+
+import typing as T
+import json
+import time
+import dataclasses
+from pathlib import Path
+
+import mpire
+from botocore.loaders import Loader
+
+from ..paths import path_enum
+from ..utils import write
+from ..models.typed_dict import TypedDefsModule
+from ..models.caster import CasterModule
+from ..structures.boto3_dataclass_service import Boto3DataclassServiceStructure
+
+from .type_defs_parser import TypedDefsModuleParser
+from .client_parser import ClientModuleParser
+from .botocore_parser import BotocoreTypedDefsModuleParser, BotocoreClientModuleParser
+
+
+def get_reachable_type_def_names(
+    tdm: TypedDefsModule,
+    cm: CasterModule,
+) -> set[str]:
+    """
+    找到从所有 caster 方法的返回值出发, 通过嵌套字段能访问到的所有 TypedDict 的名字.
+    """
+    names = set()
+    stack = [caster_method.boto3_stubs_type_name for caster_method in cm.cms]
+    while stack:
+        name = stack.pop()
+        if name in names or name not in tdm.tdds_mapping:
+            continue
+        names.add(name)
+        for tdf in tdm.tdds_mapping[name].fields:
+            if tdf.anno.is_nested_typed_dict:
+                stack.append(tdf.anno.nested_type_name)
+    return names
+
+
+def _field_signatures(tdm: TypedDefsModule, name: str) -> dict[str, tuple]:
+    return {
+        tdf.name: (
+            tdf.anno.is_nested_typed_dict,
+            tdf.anno.nested_type_name,
+            tdf.anno.nested_type_subscriptor,
+        )
+        for tdf in tdm.tdds_mapping[name].fields
+    }
+
+
+@dataclasses.dataclass
+class ServiceParity:
+    """
+    一个 service 的两种 parser 的对比结果.
+
+    :param service_name: 例如 ``iam``
+    :param stub_parse_time: stub parser 解析 ``type_defs.pyi`` 和 ``client.pyi`` 的时间 (秒)
+    :param botocore_parse_time: botocore parser 加载和解析 service model 的时间 (秒)
+    :param stub_typed_dicts: stub parser 解析出来的 TypedDict 的数量
+    :param botocore_typed_dicts: botocore parser 解析出来的 TypedDict 的数量
+    :param caster_methods: 两种 parser 都有的 caster 方法的数量
+    :param methods_only_in_stub: 只有 stub parser 有的 caster 方法
+    :param methods_only_in_botocore: 只有 botocore parser 有的 caster 方法
+    :param method_type_mismatches: 返回值类型不一样的 caster 方法,
+        ``{method_name: [stub_type_name, botocore_type_name]}``
+    :param reachable_typed_dicts: 两种 parser 都能从 caster 返回值访问到的 TypedDict 的数量
+    :param typed_dicts_only_in_stub: 只有 stub parser 能从 caster 返回值访问到的 TypedDict
+    :param typed_dicts_only_in_botocore: 只有 botocore parser 能从 caster 返回值访问到的 TypedDict
+    :param field_mismatches: 字段不一样的 TypedDict, ``{type_def_name: [field_name, ...]}``
+    :param error: 任何一个 parser 解析失败时的错误信息
+    """
+
+    service_name: str = dataclasses.field()
+    stub_parse_time: float = dataclasses.field(default=0.0)
+    botocore_parse_time: float = dataclasses.field(default=0.0)
+    stub_typed_dicts: int = dataclasses.field(default=0)
+    botocore_typed_dicts: int = dataclasses.field(default=0)
+    caster_methods: int = dataclasses.field(default=0)
+    methods_only_in_stub: list[str] = dataclasses.field(default_factory=list)
+    methods_only_in_botocore: list[str] = dataclasses.field(default_factory=list)
+    method_type_mismatches: dict[str, list[str]] = dataclasses.field(
+        default_factory=dict
+    )
+    reachable_typed_dicts: int = dataclasses.field(default=0)
+    typed_dicts_only_in_stub: list[str] = dataclasses.field(default_factory=list)
+    typed_dicts_only_in_botocore: list[str] = dataclasses.field(default_factory=list)
+    field_mismatches: dict[str, list[str]] = dataclasses.field(default_factory=dict)
+    error: str | None = dataclasses.field(default=None)
+
+    @property
+    def is_identical(self) -> bool:
+        """
+        两种 parser 生成的 caster 以及 caster 能访问到的 dataclass 是否完全一样.
+        """
+        return (
+            self.error is None
+            and not self.methods_only_in_stub
+            and not self.methods_only_in_botocore
+            and not self.method_type_mismatches
+            and not self.typed_dicts_only_in_stub
+            and not self.typed_dicts_only_in_botocore
+            and not self.field_mismatches
+        )
+
+    @classmethod
+    def compare(
+        cls,
+        structure: Boto3DataclassServiceStructure,
+    ) -> "ServiceParity":
+        """
+        分别用两种 parser 解析一个 service, 然后对比结果.
+        """
+        parity = cls(service_name=structure.service_name)
+        try:
+            start = time.perf_counter()
+            stub_tdm = TypedDefsModuleParser(
+                path_stub_file=structure.path_mypy_boto3_type_defs_pyi,
+            ).parse()
+            stub_cm = ClientModuleParser(
+                path_stub_file=structure.path_mypy_boto3_client_pyi,
+            ).parse()
+            parity.stub_parse_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            # a fresh loader shared by both parsers, so the model is loaded once
+            loader = Loader()
+            botocore_tdm = BotocoreTypedDefsModuleParser(
+                service_name=structure.service_name,
+                loader=loader,
+            ).parse()
+            botocore_cm = BotocoreClientModuleParser(
+                service_name=structure.service_name,
+                loader=loader,
+            ).parse()
+            parity.botocore_parse_time = time.perf_counter() - start
+        except Exception as e:
+            parity.error = f"{type(e).__name__}: {e}"
+            return parity
+
+        parity.stub_typed_dicts = len(stub_tdm.tdds)
+        parity.botocore_typed_dicts = len(botocore_tdm.tdds)
+
+        # compare caster methods
+        stub_cms, botocore_cms = stub_cm.cms_mapping, botocore_cm.cms_mapping
+        common_methods = sorted(set(stub_cms).intersection(botocore_cms))
+        parity.caster_methods = len(common_methods)
+        parity.methods_only_in_stub = sorted(set(stub_cms).difference(botocore_cms))
+        parity.methods_only_in_botocore = sorted(set(botocore_cms).difference(stub_cms))
+        for method_name in common_methods:
+            stub_type = stub_cms[method_name].boto3_stubs_type_name
+            botocore_type = botocore_cms[method_name].boto3_stubs_type_name
+            if stub_type != botocore_type:
+                parity.method_type_mismatches[method_name] = [stub_type, botocore_type]
+
+        # compare the TypedDict reachable from the caster methods
+        stub_names = get_reachable_type_def_names(stub_tdm, stub_cm)
+        botocore_names = get_reachable_type_def_names(botocore_tdm, botocore_cm)
+        common_names = sorted(stub_names.intersection(botocore_names))
+        parity.reachable_typed_dicts = len(common_names)
+        parity.typed_dicts_only_in_stub = sorted(stub_names.difference(botocore_names))
+        parity.typed_dicts_only_in_botocore = sorted(
+            botocore_names.difference(stub_names)
+        )
+        for name in common_names:
+            stub_fields = _field_signatures(stub_tdm, name)
+            botocore_fields = _field_signatures(botocore_tdm, name)
+            if stub_fields != botocore_fields:
+                parity.field_mismatches[name] = sorted(
+                    field_name
+                    for field_name in set(stub_fields).union(botocore_fields)
+                    if stub_fields.get(field_name) != botocore_fields.get(field_name)
+                )
+        return parity
+
+
+@dataclasses.dataclass
+class ParserParityReport:
+    """
+    所有 service 的两种 parser 的对比结果.
+
+    :param version: boto3_dataclass 的版本
+    :param services: ``{service_name: ServiceParity}``
+    """
+
+    version: str = dataclasses.field()
+    services: dict[str, ServiceParity] = dataclasses.field(default_factory=dict)
+
+    @property
+    def identical(self) -> list[ServiceParity]:
+        return [parity for parity in self.services.values() if parity.is_identical]
+
+    @property
+    def different(self) -> list[ServiceParity]:
+        return [parity for parity in self.services.values() if not parity.is_identical]
+
+    @property
+    def total_stub_parse_time(self) -> float:
+        return sum(parity.stub_parse_time for parity in self.services.values())
+
+    @property
+    def total_botocore_parse_time(self) -> float:
+        return sum(parity.botocore_parse_time for parity in self.services.values())
+
+    def to_dict(self) -> dict[str, T.Any]:
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, T.Any]) -> "ParserParityReport":
+        return cls(
+            version=data["version"],
+            services={
+                service_name: ServiceParity(**parity)
+                for service_name, parity in data["services"].items()
+            },
+        )
+
+    def write(self, path: Path):
+        write(path, json.dumps(self.to_dict(), indent=2))
+
+    @classmethod
+    def read(cls, path: Path) -> "ParserParityReport":
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+    def summary(self) -> str:
+        """
+        Human readable summary, 包括解析时间和有差异的 service.
+        """
+        stub_time = self.total_stub_parse_time
+        botocore_time = self.total_botocore_parse_time
+        speedup = stub_time / botocore_time if botocore_time else 0.0
+        lines = [
+            f"Number of service: {len(self.services)}",
+            f"Identical: {len(self.identical)}, different: {len(self.different)}",
+            f"Total stub parse time: {stub_time:.3f} seconds",
+            f"Total botocore parse time: {botocore_time:.3f} seconds ({speedup:.1f}x)",
+        ]
+        for parity in sorted(self.different, key=lambda p: p.service_name):
+            if parity.error is not None:
+                lines.append(f"- {parity.service_name}: {parity.error}")
+                continue
+            lines.append(
+                f"- {parity.service_name}: "
+                f"methods only in stub = {parity.methods_only_in_stub}, "
+                f"methods only in botocore = {parity.methods_only_in_botocore}, "
+                f"return type mismatches = {len(parity.method_type_mismatches)}, "
+                f"typed dicts only in stub = {len(parity.typed_dicts_only_in_stub)}, "
+                f"typed dicts only in botocore = {len(parity.typed_dicts_only_in_botocore)}, "
+                f"field mismatches = {len(parity.field_mismatches)}"
+            )
+        return "\n".join(lines)
+
+
+def get_path_parser_parity_report(version: str) -> Path:
+    """
+    Example: ``build/parser_parity/1.40.0.json``
+    """
+    return path_enum.dir_build / "parser_parity" / f"{version}.json"
+
+
+def run_parser_parity_all(
+    version: str,
+    structures: list[Boto3DataclassServiceStructure],
+    n_workers: int | None = 1,
+) -> ParserParityReport:
+    """
+    对比所有 service 的两种 parser 的解析结果.
+
+    :param version: boto3_dataclass 的版本
+    :param structures: 需要对比的 service
+    :param n_workers: 并行的进程数. 默认是 1, 因为并行会让解析时间的统计不准确,
+        只关心对比结果的时候可以设为 None (cpu count).
+    """
+    if n_workers == 1:
+        parities = [ServiceParity.compare(structure) for structure in structures]
+    else:
+        with mpire.WorkerPool(n_jobs=n_workers, start_method="fork") as pool:
+            parities = pool.map(
+                ServiceParity.compare,
+                [(structure,) for structure in structures],
+            )
+    return ParserParityReport(
+        version=version,
+        services={parity.service_name: parity for parity in parities},
+    )
@@ -36,6 +36,7 @@ class PathEnum:
     path_pyproject_toml = dir_project_root / "pyproject.toml"
     path_requirements_txt = dir_project_root / "requirements.txt"
     dir_tmp = dir_project_root / "tmp"
+    dir_build = dir_project_root / "build"
 
     # Source Code
     dir_templates = dir_python_lib / "templates"
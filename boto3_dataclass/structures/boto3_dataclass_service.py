@@ -172,6 +172,25 @@ class Boto3DataclassServiceStructure(PyProjectStructure):
         """
         return self.dir_mypy_boto3_package / "client.pyi"
 
+    @cached_property
+    def estimated_build_cost(self) -> int:
+        """
+        Estimate how expensive it is to build this service package.
+
+        The build time is dominated by parsing the ``type_defs.pyi`` and
+        ``client.pyi`` stub files and formatting the generated code, both are
+        roughly linear to the stub file size. So we use the total size in bytes
+        of these two files as the cost.
+        """
+        cost = 0
+        for path in [
+            self.path_mypy_boto3_type_defs_pyi,
+            self.path_mypy_boto3_client_pyi,
+        ]:
+            if path.exists():
+                cost += path.stat().st_size
+        return cost
+
     @classmethod
     def list_all(cls) -> list["Boto3DataclassServiceStructure"]:
         """
@@ -39,6 +39,14 @@ class TemplateEnum:
     def boto3_dataclass_service__package__typed_dict_field(self):
         return load_template("boto3_dataclass_service/package/typed_dict_field.jinja")
     
+    @cached_property
+    def boto3_dataclass_service__package__type_defs_compact_py(self):
+        return load_template("boto3_dataclass_service/package/type_defs_compact.py.jinja")
+    
+    @cached_property
+    def boto3_dataclass_service__package__typed_dict_def_compact(self):
+        return load_template("boto3_dataclass_service/package/typed_dict_def_compact.jinja")
+    
     @cached_property
     def boto3_dataclass_service__package____init___py(self):
         return load_template("boto3_dataclass_service/package/__init__.py.jinja")
@@ -63,9 +71,65 @@ class TemplateEnum:
     def boto3_dataclass__pyproject_toml(self):
         return load_template("boto3_dataclass/pyproject.toml.jinja")
     
+    @cached_property
+    def boto3_dataclass__package__trace_py(self):
+        return load_template("boto3_dataclass/package/trace.py.jinja")
+    
+    @cached_property
+    def boto3_dataclass__package__shm_py(self):
+        return load_template("boto3_dataclass/package/shm.py.jinja")
+    
+    @cached_property
+    def boto3_dataclass__package__aio_py(self):
+        return load_template("boto3_dataclass/package/aio.py.jinja")
+    
+    @cached_property
+    def boto3_dataclass__package__archive_py(self):
+        return load_template("boto3_dataclass/package/archive.py.jinja")
+    
+    @cached_property
+    def boto3_dataclass__package__factory_py(self):
+        return load_template("boto3_dataclass/package/factory.py.jinja")
+    
+    @cached_property
+    def boto3_dataclass__package__hook_py(self):
+        return load_template("boto3_dataclass/package/hook.py.jinja")
+    
     @cached_property
     def boto3_dataclass__package____init___py(self):
         return load_template("boto3_dataclass/package/__init__.py.jinja")
     
+    @cached_property
+    def boto3_dataclass_bundle__README_rst(self):
+        return load_template("boto3_dataclass_bundle/README.rst.jinja")
+    
+    @cached_property
+    def boto3_dataclass_bundle__pyproject_toml(self):
+        return load_template("boto3_dataclass_bundle/pyproject.toml.jinja")
+    
+    @cached_property
+    def boto3_dataclass_bundle__package____init___py(self):
+        return load_template("boto3_dataclass_bundle/package/__init__.py.jinja")
+    
+    @cached_property
+    def boto3_dataclass_core__README_rst(self):
+        return load_template("boto3_dataclass_core/README.rst.jinja")
+    
+    @cached_property
+    def boto3_dataclass_core__pyproject_toml(self):
+        return load_template("boto3_dataclass_core/pyproject.toml.jinja")
+    
+    @cached_property
+    def boto3_dataclass_core__package____init___py(self):
+        return load_template("boto3_dataclass_core/package/__init__.py.jinja")
+    
+    @cached_property
+    def boto3_dataclass_slim__package____init___py(self):
+        return load_template("boto3_dataclass_slim/package/__init__.py.jinja")
+    
+    @cached_property
+    def boto3_dataclass_slim__package__service____init___py(self):
+        return load_template("boto3_dataclass_slim/package/service/__init__.py.jinja")
+    
 
 tpl_enum = TemplateEnum()
\ No newline at end of file
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+
+from ..models.typed_dict import TypedDictFieldAnnotation, TypedDictField
+
+
+def nested(name: str, type_name: str, many: bool = False) -> TypedDictField:
+    """
+    A field of a nested TypedDict, or a list of it if ``many``.
+    """
+    return TypedDictField(
+        name=name,
+        anno=TypedDictFieldAnnotation(
+            is_nested_typed_dict=True,
+            nested_type_name=type_name,
+            nested_type_subscriptor="List" if many else "NULL",
+        ),
+    )
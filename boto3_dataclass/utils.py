@@ -1,11 +1,20 @@
 # -*- coding: utf-8 -*-
 
+import typing as T
+import sys
+import shutil
 import textwrap
+import importlib
 import dataclasses
 from pathlib import Path
+from types import ModuleType
 
 from black import format_file_contents, Mode
 
+if T.TYPE_CHECKING:  # pragma: no cover
+    from .models.typed_dict import TypedDefsModule
+    from .models.caster import CasterModule
+
 
 def normalize_code(s: str, dedent: bool = True) -> str:
     if dedent:
@@ -87,3 +96,44 @@ class SemVer:
 
 def black_format_code(code: str) -> str:
     return format_file_contents(code, fast=True, mode=Mode())
+
+
+def import_generated_package(
+    package_name: str,
+    tdm: "TypedDefsModule",
+    cm: "CasterModule",
+    dir_root: Path,
+    compact: bool = False,
+) -> ModuleType:
+    """
+    Render the ``type_defs.py`` and ``caster.py`` of a generated package with
+    the current templates, write them to ``${dir_root}/${package_name}/`` and
+    import the package. So a template change is measured without a rebuild.
+
+    The code is not black formatted, it doesn't change the runtime behavior.
+
+    :param compact: render ``type_defs.py`` in the compact mode
+    """
+    dir_package = dir_root / package_name
+    type_defs_line = f"from mypy_boto3_{cm.service_name} import type_defs"
+    write(
+        dir_package / "type_defs.py",
+        tdm.gen_code(type_defs_line=type_defs_line, compact=compact),
+    )
+    write(dir_package / "caster.py", cm.gen_code())
+    write(
+        dir_package / "__init__.py",
+        f"from .caster import {cm.service_name}_caster\n\n"
+        f"caster = {cm.service_name}_caster\n",
+    )
+    # a stale .pyc written in the same second could shadow the new code
+    shutil.rmtree(dir_package / "__pycache__", ignore_errors=True)
+    importlib.invalidate_caches()
+    sys.path.insert(0, str(dir_root))
+    try:
+        for name in list(sys.modules):
+            if name == package_name or name.startswith(f"{package_name}."):
+                del sys.modules[name]
+        return importlib.import_module(package_name)
+    finally:
+        sys.path.remove(str(dir_root))
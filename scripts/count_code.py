@@ -1,6 +1,14 @@
 # -*- coding: utf-8 -*-
 
 """
+Count the lines and bytes of all generated packages in ``build/repos/``.
+
+It is a thin wrapper of :class:`boto3_dataclass.builders.size_report.SizeReport`,
+which is also recorded automatically for every
+:meth:`~boto3_dataclass.builders.publish_boto3_dataclass_service.Boto3DataclassServiceBuilder.parallel_build_all`
+run in ``build/size_history/${version}.json``. Run this script after
+``poetry build`` to also get the wheel size.
+
 Measured on 2025-09-25
 
 Number of service: 412
@@ -420,35 +428,25 @@ Total Size: 59.62 MB
 - inspector_scan                    103
 """
 
-from pathlib import Path
-from pathlib_mate.mate_tool_box import repr_data_size
+import boto3_dataclass.api as boto3_dc
+from boto3_dataclass._version import __version__
 
-from boto3_dataclass.paths import path_enum
-
-def count_file(p: Path):
-    return len(p.read_text().splitlines())
 
 def count_all():
-    dir_repos = path_enum.dir_project_root / "build" / "repos"
-    total = 0
-    total_size = 0
-    pairs: list[tuple[str, int]] = list()
-    for dir_package in dir_repos.iterdir():
-        if dir_package.is_dir():
-            service = dir_package.name.removeprefix("boto3_dataclass_").removesuffix("-project")
-            sub_total = 0
-            for p in dir_package.rglob("**/*.py"):
-                n = count_file(p)
-                sub_total += n
-                total_size += p.stat().st_size
-            pairs.append((service, sub_total))
-            total += sub_total
-    pairs = sorted(pairs, key=lambda pair: pair[1], reverse=True)
-    n_services = len(pairs)
-    print(f"Number of service: {n_services}")
-    print(f"Total: {total} lines")
-    print(f"Total Size: {repr_data_size(total_size)}")
-    for service, n in pairs:
-        print(f"- {service:30} {n:6}")
+    structure_list = [
+        struct
+        for struct in boto3_dc.structures.Boto3DataclassServiceStructure.list_all()
+        if struct.dir_package.exists()
+    ]
+    report = boto3_dc.builders.SizeReport.measure(
+        version=__version__,
+        structures=structure_list,
+    )
+    # the wheels of the packages built with ``poetry build``
+    for struct in structure_list:
+        report.services[struct.service_name].measure_wheel(struct)
+    print(report.summary(top=len(report.services)))
+
 
-count_all()
\ No newline at end of file
+if __name__ == "__main__":
+    count_all()
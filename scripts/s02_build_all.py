@@ -3,9 +3,129 @@
 """
 We use this script to build all ``boto3_dataclass_{service_name}`` package in
 ``build/repos/`` directory in parallel.
+
+Use ``--shard i/N`` to only build the i-th of N cost balanced shards, for example,
+to simulate a 4 node build on one machine::
+
+    for i in 1 2 3 4; do python scripts/s02_build_all.py --shard $i/4 --n-workers 2 & done; wait
+    python scripts/s03_merge_shard_manifests.py
+
+A shard doesn't record the size history, the merge script records the merged
+size report of all shards, pass ``--max-bytes-growth`` to it instead.
+
+Use ``--parser-backend botocore`` to generate the code from the botocore service
+models instead of the mypy-boto3 stub files.
+
+Use ``--compact`` to generate the smaller, table-driven ``type_defs.py``, see
+``scripts/s14_benchmark_compact.py`` for the size and import time difference.
+
+Only the types that a caster method can return are generated, use
+``--keep-all-types`` to also generate the request only types, see
+``scripts/s15_benchmark_tree_shake.py`` for what is removed.
+
+The structurally identical types, e.g. ``TagTypeDef`` and ``TagOutputTypeDef``,
+share one dataclass, use ``--no-dedup`` to generate one per type, see
+``scripts/s16_benchmark_dedup.py`` for the dedup ratio.
+
+Use ``--core`` to build the ``boto3_dataclass_core`` package first, the
+dataclasses that are structurally identical across services, e.g.
+``ResponseMetadata``, go to it and the service packages import them. The
+bytes saved are written to ``build/core/${version}-report.json``. A shard
+doesn't build the core package, build it once with ``--core-only`` before the
+shards run::
+
+    python scripts/s02_build_all.py --core-only
+    for i in 1 2 3 4; do python scripts/s02_build_all.py --core --shard $i/4 & done; wait
 """
 
+import argparse
+
 import boto3_dataclass.api as boto3_dc
 
 if __name__ == "__main__":
-    boto3_dc.builders.Boto3DataclassServiceBuilder.parallel_build_all()
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--shard",
+        type=boto3_dc.builders.ShardSpec.parse,
+        default=None,
+        help="only build the i-th of N shards, for example: 2/4",
+    )
+    arg_parser.add_argument(
+        "--n-workers",
+        type=int,
+        default=None,
+        help="number of worker processes on this node",
+    )
+    arg_parser.add_argument(
+        "--max-bytes-growth",
+        type=float,
+        default=None,
+        help="fail the build if the total generated bytes grow more than this "
+        "compared to the previous build, for example: 0.1 means +10%%",
+    )
+    arg_parser.add_argument(
+        "--parser-backend",
+        choices=["stub", "botocore"],
+        default="stub",
+        help="parse the mypy-boto3 stub files or the botocore service models",
+    )
+    arg_parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="generate type_defs.py in the compact, table-driven mode",
+    )
+    arg_parser.add_argument(
+        "--keep-all-types",
+        action="store_true",
+        help="generate a dataclass for every TypedDict, including the request only types",
+    )
+    arg_parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="generate one dataclass per TypedDict, even if they are structurally identical",
+    )
+    arg_parser.add_argument(
+        "--core",
+        action="store_true",
+        help="import the dataclasses shared by many services from boto3_dataclass_core",
+    )
+    arg_parser.add_argument(
+        "--min-services",
+        type=int,
+        default=2,
+        help="with --core, a dataclass goes to the core package when it is in "
+        "at least this many services",
+    )
+    arg_parser.add_argument(
+        "--core-only",
+        action="store_true",
+        help="only build the boto3_dataclass_core package, run it before the "
+        "--core --shard i/N builds",
+    )
+    args = arg_parser.parse_args()
+    if args.core_only:
+        boto3_dc.builders.Boto3DataclassServiceBuilder.build_core(
+            n_workers=args.n_workers,
+            parser_backend=args.parser_backend,
+            keep_all_types=args.keep_all_types,
+            dedup=not args.no_dedup,
+            min_services=args.min_services,
+        )
+    else:
+        if args.max_bytes_growth is None:
+            size_budget = None
+        else:
+            size_budget = boto3_dc.builders.SizeBudget(
+                max_total_bytes_growth=args.max_bytes_growth,
+            )
+        boto3_dc.builders.Boto3DataclassServiceBuilder.parallel_build_all(
+            n_workers=args.n_workers,
+            shard=args.shard,
+            size_budget=size_budget,
+            parser_backend=args.parser_backend,
+            compact=args.compact,
+            keep_all_types=args.keep_all_types,
+            dedup=not args.no_dedup,
+            use_core=args.core,
+            min_services=args.min_services,
+        )
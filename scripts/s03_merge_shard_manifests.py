@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+"""
+After all ``scripts/s02_build_all.py --shard i/N`` runs are finished, use this
+script to validate that the shard manifests in ``build/shards/${version}/``
+cover every service exactly once, and merge them into ``merged.json``.
+
+Then the size reports of the shards are merged and recorded in
+``build/size_history/${version}.json``, use ``--max-bytes-growth`` to check the
+size budget of the whole build.
+"""
+
+import argparse
+
+import boto3_dataclass.api as boto3_dc
+from boto3_dataclass._version import __version__
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--max-bytes-growth",
+        type=float,
+        default=None,
+        help="fail if the total generated bytes grow more than this "
+        "compared to the previous build, for example: 0.1 means +10%%",
+    )
+    args = arg_parser.parse_args()
+    structure_list = boto3_dc.structures.Boto3DataclassServiceStructure.list_all()
+    merged = boto3_dc.builders.merge_shard_manifest_files(
+        version=__version__,
+        expected_service_names=[struct.service_name for struct in structure_list],
+    )
+    print(f"All {len(merged)} services are built exactly once.")
+    if args.max_bytes_growth is None:
+        size_budget = None
+    else:
+        size_budget = boto3_dc.builders.SizeBudget(
+            max_total_bytes_growth=args.max_bytes_growth,
+        )
+    report = boto3_dc.builders.merge_shard_size_report_files(
+        version=__version__,
+        budget=size_budget,
+    )
+    print(report.summary(top=10))
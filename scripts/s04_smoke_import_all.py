@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to import every ``boto3_dataclass_{service_name}`` package
+in ``build/repos/`` in a fresh interpreter after the build, and write the
+import time report to ``build/smoke_import/${version}.json``.
+
+Use ``--previous`` to compare with the report of a previous build::
+
+    python scripts/s04_smoke_import_all.py --previous build/smoke_import/1.40.0.json
+"""
+
+import argparse
+from pathlib import Path
+
+import boto3_dataclass.api as boto3_dc
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--shard",
+        type=boto3_dc.builders.ShardSpec.parse,
+        default=None,
+        help="only import the i-th of N shards, for example: 2/4",
+    )
+    arg_parser.add_argument(
+        "--n-workers",
+        type=int,
+        default=None,
+        help="max number of concurrent interpreters",
+    )
+    arg_parser.add_argument(
+        "--previous",
+        type=Path,
+        default=None,
+        help="path to the smoke import report of a previous build",
+    )
+    args = arg_parser.parse_args()
+    boto3_dc.builders.Boto3DataclassServiceBuilder.parallel_smoke_import_all(
+        n_workers=args.n_workers,
+        shard=args.shard,
+        path_previous_report=args.previous,
+    )
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to parse every service with both the mypy-boto3 stub parser
+and the botocore service model parser, compare the results and the total parse
+time, and write the report to ``build/parser_parity/${version}.json``.
+
+By default the services are parsed one by one, so the parse time is comparable.
+Use ``--n-workers`` to run in parallel if you only care about the parity::
+
+    python scripts/s05_parser_parity.py --n-workers 8
+"""
+
+import argparse
+
+import boto3_dataclass.api as boto3_dc
+from boto3_dataclass._version import __version__
+from boto3_dataclass.parsers.parity import get_path_parser_parity_report
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--n-workers",
+        type=int,
+        default=1,
+        help="number of worker processes, default is 1 for an accurate parse time",
+    )
+    arg_parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="only compare the first N services",
+    )
+    args = arg_parser.parse_args()
+    structures = boto3_dc.structures.Boto3DataclassServiceStructure.list_all()
+    structures = sorted(structures, key=lambda s: s.service_name)[: args.limit]
+    report = boto3_dc.parsers.run_parser_parity_all(
+        version=__version__,
+        structures=structures,
+        n_workers=args.n_workers,
+    )
+    path = get_path_parser_parity_report(__version__)
+    report.write(path)
+    print(report.summary())
+    print(f"Report written to: file://{path}")
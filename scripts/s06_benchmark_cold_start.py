@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to measure the cold start of the generated packages in
+``build/repos/``, in both the package folder and the zipped Lambda layer
+layout, and write the result to ``build/benchmarks/cold_start/${version}.json``.
+
+Compare the precompiled bytecode and the single archive with today's wheels::
+
+    python scripts/s06_benchmark_cold_start.py --services ec2 --layouts wheel dir archive
+
+The responses come from the recorded fixtures in
+``boto3_dataclass/benchmarks/fixtures/``::
+
+    python scripts/s06_benchmark_cold_start.py --services iam s3 --runs 10
+"""
+
+import argparse
+
+import boto3_dataclass.api as boto3_dc
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--services",
+        nargs="+",
+        default=None,
+        help="only benchmark the fixtures of these services",
+    )
+    arg_parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="number of fresh interpreters per fixture and layout",
+    )
+    arg_parser.add_argument(
+        "--layouts",
+        nargs="+",
+        choices=["dir", "zip", "wheel", "archive"],
+        default=["dir", "zip"],
+        help="wheel is today's wheel, the source only; archive is one "
+        "archive file of all packages with the meta path importer",
+    )
+    arg_parser.add_argument(
+        "--no-precompile",
+        action="store_true",
+        help="don't ship .pyc files, every import compiles the source code",
+    )
+    args = arg_parser.parse_args()
+    report = boto3_dc.benchmarks.run_cold_start_all(
+        fixtures=boto3_dc.benchmarks.ResponseFixture.list_all(
+            service_names=args.services,
+        ),
+        layouts=args.layouts,
+        n_runs=args.runs,
+        precompile=not args.no_precompile,
+    )
+    path = boto3_dc.benchmarks.get_path_benchmark_result("cold_start")
+    report.write(path)
+    print(report.summary())
+    print(f"Report written to: file://{path}")
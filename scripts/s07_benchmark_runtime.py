@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to benchmark the runtime cost of the generated dataclasses
+against plain ``dict`` indexing, rendered with the current templates, and write
+the result to ``build/benchmarks/runtime/${version}.json``.
+
+Run it before and after a change to the ``typed_dict_def.jinja`` template::
+
+    python scripts/s07_benchmark_runtime.py --targets iam.list_roles --list-sizes 1 100
+"""
+
+import argparse
+
+import boto3_dataclass.api as boto3_dc
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--targets",
+        nargs="+",
+        default=[
+            "iam.list_roles",
+            "s3.list_objects_v2",
+            "dynamodb.describe_table",
+        ],
+        help="the ${service_name}.${method_name} to benchmark, "
+        "the test gen_code is always included",
+    )
+    arg_parser.add_argument(
+        "--list-sizes",
+        nargs="+",
+        type=int,
+        default=[1, 10, 100],
+        help="number of items in every list of the synthetic response",
+    )
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--min-time", type=float, default=0.2)
+    args = arg_parser.parse_args()
+
+    targets = [boto3_dc.benchmarks.RuntimeTarget.from_test_gen_code()]
+    for name in args.targets:
+        service_name, method_name = name.split(".", 1)
+        targets.append(
+            boto3_dc.benchmarks.RuntimeTarget.from_service(service_name, method_name)
+        )
+    report = boto3_dc.benchmarks.run_runtime_benchmark_all(
+        targets=targets,
+        list_sizes=args.list_sizes,
+        repeat=args.repeat,
+        min_time=args.min_time,
+    )
+    path = boto3_dc.benchmarks.get_path_benchmark_result("runtime")
+    report.write(path)
+    print(report.summary())
+    print(f"Report written to: file://{path}")
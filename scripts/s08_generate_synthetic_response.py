@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to generate a random but schema-valid response of a caster
+method, parsed from the installed mypy-boto3 stubs, and stream it to
+``build/benchmarks/synthetic/${service_name}/${method_name}-....json``
+so benchmarks and tests can reuse it offline::
+
+    python scripts/s08_generate_synthetic_response.py ec2 describe_instances --target-size 500000000
+"""
+
+import argparse
+
+import boto3_dataclass.api as boto3_dc
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("service_name")
+    arg_parser.add_argument("method_name")
+    arg_parser.add_argument(
+        "--list-size",
+        type=int,
+        default=3,
+        help="number of items in every nested list",
+    )
+    arg_parser.add_argument(
+        "--target-size",
+        type=int,
+        default=None,
+        help="grow the root list until the file has this many bytes",
+    )
+    arg_parser.add_argument("--max-depth", type=int, default=5)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    target = boto3_dc.benchmarks.RuntimeTarget.from_service(
+        args.service_name,
+        args.method_name,
+    )
+    generator = boto3_dc.benchmarks.SyntheticResponseGenerator(
+        tdm=target.tdm,
+        list_size=args.list_size,
+        max_depth=args.max_depth,
+        seed=args.seed,
+    )
+    path = boto3_dc.benchmarks.get_path_synthetic_response(
+        service_name=args.service_name,
+        method_name=args.method_name,
+        list_size=args.list_size,
+        seed=args.seed,
+        target_size=args.target_size,
+    )
+    n_items = generator.dump(
+        type_name=target.caster_method.boto3_stubs_type_name,
+        path=path,
+        target_size=args.target_size,
+    )
+    print(f"{n_items} items in the root list, {path.stat().st_size} bytes")
+    print(f"Response written to: file://{path}")
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to measure the end-to-end throughput of
+``boto3 client call -> caster -> attribute access`` against a local moto
+server, with and without casting, and write the result to
+``build/benchmarks/throughput/${version}.json``.
+
+It needs moto, which is not a dependency of this project::
+
+    pip install "moto[server]"
+    python scripts/s09_benchmark_throughput.py --threads 1 4 16 --calls 200
+"""
+
+import argparse
+
+import boto3_dataclass.api as boto3_dc
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=list(boto3_dc.benchmarks.scenario_factories),
+        default=list(boto3_dc.benchmarks.scenario_factories),
+    )
+    arg_parser.add_argument(
+        "--items",
+        type=int,
+        default=100,
+        help="number of items to create in moto, e.g. S3 objects",
+    )
+    arg_parser.add_argument(
+        "--threads",
+        nargs="+",
+        type=int,
+        default=[1, 4, 16],
+        help="the thread pool sizes to sweep",
+    )
+    arg_parser.add_argument(
+        "--calls",
+        type=int,
+        default=200,
+        help="number of calls per scenario, mode and thread pool size",
+    )
+    args = arg_parser.parse_args()
+    report = boto3_dc.benchmarks.run_throughput_benchmark_all(
+        scenarios=[
+            boto3_dc.benchmarks.scenario_factories[name](n_items=args.items)
+            for name in args.scenarios
+        ],
+        thread_counts=args.threads,
+        n_calls=args.calls,
+    )
+    path = boto3_dc.benchmarks.get_path_benchmark_result("throughput")
+    report.write(path)
+    print(report.summary())
+    print(f"Report written to: file://{path}")
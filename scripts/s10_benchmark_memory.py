@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to measure the memory footprint of the cast responses vs
+the raw boto3 dict, with a per class breakdown, and write the result to
+``build/benchmarks/memory/${version}.json``::
+
+    python scripts/s10_benchmark_memory.py --targets ec2.describe_instances --list-sizes 10
+"""
+
+import argparse
+
+import boto3_dataclass.api as boto3_dc
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--targets",
+        nargs="+",
+        default=[
+            "iam.list_roles",
+            "s3.list_objects_v2",
+            "ec2.describe_instances",
+        ],
+        help="the ${service_name}.${method_name} to benchmark",
+    )
+    arg_parser.add_argument(
+        "--list-sizes",
+        nargs="+",
+        type=int,
+        default=[1, 10, 100],
+        help="number of items in every list of the synthetic response",
+    )
+    args = arg_parser.parse_args()
+
+    targets = []
+    for name in args.targets:
+        service_name, method_name = name.split(".", 1)
+        targets.append(
+            boto3_dc.benchmarks.RuntimeTarget.from_service(service_name, method_name)
+        )
+    report = boto3_dc.benchmarks.run_memory_benchmark_all(
+        targets=targets,
+        list_sizes=args.list_sizes,
+    )
+    path = boto3_dc.benchmarks.get_path_benchmark_result("memory")
+    report.write(path)
+    print(report.summary())
+    print(f"Report written to: file://{path}")
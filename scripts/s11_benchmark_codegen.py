@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to benchmark each stage of the code generator on the pinned
+stub corpus, and write the result to ``build/benchmarks/codegen/${git_commit}.json``.
+
+Compare with the result of a previous commit::
+
+    python scripts/s11_benchmark_codegen.py --previous build/benchmarks/codegen/1d12d5d1a2b3.json
+
+Re-pin the corpus after a boto3-stubs upgrade::
+
+    python scripts/s11_benchmark_codegen.py --pin test iam s3 ec2
+"""
+
+import argparse
+from pathlib import Path
+
+import boto3_dataclass.api as boto3_dc
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--corpus",
+        nargs="+",
+        default=None,
+        help="only run these corpus entries, default is the whole pinned corpus",
+    )
+    arg_parser.add_argument(
+        "--runs",
+        type=int,
+        default=3,
+        help="number of runs of every stage",
+    )
+    arg_parser.add_argument(
+        "--previous",
+        type=Path,
+        default=None,
+        help="path to the codegen benchmark report of a previous commit",
+    )
+    arg_parser.add_argument(
+        "--pin",
+        nargs="+",
+        default=None,
+        help="pin the installed stub files of these corpus entries and exit",
+    )
+    args = arg_parser.parse_args()
+    if args.pin:
+        boto3_dc.benchmarks.pin_corpus(args.pin)
+        print(f"Pinned corpus: {args.pin}")
+    else:
+        report = boto3_dc.benchmarks.run_codegen_benchmark_all(
+            entries=boto3_dc.benchmarks.load_corpus(args.corpus),
+            n_runs=args.runs,
+        )
+        path = boto3_dc.benchmarks.get_path_codegen_report(report.env.git_commit)
+        report.write(path)
+        print(report.summary())
+        if args.previous is not None:
+            previous = boto3_dc.benchmarks.CodegenReport.read(args.previous)
+            for change in report.compare(previous):
+                print(
+                    f"- {change.name} {change.stage}: "
+                    f"{change.previous_time:.3f} s -> {change.current_time:.3f} s "
+                    f"({change.speedup:.2f}x)"
+                )
+        print(f"Report written to: file://{path}")
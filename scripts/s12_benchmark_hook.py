@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to measure the per-call overhead of the opt-in boto3 hook
+(``boto3_dataclass.hook``) on the recorded responses in
+``boto3_dataclass/benchmarks/fixtures/``, and write the result to
+``build/benchmarks/hook/${version}.json``.
+
+The HTTP layer is replaced by the recorded responses, no AWS credentials
+are needed::
+
+    python scripts/s12_benchmark_hook.py --services iam s3 --repeat 10
+"""
+
+import argparse
+
+import boto3_dataclass.api as boto3_dc
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--services",
+        nargs="+",
+        default=None,
+        help="only the fixtures of these services, default is all",
+    )
+    arg_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=10,
+        help="number of interleaved timing rounds",
+    )
+    arg_parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="minimal seconds of a timing round",
+    )
+    args = arg_parser.parse_args()
+    report = boto3_dc.benchmarks.run_hook_benchmark_all(
+        fixtures=boto3_dc.benchmarks.ResponseFixture.list_all(
+            service_names=args.services,
+        ),
+        repeat=args.repeat,
+        min_time=args.min_time,
+    )
+    path = boto3_dc.benchmarks.get_path_benchmark_result("hook")
+    report.write(path)
+    print(report.summary())
+    print(f"Report written to: file://{path}")
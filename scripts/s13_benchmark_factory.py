@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to compare the runtime class factory
+(``boto3_dataclass.factory``) with the pre-generated packages on the recorded
+responses in ``boto3_dataclass/benchmarks/fixtures/``, the first access in a
+fresh interpreter and the steady state, and write the result to
+``build/benchmarks/factory/${version}.json``::
+
+    python scripts/s13_benchmark_factory.py --services iam ec2 --runs 5
+"""
+
+import argparse
+
+import boto3_dataclass.api as boto3_dc
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--services",
+        nargs="+",
+        default=None,
+        help="only the fixtures of these services, default is all",
+    )
+    arg_parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="number of fresh interpreters per fixture and mode",
+    )
+    arg_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="number of steady-state timing rounds",
+    )
+    args = arg_parser.parse_args()
+    report = boto3_dc.benchmarks.run_factory_benchmark_all(
+        fixtures=boto3_dc.benchmarks.ResponseFixture.list_all(
+            service_names=args.services,
+        ),
+        n_runs=args.runs,
+        repeat=args.repeat,
+    )
+    path = boto3_dc.benchmarks.get_path_benchmark_result("factory")
+    report.write(path)
+    print(report.summary())
+    print(f"Report written to: file://{path}")
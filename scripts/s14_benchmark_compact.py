@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to compare the compact, table-driven ``type_defs.py``
+(``scripts/s02_build_all.py --compact``) with the default one, the source
+size, the ``.pyc`` size and the import time in a fresh interpreter, and write
+the result to ``build/benchmarks/compact/${version}.json``::
+
+    python scripts/s14_benchmark_compact.py --services ec2 --runs 5
+"""
+
+import argparse
+
+import boto3_dataclass.api as boto3_dc
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--services",
+        nargs="+",
+        default=["ec2"],
+        help="the services to compare, default is ec2, the biggest one",
+    )
+    arg_parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="number of fresh interpreters per service and mode",
+    )
+    arg_parser.add_argument(
+        "--no-black",
+        action="store_true",
+        help="don't black format the code, it is slow for the big services",
+    )
+    args = arg_parser.parse_args()
+    report = boto3_dc.benchmarks.run_compact_benchmark_all(
+        service_names=args.services,
+        n_runs=args.runs,
+        black=not args.no_black,
+    )
+    path = boto3_dc.benchmarks.get_path_benchmark_result("compact")
+    report.write(path)
+    print(report.summary())
+    print(f"Report written to: file://{path}")
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to see what the structural deduplication of ``type_defs.py``
+merges, the dedup ratio, the lines and the import time in a fresh interpreter,
+and write the result to ``build/benchmarks/dedup/${version}.json``::
+
+    python scripts/s16_benchmark_dedup.py --services ec2 iam s3 --runs 5
+"""
+
+import argparse
+
+import boto3_dataclass.api as boto3_dc
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--services",
+        nargs="+",
+        default=["ec2", "iam", "s3"],
+        help="the services to compare",
+    )
+    arg_parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="number of fresh interpreters per service and mode",
+    )
+    arg_parser.add_argument(
+        "--no-black",
+        action="store_true",
+        help="don't black format the code, it is slow for the big services",
+    )
+    args = arg_parser.parse_args()
+    report = boto3_dc.benchmarks.run_dedup_benchmark_all(
+        service_names=args.services,
+        n_runs=args.runs,
+        black=not args.no_black,
+    )
+    path = boto3_dc.benchmarks.get_path_benchmark_result("dedup")
+    report.write(path)
+    print(report.summary())
+    print(f"Report written to: file://{path}")
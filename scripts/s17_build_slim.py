@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to build a slim private package from the usage manifests
+recorded by ``boto3_dataclass.trace``, only the used caster methods, classes
+and fields are generated, in ``build/repos/${package_name}-project/``::
+
+    python scripts/s17_build_slim.py --package-name my_app_boto3_dataclass --manifests /tmp/usage-*.json
+
+The manifests of several sampled processes are merged.
+"""
+
+import argparse
+from pathlib import Path
+
+import boto3_dataclass.api as boto3_dc
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--package-name",
+        required=True,
+        help="the name of the slim package, e.g. my_app_boto3_dataclass",
+    )
+    arg_parser.add_argument(
+        "--manifests",
+        nargs="+",
+        type=Path,
+        required=True,
+        help="the usage manifest files dumped by boto3_dataclass.trace",
+    )
+    arg_parser.add_argument(
+        "--parser-backend",
+        choices=["stub", "botocore"],
+        default="stub",
+        help="parse the mypy-boto3 stub files or the botocore service models",
+    )
+    arg_parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="generate type_defs.py in the compact, table-driven mode",
+    )
+    args = arg_parser.parse_args()
+    builder = boto3_dc.builders.Boto3DataclassSlimBuilder.new(
+        package_name=args.package_name,
+        paths=args.manifests,
+        parser_backend=args.parser_backend,
+        compact=args.compact,
+    )
+    report = builder.build_all()
+    print(report.summary())
+    print(f"Slim package written to: file://{builder.structure.dir_package}")
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to compare a slim package, built from the usage recorded
+while casting the responses in ``boto3_dataclass/benchmarks/fixtures/``,
+with the full service package, the classes, the bytes and the import time in
+a fresh interpreter, and write the result to
+``build/benchmarks/slim/${version}.json``::
+
+    python scripts/s18_benchmark_slim.py --services iam s3 --runs 5
+"""
+
+import argparse
+
+import boto3_dataclass.api as boto3_dc
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--services",
+        nargs="+",
+        default=None,
+        help="only the fixtures of these services, default is all",
+    )
+    arg_parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="number of fresh interpreters per fixture and mode",
+    )
+    args = arg_parser.parse_args()
+    report = boto3_dc.benchmarks.run_slim_benchmark_all(
+        fixtures=boto3_dc.benchmarks.ResponseFixture.list_all(
+            service_names=args.services,
+        ),
+        n_runs=args.runs,
+    )
+    path = boto3_dc.benchmarks.get_path_benchmark_result("slim")
+    report.write(path)
+    print(report.summary())
+    print(f"Report written to: file://{path}")
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to build a self-contained bundle package from an allowlist
+of ``service.operation`` names, only the casters of these operations and the
+classes they reach are generated, in ``build/repos/${package_name}-project/``::
+
+    python scripts/s19_build_bundle.py --package-name my_app_boto3_dataclass --allowlist s3.list_objects_v2 sqs.receive_message
+
+Add ``--wheel`` to build the wheel with ``poetry build``.
+"""
+
+import argparse
+
+import boto3_dataclass.api as boto3_dc
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--package-name",
+        required=True,
+        help="the name of the bundle package, e.g. my_app_boto3_dataclass",
+    )
+    arg_parser.add_argument(
+        "--allowlist",
+        nargs="+",
+        required=True,
+        help="the service.operation names, e.g. s3.list_objects_v2",
+    )
+    arg_parser.add_argument(
+        "--parser-backend",
+        choices=["stub", "botocore"],
+        default="stub",
+        help="parse the mypy-boto3 stub files or the botocore service models",
+    )
+    arg_parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="generate type_defs.py in the compact, table-driven mode",
+    )
+    arg_parser.add_argument(
+        "--wheel",
+        action="store_true",
+        help="build the wheel with poetry after the code is generated",
+    )
+    args = arg_parser.parse_args()
+    builder = boto3_dc.builders.Boto3DataclassBundleBuilder.new(
+        package_name=args.package_name,
+        allowlist=args.allowlist,
+        parser_backend=args.parser_backend,
+        compact=args.compact,
+    )
+    report = builder.build_all()
+    print(report.summary())
+    print(f"Bundle package written to: file://{builder.structure.dir_package}")
+    if args.wheel:
+        builder.structure.poetry_build()
+        print(f"Wheel written to: file://{builder.structure.dir_dist}")
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to compare a bundle package, built from an allowlist of
+``service.operation`` names, with the full service packages, the classes,
+the bytes and the import time in a fresh interpreter, and write the result to
+``build/benchmarks/bundle/${version}.json``::
+
+    python scripts/s20_benchmark_bundle.py --allowlist s3.list_objects_v2 dynamodb.query --runs 5
+"""
+
+import argparse
+
+import boto3_dataclass.api as boto3_dc
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--allowlist",
+        nargs="+",
+        default=boto3_dc.benchmarks.DEFAULT_ALLOWLIST,
+        help="the service.operation names, default is a typical serverless app",
+    )
+    arg_parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="number of fresh interpreters per mode",
+    )
+    args = arg_parser.parse_args()
+    report = boto3_dc.benchmarks.run_bundle_benchmark(
+        allowlist=args.allowlist,
+        n_runs=args.runs,
+    )
+    path = boto3_dc.benchmarks.get_path_benchmark_result("bundle")
+    report.write(path)
+    print(report.summary())
+    print(f"Report written to: file://{path}")
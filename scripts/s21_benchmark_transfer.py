@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to measure the pickle size and round-trip time of the cast
+responses, the raw dict vs the default dataclass pickling vs the generated
+``__reduce__``, across a process pool, and write the result to
+``build/benchmarks/transfer/${version}.json``::
+
+    python scripts/s21_benchmark_transfer.py --targets ec2.describe_instances --list-sizes 3 5
+
+The synthetic response grows with ``list_size ** depth``, keep the list sizes
+small for deeply nested targets like ``ec2.describe_instances``.
+"""
+
+import argparse
+
+import boto3_dataclass.api as boto3_dc
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--targets",
+        nargs="+",
+        default=[
+            "s3.list_objects_v2",
+            "ec2.describe_instances",
+        ],
+        help="the ${service_name}.${method_name} to benchmark",
+    )
+    arg_parser.add_argument(
+        "--list-sizes",
+        nargs="+",
+        type=int,
+        default=[3, 5],
+        help="number of items in every list of the synthetic response",
+    )
+    arg_parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="number of processes in the pool",
+    )
+    arg_parser.add_argument(
+        "--tasks",
+        type=int,
+        default=8,
+        help="number of objects sent to the pool per run",
+    )
+    arg_parser.add_argument(
+        "--runs",
+        type=int,
+        default=3,
+        help="number of runs per target, list size and mode",
+    )
+    args = arg_parser.parse_args()
+
+    targets = []
+    for name in args.targets:
+        service_name, method_name = name.split(".", 1)
+        targets.append(
+            boto3_dc.benchmarks.RuntimeTarget.from_service(service_name, method_name)
+        )
+    report = boto3_dc.benchmarks.run_transfer_benchmark_all(
+        targets=targets,
+        list_sizes=args.list_sizes,
+        n_workers=args.workers,
+        n_tasks=args.tasks,
+        n_runs=args.runs,
+    )
+    path = boto3_dc.benchmarks.get_path_benchmark_result("transfer")
+    report.write(path)
+    print(report.summary())
+    print(f"Report written to: file://{path}")
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to measure handing the items of a large response to a
+process pool, a pickled slice per task vs a view of a shared memory block
+(``boto3_dataclass.shm``), and write the result to
+``build/benchmarks/shm/${version}.json``::
+
+    python scripts/s22_benchmark_shm.py --targets s3.list_objects_v2:Contents --n-items 1000 10000
+"""
+
+import argparse
+
+import boto3_dataclass.api as boto3_dc
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--targets",
+        nargs="+",
+        default=[
+            "s3.list_objects_v2:Contents",
+        ],
+        help="the ${service_name}.${method_name}:${key} to benchmark",
+    )
+    arg_parser.add_argument(
+        "--n-items",
+        nargs="+",
+        type=int,
+        default=[1000, 10000],
+        help="number of items in the synthetic response",
+    )
+    arg_parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="number of processes in the pool",
+    )
+    arg_parser.add_argument(
+        "--tasks",
+        type=int,
+        default=8,
+        help="number of slices",
+    )
+    arg_parser.add_argument(
+        "--runs",
+        type=int,
+        default=3,
+        help="number of runs per target, number of items and mode",
+    )
+    args = arg_parser.parse_args()
+
+    targets = []
+    for name in args.targets:
+        name, key = name.split(":", 1)
+        service_name, method_name = name.split(".", 1)
+        target = boto3_dc.benchmarks.RuntimeTarget.from_service(
+            service_name, method_name
+        )
+        targets.append((target, key))
+    report = boto3_dc.benchmarks.run_shm_benchmark_all(
+        targets=targets,
+        n_items_list=args.n_items,
+        n_workers=args.workers,
+        n_tasks=args.tasks,
+        n_runs=args.runs,
+    )
+    path = boto3_dc.benchmarks.get_path_benchmark_result("shm")
+    report.write(path)
+    print(report.summary())
+    print(f"Report written to: file://{path}")
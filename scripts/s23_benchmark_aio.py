@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to measure the event loop lag of many concurrent
+paginators cast by ``boto3_dataclass.aio``, the fields built on the event
+loop vs on a thread pool, and write the result to
+``build/benchmarks/aio/${version}.json``::
+
+    python scripts/s23_benchmark_aio.py --targets s3.list_objects_v2:Contents --clients 20
+"""
+
+import argparse
+
+import boto3_dataclass.api as boto3_dc
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--targets",
+        nargs="+",
+        default=[
+            "s3.list_objects_v2:Contents",
+        ],
+        help="the ${service_name}.${method_name}:${key} to benchmark",
+    )
+    arg_parser.add_argument(
+        "--clients",
+        type=int,
+        default=20,
+        help="number of concurrent paginators",
+    )
+    arg_parser.add_argument(
+        "--pages",
+        type=int,
+        default=5,
+        help="number of pages per paginator",
+    )
+    arg_parser.add_argument(
+        "--items",
+        type=int,
+        default=1000,
+        help="number of items per page",
+    )
+    arg_parser.add_argument(
+        "--threads",
+        type=int,
+        default=1,
+        help="number of threads of the pool",
+    )
+    arg_parser.add_argument(
+        "--runs",
+        type=int,
+        default=3,
+        help="number of runs per target and mode",
+    )
+    args = arg_parser.parse_args()
+
+    targets = []
+    for name in args.targets:
+        name, key = name.split(":", 1)
+        service_name, method_name = name.split(".", 1)
+        target = boto3_dc.benchmarks.RuntimeTarget.from_service(
+            service_name, method_name
+        )
+        targets.append((target, key))
+    report = boto3_dc.benchmarks.run_aio_benchmark_all(
+        targets=targets,
+        n_clients=args.clients,
+        n_pages=args.pages,
+        n_items=args.items,
+        n_threads=args.threads,
+        n_runs=args.runs,
+    )
+    path = boto3_dc.benchmarks.get_path_benchmark_result("aio")
+    report.write(path)
+    print(report.summary())
+    print(f"Report written to: file://{path}")
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+"""
+We use this script to measure deduplicating the items of many responses with
+the generated ``__hash__`` and ``__eq__`` vs a set of ``json.dumps`` of the
+raw dicts, and write the result to ``build/benchmarks/hashing/${version}.json``::
+
+    python scripts/s24_benchmark_hashing.py --targets iam.list_roles:Roles --n-unique 5000
+"""
+
+import argparse
+
+import boto3_dataclass.api as boto3_dc
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--targets",
+        nargs="+",
+        default=[
+            "iam.list_roles:Roles",
+            "s3.list_objects_v2:Contents",
+            "ec2.describe_instances:Reservations",
+        ],
+        help="the ${service_name}.${method_name}:${key} to benchmark",
+    )
+    arg_parser.add_argument(
+        "--n-unique",
+        type=int,
+        default=5000,
+        help="number of unique items",
+    )
+    arg_parser.add_argument(
+        "--copies",
+        type=int,
+        default=2,
+        help="number of copies of every unique item",
+    )
+    arg_parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="number of runs per target and mode",
+    )
+    args = arg_parser.parse_args()
+
+    targets = []
+    for name in args.targets:
+        name, key = name.split(":", 1)
+        service_name, method_name = name.split(".", 1)
+        target = boto3_dc.benchmarks.RuntimeTarget.from_service(
+            service_name, method_name
+        )
+        targets.append((target, key))
+    report = boto3_dc.benchmarks.run_hashing_benchmark_all(
+        targets=targets,
+        n_unique=args.n_unique,
+        n_copies=args.copies,
+        n_runs=args.runs,
+    )
+    path = boto3_dc.benchmarks.get_path_benchmark_result("hashing")
+    report.write(path)
+    print(report.summary())
+    print(f"Report written to: file://{path}")
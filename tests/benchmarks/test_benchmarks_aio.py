@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import pytest
+
+from boto3_dataclass.utils import import_generated_package
+from boto3_dataclass.benchmarks.common import (
+    import_meta_package,
+)
+from boto3_dataclass.benchmarks.runtime import RuntimeTarget
+from boto3_dataclass.benchmarks.synthetic import SyntheticResponseGenerator
+from boto3_dataclass.benchmarks.aio import StubPageIterator, run_aio_benchmark_all
+
+
+class IAMClient:
+    meta = SimpleNamespace(service_model=SimpleNamespace(service_name="iam"))
+
+    def list_roles(self):  # pragma: no cover
+        pass
+
+
+async def collect(aiter) -> list:
+    return [obj async for obj in aiter]
+
+
+def test_aio(tmp_path):
+    aio = import_meta_package(tmp_path / "meta").aio
+    target = RuntimeTarget.from_service("iam", "list_roles")
+    import_generated_package(
+        package_name="boto3_dataclass_iam",
+        tdm=target.tdm,
+        cm=target.cm,
+        dir_root=tmp_path / "services",
+    )
+    generator = SyntheticResponseGenerator(tdm=target.tdm, list_size=3, seed=1)
+    response = generator.make(target.caster_method.boto3_stubs_type_name)
+    # the nested lists are counted too, e.g. the Tags of every role
+    assert aio.count_items(response) > 3
+    assert aio.count_items(response, limit=3) >= 3
+    reservations = {
+        "Reservations": [{"Instances": [{}, {}]}, {"Instances": [{"Tags": []}]}],
+        "NextToken": "token",
+    }
+    assert aio.count_items(reservations) == 5
+    assert aio.count_items({"Reservations": []}) == 0
+
+    pages = StubPageIterator(response, n_pages=2, latency=0)
+    with pytest.raises(ValueError):
+        aio.get_operation(pages)
+    pages._method = IAMClient().list_roles
+    assert aio.get_operation(pages) == ("iam", "list_roles")
+
+    # cast on the event loop, lazy
+    res = asyncio.run(collect(aio.iter_pages(pages)))
+    assert len(res) == 2
+    assert res[0].boto3_raw_data is response
+    assert list(vars(res[0])) == ["boto3_raw_data"]
+
+    # cast and built on the thread pool
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        roles = asyncio.run(
+            collect(
+                aio.iter_items(
+                    pages,
+                    "Roles",
+                    executor=executor,
+                    offload_threshold=3,
+                    yield_every=1,
+                )
+            )
+        )
+        assert len(roles) == 6
+        assert "Arn" in vars(roles[0])
+        assert roles[0].Arn == response["Roles"][0]["Arn"]
+
+        # below the threshold
+        roles = asyncio.run(collect(aio.iter_items(pages, "Roles", executor=executor)))
+        assert "Arn" not in vars(roles[0])
+
+    # a process pool is rejected, the built fields would be lost
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        with pytest.raises(TypeError):
+            asyncio.run(aio.cast("iam", "list_roles", response, executor=executor))
+
+    # the pages without the key are skipped
+    pages = StubPageIterator({"IsTruncated": False}, n_pages=1, latency=0)
+    roles = asyncio.run(collect(aio.iter_items(pages, "Roles", "iam", "list_roles")))
+    assert roles == []
+
+
+def test_run_aio_benchmark_all(tmp_path):
+    report = run_aio_benchmark_all(
+        targets=[(RuntimeTarget.from_service("s3", "list_objects_v2"), "Contents")],
+        n_clients=2,
+        n_pages=2,
+        n_items=10,
+        n_runs=1,
+        dir_workspace=tmp_path,
+    )
+    result = report.results[0]
+    assert len(result.times["thread"]) == 1
+    report.write(tmp_path / "report.json")
+    assert "s3.list_objects_v2.Contents" in report.summary()
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.benchmarks.aio",
+        preview=False,
+    )
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+from boto3_dataclass.benchmarks.bundle import run_bundle_benchmark
+
+
+def test_run_bundle_benchmark(tmp_path):
+    report = run_bundle_benchmark(
+        allowlist=["sts.get_caller_identity"],
+        n_runs=1,
+        dir_workspace=tmp_path,
+    )
+    result = report.result
+    assert result.operations == ["sts.get_caller_identity"]
+    assert result.classes["bundle"] < result.classes["full"]
+    assert result.source_bytes["bundle"] < result.source_bytes["full"]
+    report.write(tmp_path / "report.json")
+    assert "1 operations" in report.summary()
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.benchmarks.bundle",
+        preview=False,
+    )
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+
+from boto3_dataclass.benchmarks.codegen import (
+    STAGES,
+    CorpusEntry,
+    pin_corpus,
+    load_corpus,
+    run_codegen_benchmark,
+    run_codegen_benchmark_all,
+    CodegenReport,
+    get_path_codegen_report,
+)
+
+
+def test_corpus(tmp_path):
+    path_manifest = tmp_path / "corpus.json"
+    pin_corpus(["test"], path_manifest=path_manifest)
+    entries = load_corpus(path_manifest=path_manifest)
+    assert [entry.name for entry in entries] == ["test"]
+
+    with pytest.raises(ValueError):
+        load_corpus(["iam"], path_manifest=path_manifest)
+
+    data = json.loads(path_manifest.read_text())
+    data["test"]["type_defs.pyi"] = "0" * 64
+    path_manifest.write_text(json.dumps(data))
+    with pytest.raises(ValueError):
+        load_corpus(path_manifest=path_manifest)
+
+    # the pinned corpus shipped with the package
+    assert "test" in [entry.name for entry in load_corpus(["test"])]
+
+
+def test_run_codegen_benchmark(tmp_path):
+    entry = CorpusEntry.new("test")
+    result = run_codegen_benchmark(entry, dir_workspace=tmp_path, n_runs=2)
+    # the test stub has no client.pyi
+    assert [stage.stage for stage in result.stages] == [
+        stage for stage in STAGES if stage != "parse_client"
+    ]
+    for stage in result.stages:
+        assert stage.n_lines > 0
+        assert stage.lines_per_sec > 0
+        assert stage.peak_rss_mb > 0
+    assert tmp_path.joinpath("test", "type_defs.py").exists()
+
+
+def test_run_codegen_benchmark_all(tmp_path):
+    report = run_codegen_benchmark_all(
+        [CorpusEntry.new("test")],
+        n_runs=1,
+        dir_workspace=tmp_path,
+    )
+    path = get_path_codegen_report(report.env.git_commit)
+    assert path.stem == report.env.git_commit[:12]
+    path = tmp_path / "report.json"
+    report.write(path)
+    previous = CodegenReport.read(path)
+    assert previous == report
+    changes = report.compare(previous)
+    assert len(changes) == len(report.results[0].stages)
+    assert all(change.speedup == 1 for change in changes)
+    assert "test black" in report.summary()
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.benchmarks.codegen",
+        preview=False,
+    )
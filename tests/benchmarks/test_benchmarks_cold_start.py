@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+from boto3_dataclass.models.caster import CasterMethod, CasterModule
+from boto3_dataclass.tests.gen_code.typed_dict_def_mapping import tdm
+from boto3_dataclass.benchmarks.cold_start import (
+    ResponseFixture,
+    build_zip_layer,
+    run_cold_start_all,
+)
+
+
+def make_package(dir_root):
+    dir_package = dir_root / "boto3_dataclass_bmtest"
+    dir_package.mkdir(parents=True)
+    dir_package.joinpath("type_defs.py").write_text(
+        tdm.gen_code(type_defs_line="from mypy_boto3_bmtest import type_defs")
+    )
+    cm = CasterModule(
+        service_name="bmtest",
+        cms=[
+            CasterMethod(
+                method_name="get_user",
+                boto3_stubs_type_name="UserTypeDef",
+                boto3_dataclass_type_name="User",
+            ),
+        ],
+    )
+    dir_package.joinpath("caster.py").write_text(cm.gen_code())
+    dir_package.joinpath("__init__.py").write_text(
+        "from .caster import bmtest_caster\n\ncaster = bmtest_caster\n"
+    )
+    return dir_package
+
+
+def test_bundled_fixtures():
+    fixtures = ResponseFixture.list_all()
+    assert len(fixtures) >= 1
+    for fixture in fixtures:
+        assert fixture.path.stem == fixture.method_name
+        assert fixture.path.parent.name == fixture.service_name
+    fixtures = ResponseFixture.list_all(service_names=["iam"])
+    assert {fixture.service_name for fixture in fixtures} == {"iam"}
+
+
+def test_run_cold_start_all(tmp_path):
+    dir_package = make_package(tmp_path / "repos")
+    fixture = ResponseFixture(
+        service_name="bmtest",
+        method_name="get_user",
+        nested_attribute="attr1.attr1",
+        response={"id": "u-1", "name": "alice", "attr1": {"attr1": "v"}},
+    )
+    fixture.dump(tmp_path / "fixtures" / "bmtest" / "get_user.json")
+    assert ResponseFixture.list_all(tmp_path / "fixtures") == [fixture]
+
+    sys_path = build_zip_layer(dir_package, tmp_path / "layer.zip")
+    assert sys_path.name == "python"
+
+    missing = ResponseFixture(
+        service_name="missing",
+        method_name="get_user",
+        nested_attribute="id",
+    )
+    report = run_cold_start_all(
+        fixtures=[fixture, missing],
+        layouts=["dir", "zip", "wheel", "archive"],
+        n_runs=2,
+        get_dir_package=lambda service_name: tmp_path
+        / "repos"
+        / f"boto3_dataclass_{service_name}",
+        dir_workspace=tmp_path / "workspace",
+    )
+    layouts = ["dir", "zip", "wheel", "archive"]
+    assert [result.layout for result in report.results] == layouts * 2
+    for result in report.results[:4]:
+        assert result.error is None
+        assert len(result.samples) == 2
+        assert result.stats()["import_time"]["median"] > 0
+    assert (dir_package / "__pycache__").exists()
+    assert not (
+        tmp_path / "workspace" / "wheel" / dir_package.name / "__pycache__"
+    ).exists()
+    for result in report.results[4:]:
+        assert "not found" in result.error
+
+    path = tmp_path / "report.json"
+    report.write(path)
+    data = json.loads(path.read_text())
+    assert data["env"]["git_commit"] is not None
+    assert len(data["results"]) == 8
+    assert "bmtest.get_user (zip)" in report.summary()
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.benchmarks.cold_start",
+        preview=False,
+    )
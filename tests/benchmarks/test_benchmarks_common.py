@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+from boto3_dataclass.benchmarks.common import run_interleaved, time_once
+
+
+def test_run_interleaved():
+    calls = []
+    values = run_interleaved(
+        {
+            "a": lambda: calls.append("a") or len(calls),
+            "b": lambda: calls.append("b") or len(calls),
+        },
+        n_runs=3,
+    )
+    assert calls == ["a", "b"] * 3
+    assert values == {"a": [1, 3, 5], "b": [2, 4, 6]}
+    assert run_interleaved({"a": lambda: 1}, n_runs=0) == {"a": []}
+
+
+def test_time_once():
+    assert time_once(lambda: None) >= 0
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.benchmarks.common",
+        preview=False,
+    )
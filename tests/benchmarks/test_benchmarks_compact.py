@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import dataclasses
+
+import pytest
+
+from boto3_dataclass.utils import import_generated_package
+from boto3_dataclass.benchmarks.cold_start import ResponseFixture
+from boto3_dataclass.benchmarks.runtime import RuntimeTarget
+from boto3_dataclass.benchmarks.memory import iter_cached_property_names
+from boto3_dataclass.benchmarks.compact import run_compact_benchmark_all
+
+
+def test_compact_package(tmp_path):
+    fixture = ResponseFixture.list_all(service_names=["iam"])[0]
+    target = RuntimeTarget.from_service("iam", "get_role")
+    package = import_generated_package(
+        package_name=fixture.package_name,
+        tdm=target.tdm,
+        cm=target.cm,
+        dir_root=tmp_path / "default",
+    )
+    generated_res = package.caster.cast("GetRole", fixture.response)
+    package = import_generated_package(
+        package_name=fixture.package_name,
+        tdm=target.tdm,
+        cm=target.cm,
+        dir_root=tmp_path / "compact",
+        compact=True,
+    )
+    res = package.caster.cast("GetRole", fixture.response)
+
+    # the same attributes and values as the default mode
+    assert dataclasses.is_dataclass(res)
+    assert set(iter_cached_property_names(type(res))) == set(
+        iter_cached_property_names(type(generated_res))
+    )
+    assert res.Role.Arn == generated_res.Role.Arn
+    assert res.Role.RoleLastUsed.Region == generated_res.Role.RoleLastUsed.Region
+    assert res.Role.Tags[0].Key == generated_res.Role.Tags[0].Key
+    assert (
+        res.ResponseMetadata.RequestId
+        == fixture.response["ResponseMetadata"]["RequestId"]
+    )
+    assert type(res).make_one(None) is None
+    assert type(res).make_many(None) is None
+    assert res == type(res).make_one(fixture.response)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        res.boto3_raw_data = {}
+
+
+def test_run_compact_benchmark_all(tmp_path):
+    report = run_compact_benchmark_all(
+        service_names=["sts"],
+        n_runs=1,
+        black=False,
+        dir_workspace=tmp_path,
+    )
+    default, compact = report.results
+    assert [default.mode, compact.mode] == ["default", "compact"]
+    assert compact.source_bytes < default.source_bytes
+    assert compact.pyc_bytes > 0
+    assert compact.stats()["median"] > 0
+    report.write(tmp_path / "report.json")
+    assert "sts (compact)" in report.summary()
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.benchmarks.compact",
+        preview=False,
+    )
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+from boto3_dataclass.benchmarks.dedup import run_dedup_benchmark_all
+
+
+def test_run_dedup_benchmark_all(tmp_path):
+    report = run_dedup_benchmark_all(
+        service_names=["iam"],
+        n_runs=1,
+        black=False,
+        dir_workspace=tmp_path,
+    )
+    no_dedup, dedup = report.results
+    assert [no_dedup.mode, dedup.mode] == ["no_dedup", "dedup"]
+    assert no_dedup.aliases == 0
+    assert dedup.classes + dedup.aliases == no_dedup.classes
+    assert 0 < dedup.dedup_ratio < 1
+    assert dedup.lines < no_dedup.lines
+    assert dedup.stats()["median"] > 0
+    report.write(tmp_path / "report.json")
+    assert "- iam: " in report.summary()
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.benchmarks.dedup",
+        preview=False,
+    )
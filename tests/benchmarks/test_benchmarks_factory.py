@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+import pickle
+import dataclasses
+
+import pytest
+
+from boto3_dataclass.utils import import_generated_package
+from boto3_dataclass.benchmarks.common import (
+    import_meta_package,
+)
+from boto3_dataclass.benchmarks.cold_start import ResponseFixture
+from boto3_dataclass.benchmarks.runtime import RuntimeTarget
+from boto3_dataclass.benchmarks.memory import iter_cached_property_names
+from boto3_dataclass.benchmarks.factory import run_factory_benchmark_all
+
+
+def test_factory(tmp_path):
+    factory = import_meta_package(tmp_path).factory
+    fixture = ResponseFixture.list_all(service_names=["iam"])[0]
+    target = RuntimeTarget.from_service("iam", "get_role")
+    package = import_generated_package(
+        package_name=fixture.package_name,
+        tdm=target.tdm,
+        cm=target.cm,
+        dir_root=tmp_path,
+    )
+
+    # memoized per service and botocore version
+    iam_factory = factory.get_factory("iam")
+    assert factory.get_factory("iam") is iam_factory
+    klass = factory.get_output_class("iam", "GetRole")
+    assert iam_factory.get_output_class("get_role") is klass
+    assert factory.get_class("iam", "Role") is iam_factory.get_class("Role")
+
+    # the same attributes as the generated classes
+    res = factory.cast("iam", "GetRole", fixture.response)
+    generated_res = package.caster.cast("GetRole", fixture.response)
+    assert dataclasses.is_dataclass(res)
+    assert set(iter_cached_property_names(type(res))) == set(
+        iter_cached_property_names(type(generated_res))
+    )
+    assert set(iter_cached_property_names(type(res.Role))) == set(
+        iter_cached_property_names(type(generated_res.Role))
+    )
+    assert res.Role.Arn == generated_res.Role.Arn
+    assert res.Role.RoleLastUsed.Region == generated_res.Role.RoleLastUsed.Region
+    assert res.Role.Tags[0].Key == generated_res.Role.Tags[0].Key
+    assert (
+        res.ResponseMetadata.RequestId
+        == fixture.response["ResponseMetadata"]["RequestId"]
+    )
+    assert type(res).make_one(None) is None
+    assert type(res).make_many(None) is None
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        res.boto3_raw_data = {}
+
+    # no output shape, only ResponseMetadata
+    klass = iam_factory.get_output_class("DeleteRole")
+    assert list(iter_cached_property_names(klass)) == ["ResponseMetadata"]
+
+    with pytest.raises(ValueError):
+        iam_factory.cast("UnknownOperation", {})
+    with pytest.raises(ValueError):
+        iam_factory.get_class("UnknownShape")
+
+    # pickled as the raw dict, the class is looked up again on load
+    for obj in [res, res.Role, res.ResponseMetadata, klass.make_one({})]:
+        obj_copy = pickle.loads(pickle.dumps(obj))
+        assert type(obj_copy) is type(obj)
+        assert obj_copy == obj
+    assert pickle.loads(pickle.dumps(res)).Role.Arn == res.Role.Arn
+    res_by_method = iam_factory.cast("get_role", fixture.response)
+    assert type(pickle.loads(pickle.dumps(res_by_method))) is type(res)
+
+    # the botocore service name and the boto3_dataclass service name
+    assert factory.get_factory("sso-admin").service_data["metadata"]
+    assert factory.get_factory("sso_admin").service_data["metadata"]
+
+
+def test_run_factory_benchmark_all(tmp_path):
+    report = run_factory_benchmark_all(
+        fixtures=ResponseFixture.list_all(service_names=["sts"]),
+        n_runs=1,
+        repeat=2,
+        min_time=0.001,
+        dir_workspace=tmp_path,
+    )
+    assert [result.mode for result in report.results] == ["generated", "factory"]
+    for result in report.results:
+        assert result.stats()["total_time"]["median"] > 0
+        assert result.steady_ns_per_op["min"] > 0
+    report.write(tmp_path / "report.json")
+    assert "sts.get_caller_identity (factory)" in report.summary()
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.benchmarks.factory",
+        preview=False,
+    )
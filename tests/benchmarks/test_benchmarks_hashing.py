@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+import copy
+
+from boto3_dataclass.utils import import_generated_package
+from boto3_dataclass.benchmarks.common import (
+    import_meta_package,
+)
+from boto3_dataclass.benchmarks.runtime import RuntimeTarget
+from boto3_dataclass.benchmarks.synthetic import SyntheticResponseGenerator
+from boto3_dataclass.benchmarks.hashing import run_hashing_benchmark_all
+
+
+def check_hash_and_eq(res, response):
+    role = res.Roles[0]
+    other = type(res)(boto3_raw_data=copy.deepcopy(response))
+    # the whole raw dict is hashed, memoized
+    assert hash(res) == hash(other)
+    assert vars(res)["_hash"] == hash(res)
+    assert res == other
+    assert len({res, other}) == 1
+    # the identifier is hashed
+    assert hash(role) == hash(("RoleId", role.RoleId))
+    assert role != res.Roles[1]
+    assert role != role.boto3_raw_data
+
+    # equal identifiers, different content
+    changed = copy.deepcopy(role.boto3_raw_data)
+    changed["Path"] = "/changed/"
+    changed = type(role)(boto3_raw_data=changed)
+    assert hash(changed) == hash(role)
+    assert changed != role
+
+    # different memoized hashes
+    changed = copy.deepcopy(response)
+    changed["IsTruncated"] = not changed["IsTruncated"]
+    changed = type(res)(boto3_raw_data=changed)
+    hash(changed)
+    assert changed != res
+
+
+def test_hash_and_eq(tmp_path):
+    target = RuntimeTarget.from_service("iam", "list_roles")
+    generator = SyntheticResponseGenerator(tdm=target.tdm, list_size=2, seed=1)
+    response = generator.make(target.caster_method.boto3_stubs_type_name)
+    for compact in [False, True]:
+        package = import_generated_package(
+            package_name="boto3_dataclass_hashingtest",
+            tdm=target.tdm,
+            cm=target.cm,
+            dir_root=tmp_path / str(compact),
+            compact=compact,
+        )
+        check_hash_and_eq(package.caster.list_roles(response), response)
+
+    factory = import_meta_package(tmp_path / "meta").factory
+    check_hash_and_eq(factory.cast("iam", "list_roles", response), response)
+
+
+def test_run_hashing_benchmark_all(tmp_path):
+    report = run_hashing_benchmark_all(
+        targets=[
+            (RuntimeTarget.from_service("iam", "list_roles"), "Roles"),
+            (RuntimeTarget.from_service("s3", "list_objects_v2"), "Contents"),
+        ],
+        n_unique=10,
+        n_copies=2,
+        n_runs=1,
+        dir_workspace=tmp_path,
+    )
+    assert [result.key_field for result in report.results] == ["RoleId", ""]
+    report.write(tmp_path / "report.json")
+    assert "hash RoleId" in report.summary()
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.benchmarks.hashing",
+        preview=False,
+    )
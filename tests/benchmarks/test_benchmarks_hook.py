@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+import sys
+
+import pytest
+
+from boto3_dataclass.utils import import_generated_package
+from boto3_dataclass.benchmarks.cold_start import ResponseFixture
+from boto3_dataclass.benchmarks.runtime import RuntimeTarget
+from boto3_dataclass.benchmarks.throughput import new_boto3_session
+from boto3_dataclass.benchmarks.hook import (
+    import_hook_module,
+    make_before_call_handler,
+    get_nested_attribute,
+    run_hook_benchmark_all,
+)
+
+
+def test_hook(tmp_path):
+    hook = import_hook_module(tmp_path)
+    fixture = ResponseFixture.list_all(service_names=["sts"])[0]
+    target = RuntimeTarget.from_service("sts", "get_caller_identity")
+    import_generated_package(
+        package_name=fixture.package_name,
+        tdm=target.tdm,
+        cm=target.cm,
+        dir_root=tmp_path,
+    )
+
+    session = new_boto3_session()
+    raw_client = session.client("sts")
+    hook.install(session)
+    hooked_client = session.client("sts")
+    hook.uninstall(session)
+    after_uninstall_client = session.client("sts")
+    handler = make_before_call_handler(fixture.response)
+    for client in [raw_client, hooked_client, after_uninstall_client]:
+        client.meta.events.register("before-call", handler)
+
+    assert type(raw_client.get_caller_identity()) is dict
+    assert type(after_uninstall_client.get_caller_identity()) is dict
+
+    res = hooked_client.get_caller_identity()
+    assert isinstance(res, hook.TypedResponse)
+    assert res == fixture.response
+    # nothing is cast until ``.typed`` is accessed
+    assert f"{fixture.package_name}.type_defs" not in sys.modules
+    typed = res.typed
+    assert f"{fixture.package_name}.type_defs" in sys.modules
+    assert typed.Account == fixture.response["Account"]
+    assert res.typed is typed
+    assert get_nested_attribute(typed, fixture.nested_attribute)
+
+    res = hook.TypedResponse({}, "sts", "UnknownOperation")
+    with pytest.raises(ValueError):
+        _ = res.typed
+
+
+def test_run_hook_benchmark_all(tmp_path):
+    report = run_hook_benchmark_all(
+        fixtures=ResponseFixture.list_all(service_names=["sts"]),
+        repeat=2,
+        min_time=0.001,
+        dir_workspace=tmp_path,
+    )
+    result = report.results[0]
+    assert result.target == "sts.get_caller_identity"
+    assert list(result.ns_per_call) == ["raw", "hooked", "typed"]
+    assert result.wrap_ns["min"] > 0
+    report.write(tmp_path / "report.json")
+    assert "sts.get_caller_identity" in report.summary()
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.benchmarks.hook",
+        preview=False,
+    )
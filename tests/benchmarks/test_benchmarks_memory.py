@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+from boto3_dataclass.utils import import_generated_package
+from boto3_dataclass.benchmarks.runtime import RuntimeTarget
+from boto3_dataclass.benchmarks.synthetic import SyntheticResponseGenerator
+from boto3_dataclass.benchmarks.memory import (
+    materialize,
+    get_raw_size,
+    deep_size,
+    run_memory_benchmark_all,
+)
+
+
+def test_deep_size(tmp_path):
+    target = RuntimeTarget.from_test_gen_code()
+    package = import_generated_package(
+        package_name="boto3_dataclass_test_memory",
+        tdm=target.tdm,
+        cm=target.cm,
+        dir_root=tmp_path,
+    )
+    response = SyntheticResponseGenerator(tdm=target.tdm, list_size=3).make(
+        "UserTypeDef"
+    )
+    user = package.caster.get_user(response)
+
+    size = deep_size(user)
+    assert list(size.classes) == ["User"]
+    assert size.classes["User"].count == 1
+    assert size.raw_bytes == get_raw_size(response)
+
+    _ = user.attr7  # make_many with 3 items
+    size = deep_size(user)
+    assert size.classes["SimpleModel"].count == 3
+    assert size.classes["SimpleModel"].list_bytes > 0
+    assert size.wrapper_bytes == sum(c.total_bytes for c in size.classes.values())
+
+    size = deep_size(user, materialize_all=True)
+    # attr1 - attr6 are make_one, attr7 - attr9 are make_many
+    assert size.classes["SimpleModel"].count == 6 + 3 * 3
+    assert materialize(user) == 1 + 6 + 3 * 3
+    assert "SimpleModel: 15 objects" in size.summary()
+
+
+def test_run_memory_benchmark_all(tmp_path):
+    report = run_memory_benchmark_all(
+        targets=[RuntimeTarget.from_test_gen_code()],
+        list_sizes=[1, 5],
+        dir_workspace=tmp_path,
+    )
+    small, large = report.results
+    assert 0 < small.raw_bytes < large.raw_bytes
+    assert small.n_objects < large.n_objects
+    assert large.materialized_bytes > small.materialized_bytes
+    report.write(tmp_path / "report.json")
+    assert "gen_code.get_user (list size 5)" in report.summary()
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.benchmarks.memory",
+        preview=False,
+    )
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from boto3_dataclass.benchmarks.synthetic import SyntheticResponseGenerator
+from boto3_dataclass.benchmarks.runtime import (
+    PATTERNS,
+    RuntimeTarget,
+    walk_dict,
+    run_runtime_benchmark_all,
+)
+
+
+def test_runtime_target():
+    target = RuntimeTarget.from_test_gen_code()
+    assert target.find_first_scalar_path() == ["id"]
+
+    target = RuntimeTarget.from_service("iam", "get_role")
+    assert target.response_tdd.name == "GetRoleResponseTypeDef"
+    assert target.find_first_scalar_path()[0] == "Role"
+
+    with pytest.raises(ValueError):
+        RuntimeTarget.from_service("iam", "not_a_method")
+
+
+def test_run_runtime_benchmark_all(tmp_path):
+    target = RuntimeTarget.from_test_gen_code()
+    report = run_runtime_benchmark_all(
+        targets=[target],
+        list_sizes=[1, 3],
+        repeat=1,
+        min_time=0.001,
+        dir_workspace=tmp_path,
+    )
+    assert len(report.results) == 2 * len(PATTERNS) * 2
+    for result in report.results:
+        assert result.ns_per_op["median"] > 0
+        if result.impl == "dict":
+            assert result.blocks_per_op < 1
+
+    # the dataclass walk and the dict walk read the same fields
+    response = SyntheticResponseGenerator(tdm=target.tdm).make("UserTypeDef")
+    assert walk_dict(response, target.response_tdd, target.tdm) > 0
+
+    report.write(tmp_path / "report.json")
+    assert "gen_code.get_user (list size 3) full_walk" in report.summary()
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.benchmarks.runtime",
+        preview=False,
+    )
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import pickle
+
+import pytest
+
+from boto3_dataclass.benchmarks.common import import_meta_package
+from boto3_dataclass.benchmarks.runtime import RuntimeTarget
+from boto3_dataclass.benchmarks.shm import run_shm_benchmark_all
+
+
+def test_shared_items(tmp_path):
+    shm = import_meta_package(tmp_path / "meta").shm
+    response = {"Contents": [{"Key": f"k{i}", "Size": i} for i in range(10)]}
+    with shm.SharedItems.create(response, key="Contents", chunk_size=3) as shared:
+        assert len(shared) == 10
+        assert shared[0] == {"Key": "k0", "Size": 0}
+        assert shared[-1] == {"Key": "k9", "Size": 9}
+        with pytest.raises(IndexError):
+            shared[10]
+        assert list(shared) == response["Contents"]
+
+        # aligned to the chunks
+        views = shared.split(3)
+        assert [(view.start, view.stop) for view in views] == [(0, 6), (6, 9), (9, 10)]
+        # fewer chunks than views
+        assert [len(view) for view in shared.split(5)] == [2, 2, 2, 2, 2]
+
+        data = pickle.dumps(views[1])
+        assert len(data) < 200
+        with pickle.loads(data) as view:
+            assert [obj["Size"] for obj in view] == [6, 7, 8]
+        # the block is still there
+        assert shared[5]["Key"] == "k5"
+        name = shared.name
+
+    with pytest.raises(FileNotFoundError):
+        shm.SharedItemsView(name, 0, 1)[0]
+
+    with shm.SharedItems.create({}, key="Contents") as shared:
+        assert list(shared) == []
+
+
+def test_bad_magic(tmp_path):
+    from multiprocessing import shared_memory
+
+    shm = import_meta_package(tmp_path / "meta").shm
+    block = shared_memory.SharedMemory(create=True, size=64)
+    try:
+        with pytest.raises(ValueError):
+            shm.SharedItemsView(block.name, 0, 1)[0]
+    finally:
+        block.close()
+        block.unlink()
+
+
+def test_run_shm_benchmark_all(tmp_path):
+    report = run_shm_benchmark_all(
+        targets=[(RuntimeTarget.from_service("s3", "list_objects_v2"), "Contents")],
+        n_items_list=[10],
+        n_workers=1,
+        n_tasks=2,
+        n_runs=1,
+        dir_workspace=tmp_path,
+    )
+    result = report.results[0]
+    assert result.sent_bytes["shm"] < result.sent_bytes["pickle"]
+    report.write(tmp_path / "report.json")
+    assert "s3.list_objects_v2.Contents" in report.summary()
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.benchmarks.shm",
+        preview=False,
+    )
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import json
+import importlib
+
+from boto3_dataclass.utils import import_generated_package
+from boto3_dataclass.benchmarks.common import (
+    import_meta_package,
+)
+from boto3_dataclass.benchmarks.cold_start import ResponseFixture
+from boto3_dataclass.benchmarks.runtime import RuntimeTarget
+from boto3_dataclass.benchmarks.slim import run_slim_benchmark_all
+
+
+def test_trace(tmp_path):
+    trace = import_meta_package(tmp_path / "meta").trace
+    assert trace.install(["sts"], sample_rate=0.0) is None
+
+    fixture = ResponseFixture.list_all(service_names=["sts"])[0]
+    target = RuntimeTarget.from_service("sts", "get_caller_identity")
+    package = import_generated_package(
+        package_name=fixture.package_name,
+        tdm=target.tdm,
+        cm=target.cm,
+        dir_root=tmp_path,
+    )
+    tracer = trace.install(["sts"])
+    tracer.trace("sts")  # no-op, already traced
+    type_defs = importlib.import_module(f"{fixture.package_name}.type_defs")
+    klass = type_defs.GetCallerIdentityResponse
+    assert isinstance(vars(klass)["Account"], trace._Probe)
+
+    res = package.caster.get_caller_identity(fixture.response)
+    assert res.Account == fixture.response["Account"]
+    assert res.ResponseMetadata.RequestId
+    # the probe is replaced by the original descriptor after the first access
+    assert not isinstance(vars(klass)["Account"], trace._Probe)
+    assert isinstance(vars(klass)["Arn"], trace._Probe)
+    package.caster.cast("GetCallerIdentity", fixture.response)
+
+    tracer.uninstall()
+    assert not isinstance(vars(klass)["Arn"], trace._Probe)
+    assert "cast" not in vars(package.caster)
+    package.caster.get_caller_identity(fixture.response).Arn
+
+    path = tmp_path / "usage.json"
+    tracer.dump(str(path))
+    usage = json.loads(path.read_text())["services"]["sts"]
+    assert usage["operations"] == ["GetCallerIdentity", "get_caller_identity"]
+    assert usage["classes"] == {
+        "GetCallerIdentityResponse": ["Account", "ResponseMetadata"],
+        "ResponseMetadata": ["RequestId"],
+    }
+
+
+def test_run_slim_benchmark_all(tmp_path):
+    report = run_slim_benchmark_all(
+        fixtures=ResponseFixture.list_all(service_names=["sts"]),
+        n_runs=1,
+        dir_workspace=tmp_path,
+    )
+    result = report.results[0]
+    assert result.target == "sts.get_caller_identity"
+    assert result.classes["slim"] < result.classes["full"]
+    assert result.source_bytes["slim"] < result.source_bytes["full"]
+    report.write(tmp_path / "report.json")
+    assert "sts.get_caller_identity" in report.summary()
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.benchmarks.slim",
+        preview=False,
+    )
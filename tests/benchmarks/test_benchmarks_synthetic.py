@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+
+from boto3_dataclass.models.caster import CasterMethod, CasterModule
+from boto3_dataclass.tests.gen_code.typed_dict_def_mapping import tdm
+from boto3_dataclass.benchmarks.synthetic import (
+    SyntheticResponseGenerator,
+    get_path_synthetic_response,
+)
+
+
+class TestSyntheticResponseGenerator:
+    def test_make(self):
+        generator = SyntheticResponseGenerator(tdm=tdm, list_size=2, max_depth=1)
+        response = generator.make("SimpleContainerTypeDef")
+        assert len(response["attr1"]["attr1"]) == generator.scalar_size
+        assert len(response["attr7"]) == 2
+        assert set(response["attr7"][0]) == {"attr1"}
+
+        # same seed, same response
+        assert (
+            SyntheticResponseGenerator(tdm=tdm, list_size=2, max_depth=1).make(
+                "SimpleContainerTypeDef"
+            )
+            == response
+        )
+        assert (
+            SyntheticResponseGenerator(tdm=tdm, list_size=2, max_depth=1, seed=1).make(
+                "SimpleContainerTypeDef"
+            )
+            != response
+        )
+
+        generator.max_depth = 0
+        assert "attr1" not in generator.make("SimpleContainerTypeDef")
+
+        cm = CasterModule(
+            service_name="gen_code",
+            cms=[
+                CasterMethod(
+                    method_name="get_user",
+                    boto3_stubs_type_name="UserTypeDef",
+                    boto3_dataclass_type_name="User",
+                ),
+            ],
+        )
+        assert set(generator.make_response(cm, "get_user")) == {"id", "name"}
+
+    def test_dump(self, tmp_path):
+        generator = SyntheticResponseGenerator(tdm=tdm, list_size=2)
+        path = tmp_path / "response.json"
+
+        # without target size, same as make()
+        n_items = generator.dump("SimpleContainerTypeDef", path)
+        assert n_items == 2
+        expected = SyntheticResponseGenerator(tdm=tdm, list_size=2).make(
+            "SimpleContainerTypeDef"
+        )
+        assert json.loads(path.read_text()) == expected
+
+        # fill the root list up to the target size
+        n_items = generator.dump(
+            "SimpleContainerTypeDef",
+            path,
+            target_size=100_000,
+            fan_out_field="attr8",
+        )
+        data = json.loads(path.read_text())
+        assert len(data["attr8"]) == n_items > 100
+        assert len(data["attr7"]) == 2
+        assert path.stat().st_size >= 100_000
+
+        with pytest.raises(ValueError):
+            generator.dump("SimpleContainerTypeDef", path, fan_out_field="attr1")
+        with pytest.raises(ValueError):
+            generator.dump("SimpleModelTypeDef", path, target_size=1000)
+
+
+def test_get_path_synthetic_response():
+    path = get_path_synthetic_response("ec2", "describe_instances", 3, 0, 1000)
+    assert path.name == "describe_instances-list-3-seed-0-size-1000.json"
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.benchmarks.synthetic",
+        preview=False,
+    )
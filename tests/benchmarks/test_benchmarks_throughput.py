@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from boto3_dataclass.benchmarks.common import percentiles
+from boto3_dataclass.benchmarks.throughput import (
+    get_values,
+    scenario_s3_list_objects_v2,
+    run_throughput_benchmark_all,
+)
+
+
+def test_percentiles():
+    assert percentiles(list(range(1, 101))) == {"p50": 50, "p90": 90, "p99": 99}
+    assert percentiles([1.0]) == {"p50": 1.0, "p90": 1.0, "p99": 1.0}
+    assert percentiles([]) == {}
+
+
+def test_get_values():
+    response = {"Reservations": [{"Instances": [{"Id": "i-1"}, {"Id": "i-2"}]}]}
+    assert get_values(response, "Reservations.*.Instances.*.Id", True) == [
+        "i-1",
+        "i-2",
+    ]
+
+
+def test_run_throughput_benchmark_all(tmp_path):
+    pytest.importorskip("moto.server")
+
+    report = run_throughput_benchmark_all(
+        scenarios=[scenario_s3_list_objects_v2(n_items=3)],
+        thread_counts=[1, 2],
+        n_calls=4,
+        dir_workspace=tmp_path,
+    )
+    assert [(r.n_threads, r.mode) for r in report.results] == [
+        (1, "raw"),
+        (1, "cast"),
+        (2, "raw"),
+        (2, "cast"),
+    ]
+    for result in report.results:
+        assert result.requests_per_sec > 0
+        assert result.latency_ms["p50"] >= result.cast_latency_ms["p50"]
+    report.write(tmp_path / "report.json")
+    assert "s3.list_objects_v2 (3 items, 2 threads)" in report.summary()
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.benchmarks.throughput",
+        preview=False,
+    )
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+import pickle
+
+from boto3_dataclass.utils import import_generated_package
+from boto3_dataclass.benchmarks.runtime import RuntimeTarget
+from boto3_dataclass.benchmarks.synthetic import SyntheticResponseGenerator
+from boto3_dataclass.benchmarks.memory import materialize
+from boto3_dataclass.benchmarks.transfer import dumps, run_transfer_benchmark_all
+
+
+def test_reduce(tmp_path):
+    target = RuntimeTarget.from_service("iam", "list_roles")
+    generator = SyntheticResponseGenerator(tdm=target.tdm, list_size=2, seed=1)
+    response = generator.make(target.caster_method.boto3_stubs_type_name)
+    for compact in [False, True]:
+        package = import_generated_package(
+            package_name="boto3_dataclass_transfertest",
+            tdm=target.tdm,
+            cm=target.cm,
+            dir_root=tmp_path / str(compact),
+            compact=compact,
+        )
+        res = package.caster.list_roles(response)
+        materialize(res)
+        data = dumps(res, "reduce")
+        assert len(data) < len(dumps(res, "state"))
+        loaded = pickle.loads(data)
+        assert type(loaded) is type(res)
+        assert loaded == res
+        # the fields are rebuilt lazily
+        assert list(vars(loaded)) == ["boto3_raw_data"]
+        assert loaded.Roles[0].Arn == res.Roles[0].Arn
+
+
+def test_run_transfer_benchmark_all(tmp_path):
+    report = run_transfer_benchmark_all(
+        targets=[RuntimeTarget.from_service("sts", "get_caller_identity")],
+        list_sizes=[1],
+        n_workers=1,
+        n_tasks=1,
+        n_runs=1,
+        dir_workspace=tmp_path,
+    )
+    result = report.results[0]
+    assert result.pickle_bytes["reduce"] < result.pickle_bytes["state"]
+    report.write(tmp_path / "report.json")
+    assert "sts.get_caller_identity" in report.summary()
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.benchmarks.transfer",
+        preview=False,
+    )
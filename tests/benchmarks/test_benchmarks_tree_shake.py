@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+
+from boto3_dataclass.benchmarks.tree_shake import run_tree_shake_benchmark_all
+
+
+def test_run_tree_shake_benchmark_all(tmp_path):
+    report = run_tree_shake_benchmark_all(
+        service_names=["sts"],
+        n_runs=1,
+        black=False,
+        dir_workspace=tmp_path,
+    )
+    keep_all, shaken = report.results
+    assert [keep_all.mode, shaken.mode] == ["keep_all", "shaken"]
+    # the *RequestTypeDef are removed
+    assert 0 < shaken.classes < keep_all.classes
+    assert shaken.lines < keep_all.lines
+    assert shaken.stats()["median"] > 0
+    report.write(tmp_path / "report.json")
+    assert "- sts: removed" in report.summary()
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.benchmarks.tree_shake",
+        preview=False,
+    )
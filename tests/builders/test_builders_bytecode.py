@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import zipfile
+import importlib
+
+import pytest
+
+from boto3_dataclass.builders.bytecode import (
+    compile_package,
+    add_bytecode_to_wheel,
+    build_archive,
+)
+from boto3_dataclass.benchmarks.common import import_meta_package
+
+
+def make_package(dir_root, name="boto3_dataclass_bctest"):
+    dir_package = dir_root / name
+    dir_package.joinpath("sub").mkdir(parents=True)
+    dir_package.joinpath("__init__.py").write_text("from .caster import value\n")
+    dir_package.joinpath("caster.py").write_text("value = 'caster'\n")
+    dir_package.joinpath("sub", "__init__.py").write_text("")
+    dir_package.joinpath("sub", "type_defs.py").write_text("value = 'type_defs'\n")
+    return dir_package
+
+
+def test_compile_package(tmp_path):
+    dir_package = make_package(tmp_path)
+    pycs = compile_package(dir_package, optimize_levels=(0, 1))
+    assert len(pycs) == 4 * 2
+    # the flags of an unchecked hash pyc, see PEP 552
+    assert all(path.read_bytes()[4:8] == b"\x01\x00\x00\x00" for path in pycs)
+
+
+def test_add_bytecode_to_wheel(tmp_path):
+    path_wheel = tmp_path / "boto3_dataclass_bctest-0.1.0-py3-none-any.whl"
+    record = "boto3_dataclass_bctest-0.1.0.dist-info/RECORD"
+    with zipfile.ZipFile(path_wheel, "w") as zf:
+        zf.writestr("boto3_dataclass_bctest/__init__.py", "value = 1\n")
+        zf.writestr("boto3_dataclass_bctest/py.typed", "")
+        zf.writestr(
+            record,
+            f"boto3_dataclass_bctest/__init__.py,sha256=x,10\n{record},,\n",
+        )
+
+    arcnames = add_bytecode_to_wheel(path_wheel)
+    # run twice, the pyc are replaced, not duplicated
+    assert add_bytecode_to_wheel(path_wheel) == arcnames
+    tag = sys.implementation.cache_tag
+    assert arcnames == [f"boto3_dataclass_bctest/__pycache__/__init__.{tag}.pyc"]
+    with zipfile.ZipFile(path_wheel) as zf:
+        names = zf.namelist()
+        lines = zf.read(record).decode("utf-8").splitlines()
+    assert names[-1] == record
+    assert len(names) == 4
+    assert lines[-1] == f"{record},,"
+    assert len(lines) == 3
+    assert lines[1].startswith(f"{arcnames[0]},sha256=")
+
+    # the wheel is importable with the pyc
+    sys.path.insert(0, str(path_wheel))
+    try:
+        assert importlib.import_module("boto3_dataclass_bctest").value == 1
+    finally:
+        sys.path.remove(str(path_wheel))
+        sys.modules.pop("boto3_dataclass_bctest", None)
+
+
+def test_build_archive(tmp_path):
+    dir_package = make_package(tmp_path / "repos")
+    path_archive = tmp_path / "boto3_dataclass.archive"
+    index = build_archive([dir_package], path_archive)
+    assert set(index) == {
+        "boto3_dataclass_bctest",
+        "boto3_dataclass_bctest.caster",
+        "boto3_dataclass_bctest.sub",
+        "boto3_dataclass_bctest.sub.type_defs",
+    }
+    assert index["boto3_dataclass_bctest.sub"][0] is True
+
+    archive = import_meta_package(tmp_path / "meta").archive
+    finder = archive.install(path_archive)
+    try:
+        assert sorted(finder.module_names) == sorted(index)
+        package = importlib.import_module("boto3_dataclass_bctest")
+        assert package.value == "caster"
+        assert package.__spec__.loader is finder
+        type_defs = importlib.import_module("boto3_dataclass_bctest.sub.type_defs")
+        assert type_defs.value == "type_defs"
+        assert finder.find_spec("boto3_dataclass_unknown") is None
+    finally:
+        archive.uninstall(finder)
+        for name in index:
+            sys.modules.pop(name, None)
+    assert finder not in sys.meta_path
+
+    path_archive.write_bytes(b"not an archive" * 10)
+    with pytest.raises(ImportError):
+        archive.install(path_archive)
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.builders.bytecode",
+        preview=False,
+    )
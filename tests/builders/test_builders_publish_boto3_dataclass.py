@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import importlib
+
+import pytest
+
+from boto3_dataclass.utils import write
+from boto3_dataclass.builders.publish_boto3_dataclass import Boto3DataclassBuilder
+
+
+def test_lazy_service_attributes(tmp_path, monkeypatch):
+    builder = Boto3DataclassBuilder.new(
+        version="0.1.1",
+        package_name="boto3_dataclass_lazymeta",
+    )
+    builder.structure.dir_repo = tmp_path / "repo"
+    builder.build_all()
+    for name in ["lazytest", "lambda"]:
+        write(
+            tmp_path / "site" / f"boto3_dataclass_{name}" / "__init__.py",
+            f"caster = {name!r}\n",
+        )
+        write(tmp_path / "site" / f"boto3_dataclass_{name}" / "caster.py", "")
+    # not a service, e.g. a bundle
+    write(tmp_path / "site" / "boto3_dataclass_lazybundle" / "__init__.py", "")
+    monkeypatch.syspath_prepend(str(tmp_path / "site"))
+    monkeypatch.syspath_prepend(str(builder.structure.dir_repo))
+
+    meta = importlib.import_module("boto3_dataclass_lazymeta")
+    assert meta.__version__ == "0.1.1"
+    services = meta.list_services()
+    assert {"lazytest", "lambda"} <= set(services)
+    assert "lazybundle" not in services
+    # not imported until accessed
+    assert "boto3_dataclass_lazytest" not in sys.modules
+    assert "lazytest" in dir(meta)
+    assert meta.lazytest.caster == "lazytest"
+    assert "lazytest" in vars(meta)
+    assert meta.lambda_.caster == "lambda"
+    assert getattr(meta, "lambda") is meta.lambda_
+    with pytest.raises(AttributeError):
+        _ = meta.not_a_service
+
+    # the packages of an installed archive, see boto3_dataclass.archive
+    class Finder:
+        module_names = [
+            "boto3_dataclass_archived",
+            "boto3_dataclass_archived.caster",
+            "boto3_dataclass_archivedbundle",
+            "boto3_dataclass_archivedbundle.type_defs",
+        ]
+
+        def find_spec(self, fullname, path=None, target=None):
+            return None
+
+    monkeypatch.setattr(sys, "meta_path", [Finder(), *sys.meta_path])
+    assert "archived" not in meta.list_services()
+    meta.list_services.cache_clear()
+    assert meta.list_services() == sorted([*services, "archived"])
+
+    for name in list(sys.modules):
+        if name.startswith(("boto3_dataclass_lazy", "boto3_dataclass_lambda")):
+            monkeypatch.delitem(sys.modules, name)
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.builders.publish_boto3_dataclass",
+        preview=False,
+    )
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import importlib
+
+import pytest
+
+from boto3_dataclass.builders.publish_boto3_dataclass_bundle import (
+    Boto3DataclassBundleBuilder,
+)
+
+
+def test_build_all(tmp_path, monkeypatch):
+    builder = Boto3DataclassBundleBuilder.new(
+        package_name="boto3_dataclass_bundlebuildtest",
+        allowlist=["sts.get_caller_identity", "lambda.Invoke"],
+        version="0.1.1",
+    )
+    builder.structure.dir_repo = tmp_path / "repo"
+    assert builder.service_names == ["lambda_", "sts"]
+    assert builder.operations == ["lambda.Invoke", "sts.get_caller_identity"]
+    report = builder.build_all()
+    assert [service.methods_after for service in report.services] == [1, 1]
+    service = report.services[1]
+    # every field of the reachable classes is kept
+    assert service.classes_after == 2
+    assert service.fields_after == 9
+    assert "sts" in report.summary()
+    assert builder.structure.path_pyproject_toml.exists()
+    assert "lambda.Invoke" in builder.structure.path_README_rst.read_text()
+
+    monkeypatch.syspath_prepend(str(builder.structure.dir_repo))
+    package = importlib.import_module("boto3_dataclass_bundlebuildtest")
+    assert package.__version__ == "0.1.1"
+    sts = importlib.import_module("boto3_dataclass_bundlebuildtest.sts")
+    res = sts.caster.get_caller_identity({"Account": "123", "Arn": "arn"})
+    assert res.Account == "123"
+    assert not hasattr(sts.caster, "get_session_token")
+    lambda_ = importlib.import_module("boto3_dataclass_bundlebuildtest.lambda_")
+    assert lambda_.caster.invoke({"StatusCode": 200}).StatusCode == 200
+    for name in list(sys.modules):
+        if name.startswith("boto3_dataclass_bundlebuildtest"):
+            monkeypatch.delitem(sys.modules, name)
+
+
+def test_unknown_operation(tmp_path):
+    builder = Boto3DataclassBundleBuilder.new(
+        package_name="boto3_dataclass_bundlebuildtest",
+        allowlist=["lambda.Invoke", "sts.get_caller_identity", "sts.get_role"],
+    )
+    builder.structure.dir_repo = tmp_path / "repo"
+    path_old = builder.structure.dir_repo / "old.txt"
+    path_old.parent.mkdir(parents=True)
+    path_old.write_text("old")
+    with pytest.raises(ValueError, match="get_role"):
+        builder.build_all()
+    # the previous bundle is untouched, no service before sts is written
+    assert path_old.read_text() == "old"
+    assert not builder.structure.dir_package.exists()
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.builders.publish_boto3_dataclass_bundle",
+        preview=False,
+    )
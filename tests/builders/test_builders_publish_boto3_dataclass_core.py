@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import importlib
+
+import pytest
+
+from boto3_dataclass.models.typed_dict import (
+    TypedDictField,
+    TypedDictDef,
+    TypedDefsModule,
+)
+from boto3_dataclass.models.caster import CasterMethod, CasterModule
+from boto3_dataclass.builders.publish_boto3_dataclass_core import (
+    CORE_TYPE_DEFS_LINE,
+    CoreIndex,
+    make_core_module,
+    make_core_report,
+)
+from boto3_dataclass.utils import import_generated_package
+from boto3_dataclass.tests.typed_dict import nested
+from boto3_dataclass.benchmarks.compact import write_type_defs
+
+
+def make_service_tdms() -> dict[str, TypedDefsModule]:
+    metadata = TypedDictDef(
+        name="ResponseMetadataTypeDef",
+        fields=[TypedDictField(name="RequestId")],
+    )
+    return {
+        "iam": TypedDefsModule(
+            tdds=[
+                metadata,
+                TypedDictDef(
+                    name="TagTypeDef",
+                    fields=[TypedDictField(name="Key"), TypedDictField(name="Value")],
+                ),
+                TypedDictDef(
+                    name="GetRoleResponseTypeDef",
+                    fields=[
+                        nested("Tags", "TagTypeDef", True),
+                        nested("ResponseMetadata", "ResponseMetadataTypeDef"),
+                    ],
+                ),
+                # same structure in both services, but the nested target is
+                # not in the module
+                TypedDictDef(name="ExternalTypeDef", fields=[nested("X", "Other")]),
+                TypedDictDef(name="FilterTypeDef", fields=[TypedDictField(name="A")]),
+            ],
+        ),
+        "s3": TypedDefsModule(
+            tdds=[
+                metadata,
+                TypedDictDef(
+                    name="TagOutputTypeDef",
+                    fields=[TypedDictField(name="Value"), TypedDictField(name="Key")],
+                ),
+                TypedDictDef(
+                    name="GetTagsResponseTypeDef",
+                    fields=[
+                        nested("Tags", "TagV1TypeDef", True),
+                        nested("ResponseMetadata", "ResponseMetadataTypeDef"),
+                    ],
+                ),
+                TypedDictDef(name="ExternalTypeDef", fields=[nested("X", "Other")]),
+                # same name as in iam, but a different structure
+                TypedDictDef(name="FilterTypeDef", fields=[TypedDictField(name="B")]),
+            ],
+            aliases={"TagV1TypeDef": "TagOutputTypeDef"},
+        ),
+        "sts": TypedDefsModule(
+            tdds=[
+                metadata,
+                TypedDictDef(name="FilterTypeDef", fields=[TypedDictField(name="A")]),
+                TypedDictDef(name="FilterV2TypeDef", fields=[TypedDictField(name="B")]),
+            ],
+        ),
+    }
+
+
+def test_make_core_module():
+    service_tdms = make_service_tdms()
+    core_tdm, index = make_core_module(service_tdms)
+    tdds = {tdd.name: tdd for tdd in core_tdm.tdds}
+    # the most common name wins, ties go to the shortest
+    assert "ResponseMetadataTypeDef" in tdds
+    assert "TagTypeDef" in tdds
+    assert "GetRoleResponseTypeDef" in tdds
+    # the nested target is renamed to the core name
+    fields = {tdf.name: tdf for tdf in tdds["GetRoleResponseTypeDef"].fields}
+    assert fields["Tags"].anno.nested_type_name == "TagTypeDef"
+    assert fields["Tags"].anno.nested_type_subscriptor == "List"
+    # a shape with a target outside the module stays in the service package
+    assert "ExternalTypeDef" not in tdds
+    # two shapes named FilterTypeDef, both get the hash in the name
+    filters = [name for name in tdds if name.startswith("Filter_")]
+    assert len(filters) == 2
+    assert len(index.shapes) == len(tdds)
+    assert set(index.shapes.values()) == set(tdds)
+
+    core_tdm, index = make_core_module(service_tdms, min_services=3)
+    assert [tdd.name for tdd in core_tdm.tdds] == ["ResponseMetadataTypeDef"]
+
+
+def test_core_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(CoreIndex, "get_dir", staticmethod(lambda: tmp_path))
+    with pytest.raises(FileNotFoundError):
+        CoreIndex.read("1.2.3")
+    index = CoreIndex(version="1.2.3", shapes={"abc": "TagTypeDef"})
+    index.write()
+    assert CoreIndex.read("1.2.3") == index
+
+
+def test_make_core_report():
+    service_tdms = make_service_tdms()
+    core_tdm, index = make_core_module(service_tdms)
+    report = make_core_report("1.2.3", service_tdms, core_tdm, index)
+    assert report.core_classes == len(core_tdm.tdds)
+    for service in report.services:
+        assert service.classes_moved > 0
+        assert service.bytes_after < service.bytes_before
+    assert report.bytes_after == (
+        sum(service.bytes_after for service in report.services) + report.core_bytes
+    )
+    assert "bytes saved" in report.summary()
+
+
+def test_use_core_runtime(tmp_path, monkeypatch):
+    service_tdms = make_service_tdms()
+    core_tdm, index = make_core_module(service_tdms)
+    # the core package has no caster
+    dir_core = tmp_path / "boto3_dataclass_core"
+    write_type_defs(dir_core, core_tdm.gen_code(type_defs_line=CORE_TYPE_DEFS_LINE))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for name in list(sys.modules):
+        if name.startswith("boto3_dataclass_core"):
+            monkeypatch.delitem(sys.modules, name)
+
+    cms = {
+        "iam": ("get_role", "GetRoleResponseTypeDef"),
+        "s3": ("get_tags", "GetTagsResponseTypeDef"),
+    }
+    results = dict()
+    for service_name, (method_name, type_name) in cms.items():
+        tdm = service_tdms[service_name].use_core(index.shapes)
+        assert type_name in tdm.core_imports
+        cm = CasterModule(
+            service_name=service_name,
+            cms=[
+                CasterMethod(
+                    method_name=method_name,
+                    boto3_stubs_type_name=type_name,
+                    boto3_dataclass_type_name=type_name.removesuffix("TypeDef"),
+                ),
+            ],
+        )
+        package = import_generated_package(
+            package_name=f"boto3_dataclass_coretest_{service_name}",
+            tdm=tdm,
+            cm=cm,
+            dir_root=tmp_path / service_name,
+        )
+        res = getattr(package.caster, method_name)(
+            {"Tags": [{"Key": "k"}], "ResponseMetadata": {"RequestId": "r"}}
+        )
+        assert res.Tags[0].Key == "k"
+        results[service_name] = res
+
+    # the services share the classes of the core package
+    assert type(results["iam"]) is type(results["s3"])
+    assert type(results["iam"].Tags[0]) is type(results["s3"].Tags[0])
+    type_defs = importlib.import_module("boto3_dataclass_coretest_s3.type_defs")
+    assert type_defs.TagOutput.__module__ == "boto3_dataclass_core.type_defs"
+    assert type_defs.TagV1 is type_defs.TagOutput
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.builders.publish_boto3_dataclass_core",
+        preview=False,
+    )
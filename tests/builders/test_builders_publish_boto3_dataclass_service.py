@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from boto3_dataclass.parsers import botocore_parser
+from boto3_dataclass.structures.api import Boto3DataclassServiceStructure
+from boto3_dataclass.builders.shard import ShardSpec
+from boto3_dataclass.builders.publish_boto3_dataclass_core import CoreIndex
+from boto3_dataclass.builders.publish_boto3_dataclass_service import (
+    Boto3DataclassServiceBuilder,
+)
+
+
+def make_builder() -> Boto3DataclassServiceBuilder:
+    return Boto3DataclassServiceBuilder(
+        version="0.1.1",
+        structure=Boto3DataclassServiceStructure.new("iam"),
+    )
+
+
+def test_parse_client_module():
+    builder = make_builder()
+    cm = builder.parse_client_module()
+    assert cm.cms_mapping["list_roles"].operation_name == "ListRoles"
+
+
+def test_parse_client_module_not_in_botocore(monkeypatch):
+    def get_botocore_service_name(service_name, loader=None):
+        raise ValueError(f"Service {service_name!r} not found in botocore data")
+
+    monkeypatch.setattr(
+        botocore_parser, "get_botocore_service_name", get_botocore_service_name
+    )
+    cm = make_builder().parse_client_module()
+    assert len(cm.cms)
+    assert {method.operation_name for method in cm.cms} == {None}
+
+
+def test_client_module(monkeypatch):
+    builder = make_builder()
+    calls = []
+    parse_client_module = builder.parse_client_module
+    monkeypatch.setattr(
+        builder,
+        "parse_client_module",
+        lambda: calls.append(1) or parse_client_module(),
+    )
+    tdm = builder.prepare_type_defs_module()
+    assert builder.client_module.service_name == "iam"
+    assert len(tdm.tdds)
+    assert calls == [1]
+
+
+def test_parallel_build_all_shard_use_core(monkeypatch, tmp_path):
+    def build_core(*args, **kwargs):  # pragma: no cover
+        raise AssertionError("a shard must not build the core package")
+
+    monkeypatch.setattr(CoreIndex, "get_dir", staticmethod(lambda: tmp_path))
+    monkeypatch.setattr(Boto3DataclassServiceBuilder, "build_core", build_core)
+    # the core package is not built yet
+    with pytest.raises(FileNotFoundError):
+        Boto3DataclassServiceBuilder.parallel_build_all(
+            version="0.1.1",
+            shard=ShardSpec(1, 2),
+            use_core=True,
+        )
+
+
+def test_list_filtered_sorted_all_shard():
+    def list_slugs(**kwargs) -> list[str]:
+        return [
+            builder.structure.package_name_slug
+            for builder in Boto3DataclassServiceBuilder.list_filtered_sorted_all(
+                **kwargs
+            )
+        ]
+
+    slugs = list_slugs()
+    shards = [list_slugs(shard=ShardSpec(i, 2)) for i in [1, 2]]
+    assert sorted(shards[0] + shards[1]) == slugs
+    # a published service doesn't move the other services to another shard
+    status = {shards[0][0]: True}
+    assert (
+        list_slugs(shard=ShardSpec(1, 2), package_status_info=status) == shards[0][1:]
+    )
+    assert list_slugs(shard=ShardSpec(2, 2), package_status_info=status) == shards[1]
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.builders.publish_boto3_dataclass_service",
+        preview=False,
+    )
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import importlib
+
+from boto3_dataclass.models.usage import UsageManifest
+from boto3_dataclass.builders.publish_boto3_dataclass_slim import (
+    Boto3DataclassSlimBuilder,
+)
+
+
+def test_build_all(tmp_path, monkeypatch):
+    path = tmp_path / "usage.json"
+    UsageManifest.from_dict(
+        {
+            "services": {
+                "sts": {
+                    "operations": ["get_caller_identity"],
+                    "classes": {"GetCallerIdentityResponse": ["Account"]},
+                }
+            }
+        }
+    ).write(path)
+    builder = Boto3DataclassSlimBuilder.new(
+        package_name="boto3_dataclass_slimbuildtest",
+        paths=[path],
+        version="0.1.1",
+    )
+    builder.structure.dir_repo = tmp_path / "repo"
+    assert builder.service_names == ["sts"]
+    report = builder.build_all()
+    service = report.services[0]
+    assert service.methods_after == 1
+    assert service.classes_after == 1
+    assert service.fields_after == 1
+    assert service.bytes_after < service.bytes_before
+    assert "sts" in report.summary()
+    report.write(tmp_path / "report.json")
+
+    monkeypatch.syspath_prepend(str(builder.structure.dir_repo))
+    package = importlib.import_module("boto3_dataclass_slimbuildtest.sts")
+    res = package.caster.get_caller_identity({"Account": "123", "Arn": "arn"})
+    assert res.Account == "123"
+    assert res.Arn == "arn"
+    for name in list(sys.modules):
+        if name.startswith("boto3_dataclass_slimbuildtest"):
+            monkeypatch.delitem(sys.modules, name)
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.builders.publish_boto3_dataclass_slim",
+        preview=False,
+    )
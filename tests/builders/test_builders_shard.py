@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from boto3_dataclass.builders.shard import (
+    ShardSpec,
+    partition_by_cost,
+    select_shard,
+    ShardManifest,
+    merge_shard_manifests,
+)
+
+
+class TestShardSpec:
+    def test_parse(self):
+        shard = ShardSpec.parse("2/4")
+        assert shard.index == 2
+        assert shard.total == 4
+        assert shard.label == "2-of-4"
+
+        for s in ["0/4", "5/4", "1/0", "1", "a/b"]:
+            with pytest.raises(ValueError):
+                ShardSpec.parse(s)
+
+
+def test_partition_by_cost():
+    costs = {"ec2": 100, "s3": 40, "iam": 30, "sts": 10, "sqs": 10, "kms": 10}
+    items = sorted(costs)
+    buckets = partition_by_cost(items, cost_func=costs.get, total=2)
+    # every item appears in exactly one bucket
+    assert sorted(item for bucket in buckets for item in bucket) == items
+    # balanced by cost, not by count
+    assert buckets[0] == ["ec2"]
+    assert sorted(buckets[1]) == ["iam", "kms", "s3", "sqs", "sts"]
+    # deterministic
+    assert partition_by_cost(items, cost_func=costs.get, total=2) == buckets
+
+    # more shards than items
+    buckets = partition_by_cost(["a"], cost_func=lambda x: 1, total=3)
+    assert buckets == [["a"], [], []]
+
+    assert select_shard(items, costs.get, ShardSpec.parse("1/2")) == ["ec2"]
+
+
+def make_manifest(index: int, total: int, services: list[str]) -> ShardManifest:
+    return ShardManifest(
+        version="1.40.0",
+        shard_index=index,
+        shard_total=total,
+        services={service: {"pyproject.toml": "abc"} for service in services},
+    )
+
+
+def test_merge_shard_manifests(tmp_path):
+    m1 = make_manifest(1, 2, ["ec2"])
+    m2 = make_manifest(2, 2, ["iam", "s3"])
+
+    # write / read round trip
+    path = tmp_path / "shard-1-of-2.json"
+    m1.write(path)
+    assert ShardManifest.read(path) == m1
+
+    merged = merge_shard_manifests(
+        [m2, m1], expected_service_names=["ec2", "iam", "s3"]
+    )
+    assert list(merged) == ["ec2", "iam", "s3"]
+
+    # missing shard
+    with pytest.raises(ValueError):
+        merge_shard_manifests([m1])
+    # service built twice
+    with pytest.raises(ValueError):
+        merge_shard_manifests([m1, make_manifest(2, 2, ["ec2"])])
+    # service not built
+    with pytest.raises(ValueError):
+        merge_shard_manifests(
+            [m1, m2], expected_service_names=["ec2", "iam", "s3", "sts"]
+        )
+    # mixed shard total
+    with pytest.raises(ValueError):
+        merge_shard_manifests([m1, make_manifest(2, 3, ["s3"])])
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.builders.shard",
+        preview=False,
+    )
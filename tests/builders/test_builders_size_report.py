@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+from types import SimpleNamespace
+
+import pytest
+
+from boto3_dataclass.builders.shard import ShardSpec
+from boto3_dataclass.builders.size_report import (
+    count_classes_and_fields,
+    count_caster_methods,
+    ServiceSize,
+    SizeReport,
+    SizeBudget,
+    SizeHistory,
+    get_path_shard_size_report,
+    merge_shard_size_report_files,
+    record_wheel_sizes,
+)
+from boto3_dataclass.parsers.type_defs_parser import TypedDefsModuleParser
+from boto3_dataclass.paths import path_enum
+
+
+def test_count_classes_and_fields():
+    parser = TypedDefsModuleParser(path_stub_file=path_enum.path_test_stub_file)
+    tdm = parser.parse()
+    code = tdm.gen_code(
+        type_defs_line="from boto3_dataclass.tests.gen_code import type_defs",
+    )
+    n_class, n_field = count_classes_and_fields(code)
+    assert n_class == len(tdm.tdds)
+    assert n_field == sum(len(tdd.fields) for tdd in tdm.tdds)
+
+    code = tdm.gen_code(type_defs_line="", compact=True)
+    assert count_classes_and_fields(code) == (n_class, n_field)
+
+
+def test_count_caster_methods():
+    code = """
+class IAMCaster:
+    def cast(self, operation_name, res):
+        pass
+
+    def get_role(self, res):
+        pass
+
+    def list_roles(self, res):
+        pass
+
+    def _private(self):
+        pass
+    """
+    assert count_caster_methods(code) == 2
+
+
+def make_report(version: str, **bytes_mapping: int) -> SizeReport:
+    return SizeReport(
+        version=version,
+        services={
+            service_name: ServiceSize(service_name=service_name, bytes=b, lines=b)
+            for service_name, b in bytes_mapping.items()
+        },
+    )
+
+
+def test_size_budget():
+    baseline = make_report("1.40.0", ec2=1000, s3=100)
+
+    report = make_report("1.40.1", ec2=1050, s3=100, iam=999999)
+    assert report.total("bytes") == 1050 + 100 + 999999
+    # the new service iam is not compared
+    assert SizeBudget(max_total_bytes_growth=0.10).check(report, baseline) == []
+
+    report = make_report("1.40.1", ec2=1200, s3=100)
+    violations = SizeBudget(max_total_bytes_growth=0.10).check(report, baseline)
+    assert len(violations) == 1
+    assert "total bytes" in violations[0]
+
+    violations = SizeBudget(
+        max_total_bytes_growth=None,
+        max_service_bytes_growth=0.10,
+    ).check(make_report("1.40.1", ec2=1000, s3=200), baseline)
+    assert len(violations) == 1
+    assert "s3 bytes" in violations[0]
+
+
+def test_size_report_serialization():
+    report = make_report("1.40.0", ec2=1000, s3=100)
+    assert SizeReport.from_dict(report.to_dict()) == report
+    assert "ec2" in report.summary()
+
+    # a report of an older build with a dropped metric
+    data = report.to_dict()
+    data["services"]["ec2"]["dropped"] = None
+    assert SizeReport.from_dict(data) == report
+
+
+def test_merge_shard_size_report_files(monkeypatch, tmp_path):
+    monkeypatch.setattr(path_enum, "dir_build", tmp_path)
+    version = "1.40.0"
+    for shard, report in [
+        (ShardSpec(1, 2), make_report(version, ec2=1000)),
+        (ShardSpec(2, 2), make_report(version, s3=100, iam=10)),
+    ]:
+        report.write(get_path_shard_size_report(version, shard))
+    # the shards don't touch the size history
+    assert SizeHistory.read(version).reports == []
+
+    report = merge_shard_size_report_files(version)
+    assert sorted(report.services) == ["ec2", "iam", "s3"]
+    history = SizeHistory.read(version)
+    assert len(history.reports) == 1
+    assert history.last_accepted == report
+
+    # the next sharded build is checked against the merged build
+    make_report(version, ec2=2000).write(
+        get_path_shard_size_report(version, ShardSpec(1, 2))
+    )
+    with pytest.raises(ValueError, match="total bytes"):
+        merge_shard_size_report_files(version, budget=SizeBudget())
+    history = SizeHistory.read(version)
+    assert [report.accepted for report in history.reports] == [True, False]
+
+
+def test_size_report_merge():
+    with pytest.raises(ValueError, match="ec2"):
+        SizeReport.merge(
+            version="1.40.0",
+            reports=[
+                make_report("1.40.0", ec2=1000),
+                make_report("1.40.0", ec2=1000, s3=100),
+            ],
+        )
+
+
+def test_record_wheel_sizes(monkeypatch, tmp_path):
+    monkeypatch.setattr(path_enum, "dir_build", tmp_path)
+    version = "1.40.0"
+    structures = []
+    for service_name, n_bytes in [("ec2", 300), ("s3", 200)]:
+        dir_dist = tmp_path / service_name / "dist"
+        dir_dist.mkdir(parents=True)
+        (dir_dist / f"{service_name}-{version}-py3-none-any.whl").write_bytes(
+            b"x" * n_bytes
+        )
+        structures.append(SimpleNamespace(service_name=service_name, dir_dist=dir_dist))
+    with pytest.raises(ValueError):
+        record_wheel_sizes(version, structures)
+
+    # the last report of the size history
+    SizeHistory(
+        version=version, reports=[make_report(version, ec2=1000, s3=100)]
+    ).write()
+    report = record_wheel_sizes(version, structures)
+    assert report.total("wheel_bytes") == 500
+    assert SizeHistory.read(version).reports[-1] == report
+    assert "Total wheel size" in report.summary()
+
+    # the report of a shard, the wheel size goes through the merge
+    shard = ShardSpec(1, 1)
+    with pytest.raises(ValueError):
+        record_wheel_sizes(version, structures, shard=shard)
+    make_report(version, ec2=1000).write(get_path_shard_size_report(version, shard))
+    record_wheel_sizes(version, structures, shard=shard)
+    report = merge_shard_size_report_files(version)
+    assert report.services["ec2"].wheel_bytes == 300
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.builders.size_report",
+        preview=False,
+    )
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+from boto3_dataclass.builders.smoke_import import (
+    parse_importtime,
+    smoke_import,
+    ImportResult,
+    SmokeImportReport,
+    run_smoke_import_all,
+)
+
+
+def test_parse_importtime():
+    stderr = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 | site",
+            "__BOTO3_DATACLASS_SMOKE_IMPORT_START__",
+            "import time: self [us] | cumulative | imported package",
+            "import time:       345 |        345 |   dataclasses",
+            "import time:      1200 |       1545 | my_package",
+        ]
+    )
+    entries = parse_importtime(stderr)
+    assert [entry.module for entry in entries] == ["dataclasses", "my_package"]
+    assert entries[1].self_us == 1200
+    assert entries[1].cumulative_us == 1545
+
+
+def test_smoke_import(tmp_path):
+    dir_good = tmp_path / "good_pkg"
+    dir_good.mkdir()
+    dir_good.joinpath("__init__.py").write_text("import dataclasses\n")
+    dir_bad = tmp_path / "bad_pkg"
+    dir_bad.mkdir()
+    dir_bad.joinpath("__init__.py").write_text("raise ValueError('boom')\n")
+    # the caster doesn't import type_defs.py, the smoke import does
+    dir_lazy = tmp_path / "lazy_pkg"
+    dir_lazy.mkdir()
+    dir_lazy.joinpath("__init__.py").write_text("")
+    dir_lazy.joinpath("type_defs.py").write_text("raise ValueError('broken')\n")
+
+    result = smoke_import("good_pkg", tmp_path)
+    assert result.success is True
+    assert result.import_time > 0
+    assert result.rss_delta is not None
+
+    result = smoke_import("bad_pkg", tmp_path, precompile=False)
+    assert result.success is False
+    assert "boom" in result.error
+
+    result = smoke_import("lazy_pkg", tmp_path, precompile=False)
+    assert result.success is False
+    assert "broken" in result.error
+
+    report = run_smoke_import_all(
+        version="1.40.0",
+        packages=[("good_pkg", tmp_path), ("bad_pkg", tmp_path)],
+        n_workers=2,
+    )
+    assert [result.package_name for result in report.failed] == ["bad_pkg"]
+
+    path = tmp_path / "report.json"
+    report.write(path)
+    assert SmokeImportReport.read(path) == report
+
+
+def test_compare():
+    previous = SmokeImportReport(
+        version="1.40.0",
+        results={
+            "a": ImportResult("a", True, import_time=0.100),
+            "b": ImportResult("b", True, import_time=0.100),
+            "c": ImportResult("c", True, import_time=0.001),
+            "d": ImportResult("d", True, import_time=0.100),
+        },
+    )
+    current = SmokeImportReport(
+        version="1.40.1",
+        results={
+            "a": ImportResult("a", True, import_time=0.105),  # noise
+            "b": ImportResult("b", True, import_time=0.200),  # slower
+            "c": ImportResult("c", True, import_time=0.002),  # too small
+            "d": ImportResult("d", False, error="boom"),  # broken
+        },
+    )
+    regressions = current.compare(previous)
+    assert [r.package_name for r in regressions] == ["b", "d"]
+    assert regressions[0].ratio == 2.0
+    assert regressions[1].ratio is None
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.builders.smoke_import",
+        preview=False,
+    )
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from boto3_dataclass.models.caster import CasterMethod, CasterModule
+from boto3_dataclass.tests.gen_code.typed_dict_def_mapping import tdm
+from boto3_dataclass.utils import import_generated_package
+
+
+class TestCasterModule:
+    def test_dispatch_mapping(self):
+        cm = CasterModule(
+            service_name="iam",
+            cms=[
+                CasterMethod(
+                    method_name="get_role",
+                    boto3_stubs_type_name="GetRoleResponseTypeDef",
+                    boto3_dataclass_type_name="GetRoleResponse",
+                    operation_name="GetRole",
+                ),
+                # boto3 customized method, no botocore operation
+                CasterMethod(
+                    method_name="custom",
+                    boto3_stubs_type_name="CustomTypeDef",
+                    boto3_dataclass_type_name="Custom",
+                ),
+            ],
+        )
+        assert cm.dispatch_mapping == {
+            "GetRole": "GetRoleResponse",
+            "get_role": "GetRoleResponse",
+            "custom": "Custom",
+        }
+
+    def test_gen_code(self, tmp_path):
+        cm = CasterModule(
+            service_name="gen_code",
+            cms=[
+                CasterMethod(
+                    method_name="get_user",
+                    boto3_stubs_type_name="UserTypeDef",
+                    boto3_dataclass_type_name="User",
+                    operation_name="GetUser",
+                ),
+            ],
+        )
+        package = import_generated_package(
+            package_name="boto3_dataclass_test_caster",
+            tdm=tdm,
+            cm=cm,
+            dir_root=tmp_path,
+        )
+        # type_defs.py is loaded on the first cast
+        assert not hasattr(package, "type_defs")
+
+        res = {"id": "u-1", "name": "alice"}
+        user = package.caster.cast("GetUser", res)
+        assert type(user).__name__ == "User"
+        assert user.id == "u-1"
+        assert package.caster.cast("get_user", res).name == "alice"
+        assert package.caster.get_user(res).id == "u-1"
+        assert package.caster.get_user(None) is None
+
+        with pytest.raises(ValueError):
+            package.caster.cast("GetGroup", res)
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.models.caster",
+        preview=False,
+    )
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+from boto3_dataclass.models.caster import CasterMethod, CasterModule
+from boto3_dataclass.models.reachability import TypeReachabilityGraph
+from boto3_dataclass.tests.gen_code.typed_dict_def_mapping import tdm
+
+
+def make_cm(*type_names: str) -> CasterModule:
+    return CasterModule(
+        service_name="bmtest",
+        cms=[
+            CasterMethod(
+                method_name=f"method_{i}",
+                boto3_stubs_type_name=type_name,
+                boto3_dataclass_type_name=type_name.removesuffix("TypeDef"),
+            )
+            for i, type_name in enumerate(type_names)
+        ],
+    )
+
+
+class TestTypeReachabilityGraph:
+    def test_reachable(self):
+        graph = TypeReachabilityGraph.new(tdm=tdm, cm=make_cm("UserTypeDef"))
+        assert graph.edges["UserTypeDef"] == {"SimpleModelTypeDef"}
+        assert graph.edges["SimpleModelTypeDef"] == set()
+        assert graph.reachable() == {"UserTypeDef", "SimpleModelTypeDef"}
+
+        # the order of the module is kept
+        shaken = graph.shake(tdm)
+        assert [tdd.name for tdd in shaken.tdds] == [
+            tdd.name
+            for tdd in tdm.tdds
+            if tdd.name in {"UserTypeDef", "SimpleModelTypeDef"}
+        ]
+        code = shaken.gen_code(type_defs_line="")
+        assert "class User:" in code
+        assert "class SimpleContainer:" not in code
+
+    def test_unknown_and_cycle(self):
+        graph = TypeReachabilityGraph(
+            edges={"ATypeDef": {"BTypeDef"}, "BTypeDef": {"ATypeDef", "CTypeDef"}},
+            roots={"ATypeDef", "UnknownTypeDef"},
+        )
+        assert graph.reachable() == {"ATypeDef", "BTypeDef"}
+        graph = TypeReachabilityGraph.new(tdm=tdm, cm=make_cm())
+        assert graph.shake(tdm).tdds == []
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.models.reachability",
+        preview=False,
+    )
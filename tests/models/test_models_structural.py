@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+import importlib
+
+from boto3_dataclass.models.typed_dict import (
+    TypedDictField,
+    TypedDictDef,
+    TypedDefsModule,
+)
+from boto3_dataclass.models.structural import partition, get_structural_hashes
+from boto3_dataclass.utils import import_generated_package
+from boto3_dataclass.tests.typed_dict import nested
+from boto3_dataclass.models.caster import CasterMethod, CasterModule
+
+
+def make_tdds() -> list[TypedDictDef]:
+    return [
+        TypedDictDef(
+            name="RoleOutputTypeDef",
+            fields=[
+                TypedDictField(name="Arn"),
+                nested("Tags", "TagOutputTypeDef", True),
+            ],
+        ),
+        TypedDictDef(
+            name="RoleTypeDef",
+            # the field order doesn't matter
+            fields=[nested("Tags", "TagTypeDef", True), TypedDictField(name="Arn")],
+        ),
+        TypedDictDef(
+            name="TagTypeDef",
+            fields=[TypedDictField(name="Key"), TypedDictField(name="Value")],
+        ),
+        TypedDictDef(
+            name="TagOutputTypeDef",
+            fields=[TypedDictField(name="Key"), TypedDictField(name="Value")],
+        ),
+        # same field names, but the nested one is not a list
+        TypedDictDef(
+            name="RoleSingleTagTypeDef",
+            fields=[TypedDictField(name="Arn"), nested("Tags", "TagTypeDef")],
+        ),
+        # a cycle, the same structure as NodeTypeDef
+        TypedDictDef(name="NodeTypeDef", fields=[nested("Next", "NodeTypeDef")]),
+        TypedDictDef(name="LinkTypeDef", fields=[nested("Next", "NodeTypeDef")]),
+        # same field names, but a different nested target
+        TypedDictDef(name="RefTypeDef", fields=[nested("Next", "TagTypeDef")]),
+    ]
+
+
+def test_partition_and_hash():
+    tdds = make_tdds()
+    blocks = partition(tdds)
+    hashes = get_structural_hashes(tdds)
+    for mapping in [blocks, hashes]:
+        assert mapping["RoleTypeDef"] == mapping["RoleOutputTypeDef"]
+        assert mapping["TagTypeDef"] == mapping["TagOutputTypeDef"]
+        assert mapping["NodeTypeDef"] == mapping["LinkTypeDef"]
+        assert mapping["RoleTypeDef"] != mapping["RoleSingleTagTypeDef"]
+        assert mapping["RefTypeDef"] != mapping["NodeTypeDef"]
+    assert len(set(hashes.values())) == 5
+
+    # the hash doesn't depend on the names, so it is comparable across services
+    other = [TypedDictDef(name="KeyValueTypeDef", fields=tdds[2].fields)]
+    assert get_structural_hashes(other)["KeyValueTypeDef"] == hashes["TagTypeDef"]
+
+
+def test_dedup(tmp_path):
+    tdm = TypedDefsModule(
+        tdds=make_tdds(), aliases={"RoleV1TypeDef": "RoleOutputTypeDef"}
+    )
+    deduped = tdm.dedup()
+    # the shortest name is kept, in the original order
+    assert [tdd.name for tdd in deduped.tdds] == [
+        "RoleTypeDef",
+        "TagTypeDef",
+        "RoleSingleTagTypeDef",
+        "NodeTypeDef",
+        "RefTypeDef",
+    ]
+    assert deduped.aliases == {
+        "RoleOutputTypeDef": "RoleTypeDef",
+        "TagOutputTypeDef": "TagTypeDef",
+        "LinkTypeDef": "NodeTypeDef",
+        "RoleV1TypeDef": "RoleTypeDef",
+    }
+    assert deduped.alias_model_names["TagOutput"] == "Tag"
+
+    cm = CasterModule(
+        service_name="bmtest",
+        cms=[
+            CasterMethod(
+                method_name="get_role",
+                boto3_stubs_type_name="RoleOutputTypeDef",
+                boto3_dataclass_type_name="RoleOutput",
+            ),
+        ],
+    )
+    for compact in [False, True]:
+        package = import_generated_package(
+            package_name="boto3_dataclass_bmtest",
+            tdm=deduped,
+            cm=cm,
+            dir_root=tmp_path / str(compact),
+            compact=compact,
+        )
+        res = package.caster.get_role({"Arn": "arn", "Tags": [{"Key": "k"}]})
+        type_defs = importlib.import_module("boto3_dataclass_bmtest.type_defs")
+        assert type_defs.RoleOutput is type_defs.Role
+        assert isinstance(res, type_defs.Role)
+        assert isinstance(res.Tags[0], type_defs.TagOutput)
+        assert res.Tags[0].Key == "k"
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.models.structural",
+        preview=False,
+    )
@@ -4,7 +4,9 @@ from boto3_dataclass.models.typed_dict import (
     TypedDictFieldAnnotation,
     TypedDictField,
     TypedDictDef,
+    TypedDefsModule,
 )
+from boto3_dataclass.models.structural import get_structural_hashes
 from boto3_dataclass.utils import compare_code
 
 # DEBUG = True
@@ -85,7 +87,7 @@ class TestTypedDictDef:
         )
         code = typed_dict.gen_code()
         expected = """
-        @dataclasses.dataclass(frozen=True)
+        @dataclasses.dataclass(frozen=True, eq=False)
         class User:
             boto3_raw_data: "type_defs.UserTypeDef" = dataclasses.field()
         
@@ -99,6 +101,10 @@ class TestTypedDictDef:
             def users(self):  # pragma: no cover
                 return User.make_many(self.boto3_raw_data["users"])
         
+            __reduce__ = _reduce
+            __hash__ = _hash
+            __eq__ = _eq
+        
             @classmethod
             def make_one(cls, boto3_raw_data: T.Optional["type_defs.UserTypeDef"]):
                 if boto3_raw_data is None:
@@ -113,6 +119,72 @@ class TestTypedDictDef:
         """
         assert compare_code(code, expected, debug=DEBUG) is True
 
+        # case 2, compact mode
+        code = typed_dict.gen_code(compact=True)
+        expected = """
+        class User(_Base):
+            _fields = (
+                "id",
+                ("user", "User", False),
+                ("users", "User", True),
+            )
+        """
+        assert compare_code(code, expected, debug=DEBUG) is True
+
+    def test_key_field_name(self):
+        typed_dict = TypedDictDef(
+            name="InstanceTypeDef",
+            fields=[
+                TypedDictField(name="ImageId"),
+                TypedDictField(
+                    name="InstanceArn",
+                    anno=TypedDictFieldAnnotation(
+                        is_nested_typed_dict=True,
+                        nested_type_name="ArnTypeDef",
+                    ),
+                ),
+                TypedDictField(name="InstanceId"),
+            ],
+        )
+        assert typed_dict.key_field_name == "InstanceId"
+        assert '__hash__ = _make_hash("InstanceId")' in typed_dict.gen_code()
+        assert '_key = "InstanceId"' in typed_dict.gen_code(compact=True)
+
+        # a nested field is not an identifier
+        typed_dict.fields.pop()
+        typed_dict.fields_mapping.pop("InstanceId")
+        assert typed_dict.key_field_name is None
+        assert "_key" not in typed_dict.gen_code(compact=True)
+
+
+class TestTypedDefsModule:
+    def test_use_core(self):
+        tdm = TypedDefsModule(
+            tdds=[
+                TypedDictDef(
+                    name="TagOutputTypeDef",
+                    fields=[TypedDictField(name="Key"), TypedDictField(name="Value")],
+                ),
+                TypedDictDef(name="RoleTypeDef", fields=[TypedDictField(name="Arn")]),
+            ],
+            aliases={"TagV1TypeDef": "TagOutputTypeDef"},
+        )
+        hashes = get_structural_hashes(tdm.tdds)
+        core_tdm = tdm.use_core({hashes["TagOutputTypeDef"]: "TagTypeDef"})
+        assert [tdd.name for tdd in core_tdm.tdds] == ["RoleTypeDef"]
+        assert core_tdm.core_imports == {"TagOutputTypeDef": "TagTypeDef"}
+        assert core_tdm.core_model_names == {"TagOutput": "Tag"}
+        assert core_tdm.aliases == tdm.aliases
+        # dedup keeps the imports
+        assert core_tdm.dedup().core_imports == core_tdm.core_imports
+
+        for compact in [False, True]:
+            code = core_tdm.gen_code(type_defs_line="", compact=compact)
+            assert "from boto3_dataclass_core.type_defs import (" in code
+            assert "Tag as TagOutput," in code
+            assert "class TagOutput" not in code
+            assert "TagV1 = TagOutput" in code
+
 
 if __name__ == "__main__":
     from boto3_dataclass.tests import run_cov_test
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+
+import importlib
+
+import pytest
+
+from boto3_dataclass.models.typed_dict import (
+    TypedDictField,
+    TypedDictDef,
+    TypedDefsModule,
+)
+from boto3_dataclass.models.caster import CasterMethod, CasterModule
+from boto3_dataclass.models.usage import (
+    ServiceUsage,
+    UsageManifest,
+    make_slim_modules,
+    make_bundle_modules,
+)
+from boto3_dataclass.utils import import_generated_package
+from boto3_dataclass.tests.typed_dict import nested
+
+
+def make_modules() -> tuple[TypedDefsModule, CasterModule]:
+    tdm = TypedDefsModule(
+        tdds=[
+            TypedDictDef(
+                name="GetRoleResponseTypeDef",
+                fields=[
+                    nested("Role", "RoleTypeDef"),
+                    nested("ResponseMetadata", "ResponseMetadataTypeDef"),
+                ],
+            ),
+            TypedDictDef(
+                name="RoleTypeDef",
+                fields=[
+                    TypedDictField(name="Arn"),
+                    TypedDictField(name="RoleName"),
+                    TypedDictField(name="from"),
+                    nested("Tags", "TagV1TypeDef", True),
+                ],
+            ),
+            TypedDictDef(
+                name="TagTypeDef",
+                fields=[TypedDictField(name="Key"), TypedDictField(name="Value")],
+            ),
+            TypedDictDef(
+                name="ResponseMetadataTypeDef",
+                fields=[TypedDictField(name="RequestId")],
+            ),
+            TypedDictDef(
+                name="ListUsersResponseTypeDef",
+                fields=[TypedDictField(name="Users")],
+            ),
+        ],
+        aliases={"TagV1TypeDef": "TagTypeDef"},
+    )
+    cm = CasterModule(
+        service_name="slimtest",
+        cms=[
+            CasterMethod(
+                method_name="get_role",
+                boto3_stubs_type_name="GetRoleResponseTypeDef",
+                boto3_dataclass_type_name="GetRoleResponse",
+                operation_name="GetRole",
+            ),
+            CasterMethod(
+                method_name="list_users",
+                boto3_stubs_type_name="ListUsersResponseTypeDef",
+                boto3_dataclass_type_name="ListUsersResponse",
+                operation_name="ListUsers",
+            ),
+        ],
+    )
+    return tdm, cm
+
+
+def test_usage_manifest(tmp_path):
+    manifest_1 = UsageManifest.from_dict(
+        {
+            "services": {
+                "iam": {"operations": ["get_role"], "classes": {"Role": ["Arn"]}},
+            }
+        }
+    )
+    manifest_2 = UsageManifest(
+        services={
+            "iam": ServiceUsage(operations={"GetRole"}, classes={"Role": {"from_"}}),
+            "s3": ServiceUsage(operations={"list_buckets"}),
+        }
+    )
+    merged = UsageManifest.merge([manifest_1, manifest_2])
+    assert merged.services["iam"].operations == {"get_role", "GetRole"}
+    assert merged.services["iam"].classes == {"Role": {"Arn", "from_"}}
+    assert merged.services["s3"].classes == {}
+    # the inputs are not changed
+    assert manifest_1.services["iam"].classes == {"Role": {"Arn"}}
+
+    path = tmp_path / "usage.json"
+    merged.write(path)
+    assert UsageManifest.read(path) == merged
+
+
+def test_from_allowlist():
+    manifest = UsageManifest.from_allowlist(
+        ["iam.get_role", "iam.ListUsers", "s3.list_buckets"]
+    )
+    assert manifest.services["iam"].operations == {"get_role", "ListUsers"}
+    assert manifest.services["iam"].classes == {}
+    assert manifest.services["s3"].operations == {"list_buckets"}
+    for name in ["iam", "iam.", ".get_role"]:
+        with pytest.raises(ValueError):
+            UsageManifest.from_allowlist([name])
+
+
+def test_make_bundle_modules():
+    tdm, cm = make_modules()
+    bundle_tdm, bundle_cm = make_bundle_modules(tdm, cm, ["GetRole"])
+    assert [method.method_name for method in bundle_cm.cms] == ["get_role"]
+    tdds = bundle_tdm.tdds_mapping
+    # the closure of the output type, every class keeps all its fields
+    assert list(tdds) == [
+        "GetRoleResponseTypeDef",
+        "RoleTypeDef",
+        "TagTypeDef",
+        "ResponseMetadataTypeDef",
+    ]
+    assert tdds["RoleTypeDef"] == tdm.tdds_mapping["RoleTypeDef"]
+    assert bundle_tdm.aliases == {"TagV1TypeDef": "TagTypeDef"}
+    assert bundle_tdm.raw_fallback is False
+
+    with pytest.raises(ValueError):
+        make_bundle_modules(tdm, cm, ["get_role", "delete_role"])
+
+
+def test_make_slim_modules():
+    tdm, cm = make_modules()
+    usage = ServiceUsage(
+        operations={"GetRole"},
+        classes={
+            "GetRoleResponse": {"Role"},
+            "Role": {"Arn", "Tags"},
+            "Unknown": {"Foo"},
+        },
+    )
+    slim_tdm, slim_cm = make_slim_modules(tdm, cm, usage)
+    # the operation name and the method name both select the method
+    assert [method.method_name for method in slim_cm.cms] == ["get_role"]
+    tdds = slim_tdm.tdds_mapping
+    # the target of a used nested field is kept without fields
+    assert list(tdds) == ["GetRoleResponseTypeDef", "RoleTypeDef", "TagTypeDef"]
+    assert [tdf.name for tdf in tdds["GetRoleResponseTypeDef"].fields] == ["Role"]
+    assert [tdf.name for tdf in tdds["RoleTypeDef"].fields] == ["Arn", "Tags"]
+    assert tdds["TagTypeDef"].fields == []
+    assert slim_tdm.aliases == {"TagV1TypeDef": "TagTypeDef"}
+    assert slim_tdm.raw_fallback is True
+
+    slim_tdm, slim_cm = make_slim_modules(tdm, cm, ServiceUsage())
+    assert slim_tdm.tdds == []
+    assert slim_cm.cms == []
+
+
+def test_raw_fallback(tmp_path):
+    tdm, cm = make_modules()
+    usage = ServiceUsage(
+        operations={"get_role"},
+        classes={"GetRoleResponse": {"Role"}, "Role": {"Arn"}},
+    )
+    slim_tdm, slim_cm = make_slim_modules(tdm, cm, usage)
+    for compact in [False, True]:
+        package = import_generated_package(
+            package_name="boto3_dataclass_slimtest",
+            tdm=slim_tdm,
+            cm=slim_cm,
+            dir_root=tmp_path / str(compact),
+            compact=compact,
+        )
+        response = {
+            "Role": {
+                "Arn": "arn",
+                "RoleName": "name",
+                "from": "keyword",
+                "Tags": [{"Key": "k"}],
+            },
+            "ResponseMetadata": {"RequestId": "id"},
+        }
+        res = package.caster.get_role(response)
+        type_defs = importlib.import_module("boto3_dataclass_slimtest.type_defs")
+        assert isinstance(res.Role, type_defs.Role)
+        assert res.Role.Arn == "arn"
+        # the fields that are not generated return the raw value
+        assert res.Role.RoleName == "name"
+        assert res.Role.from_ == "keyword"
+        assert res.Role.Tags == [{"Key": "k"}]
+        assert res.ResponseMetadata == {"RequestId": "id"}
+        assert hasattr(res.Role, "MaxSessionDuration") is False
+        with pytest.raises(AttributeError):
+            _ = res.__wrapped__
+        assert not hasattr(package.caster, "list_users")
+        assert res == package.caster.cast("GetRole", response)
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.models.usage",
+        preview=False,
+    )
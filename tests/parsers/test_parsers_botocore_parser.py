@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+from boto3_dataclass.structures.boto3_dataclass_service import (
+    Boto3DataclassServiceStructure,
+)
+from boto3_dataclass.parsers.client_parser import ClientModuleParser
+from boto3_dataclass.parsers.botocore_parser import (
+    get_botocore_service_name,
+    BotocoreModelParser,
+    BotocoreTypedDefsModuleParser,
+    BotocoreClientModuleParser,
+)
+
+
+def test_get_botocore_service_name():
+    assert get_botocore_service_name("iam") == "iam"
+    assert get_botocore_service_name("sso_admin") == "sso-admin"
+
+
+class TestBotocoreTypedDefsModuleParser:
+    def test_parse(self):
+        tdm = BotocoreTypedDefsModuleParser(service_name="iam").parse()
+
+        tdd = tdm.tdds_mapping["GetRoleResponseTypeDef"]
+        tdf = tdd.fields_mapping["Role"]
+        assert tdf.anno.is_nested_typed_dict is True
+        assert tdf.anno.nested_type_name == "RoleTypeDef"
+        assert tdf.anno.nested_type_subscriptor == "NULL"
+        tdf = tdd.fields_mapping["ResponseMetadata"]
+        assert tdf.anno.nested_type_name == "ResponseMetadataTypeDef"
+
+        tdd = tdm.tdds_mapping["ListRolesResponseTypeDef"]
+        tdf = tdd.fields_mapping["Roles"]
+        assert tdf.anno.is_nested_typed_dict is True
+        assert tdf.anno.nested_type_name == "RoleTypeDef"
+        assert tdf.anno.nested_type_subscriptor == "List"
+
+        # exceptions are never returned
+        assert "NoSuchEntityExceptionTypeDef" not in tdm.tdds_mapping
+        assert "EmptyResponseMetadataTypeDef" in tdm.tdds_mapping
+
+    def test_output_variant(self):
+        tdm = BotocoreTypedDefsModuleParser(service_name="s3").parse()
+        # CORSRule is used in both input and output, and has list fields
+        assert "CORSRuleTypeDef" in tdm.tdds_mapping
+        tdd = tdm.tdds_mapping["GetBucketCorsOutputTypeDef"]
+        tdf = tdd.fields_mapping["CORSRules"]
+        assert tdf.anno.nested_type_name == "CORSRuleOutputTypeDef"
+        assert tdf.anno.nested_type_subscriptor == "List"
+
+
+class TestBotocoreClientModuleParser:
+    def test_parse(self):
+        cm = BotocoreClientModuleParser(service_name="iam").parse()
+        caster_method = cm.cms_mapping["get_role"]
+        assert caster_method.boto3_stubs_type_name == "GetRoleResponseTypeDef"
+        assert caster_method.boto3_dataclass_type_name == "GetRoleResponse"
+        assert caster_method.operation_name == "GetRole"
+        caster_method = cm.cms_mapping["delete_role"]
+        assert caster_method.boto3_stubs_type_name == "EmptyResponseMetadataTypeDef"
+        # the output shape has no member, the stub returns Dict[str, Any]
+        assert "update_role" not in cm.cms_mapping
+
+    def test_set_operation_names(self):
+        path = Boto3DataclassServiceStructure.new("s3").path_mypy_boto3_client_pyi
+        cm = ClientModuleParser(path_stub_file=path).parse()
+        BotocoreModelParser(service_name="s3").set_operation_names(cm)
+        assert cm.cms_mapping["list_objects_v2"].operation_name == "ListObjectsV2"
+        assert cm.dispatch_mapping["ListObjectsV2"] == "ListObjectsV2Output"
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.parsers.botocore_parser",
+        preview=False,
+    )
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+from boto3_dataclass.parsers.parity import (
+    ServiceParity,
+    ParserParityReport,
+    run_parser_parity_all,
+)
+from boto3_dataclass.structures.boto3_dataclass_service import (
+    Boto3DataclassServiceStructure,
+)
+
+
+def test_run_parser_parity_all(tmp_path):
+    structures = [
+        Boto3DataclassServiceStructure.new("iam"),
+        Boto3DataclassServiceStructure.new("sts"),
+    ]
+    report = run_parser_parity_all(version="0.1.1", structures=structures)
+    for parity in report.services.values():
+        assert parity.is_identical is True
+        assert parity.caster_methods > 0
+        assert parity.stub_parse_time > 0
+        assert parity.botocore_parse_time > 0
+    assert len(report.identical) == 2
+    assert "Identical: 2, different: 0" in report.summary()
+
+    path = tmp_path / "parity.json"
+    report.write(path)
+    assert ParserParityReport.read(path) == report
+
+
+def test_service_parity_is_identical():
+    parity = ServiceParity(service_name="ec2", methods_only_in_botocore=["create_tags"])
+    assert parity.is_identical is False
+    parity = ServiceParity(service_name="ec2", error="ValueError: not found")
+    assert parity.is_identical is False
+    report = ParserParityReport(version="0.1.1", services={"ec2": parity})
+    assert "ValueError" in report.summary()
+
+
+if __name__ == "__main__":
+    from boto3_dataclass.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "boto3_dataclass.parsers.parity",
+        preview=False,
+    )